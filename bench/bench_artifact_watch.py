@@ -0,0 +1,133 @@
+"""
+민감한 파일 감시(ArtifactMonitor) 벤치마크.
+
+generate_steam_root로 만든 가짜 Steam 루트를 감시 방식별로 감시하면서 다음을 잽니다.
+- 유휴 CPU: --idle초 동안 아무 변경이 없을 때 쓴 CPU 시간
+- 관련 없는 파일 쓰기: Steam 루트의 다른 파일을 --noise번 쓸 때 다시 확인한 횟수와 CPU 시간
+- 감지 지연: ssfn / config 파일을 바꾼 뒤 이벤트가 올 때까지 걸린 시간 (--changes번)
+모든 변경(생성, 변경, 교체, 삭제)을 감지하지 못하면 종료 코드 1로 끝납니다.
+
+사용법:
+  python bench/bench_artifact_watch.py [--backend inotify --backend poll] [--ssfn 5] [--config-files 50] [--idle 3]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.steam_fixture import generate_steam_root
+from src.steam.artifact_watch import (BACKEND_INOTIFY, BACKEND_POLL, BACKEND_WINDOWS, EVENT_CREATED, EVENT_DELETED,
+                                      EVENT_MODIFIED, EVENT_REPLACED, ArtifactMonitor, create_backend)
+
+
+class EventWaiter:
+    def __init__(self):
+        self.events = []
+        self._condition = threading.Condition()
+
+    def __call__(self, event):
+        with self._condition:
+            self.events.append((time.perf_counter(), event))
+            self._condition.notify_all()
+
+    def wait_for(self, kind: str, path: str, timeout: float):
+        """kind/path 이벤트를 받은 시각. 제한 시간 안에 오지 않으면 None"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                for received, event in self.events:
+                    if event.kind == kind and event.path == path:
+                        return received
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+
+def bench_backend(kind: str, args) -> bool:
+    root = tempfile.mkdtemp(prefix="artifact_watch_bench_")
+    try:
+        generate_steam_root(root, ssfn_count=args.ssfn, config_files=args.config_files, users=args.users)
+        waiter = EventWaiter()
+        monitor = ArtifactMonitor(root, backend=create_backend(kind, args.poll_interval), on_event=waiter)
+        started = time.perf_counter()
+        monitor.start()
+        print(f"[{kind}] 파일 {len(monitor.index)}개 색인 {(time.perf_counter() - started) * 1000:.1f}ms")
+
+        cpu = time.process_time()
+        time.sleep(args.idle)
+        idle_cpu = time.process_time() - cpu
+        print(f"  유휴 {args.idle:.0f}초: CPU {idle_cpu * 1000:.1f}ms, 확인 {monitor.scans - 1}회")
+
+        scans, cpu = monitor.scans, time.process_time()
+        noise = os.path.join(root, "steam.log")
+        for index in range(args.noise):
+            with open(noise, "a", encoding="utf-8") as f:
+                f.write(f"line {index}\n")
+            time.sleep(0.001)
+        time.sleep(args.poll_interval + 0.2)
+        print(f"  관련 없는 쓰기 {args.noise}번: 확인 {monitor.scans - scans}회, CPU {(time.process_time() - cpu) * 1000:.1f}ms")
+
+        ok = True
+        latencies = []
+        timeout = args.poll_interval * 2 + 2
+        for index in range(args.changes):
+            path = os.path.join("config", "loginusers.vdf") if index % 2 else f"ssfn{10 ** 18 + index}"
+            absolute = os.path.join(root, path)
+            steps = [(EVENT_CREATED, lambda: open(absolute, "wb").write(b"a" * 64)) if not os.path.exists(absolute) else
+                     (EVENT_MODIFIED, lambda: open(absolute, "r+b").write(b"#"))]
+            temp = absolute + ".tmp"
+            steps.append((EVENT_REPLACED, lambda: (open(temp, "wb").write(os.urandom(64)), os.replace(temp, absolute))))
+            if path.startswith("ssfn"):
+                steps.append((EVENT_DELETED, lambda: os.remove(absolute)))
+            for kind_expected, change in steps:
+                waiter.events.clear()
+                changed = time.perf_counter()
+                change()
+                received = waiter.wait_for(kind_expected, path, timeout)
+                if received is None:
+                    print(f"  실패: {path} {kind_expected} 이벤트를 받지 못했습니다. ({[repr(e) for _, e in waiter.events]})")
+                    ok = False
+                else:
+                    latencies.append(received - changed)
+        monitor.close()
+        if latencies:
+            print(f"  감지 지연 {len(latencies)}건: 중앙값 {statistics.median(latencies) * 1000:.1f}ms, "
+                  f"최대 {max(latencies) * 1000:.1f}ms, 해시 계산 {monitor.hashed}회")
+        return ok
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="민감한 파일 감시 벤치마크")
+    parser.add_argument("--backend", choices=(BACKEND_INOTIFY, BACKEND_WINDOWS, BACKEND_POLL), action="append",
+                        help="측정할 감시 방식 (여러 번 지정 가능, 기본: 이 OS의 알림 방식과 poll)")
+    parser.add_argument("--ssfn", type=int, default=5)
+    parser.add_argument("--config-files", type=int, default=50)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--idle", type=float, default=3.0, help="유휴 CPU를 잴 시간 (초)")
+    parser.add_argument("--noise", type=int, default=200, help="관련 없는 파일 쓰기 횟수")
+    parser.add_argument("--changes", type=int, default=10)
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    args = parser.parse_args()
+
+    backends = args.backend or [BACKEND_WINDOWS if os.name == "nt" else BACKEND_INOTIFY, BACKEND_POLL]
+    ok = True
+    for kind in backends:
+        try:
+            ok = bench_backend(kind, args) and ok
+        except OSError as e:
+            print(f"[{kind}] 건너뜀: {e}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+빌드 카탈로그(BuildCatalog) 수집/조회 벤치마크.
+
+가짜 Wayback 서버(CDX 목록 /cdx/search/cdx, 스냅샷 /web/<시각>id_/<원본 주소>)를 로컬에 띄우고
+generate_cdx_archive로 만든 보관 기록을 수집한 뒤, 날짜 -> 빌드 / 가까운 빌드 조회 시간을 측정합니다.
+- 1차 수집: 모든 digest의 매니페스트를 받음
+- 2차 수집: 새 스냅샷이 없으므로 매니페스트를 받지 않아야 함 (요청 1회)
+- --broken N: N개 스냅샷이 404를 반환 (실패 기록 후 조회에서 제외되는지 확인)
+- 날짜 조회 결과가 web.archive.org가 연결하는 스냅샷(빌드를 아는 스냅샷 중 가장 가까운 것)과 같은지 확인
+
+사용법:
+  python bench/bench_catalog.py [--builds 200] [--snapshots 5] [--lookups 10000] [--latency-ms 5]
+"""
+import argparse
+import bisect
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.steam_fixture import generate_cdx_archive
+from src.steam.build_catalog import BuildCatalog, CatalogIngester, timestamp_epoch
+
+
+def collapse_listing(listing: str, field: str = None) -> str:
+    """CDX collapse=<필드>처럼, 그 필드 값이 같은 연속된 행 중 첫 행만 남깁니다."""
+    if not field:
+        return listing
+    header, *rows = json.loads(listing)
+    index = header.index(field)
+    kept, previous = [header], None
+    for row in rows:
+        if row[index] != previous:
+            kept.append(row)
+        previous = row[index]
+    return json.dumps(kept)
+
+
+def served_snapshot(epochs: list, timestamps: list, date: str) -> str:
+    """web.archive.org가 날짜 주소를 연결하는 스냅샷 (가장 가까운 스냅샷, 같으면 이른 쪽)"""
+    epoch = timestamp_epoch(date)
+    index = bisect.bisect_left(epochs, epoch)
+    candidates = [i for i in (index - 1, index) if 0 <= i < len(epochs)]
+    return timestamps[min(candidates, key=lambda i: (abs(epochs[i] - epoch), i))]
+
+
+class _WaybackHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency)
+        url = urllib.parse.urlsplit(self.path)
+        with server.lock:
+            server.requests.append(url.path)
+        data = None
+        if url.path == "/cdx/search/cdx":
+            query = urllib.parse.parse_qs(url.query)
+            data = collapse_listing(server.listing, query.get("collapse", [None])[0]).encode("utf-8")
+        elif url.path.startswith("/web/"):
+            timestamp = url.path[len("/web/"):].split("id_/", 1)[0]
+            if timestamp not in server.broken:
+                data = server.manifests.get(timestamp, "").encode("utf-8") or None
+        if data is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class WaybackStandIn:
+    def __init__(self, listing: str, manifests: dict, latency: float = 0.0, broken=()):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _WaybackHandler)
+        self._server.daemon_threads = True
+        self._server.listing = listing
+        self._server.manifests = manifests
+        self._server.latency = latency
+        self._server.broken = set(broken)
+        self._server.requests = []
+        self._server.lock = threading.Lock()
+        threading.Thread(target=self._server.serve_forever, name="wayback", daemon=True).start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def requests(self) -> list:
+        return list(self._server.requests)
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="빌드 카탈로그 벤치마크")
+    parser.add_argument("--builds", type=int, default=200)
+    parser.add_argument("--snapshots", type=int, default=5, help="빌드당 스냅샷 수")
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="가짜 서버 요청당 지연")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--broken", type=int, default=0, help="404를 반환할 스냅샷 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    listing, manifests = generate_cdx_archive(args.builds, args.snapshots, seed=args.seed)
+    rng = random.Random(args.seed)
+    # 한 digest의 모든 스냅샷이 아니라 가장 이른 스냅샷(수집기가 받는 스냅샷)을 망가뜨립니다.
+    first_snapshots = {}
+    for timestamp, manifest in sorted(manifests.items()):
+        first_snapshots.setdefault(manifest, timestamp)
+    broken = rng.sample(sorted(first_snapshots.values()), min(args.broken, len(first_snapshots)))
+
+    server = WaybackStandIn(listing, manifests, args.latency_ms / 1000, broken)
+    workdir = tempfile.mkdtemp(prefix="catalog_bench_")
+    try:
+        with BuildCatalog(os.path.join(workdir, "catalog.sqlite")) as catalog:
+            ingester = CatalogIngester(catalog, cdx_url=f"{server.base_url}/cdx/search/cdx",
+                                       snapshot_url=f"{server.base_url}/web/{{timestamp}}id_/{{original}}",
+                                       max_workers=args.workers)
+            first = ingester.update()
+            requests_after_first = len(server.requests)
+            second = ingester.update()
+            print(f"1차 수집: {first}")
+            print(f"2차 수집: {second} (요청 {len(server.requests) - requests_after_first}회)")
+
+            timestamps = sorted(manifests)
+            low, high = timestamp_epoch(timestamps[0]), timestamp_epoch(timestamps[-1])
+            dates = [time.strftime("%Y%m%d%H%M%S", time.gmtime(rng.randrange(low, high))) for _ in range(args.lookups)]
+            started = time.perf_counter()
+            resolved = [catalog.resolve(date) for date in dates]
+            resolve_us = (time.perf_counter() - started) / len(dates) * 1e6
+
+            # 매니페스트를 받지 못한 digest의 스냅샷은 조회에서 빠집니다.
+            failed = {digest for digest, _ in first.failed}
+            digests = {row[1]: row[5] for row in json.loads(listing)[1:]}
+            known = sorted(timestamp for timestamp in manifests if digests[timestamp] not in failed)
+            known_epochs = [timestamp_epoch(timestamp) for timestamp in known]
+            wrong = [(date, entry.timestamp) for date, entry in zip(dates, resolved)
+                     if entry is not None and entry.timestamp != served_snapshot(known_epochs, known, date)]
+
+            builds = [row[0] for row in catalog.builds()]
+            targets = [str(int(rng.choice(builds)) + rng.randrange(-300000, 300000)) for _ in range(args.lookups)]
+            started = time.perf_counter()
+            for target in targets:
+                catalog.nearest_build(target)
+            nearest_us = (time.perf_counter() - started) / len(targets) * 1e6
+
+            print(f"빌드 {len(builds)}개, 스냅샷 {len(catalog.entries())}개, 실패 digest {len(first.failed)}개")
+            print(f"날짜 -> 빌드 조회: {resolve_us:.1f}us/회, 가까운 빌드 조회: {nearest_us:.1f}us/회 ({args.lookups}회)")
+            if wrong:
+                print(f"실패: web.archive.org가 연결하는 스냅샷과 다른 조회 {len(wrong)}건 (예: {wrong[:3]})")
+                sys.exit(1)
+            if any(entry is None for entry in resolved) or second.fetched or len(first.failed) != len(broken):
+                print("실패: 조회 결과 또는 수집 횟수가 예상과 다릅니다.")
+                sys.exit(1)
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
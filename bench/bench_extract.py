@@ -0,0 +1,109 @@
+"""
+패키지 직접 설치(PackageExtractor) 벤치마크.
+
+generate_client_packages로 만든 패키지를 PackageCache에 넣고, 압축 방식별로 Steam 루트에 푸는 시간을 잽니다.
+- zipfile.extractall로 패키지를 하나씩 푸는 기준값 (zip만, 구 클라이언트 방식과 비슷)
+- PackageExtractor 스레드 1개 / --workers개
+- 같은 루트에 다시 설치 (해시 캐시로 이미 같은 파일을 건너뛰는 경로)
+푼 결과는 IntegrityVerifier로 확인하며, 하나라도 맞지 않거나 패키지에 섞인 임시 파일을 풀면 종료 코드 1로 끝납니다.
+zstd / zip-zstd는 zstandard 모듈이 필요합니다. (없으면 건너뜀)
+
+사용법:
+  python bench/bench_extract.py [--packages 12] [--files-per-package 20] [--file-size-kb 512] [--workers 8]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.steam_fixture import PACKAGE_COMPRESSIONS, generate_client_packages
+from src.net.package_cache import PackageCache
+from src.steam.client_manifest import ClientManifest
+from src.steam.integrity import DigestCache, IntegrityVerifier
+from src.steam.package_extractor import PackageExtractor
+
+
+def _mb_per_s(size: int, elapsed: float) -> str:
+    return f"{size / 1024 / 1024 / elapsed:8.1f}MB/s" if elapsed > 0 else "       -"
+
+
+def bench_compression(workdir: str, compression: str, args) -> bool:
+    manifest_text, blobs = generate_client_packages(args.packages, args.files_per_package, args.file_size_kb * 1024,
+                                                    seed=args.seed, compression=compression)
+    manifest = ClientManifest.parse(manifest_text)
+    cache = PackageCache(os.path.join(workdir, "cache"), 1 << 40)
+    for name, data in blobs.items():
+        cache.store_bytes(name, data)
+    manifest_path = os.path.join(workdir, "target.manifest")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        f.write(manifest_text)
+    total = args.packages * args.files_per_package * args.file_size_kb * 1024
+    print(f"[{compression}] 패키지 {len(blobs)}개, 압축 {sum(map(len, blobs.values())) / 1024 / 1024:.1f}MB -> "
+          f"{total / 1024 / 1024:.1f}MB")
+
+    if compression == "zip":
+        root = os.path.join(workdir, "extractall")
+        started = time.perf_counter()
+        for package in manifest.packages.values():
+            with zipfile.ZipFile(cache.blob_path(package.download_sha2)) as archive:
+                archive.extractall(root)
+        elapsed = time.perf_counter() - started
+        print(f"  zipfile.extractall      {elapsed * 1000:8.1f}ms {_mb_per_s(total, elapsed)}")
+
+    ok = True
+    for label, workers in (("스레드 1개", 1), (f"스레드 {args.workers}개", args.workers)):
+        root = os.path.join(workdir, f"root{workers}")
+        digest_path = os.path.join(workdir, f"digests{workers}.json")
+        report = PackageExtractor(root, cache=cache, max_workers=workers).install(manifest, manifest_path)
+        print(f"  PackageExtractor {label:8s}{report.elapsed * 1000:8.1f}ms {_mb_per_s(report.bytes_out, report.elapsed)}")
+        verify = IntegrityVerifier(root, digest_path).verify(manifest)
+        stray = os.path.join(root, "bin", "pkg0", "file0.dll.tmp")
+        if not report.ok or not verify.ok or os.path.exists(stray):
+            print(f"  실패: {report.failed[:3]} / {verify} / 임시 파일 설치됨 {os.path.exists(stray)}")
+            ok = False
+            continue
+        # 다시 설치: 검사에서 채운 해시 캐시로 같은 파일을 건너뜁니다.
+        rerun = PackageExtractor(root, cache=cache, max_workers=workers,
+                                 digest_cache=DigestCache(digest_path)).install(manifest, manifest_path)
+        unchanged = sum(result.unchanged for result in rerun.results)
+        print(f"    다시 설치               {rerun.elapsed * 1000:8.1f}ms (유지 {unchanged}개, 새로 씀 {rerun.files}개)")
+
+    if args.verbose:
+        slowest = sorted(report.results, key=lambda result: result.elapsed, reverse=True)[:5]
+        for result in slowest:
+            print(f"    {result.name:8s} {result.elapsed * 1000:7.1f}ms {_mb_per_s(result.bytes_out, result.elapsed)}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="패키지 직접 설치 벤치마크")
+    parser.add_argument("--packages", type=int, default=12)
+    parser.add_argument("--files-per-package", type=int, default=20)
+    parser.add_argument("--file-size-kb", type=int, default=512)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--compression", choices=PACKAGE_COMPRESSIONS, action="append",
+                        help="측정할 압축 방식 (여러 번 지정 가능, 기본: 모두)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="가장 오래 걸린 패키지 출력")
+    args = parser.parse_args()
+
+    ok = True
+    for compression in args.compression or PACKAGE_COMPRESSIONS:
+        workdir = tempfile.mkdtemp(prefix="extract_bench_")
+        try:
+            ok = bench_compression(workdir, compression, args) and ok
+        except ImportError as e:
+            print(f"[{compression}] 건너뜀: {e}")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
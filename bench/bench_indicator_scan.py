@@ -0,0 +1,132 @@
+"""
+지표 검색기(IndicatorScanner) 벤치마크.
+
+임의 바이트로 채운 파일 트리(작은 파일 --files개 + 큰 파일 하나)를 만들고, 정해 둔 오프셋에 지표 문자열을
+대소문자를 섞어 UTF-8 / UTF-16LE로 심은 뒤 검사합니다. 큰 파일에는 검사 구간(CHUNK_SIZE)과 작업 단위(UNIT_BYTES)
+경계에 걸치도록 심습니다.
+- 기준값: 파일마다 통째로 읽어 re 대안 패턴(re.IGNORECASE 없이 소문자로 바꾼 뒤)으로 찾기
+- IndicatorScanner 프로세스 1개 / --workers개
+심은 지표를 하나라도 그 위치에서 찾지 못하면 종료 코드 1로 끝납니다.
+
+사용법:
+  python bench/bench_indicator_scan.py [--files 400] [--file-size-kb 256] [--large-mb 160] [--workers 4]
+"""
+import argparse
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.steam.indicator_scan import CHUNK_SIZE, INDICATORS, UNIT_BYTES, IndicatorScanner, compile_patterns
+
+
+def _mixed_case(rng: random.Random, text: str) -> str:
+    return "".join(char.upper() if rng.random() < 0.5 else char for char in text)
+
+
+def build_tree(root: str, args) -> dict:
+    """파일 트리를 만들고 심은 지표 {(경로, 지표, 인코딩): {오프셋}}를 반환합니다."""
+    rng = random.Random(args.seed)
+    texts = [(name, text) for name, values in INDICATORS.items() for text in values]
+    planted = {}
+    occupied = {}
+
+    def plant(data: bytearray, path: str, offset: int):
+        name, text = rng.choice(texts)
+        encoding = rng.choice(("utf-8", "utf-16-le"))
+        payload = _mixed_case(rng, text).encode(encoding)
+        # 앞서 심은 지표를 덮어쓰지 않습니다.
+        if any(offset < end and start < offset + len(payload) for start, end in occupied.get(path, ())):
+            return
+        occupied.setdefault(path, []).append((offset, offset + len(payload)))
+        data[offset:offset + len(payload)] = payload
+        planted.setdefault((path, name, encoding), set()).add(offset)
+
+    for index in range(args.files):
+        path = os.path.join(root, f"dir{index % 20}", f"file{index}.bin")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = bytearray(rng.randbytes(args.file_size_kb * 1024))
+        if index % 10 == 0:
+            for _ in range(3):
+                plant(data, path, rng.randrange(len(data) - 64))
+        with open(path, "wb") as f:
+            f.write(data)
+
+    if args.large_mb:
+        path = os.path.join(root, "large.bin")
+        data = bytearray(rng.randbytes(args.large_mb * 1024 * 1024))
+        boundaries = sorted({offset for step in (CHUNK_SIZE, UNIT_BYTES) for offset in range(step, len(data), step)})
+        for boundary in boundaries:
+            plant(data, path, boundary - rng.randrange(1, 12))
+        for _ in range(8):
+            plant(data, path, rng.randrange(len(data) - 64))
+        with open(path, "wb") as f:
+            f.write(data)
+    return planted
+
+
+def baseline_re(root: str) -> tuple:
+    pattern = re.compile(b"|".join(re.escape(pattern) for pattern, _, _ in compile_patterns()))
+    count, total, started = 0, 0, time.perf_counter()
+    for directory, _, names in os.walk(root):
+        for name in names:
+            with open(os.path.join(directory, name), "rb") as f:
+                data = f.read()
+            total += len(data)
+            count += sum(1 for _ in pattern.finditer(data.lower()))
+    return count, total, time.perf_counter() - started
+
+
+def check(report, planted: dict) -> list:
+    """심은 지표 중 찾지 못한 것 [(경로, 지표, 인코딩, 오프셋)]"""
+    found = {}
+    for result in report.results:
+        for (name, encoding), (_, offsets) in result.hits.items():
+            found.setdefault((result.path, name, encoding), set()).update(offsets)
+    missing = []
+    for key, offsets in planted.items():
+        for offset in sorted(offsets - found.get(key, set())):
+            missing.append((*key, offset))
+    return missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지표 검색기 벤치마크")
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--file-size-kb", type=int, default=256)
+    parser.add_argument("--large-mb", type=int, default=160, help="큰 파일 하나의 크기 (0이면 만들지 않음)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="indicator_scan_bench_")
+    try:
+        planted = build_tree(root, args)
+        print(f"파일 {args.files + bool(args.large_mb)}개, 심은 지표 {sum(map(len, planted.values()))}개 "
+              f"(CPU {os.cpu_count()}개)")
+        count, total, elapsed = baseline_re(root)
+        print(f"  re 대안 패턴 (기준)    {elapsed * 1000:9.1f}ms {total / 1024 / 1024 / elapsed:8.1f}MB/s 일치 {count}개")
+
+        ok = True
+        for workers in sorted({1, args.workers}):
+            report = IndicatorScanner(max_workers=workers, min_indicators=1).scan([root])
+            label = f"프로세스 {report.workers}개"
+            print(f"  IndicatorScanner {label:9s}{report.elapsed * 1000:9.1f}ms "
+                  f"{report.throughput / 1024 / 1024:8.1f}MB/s 일치 파일 {len(report.results)}개")
+            missing = check(report, planted)
+            if missing or report.errors:
+                print(f"    실패: 찾지 못한 지표 {missing[:5]}, 읽기 실패 {report.errors[:3]}")
+                ok = False
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Steam 프로세스 종료 경로 벤치마크.
+
+가짜 프로세스 테이블에서 ProcessTable.kill_tree의 비용을 측정하고,
+기존 방식처럼 외부 명령을 실행할 때의 서브프로세스 시작 비용과 비교합니다.
+사용법: python bench/bench_kill_steam.py [--processes 50 500 5000] [--repeat 20]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.util.process_supervisor import FakeProcessBackend, STEAM_PROCESS_NAMES
+from src.util.process_table import ProcessTable
+
+
+def build_table(process_count: int) -> FakeProcessBackend:
+    backend = FakeProcessBackend()
+    for index in range(process_count):
+        backend.add(f"process{index}.exe", ppid=index % 50)
+    steam = backend.add("steam.exe", ppid=4)
+    # Steam보다 먼저 생성되어 재사용된 pid를 ppid로 가진 관계없는 프로세스 (종료하면 안 됨)
+    backend.add("unrelated.exe", ppid=steam, started=0)
+    for _ in range(8):
+        helper = backend.add("steamwebhelper.exe", ppid=steam)
+        backend.add("steamwebhelper.exe", ppid=helper)
+    return backend
+
+
+def measure_kill_tree(process_count: int, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        table = ProcessTable(build_table(process_count))
+        started = time.perf_counter()
+        result = table.kill_tree(STEAM_PROCESS_NAMES)
+        elapsed = time.perf_counter() - started
+        assert result.ok and len(result.terminated) == 17
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure_subprocess(repeat: int) -> float:
+    # taskkill을 실행할 수 없는 환경에서도 비교할 수 있도록 아무 일도 하지 않는 명령의 시작 비용을 잽니다.
+    command = [sys.executable, "-c", "pass"]
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, capture_output=True)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Steam 프로세스 종료 경로 벤치마크")
+    parser.add_argument("--processes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"서브프로세스 1회 실행 비용: {measure_subprocess(min(args.repeat, 5)) * 1000:.2f}ms")
+    print(f"{'processes':>10} {'kill_tree(ms)':>14}")
+    for process_count in args.processes:
+        print(f"{process_count:>10} {measure_kill_tree(process_count, args.repeat) * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
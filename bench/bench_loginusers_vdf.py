@@ -0,0 +1,111 @@
+"""
+loginusers.vdf 오프라인 로그인 설정 벤치마크.
+
+기존 str.replace 체인 방식과 src.steam.vdf 편집기(작은 파일용 메모리 편집, 큰 파일용 청크 스트리밍)를
+사용자 수별로 비교합니다. 두 편집 경로는 in_memory_limit로 강제해 각각 측정합니다.
+사용법: python bench/bench_loginusers_vdf.py [--users 10 100 1000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.steam import vdf
+
+
+def generate_loginusers(user_count: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    lines = ['"users"', "{"]
+    for index in range(user_count):
+        steam_id = 76561197960265728 + rng.randrange(10 ** 9)
+        # 탭 개수와 누락 키를 섞어서 실제 파일의 다양한 형식을 흉내 냅니다.
+        sep = rng.choice(["\t\t", "\t", " "])
+        lines.append(f'\t"{steam_id}"')
+        lines.append("\t{")
+        lines.append(f'\t\t"AccountName"{sep}"user{index}"')
+        lines.append(f'\t\t"PersonaName"{sep}"Persona {index}"')
+        for key in vdf.OFFLINE_LOGIN_FLAGS:
+            if rng.random() < 0.7:
+                lines.append(f'\t\t"{key}"{sep}"{rng.choice("01")}"')
+        lines.append(f'\t\t"Timestamp"{sep}"{1700000000 + index}"')
+        lines.append("\t}")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def legacy_edit(path: str):
+    """기존 _edit_loginusers_vdf_for_offline의 str.replace 체인"""
+    with open(path, "r+", encoding="utf-8") as f:
+        content = f.read()
+        f.seek(0)
+        content = content.replace('"RememberPassword"\t\t"0"', '"RememberPassword"\t\t"1"')
+        content = content.replace('"RememberPassword"\t\t"1"', '"RememberPassword"\t\t"1"')
+        content = content.replace('"WantsOfflineMode"\t\t"0"', '"WantsOfflineMode"\t\t"1"')
+        content = content.replace('"WantsOfflineMode"\t\t"1"', '"WantsOfflineMode"\t\t"1"')
+        content = content.replace('"SkipOfflineModeWarning"\t"0"', '"SkipOfflineModeWarning"\t"1"')
+        content = content.replace('"SkipOfflineModeWarning"\t"1"', '"SkipOfflineModeWarning"\t"1"')
+        content = content.replace('"AllowAutoLogin"\t\t"0"', '"AllowAutoLogin"\t\t"1"')
+        content = content.replace('"AllowAutoLogin"\t\t"1"', '"AllowAutoLogin"\t\t"1"')
+        f.truncate(0)
+        f.write(content)
+
+
+def in_memory_edit(path: str):
+    vdf.rewrite_user_flags(path, vdf.OFFLINE_LOGIN_FLAGS, in_memory_limit=1 << 62)
+
+
+def streaming_edit(path: str):
+    vdf.rewrite_user_flags(path, vdf.OFFLINE_LOGIN_FLAGS, in_memory_limit=-1)
+
+
+def measure(func, source: str, workdir: str, repeat: int):
+    path = os.path.join(workdir, "loginusers.vdf")
+    best = None
+    for _ in range(repeat):
+        shutil.copyfile(source, path)
+        started = time.perf_counter()
+        func(path)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    # tracemalloc은 할당마다 비용이 크므로 시간 측정과 분리해서 한 번만 실행합니다.
+    shutil.copyfile(source, path)
+    tracemalloc.start()
+    func(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="loginusers.vdf 편집 방식 벤치마크")
+    parser.add_argument("--users", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_vdf_")
+    try:
+        print(f"{'users':>8} {'size(KB)':>10} {'legacy(ms)':>12} {'legacy peak(KB)':>16} {'memory(ms)':>11} "
+              f"{'memory peak(KB)':>16} {'stream(ms)':>11} {'stream peak(KB)':>16}")
+        for user_count in args.users:
+            source = os.path.join(workdir, f"source_{user_count}.vdf")
+            with open(source, "w", encoding="utf-8", newline="") as f:
+                f.write(generate_loginusers(user_count))
+            size_kb = os.path.getsize(source) / 1024
+            legacy_time, legacy_peak = measure(legacy_edit, source, workdir, args.repeat)
+            memory_time, memory_peak = measure(in_memory_edit, source, workdir, args.repeat)
+            stream_time, stream_peak = measure(streaming_edit, source, workdir, args.repeat)
+            print(f"{user_count:>8} {size_kb:>10.1f} {legacy_time * 1000:>12.2f} {legacy_peak / 1024:>16.1f} "
+                  f"{memory_time * 1000:>11.2f} {memory_peak / 1024:>16.1f} {stream_time * 1000:>11.2f} {stream_peak / 1024:>16.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
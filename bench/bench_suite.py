@@ -0,0 +1,187 @@
+"""
+가짜 Steam 루트 위에서 주요 단계를 데이터 크기별로 측정하는 벤치마크 모음.
+
+측정 대상: SSFNHandler.use_local_ssfn (교체 / 이미 같은 파일), SteamDowngrader._edit_loginusers_vdf_for_offline,
+SteamDowngrader._create_steam_cfg, Config 로딩 (EnvironmentProbe 처음 / 공유)
+결과는 JSON으로 저장하고, 저장한 기준값과 비교해 느려진 항목이 있으면 종료 코드 1을 반환합니다.
+
+사용법:
+  python bench/bench_suite.py --save bench/baselines/linux-py311.json
+  python bench/bench_suite.py --compare bench/baselines/linux-py311.json [--tolerance 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.steam_fixture import generate_loginusers, generate_steam_root, write_config_yaml
+from src.util import log_pipeline
+from src.helper.env_probe import EnvironmentProbe
+from src.helper.config import Config
+from src.steam.reg import FakeRegistryBackend
+from src.util.process_supervisor import FakeProcessBackend
+from src.util.steam_downgrader import SteamDowngrader
+from ssfn import SSFNHandler
+
+SIZES = {
+    "small": {"ssfn": 10, "config_files": 20, "users": 10},
+    "medium": {"ssfn": 500, "config_files": 200, "users": 200},
+    "large": {"ssfn": 5000, "config_files": 1000, "users": 2000},
+}
+
+
+def best_of(repeat: int, setup, run) -> float:
+    """setup()은 측정에서 빼고 run()만 repeat번 재서 가장 빠른 시간을 반환합니다."""
+    best = None
+    for _ in range(repeat):
+        state = setup()
+        started = time.perf_counter()
+        run(state)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def fake_registry(steam_root: str) -> FakeRegistryBackend:
+    return FakeRegistryBackend({r"SOFTWARE\Valve\Steam": {
+        "SteamPath": steam_root,
+        "SteamExe": os.path.join(steam_root, "steam.exe"),
+    }})
+
+
+def make_downgrader(workdir: str, steam_root: str) -> SteamDowngrader:
+    config_path = os.path.join(workdir, "config.yaml")
+    write_config_yaml(config_path, steam_root)
+    probe = EnvironmentProbe(config_path, fake_registry(steam_root))
+    return SteamDowngrader(process_backend=FakeProcessBackend(), config=Config(probe))
+
+
+def bench_size(size_name: str, params: dict, repeat: int, workdir: str) -> dict:
+    root = os.path.join(workdir, size_name, "Steam")
+    generate_steam_root(root, params["ssfn"], params["config_files"], params["users"])
+    ssfn_source = os.path.join(workdir, size_name, "ssfn1234567890123456789")
+    with open(ssfn_source, "wb") as f:
+        f.write(os.urandom(2048))
+    ssfn_names = sorted(name for name in os.listdir(root) if name.startswith("ssfn"))
+    ssfn_backup = os.path.join(workdir, size_name, "ssfn_backup")
+    os.makedirs(ssfn_backup)
+    for name in ssfn_names:
+        shutil.copyfile(os.path.join(root, name), os.path.join(ssfn_backup, name))
+
+    def restore_ssfn():
+        for name in os.listdir(root):
+            if name.startswith("ssfn"):
+                os.remove(os.path.join(root, name))
+        for name in ssfn_names:
+            shutil.copyfile(os.path.join(ssfn_backup, name), os.path.join(root, name))
+
+    handler = SSFNHandler(os.path.join(workdir, size_name, "ssfn_slots"))
+    results = {}
+    results["use_local_ssfn"] = best_of(repeat, restore_ssfn, lambda _: handler.use_local_ssfn(ssfn_source, root))
+    results["use_local_ssfn_noop"] = best_of(repeat, lambda: None, lambda _: handler.use_local_ssfn(ssfn_source, root))
+
+    downgrader = make_downgrader(os.path.join(workdir, size_name), root)
+    loginusers_path = os.path.join(root, "config", "loginusers.vdf")
+    loginusers_source = generate_loginusers(params["users"])
+
+    def reset_loginusers():
+        with open(loginusers_path, "w", encoding="utf-8", newline="") as f:
+            f.write(loginusers_source)
+
+    results["edit_loginusers_vdf"] = best_of(repeat, reset_loginusers, lambda _: downgrader._edit_loginusers_vdf_for_offline())
+    results["edit_loginusers_vdf_noop"] = best_of(repeat, lambda: None, lambda _: downgrader._edit_loginusers_vdf_for_offline())
+    results["create_steam_cfg"] = best_of(repeat, lambda: None, lambda _: downgrader._create_steam_cfg())
+
+    config_path = os.path.join(workdir, size_name, "config.yaml")
+    results["config_cold"] = best_of(repeat, lambda: EnvironmentProbe(config_path, fake_registry(root)), lambda probe: Config(probe))
+    shared = EnvironmentProbe(config_path, fake_registry(root))
+    Config(shared)
+    results["config_shared"] = best_of(repeat, lambda: shared, lambda probe: Config(probe))
+    return results
+
+
+def run_suite(sizes, repeat: int) -> dict:
+    # 측정 대상이 남기는 로그는 버리고 오류만 출력합니다.
+    log_pipeline.configure(console_level="ERROR")
+    workdir = tempfile.mkdtemp(prefix="steam_bench_")
+    try:
+        results = {}
+        for size_name in sizes:
+            results[size_name] = bench_size(size_name, SIZES[size_name], repeat, workdir)
+            log_pipeline.get_pipeline().flush()
+        return {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeat": repeat,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "results": results,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_delta: float = 0.0005) -> list:
+    """
+    기준값보다 (1 + tolerance)배 넘게 느려진 (크기, 항목, 기준, 현재) 목록.
+    차이가 min_delta초보다 작으면 측정 오차로 보고 무시합니다.
+    """
+    regressions = []
+    for size_name, metrics in current["results"].items():
+        for metric, value in metrics.items():
+            base = baseline.get("results", {}).get(size_name, {}).get(metric)
+            if base and value > base * (1 + tolerance) and value - base > min_delta:
+                regressions.append((size_name, metric, base, value))
+    return regressions
+
+
+def print_table(current: dict, baseline: dict = None):
+    print(f"{'size':>8} {'metric':>26} {'ms':>10} {'baseline':>10} {'ratio':>7}")
+    for size_name, metrics in current["results"].items():
+        for metric, value in metrics.items():
+            base = (baseline or {}).get("results", {}).get(size_name, {}).get(metric)
+            base_text = f"{base * 1000:10.3f}" if base else f"{'-':>10}"
+            ratio_text = f"{value / base:7.2f}" if base else f"{'-':>7}"
+            print(f"{size_name:>8} {metric:>26} {value * 1000:10.3f} {base_text} {ratio_text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 Steam 루트 벤치마크 모음")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="JSON", help="결과를 기준값 파일로 저장")
+    parser.add_argument("--compare", metavar="JSON", help="기준값 파일과 비교")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용하는 느려짐 비율 (기본 0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="이보다 작은 차이는 무시 (기본 0.5ms)")
+    args = parser.parse_args()
+
+    current = run_suite(args.sizes, args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_table(current, baseline)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"기준값 저장: {args.save}")
+
+    if baseline is not None:
+        regressions = compare(current, baseline, args.tolerance, args.min_delta_ms / 1000)
+        for size_name, metric, base, value in regressions:
+            print(f"느려짐: {size_name}/{metric} {base * 1000:.3f}ms -> {value * 1000:.3f}ms ({value / base:.2f}배)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
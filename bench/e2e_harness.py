@@ -0,0 +1,445 @@
+"""
+Linux에서 전체 다운그레이드 과정(Main.start)을 끝까지 실행하는 가짜 Steam 하니스.
+
+- 가짜 Steam 루트 (steam_fixture) 와 steam.exe 자리에 설치한 가짜 Steam 클라이언트 (fake_steam.py)
+- 대상 클라이언트 빌드를 제공하는 로컬 패키지 원본 서버 (package_origin_url)
+- 가짜 레지스트리 (FakeRegistryBackend) 와 가짜 프로세스 테이블 (HarnessProcessBackend)
+- 네트워크 차단 자동 확인이 바라보는 로컬 연결 확인 주소 (NetworkStandIn). --cut-after초 뒤에 닫아 차단을 흉내 냅니다.
+  --network-cut prompt이면 input()에 미리 준비한 입력을 넣어 사람 없이 진행합니다.
+실행마다 Tracer의 단계별 소요 시간을 모아 표로 출력하고, --json으로 저장할 수 있습니다.
+--history로 실행 기록(RunLedger)에 쌓으면 하니스를 반복 실행할 때 이전 실행보다 느려진 단계를 찾아 종료 코드 1로 끝냅니다.
+같은 Steam 루트에서 --runs N번 실행하므로 두 번째 실행부터는 캐시/변경 없음 경로를 측정합니다.
+
+사용법:
+  python bench/e2e_harness.py [--runs 2] [--packages 8] [--package-delay 0.05] [--fail package] [--json result.json]
+                              [--network-cut auto|prompt] [--cut-after 0.3]
+                              [--compression zip|zstd|zip-zstd] [--install-mode steam|direct]
+                              [--history e2e_history.sqlite]
+"""
+import argparse
+import io
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.fake_steam import LOG_NAME, SETTINGS_NAME
+from bench.steam_fixture import PACKAGE_COMPRESSIONS, generate_client_packages, generate_steam_root, write_config_yaml
+from src.util import log_pipeline, tracing
+from src.helper.env_probe import EnvironmentProbe, set_probe
+from src.steam.client_manifest import CLIENT_MANIFEST_NAME
+from src.steam.reg import FakeRegistryBackend
+from src.util.process_supervisor import FakeProcessBackend
+
+FAKE_STEAM_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_steam.py")
+FAIL_STAGES = ("startup", "manifest", "package", "extract")
+
+
+class HarnessProcessBackend(FakeProcessBackend):
+    """
+    가짜 프로세스 테이블에 실제로 실행한 가짜 Steam을 steam.exe로 등록합니다.
+    프로세스가 끝나면 테이블에서 빠지므로 ProcessSupervisor는 실제 종료 시점을 기다립니다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.children = {}  # pid -> Popen
+
+    def spawn(self, command, shell: bool = False):
+        self.spawned.append(command)
+        # 셸이 자식 프로세스를 남겨도 한 번에 종료할 수 있도록 새 세션에서 실행합니다.
+        process = subprocess.Popen(command, shell=shell, start_new_session=True)
+        pid = self.add("steam.exe", pid=process.pid)
+        self.children[pid] = process
+        threading.Thread(target=self._reap, args=(pid, process), name=f"reap-{pid}", daemon=True).start()
+        return process
+
+    def _reap(self, pid: int, process):
+        process.wait()
+        self.exit(pid)
+
+    def _kill(self, process):
+        if process.poll() is None:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            process.wait()
+
+    def terminate(self, pid: int):
+        process = self.children.get(pid)
+        if process is not None:
+            self._kill(process)
+        super().terminate(pid)
+
+    def shutdown(self):
+        """남아 있는 가짜 Steam (오프라인 실행 등)을 모두 종료합니다."""
+        for pid, process in list(self.children.items()):
+            self._kill(process)
+            self.exit(pid)
+
+
+class _OriginHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        name = self.path.split("?", 1)[0].rsplit("/", 1)[-1]
+        data = server.files.get(name)
+        time.sleep(server.latency)
+        with server.lock:
+            server.requests.append(name)
+        if data is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class OriginServer:
+    """대상 빌드의 매니페스트와 패키지를 <base>/client/<이름>으로 제공하는 로컬 서버"""
+
+    def __init__(self, files: dict, latency: float = 0.0):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _OriginHandler)
+        self._server.daemon_threads = True
+        self._server.files = files
+        self._server.latency = latency
+        self._server.requests = []
+        self._server.lock = threading.Lock()
+        self._thread = threading.Thread(target=self._server.serve_forever, name="origin", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/client"
+
+    @property
+    def requests(self) -> list:
+        return list(self._server.requests)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class NetworkStandIn:
+    """
+    네트워크 차단 자동 확인용 로컬 연결 확인 주소. 열려 있으면 "연결됨", cut() 뒤에는 연결이 거부되어 "차단됨"입니다.
+    설정 파일에 주소를 한 번만 쓰도록 실행마다 같은 포트를 다시 엽니다.
+    """
+
+    def __init__(self):
+        self.port = 0
+        self._socket = None
+        self._thread = None
+        self._timer = None
+
+    @property
+    def endpoint(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    def open(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("127.0.0.1", self.port))
+        sock.listen(16)
+        self.port = sock.getsockname()[1]
+        self._socket = sock
+        self._thread = threading.Thread(target=self._accept, args=(sock,), name="network-stand-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def _accept(self, sock):
+        while True:
+            try:
+                connection, _ = sock.accept()
+            except OSError:
+                return
+            connection.close()
+
+    def cut_after(self, delay: float):
+        self._timer = threading.Timer(delay, self.cut)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def cut(self):
+        if self._socket is not None:
+            # accept()에서 기다리는 스레드를 깨운 뒤 닫습니다.
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._socket.close()
+            self._socket = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.cut()
+
+
+def install_fake_steam(root: str, settings: dict):
+    """steam.exe 자리에 fake_steam.py를 실행하는 셸 스크립트를 두고 지연/실패 설정을 기록합니다."""
+    exe_path = os.path.join(root, "steam.exe")
+    with open(exe_path, "w", encoding="utf-8") as f:
+        f.write(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_STEAM_SCRIPT}" --root "{root}" "$@"\n')
+    os.chmod(exe_path, 0o755)
+    with open(os.path.join(root, SETTINGS_NAME), "w", encoding="utf-8") as f:
+        json.dump(settings, f)
+    return exe_path
+
+
+def read_fake_steam_log(root: str) -> list:
+    path = os.path.join(root, LOG_NAME)
+    if not os.path.isfile(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class E2EHarness:
+    def __init__(self, workdir: str, args):
+        self.workdir = workdir
+        self.args = args
+        self.root = os.path.join(workdir, "Steam")
+        self.config_path = os.path.join(workdir, "config.yaml")
+        self.ssfn_path = os.path.join(workdir, "ssfn1234567890123456789")
+        self.store_dir = os.path.join(workdir, "client_store")
+        self.origin = None
+        self.network = NetworkStandIn()
+
+    def prepare(self):
+        args = self.args
+        generate_steam_root(self.root, args.ssfn, args.config_files, args.users, seed=args.seed)
+        with open(self.ssfn_path, "wb") as f:
+            f.write(os.urandom(2048))
+        manifest, blobs = generate_client_packages(args.packages, args.files_per_package,
+                                                   args.file_size_kb * 1024, seed=args.seed, compression=args.compression)
+        files = dict(blobs)
+        files[CLIENT_MANIFEST_NAME] = manifest.encode("utf-8")
+        self.origin = OriginServer(files, args.latency_ms / 1000).start()
+
+        install_fake_steam(self.root, {
+            "startup_delay": args.startup_delay,
+            "package_delay": args.package_delay,
+            "exit_delay": args.exit_delay,
+            "linger": 30.0,
+            "fail_stage": args.fail,
+            "exit_code": 1,
+            "self_update": args.self_update,
+        })
+        write_config_yaml(self.config_path, self.root, {
+            "use_local_mirror": "false" if args.no_mirror else "true",
+            "package_cache_dir": f'"{os.path.join(self.workdir, "package_cache")}"',
+            "ssfn_store_dir": f'"{os.path.join(self.workdir, "ssfn_slots")}"',
+            "client_store_dir": f'"{self.store_dir}"',
+            "package_origin_url": self.origin.base_url,
+            "verify_after_download": "true",
+            "package_install_mode": args.install_mode,
+            "network_cut_mode": args.network_cut,
+            "network_probe_endpoints": f'["{self.network.open().endpoint}"]',
+            "network_probe_interval": 0.05,
+            "network_cut_timeout": 30,
+        })
+        self.network.cut()
+
+    def run_once(self, index: int) -> dict:
+        from main import Main
+
+        backend = HarnessProcessBackend()
+        if self.args.running_steam:
+            # 하니스 시작 시 이미 실행 중인 Steam (프로세스 트리)
+            steam = backend.add("steam.exe")
+            for _ in range(4):
+                backend.add("steamwebhelper.exe", ppid=steam)
+
+        set_probe(EnvironmentProbe(self.config_path, FakeRegistryBackend({r"SOFTWARE\Valve\Steam": {
+            "SteamPath": self.root,
+            "SteamExe": os.path.join(self.root, "steam.exe"),
+        }})))
+        tracer = tracing.Tracer()
+        tracing.set_tracer(tracer)
+
+        requests_before = len(self.origin.requests)
+        # 실행마다 네트워크를 다시 연결하고, 사람이 차단하는 것처럼 --cut-after초 뒤에 끊습니다.
+        self.network.open().cut_after(self.args.cut_after)
+        stdin = sys.stdin
+        sys.stdin = io.StringIO("\n" * 8)
+        started_at = time.time()
+        started = time.perf_counter()
+        error = None
+        try:
+            Main(process_backend=backend, ssfn_path=self.ssfn_path).start()
+        except SystemExit as e:
+            error = f"SystemExit({e.code})"
+        finally:
+            elapsed = time.perf_counter() - started
+            sys.stdin = stdin
+            self.network.close()
+            backend.shutdown()
+            log_pipeline.get_pipeline().flush()
+
+        if self.args.trace:
+            tracer.export(os.path.join(self.args.trace, f"run{index}.json"))
+        return {
+            "run": index,
+            "ok": error is None,
+            "error": error,
+            "total": elapsed,
+            "started": started_at,
+            "phases": tracer.totals(),
+            "metrics": dict(tracer.metrics),
+            "origin_requests": len(self.origin.requests) - requests_before,
+            "steam_launches": len(backend.spawned),
+        }
+
+    def restore(self) -> dict:
+        """다운그레이드 전 스냅샷으로 Steam 루트를 되돌립니다. (다음 실행이 저장소 전환 경로를 타도록)"""
+        from src.steam.client_store import ClientStore
+
+        store = ClientStore(self.store_dir)
+        snapshots = [record for record in store.builds().values() if record.label == "pre-downgrade"]
+        if not snapshots:
+            return {"ok": False, "error": "다운그레이드 전 스냅샷 없음"}
+        build = min(snapshots, key=lambda record: record.created).build
+        report = store.switch(self.root, build)
+        return {"ok": report.ok, "build": build, "linked": report.linked, "removed": report.removed,
+                "unchanged": report.unchanged, "elapsed": report.elapsed}
+
+    def close(self):
+        if self.origin is not None:
+            self.origin.stop()
+        self.network.close()
+
+
+def print_report(results: list):
+    phases = []
+    for result in results:
+        for name in result["phases"]:
+            if name not in phases:
+                phases.append(name)
+    header = f"{'phase':>22}" + "".join(f"{'run' + str(result['run']):>12}" for result in results)
+    print(header)
+    for name in phases:
+        cells = "".join(f"{result['phases'][name] * 1000:10.1f}ms" if name in result["phases"] else f"{'-':>12}"
+                        for result in results)
+        print(f"{name:>22}{cells}")
+    print(f"{'total':>22}" + "".join(f"{result['total'] * 1000:10.1f}ms" for result in results))
+    print(f"{'origin requests':>22}" + "".join(f"{result['origin_requests']:>12}" for result in results))
+    print(f"{'steam launches':>22}" + "".join(f"{result['steam_launches']:>12}" for result in results))
+    for result in results:
+        restore = result.get("restore")
+        if restore:
+            print(f"run{result['run']} 이후 되돌리기: {restore}")
+    for result in results:
+        if not result["ok"]:
+            print(f"run{result['run']} 실패: {result['error']}")
+
+
+def record_history(path: str, results: list) -> list:
+    """실행 결과를 실행 기록에 남기고, 각 실행에서 이전 실행보다 느려진 단계를 출력합니다."""
+    from src.util.run_ledger import OUTCOME_FAILED, OUTCOME_OK, RunLedger
+
+    found = []
+    with RunLedger(path) as ledger:
+        for result in results:
+            run_id = ledger.record("e2e", OUTCOME_OK if result["ok"] else OUTCOME_FAILED, result["started"],
+                                   result["total"], result["phases"], result["metrics"], result["error"])
+            if not result["ok"]:
+                continue
+            _, regressions = ledger.regressions("e2e", run_id=run_id)
+            for regression in regressions:
+                print(f"run{result['run']} 느려진 단계: {regression}")
+            found.extend(regressions)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 Steam으로 전체 다운그레이드 과정을 실행하고 단계별 시간을 측정합니다.")
+    parser.add_argument("--runs", type=int, default=2, help="같은 Steam 루트에서 반복 실행할 횟수")
+    parser.add_argument("--packages", type=int, default=8)
+    parser.add_argument("--files-per-package", type=int, default=10)
+    parser.add_argument("--file-size-kb", type=int, default=64)
+    parser.add_argument("--ssfn", type=int, default=50)
+    parser.add_argument("--config-files", type=int, default=50)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--startup-delay", type=float, default=0.0, help="가짜 Steam 시작 지연 (초)")
+    parser.add_argument("--package-delay", type=float, default=0.0, help="가짜 Steam 패키지당 지연 (초)")
+    parser.add_argument("--exit-delay", type=float, default=0.0, help="-exitsteam 종료 전 지연 (초)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="원본 서버 요청당 지연 (ms)")
+    parser.add_argument("--fail", choices=FAIL_STAGES, help="가짜 Steam이 지정한 단계에서 실패")
+    parser.add_argument("--network-cut", choices=("auto", "prompt"), default="auto",
+                        help="네트워크 차단 확인 방식 (auto: 로컬 연결 확인 주소를 닫아 자동 확인, prompt: 입력 대기)")
+    parser.add_argument("--cut-after", type=float, default=0.3, help="실행 시작 후 네트워크를 끊을 때까지의 시간 (초)")
+    parser.add_argument("--self-update", action="store_true",
+                        help="가짜 Steam이 구 버전 대신 최신 버전으로 업데이트를 시작 (도구가 바로 중단하는지 확인)")
+    parser.add_argument("--compression", choices=PACKAGE_COMPRESSIONS, default="zip",
+                        help="대상 빌드 패키지 압축 방식 (zstd 계열은 가짜 Steam이 풀지 못합니다)")
+    parser.add_argument("--install-mode", choices=("steam", "direct"), default="steam",
+                        help="패키지 설치 방식 (direct: 도구가 캐시의 패키지를 직접 설치)")
+    parser.add_argument("--no-mirror", action="store_true", help="로컬 미러 없이 원본 서버에서 직접 받기")
+    parser.add_argument("--no-running-steam", dest="running_steam", action="store_false",
+                        help="시작 시 실행 중인 Steam 프로세스를 만들지 않음")
+    parser.add_argument("--restore", action="store_true",
+                        help="실행 사이에 다운그레이드 전 스냅샷으로 되돌리기 (저장소 전환 경로 측정)")
+    parser.add_argument("--json", metavar="PATH", help="결과를 JSON으로 저장")
+    parser.add_argument("--history", metavar="PATH",
+                        help="실행마다 실행 기록(RunLedger, 명령 이름 e2e)에 남기고 느려진 단계를 확인 (있으면 종료 코드 1)")
+    parser.add_argument("--trace", metavar="DIR", help="실행마다 Chrome trace 파일 저장")
+    parser.add_argument("--keep", action="store_true", help="작업 폴더를 지우지 않음")
+    parser.add_argument("--verbose", action="store_true", help="도구 로그를 모두 출력")
+    args = parser.parse_args()
+
+    log_pipeline.configure(console_level="INFO" if args.verbose else "ERROR")
+    workdir = tempfile.mkdtemp(prefix="steam_e2e_")
+    harness = E2EHarness(workdir, args)
+    try:
+        harness.prepare()
+        results = []
+        for index in range(args.runs):
+            results.append(harness.run_once(index))
+            if args.restore and index < args.runs - 1:
+                results[-1]["restore"] = harness.restore()
+        events = read_fake_steam_log(harness.root)
+    finally:
+        harness.close()
+        if args.keep:
+            print(f"작업 폴더: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results, "fake_steam": events}, f, indent=2, ensure_ascii=False)
+    regressions = record_history(args.history, results) if args.history else []
+    if not all(result["ok"] for result in results) or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
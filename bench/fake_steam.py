@@ -0,0 +1,192 @@
+"""
+Linux에서 steam.exe 대신 실행되는 가짜 Steam 클라이언트. (e2e_harness.py가 Steam 루트에 설치합니다)
+
+  -forcepackagedownload -overridepackageurl <url>
+      <url>/steam_client_win32 매니페스트와 패키지를 받아 package/에 저장하고, SHA-256을 확인한 뒤 Steam 루트에 풉니다.
+  -exitsteam
+      작업이 끝나면 종료합니다. 없으면 linger초 동안 실행 중인 상태로 남습니다. (오프라인 실행 흉내)
+
+지연과 실패는 Steam 루트의 fake_steam.json으로 지정합니다.
+  startup_delay, package_delay, exit_delay, linger (초)
+  fail_stage: "startup" | "manifest" | "package" | "extract" 중 하나에서 exit_code로 종료
+  self_update: true이면 대상 매니페스트를 받은 뒤 실제 Steam처럼 최신 버전 업데이트를 시작하고 멈춰 있습니다.
+실행 기록은 Steam 루트의 fake_steam.log에 한 줄씩 JSON으로 남기고,
+실제 Steam처럼 logs/bootstrap_log.txt에 진행 상황을 기록합니다.
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+import urllib.request
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.steam.client_manifest import CLIENT_MANIFEST_NAME, ClientManifest, get_installed_manifest_path
+
+SETTINGS_NAME = "fake_steam.json"
+LOG_NAME = "fake_steam.log"
+DEFAULT_SETTINGS = {
+    "startup_delay": 0.0,
+    "package_delay": 0.0,
+    "exit_delay": 0.0,
+    "linger": 5.0,
+    "fail_stage": None,
+    "exit_code": 1,
+    "self_update": False,
+}
+# 실제 Steam의 기본 매니페스트 주소 (자체 업데이트 흉내)
+STEAM_MANIFEST_URL = "http://media.steampowered.com/client/steam_client_win32"
+
+
+def load_settings(root: str) -> dict:
+    settings = dict(DEFAULT_SETTINGS)
+    path = os.path.join(root, SETTINGS_NAME)
+    if os.path.isfile(path):
+        with open(path, "r", encoding="utf-8") as f:
+            settings.update(json.load(f))
+    return settings
+
+
+def parse_args(argv: list) -> dict:
+    """Steam 실행 인수를 {소문자 옵션: 값 또는 True}로 바꿉니다."""
+    options = {}
+    index = 0
+    while index < len(argv):
+        name = argv[index].lower()
+        if name == "-overridepackageurl" and index + 1 < len(argv):
+            options[name] = argv[index + 1]
+            index += 2
+            continue
+        options[name] = True
+        index += 1
+    return options
+
+
+class FakeSteam:
+    def __init__(self, root: str, settings: dict):
+        self.root = root
+        self.settings = settings
+        self.events = []
+        self.started = time.monotonic()
+
+    def record(self, event: str, **fields):
+        fields.update({"event": event, "pid": os.getpid(), "t": round(time.monotonic() - self.started, 6)})
+        self.events.append(fields)
+
+    def bootstrap(self, message: str):
+        """logs/bootstrap_log.txt에 한 줄 기록합니다. (watcher가 바로 읽도록 줄마다 씁니다)"""
+        log_dir = os.path.join(self.root, "logs")
+        os.makedirs(log_dir, exist_ok=True)
+        with open(os.path.join(log_dir, "bootstrap_log.txt"), "a", encoding="utf-8") as f:
+            f.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}\n")
+
+    def fail_at(self, stage: str):
+        if self.settings.get("fail_stage") == stage:
+            self.record("fail", stage=stage)
+            self.bootstrap(f"Error: {stage} failed")
+            self.finish(int(self.settings.get("exit_code") or 1))
+
+    def flush_log(self):
+        with open(os.path.join(self.root, LOG_NAME), "a", encoding="utf-8") as f:
+            for event in self.events:
+                f.write(json.dumps(event) + "\n")
+        self.events = []
+
+    def finish(self, code: int):
+        self.flush_log()
+        sys.exit(code)
+
+    def download(self, base_url: str):
+        base_url = base_url.rstrip("/")
+        self.fail_at("manifest")
+        self.bootstrap(f"Downloading manifest: {base_url}/{CLIENT_MANIFEST_NAME}")
+        with urllib.request.urlopen(f"{base_url}/{CLIENT_MANIFEST_NAME}", timeout=60) as response:
+            manifest_text = response.read()
+        manifest = ClientManifest.parse(manifest_text.decode("utf-8"))
+        self.record("manifest", version=manifest.version, packages=len(manifest.packages))
+        self.bootstrap(f"Downloaded new manifest, version {manifest.version}")
+
+        if self.settings.get("self_update"):
+            # 구 버전을 받지 않고 최신 버전으로 업데이트하기 시작합니다. (도구가 중단해야 함)
+            self.bootstrap(f"Downloading manifest: {STEAM_MANIFEST_URL}")
+            self.bootstrap("Update available, downloading update for client")
+            self.record("self_update")
+            self.flush_log()
+            time.sleep(float(self.settings.get("linger") or 0))
+            self.finish(0)
+
+        package_dir = os.path.join(self.root, "package")
+        os.makedirs(package_dir, exist_ok=True)
+        received = 0
+        total_kb = sum(package.download_size for package in manifest.packages.values()) // 1024
+        for index, package in enumerate(manifest.packages.values(), 1):
+            time.sleep(float(self.settings.get("package_delay") or 0))
+            self.fail_at("package")
+            name = package.download_name
+            self.bootstrap(f"Downloading package {index} of {len(manifest.packages)}: {name}")
+            with urllib.request.urlopen(f"{base_url}/{name}", timeout=60) as response:
+                data = response.read()
+            if package.download_sha2 and hashlib.sha256(data).hexdigest() != package.download_sha2.lower():
+                self.record("sha_mismatch", package=package.name)
+                self.finish(3)
+            path = os.path.join(package_dir, name)
+            with open(path, "wb") as f:
+                f.write(data)
+            received += len(data)
+            self.bootstrap(f"Downloading update ({received // 1024:,} of {total_kb:,} KB)...")
+
+            self.fail_at("extract")
+            self.bootstrap("Extracting package...")
+            # 구 클라이언트처럼 deflate zip만 풉니다. Zstandard 패키지는 풀지 못하고 오류만 남깁니다.
+            try:
+                if not zipfile.is_zipfile(path):
+                    raise NotImplementedError("not a zip archive")
+                with zipfile.ZipFile(path) as archive:
+                    archive.extractall(self.root)
+            except (NotImplementedError, zipfile.BadZipFile) as e:
+                self.record("unsupported_package", package=package.name, error=str(e))
+                self.bootstrap(f"Error: failed to unpack package {name} ({e})")
+
+        # 실제 Steam처럼 모든 패키지를 설치한 뒤 매니페스트를 기록합니다.
+        with open(get_installed_manifest_path(self.root), "wb") as f:
+            f.write(manifest_text)
+        self.record("installed", version=manifest.version, bytes=received)
+        self.bootstrap("Installing update...")
+        self.bootstrap("Update complete, launching...")
+
+    def run(self, argv: list):
+        options = parse_args(argv)
+        self.record("start", args=argv)
+        self.bootstrap("Startup - updater built by fake_steam")
+        time.sleep(float(self.settings.get("startup_delay") or 0))
+        self.fail_at("startup")
+
+        if "-forcepackagedownload" in options and "-overridepackageurl" in options:
+            self.download(options["-overridepackageurl"])
+
+        if "-exitsteam" in options:
+            time.sleep(float(self.settings.get("exit_delay") or 0))
+            self.bootstrap("Shutdown")
+        else:
+            self.record("running")
+            # 강제 종료되더라도 기록이 남도록 먼저 씁니다.
+            self.flush_log()
+            time.sleep(float(self.settings.get("linger") or 0))
+        self.record("exit")
+        self.finish(0)
+
+
+def main():
+    # 사용법: fake_steam.py --root <Steam 루트> [Steam 실행 인수...]
+    argv = sys.argv[1:]
+    if len(argv) < 2 or argv[0] != "--root":
+        print("사용법: fake_steam.py --root <Steam 루트> [Steam 실행 인수...]", file=sys.stderr)
+        sys.exit(2)
+    root = argv[1]
+    FakeSteam(root, load_settings(root)).run(argv[2:])
+
+
+if __name__ == "__main__":
+    main()
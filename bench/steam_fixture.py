@@ -0,0 +1,244 @@
+"""
+벤치마크/테스트용 가짜 Steam 루트 생성기.
+
+실제 설치와 비슷한 구조(ssfn* 파일, config/ 트리, 여러 형식이 섞인 loginusers.vdf, package/ 매니페스트)를
+재현 가능한 난수로 만듭니다. 내용은 모두 임의 데이터이며 실제 계정 정보는 들어 있지 않습니다.
+사용법: python bench/steam_fixture.py <출력 경로> [--ssfn 2000] [--config-files 500] [--users 100]
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import random
+import struct
+import sys
+import zipfile
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.steam import vdf
+
+STEAM_ID_BASE = 76561197960265728
+# generate_client_packages의 패키지 압축 방식
+# zip: deflate zip (구 클라이언트), zstd: zip 전체를 Zstandard로 압축, zip-zstd: zip 항목을 Zstandard(방식 93)로 압축
+PACKAGE_COMPRESSIONS = ("zip", "zstd", "zip-zstd")
+
+
+def generate_loginusers(user_count: int, seed: int = 0) -> str:
+    """
+    들여쓰기, 구분자, 줄바꿈(CRLF), 주석, 조건, 누락 키, 대소문자가 섞인 loginusers.vdf를 만듭니다.
+    """
+    rng = random.Random(seed)
+    newline = "\r\n" if rng.random() < 0.3 else "\n"
+    lines = ["// 자동 생성된 loginusers.vdf", '"users"', "{"]
+    for index in range(user_count):
+        steam_id = STEAM_ID_BASE + rng.randrange(10 ** 9)
+        indent = rng.choice(["\t", "    ", "  "])
+        sep = rng.choice(["\t\t", "\t", " ", "   "])
+        open_brace_inline = rng.random() < 0.1
+        lines.append(f'{indent}"{steam_id}"' + (" {" if open_brace_inline else ""))
+        if not open_brace_inline:
+            lines.append(f"{indent}{{")
+        inner = indent * 2
+        lines.append(f'{inner}"AccountName"{sep}"user{index}"')
+        lines.append(f'{inner}"PersonaName"{sep}"Persona {index} \\"quoted\\""')
+        if rng.random() < 0.05:
+            lines.append(f"{inner}// 주석 줄")
+        for key in vdf.OFFLINE_LOGIN_FLAGS:
+            roll = rng.random()
+            if roll < 0.6:
+                lines.append(f'{inner}"{key}"{sep}"{rng.choice("01")}"')
+            elif roll < 0.7:
+                lines.append(f'{inner}{key.lower()}{sep}{rng.choice("01")}')
+        if rng.random() < 0.05:
+            lines.append(f'{inner}"MostRecent"{sep}"1" [$WIN32]')
+        lines.append(f'{inner}"Timestamp"{sep}"{1700000000 + index}"')
+        lines.append(f"{indent}}}")
+    lines.append("}")
+    return newline.join(lines) + newline
+
+
+def _write(path: str, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with open(path, mode, **({} if mode == "wb" else {"encoding": "utf-8", "newline": ""})) as f:
+        f.write(data)
+
+
+def _config_vdf(rng: random.Random, entries: int) -> str:
+    lines = ['"InstallConfigStore"', "{", '\t"Software"', "\t{", '\t\t"Valve"', "\t\t{", '\t\t\t"Steam"', "\t\t\t{"]
+    for index in range(entries):
+        lines.append(f'\t\t\t\t"key{index}"\t\t"{rng.randrange(10 ** 6)}"')
+    lines += ["\t\t\t}", "\t\t}", "\t}", "}"]
+    return "\n".join(lines) + "\n"
+
+
+def generate_steam_root(root: str, ssfn_count: int = 100, config_files: int = 50, users: int = 10,
+                        ssfn_size: int = 2048, seed: int = 0, manifest_version: str = "1685488080") -> dict:
+    """
+    root 아래에 가짜 Steam 설치를 만들고 생성한 항목 수를 반환합니다.
+    - <root>/ssfn<숫자> 파일 ssfn_count개
+    - <root>/config/ 아래 config.vdf, loginusers.vdf, 하위 폴더의 vdf 파일 config_files개
+    - <root>/package/steam_client_win32.manifest
+    - <root>/steam.exe (빈 파일)
+    """
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    for _ in range(ssfn_count):
+        name = f"ssfn{rng.randrange(10 ** 18, 10 ** 19)}"
+        _write(os.path.join(root, name), rng.randbytes(ssfn_size))
+
+    config_dir = os.path.join(root, "config")
+    _write(os.path.join(config_dir, "config.vdf"), _config_vdf(rng, 200))
+    _write(os.path.join(config_dir, "loginusers.vdf"), generate_loginusers(users, seed))
+    for index in range(config_files):
+        sub = os.path.join(config_dir, f"htmlcache{index % 16}", f"entry{index}.vdf")
+        _write(sub, _config_vdf(rng, rng.randrange(5, 50)))
+
+    packages = []
+    for index in range(20):
+        packages.append(
+            f'\t"pkg{index}"\n\t{{\n\t\t"file"\t\t"pkg{index}.zip"\n\t\t"size"\t\t"{rng.randrange(10 ** 6)}"\n'
+            f'\t\t"sha2"\t\t"{rng.randbytes(32).hex()}"\n\t}}\n'
+        )
+    manifest = f'"win32"\n{{\n\t"version"\t\t"{manifest_version}"\n' + "".join(packages) + "}\n"
+    _write(os.path.join(root, "package", "steam_client_win32.manifest"), manifest)
+    _write(os.path.join(root, "steam.exe"), b"")
+    return {"ssfn": ssfn_count, "config_files": config_files + 2, "users": users}
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    import zstandard
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+
+def _zip_with_zstd_members(files: dict) -> bytes:
+    """항목을 Zstandard(방식 93)로 압축한 zip을 만듭니다. zipfile은 이 방식으로 쓸 수 없어 헤더를 직접 고칩니다."""
+    buffer = io.BytesIO()
+    originals = {}
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, _zstd_compress(content))
+            originals[name] = (zlib.crc32(content), len(content))
+    data = bytearray(buffer.getvalue())
+    with zipfile.ZipFile(io.BytesIO(bytes(data))) as archive:
+        infos = archive.infolist()
+        position = archive.start_dir
+    for info in infos:
+        crc, size = originals[info.filename]
+        # 로컬 헤더: 방식 +8, crc32 +14, 원래 크기 +22 / 중앙 디렉터리: 방식 +10, crc32 +16, 원래 크기 +24
+        struct.pack_into("<H", data, info.header_offset + 8, 93)
+        struct.pack_into("<I", data, info.header_offset + 14, crc)
+        struct.pack_into("<I", data, info.header_offset + 22, size)
+        struct.pack_into("<H", data, position + 10, 93)
+        struct.pack_into("<I", data, position + 16, crc)
+        struct.pack_into("<I", data, position + 24, size)
+        name_length, extra_length, comment_length = struct.unpack_from("<3H", data, position + 28)
+        position += 46 + name_length + extra_length + comment_length
+    return bytes(data)
+
+
+def generate_client_packages(package_count: int = 8, files_per_package: int = 10, file_size: int = 64 * 1024,
+                             seed: int = 0, version: str = "1683580360", compression: str = "zip") -> tuple:
+    """
+    가짜 대상 클라이언트 빌드를 만듭니다. (매니페스트 텍스트, {다운로드 이름: 패키지 바이트}) 를 반환합니다.
+    각 패키지는 bin/<패키지>/fileN.dll 파일들을 담은 zip이며, 매니페스트에는 크기와 SHA-256이 기록됩니다.
+    첫 패키지에는 설치하지 않아야 하는 임시 파일(bin/pkg0/file0.dll.tmp)이 하나 섞여 있습니다.
+    compression이 zstd / zip-zstd이면 zstandard 모듈이 필요합니다. (PACKAGE_COMPRESSIONS)
+    """
+    if compression not in PACKAGE_COMPRESSIONS:
+        raise ValueError(f"알 수 없는 패키지 압축 방식: {compression}")
+    rng = random.Random(seed)
+    blobs = {}
+    packages = []
+    for index in range(package_count):
+        name = f"pkg{index}"
+        # 절반은 압축이 잘 되는 데이터, 절반은 임의 데이터로 채웁니다.
+        half = file_size // 2
+        files = {f"bin/{name}/file{file_index}.dll": bytes(half) + rng.randbytes(file_size - half)
+                 for file_index in range(files_per_package)}
+        if index == 0:
+            # 패키지를 만들 때 섞여 들어간 임시 파일 (설치하지 않아야 합니다)
+            files[f"bin/{name}/file0.dll.tmp"] = rng.randbytes(64)
+        if compression == "zip-zstd":
+            data = _zip_with_zstd_members(files)
+        else:
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+                for file_name, content in files.items():
+                    archive.writestr(file_name, content)
+            data = buffer.getvalue()
+            if compression == "zstd":
+                data = _zstd_compress(data)
+        file_name = f"{name}.zip.{hashlib.sha1(data).hexdigest()}"
+        blobs[file_name] = data
+        packages.append(
+            f'\t"{name}"\n\t{{\n\t\t"file"\t\t"{file_name}"\n\t\t"size"\t\t"{len(data)}"\n'
+            f'\t\t"sha2"\t\t"{hashlib.sha256(data).hexdigest()}"\n\t}}\n'
+        )
+    manifest = f'"win32"\n{{\n\t"version"\t\t"{version}"\n' + "".join(packages) + "}\n"
+    return manifest, blobs
+
+
+def generate_cdx_archive(build_count: int = 20, snapshots_per_build: int = 5, start: str = "20230101000000",
+                         packages: int = 30, seed: int = 0) -> tuple:
+    """
+    가짜 Wayback 보관 기록을 만듭니다. (CDX JSON 목록 텍스트, {스냅샷 시각: 매니페스트 텍스트}) 를 반환합니다.
+    빌드는 약 1주 간격이고, 빌드 번호는 실제 Steam처럼 빌드 시각의 Unix 시간입니다.
+    한 빌드의 스냅샷은 모두 같은 내용(digest)입니다.
+    """
+    import base64
+    import calendar
+    import time
+
+    rng = random.Random(seed)
+    epoch = calendar.timegm(time.strptime(start, "%Y%m%d%H%M%S"))
+    rows = [["urlkey", "timestamp", "original", "mimetype", "statuscode", "digest", "length"]]
+    manifests = {}
+    for build_index in range(build_count):
+        build_epoch = epoch + build_index * 7 * 86400 + rng.randrange(86400)
+        lines = [f'"win32"\n{{\n\t"version"\t\t"{build_epoch}"\n']
+        for index in range(packages + rng.randrange(5)):
+            size = rng.randrange(10_000, 50_000_000)
+            lines.append(f'\t"pkg{index}"\n\t{{\n\t\t"file"\t\t"pkg{index}.zip.{build_epoch:x}"\n\t\t"size"\t\t"{size}"\n\t}}\n')
+        manifest = "".join(lines) + "}\n"
+        digest = base64.b32encode(hashlib.sha1(manifest.encode("utf-8")).digest()).decode("ascii")
+        for snapshot_index in range(snapshots_per_build):
+            snapshot_epoch = build_epoch + 3600 + snapshot_index * 86400 + rng.randrange(3600)
+            timestamp = time.strftime("%Y%m%d%H%M%S", time.gmtime(snapshot_epoch))
+            rows.append(["com,steampowered,media)/client/steam_client_win32", timestamp,
+                         "http://media.steampowered.com/client/steam_client_win32", "text/plain", "200",
+                         digest, str(len(manifest))])
+            manifests[timestamp] = manifest
+    return json.dumps(rows), manifests
+
+
+def write_config_yaml(path: str, steam_path: str, extra: dict = None):
+    """가짜 Steam 루트를 가리키는 config.yaml을 만듭니다."""
+    lines = [
+        "username: bench_user",
+        f'steam_path: "{steam_path}"',
+        'downgrade_wayback_date: "20230531000000"',
+        "use_local_mirror: false",
+    ]
+    for key, value in (extra or {}).items():
+        lines.append(f"{key}: {value}")
+    _write(path, "\n".join(lines) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 Steam 루트 생성기")
+    parser.add_argument("root")
+    parser.add_argument("--ssfn", type=int, default=2000)
+    parser.add_argument("--config-files", type=int, default=500)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    counts = generate_steam_root(args.root, args.ssfn, args.config_files, args.users, seed=args.seed)
+    print(f"'{args.root}' 생성 완료: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,44 @@
-import logging, pyuac
+import argparse
 import os
 import time
-from src.util.logger import Logger
-from src.helper.config import Config
-from ssfn import SSFNHandler
-from src.util.steam_downgrader import SteamDowngrader
+from src.util import tracing
+from src.util.tracing import span, traced
+# 나머지 모듈(pyuac, yaml, colorama, winreg, 다운그레이드 단계)은 실행하는 명령에 필요할 때 불러옵니다.
+# 시작 시간 예산은 tests/test_import_time.py로 확인합니다.
+
+YOUR_SSFN_FILE_NAME = "ssfn45221453585958369" # <-- 이 부분을 당신의 실제 SSFN 파일 이름으로 변경하세요!
+DEFAULT_RUN_HISTORY_PATH = "run_history.sqlite"
+
+
+def default_ssfn_path() -> str:
+    # main.py 옆의 YOUR_SSFN_FILE_NAME 파일
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), YOUR_SSFN_FILE_NAME)
 
-# 로깅 시스템 설정
-logging.basicConfig(handlers=[logging.FileHandler('ssfntool.log', 'w+', 'utf-8')], level=logging.ERROR, format='%(asctime)s: %(message)s')
 
 class Main:
-    def __init__(self) -> None:
+    def __init__(self, process_backend=None, ssfn_path: str = None) -> None:
+        from src.util.logger import Logger
+        from src.helper.config import Config
+        from ssfn import SSFNHandler
+        from src.util.steam_downgrader import SteamDowngrader
+
         self.logger = Logger()
-        self.config = Config()
-        self.ssfn_handler = SSFNHandler()
-        self.steam_downgrader = SteamDowngrader()
+        # ssfn_path를 주지 않으면 main.py 옆의 YOUR_SSFN_FILE_NAME 파일을 사용합니다.
+        self.ssfn_path = ssfn_path or default_ssfn_path()
+        with span("init"):
+            self.config = Config()
+            self.ssfn_handler = SSFNHandler(self.config.ssfn_store_dir)
+            self.steam_downgrader = SteamDowngrader(process_backend=process_backend, config=self.config)
+        self.logger.log("INFO", self.config.probe.report())
 
+    @traced("main")
     def start(self):
         self.logger.log("INFO", f"SSFN 파일 교체 및 Steam Rollback 도구를 시작합니다. {self.config.username}님 환영합니다!")
 
         # --- 1. SSFN 파일 교체 로직 ---
         self.logger.log("INFO", "로컬 SSFN 파일 교체 작업을 시작합니다...")
 
-        YOUR_SSFN_FILE_NAME = "ssfn45221453585958369" # <-- 이 부분을 당신의 실제 SSFN 파일 이름으로 변경하세요!
-        current_script_dir = os.path.dirname(os.path.abspath(__file__))
-        local_ssfn_filepath = os.path.join(current_script_dir, YOUR_SSFN_FILE_NAME)
+        local_ssfn_filepath = self.ssfn_path
 
         steam_installation_path = self.config.get_steam_path()
 
@@ -35,20 +49,25 @@ class Main:
         self.logger.log("INFO", f"로컬 SSFN 파일 소스 경로: {local_ssfn_filepath}")
         self.logger.log("INFO", f"Steam 대상 디렉토리 경로: {steam_installation_path}")
 
-        ssfn_copy_success = self.ssfn_handler.use_local_ssfn(local_ssfn_filepath, steam_installation_path)
+        def swap_ssfn(values):
+            with span("ssfn_swap"):
+                ssfn_copy_success = self.ssfn_handler.use_local_ssfn(local_ssfn_filepath, steam_installation_path)
 
-        if not ssfn_copy_success:
-            self.logger.log("ERROR", "SSFN 파일 교체에 실패했습니다. Steam 관련 작업에 문제가 발생할 수 있습니다. 프로그램을 종료합니다.")
-            self.logger.exit_program()
-        else:
-            self.logger.log("INFO", "SSFN 파일이 성공적으로 Steam 디렉토리로 교체되었습니다!")
-        # --- SSFN 파일 교체 로직 끝 ---
+            if not ssfn_copy_success:
+                self.logger.log("ERROR", "SSFN 파일 교체에 실패했습니다. Steam 관련 작업에 문제가 발생할 수 있습니다. 프로그램을 종료합니다.")
+                self.logger.exit_program()
+            else:
+                self.logger.log("INFO", "SSFN 파일이 성공적으로 Steam 디렉토리로 교체되었습니다!")
 
-        time.sleep(2)
         self.logger.log("INFO", "Steam 클라이언트 다운그레이드 작업을 시작합니다...")
 
         # --- 2. Steam 클라이언트 다운그레이드 로직
-        self.steam_downgrader.execute_downgrader_online()
+        # SSFN 교체는 Steam 종료, 미러 시작과 동시에 실행하고, 다운로드와 오프라인 실행 전에만 끝나 있으면 됩니다.
+        graph = self.steam_downgrader.build_steps()
+        graph.add("ssfn_swap", swap_ssfn)
+        graph.require("download", "ssfn_swap")
+        graph.require("launch_offline", "ssfn_swap")
+        self.steam_downgrader.run_steps(graph)
 
         self.logger.log("INFO", "모든 작업이 완료되었습니다. Steam 클라이언트가 실행될 것입니다.")
         self.logger.log("INFO", "네트워크를 차단한 후 Steam 클라이언트의 동작을 확인하세요.")
@@ -56,11 +75,478 @@ class Main:
         self.logger.log("INFO", "모든 작업이 완료되었습니다.")
 
 
+def run_fleet(fleet_path: str):
+    """fleet.yaml에 적힌 여러 Steam 루트 / VM에 다운그레이드 단계를 동시에 실행합니다."""
+    from src.util.logger import Logger
+    from src.helper.config import Config
+    from src.fleet.target import load_fleet_file
+    from src.fleet.executors import LocalExecutor
+    from src.fleet.runner import FleetRunner, log_summary
+    from src.net.package_cache import PackageCache
+
+    logger = Logger()
+    targets, concurrency, agent_token = load_fleet_file(fleet_path)
+    logger.log("INFO", f"플릿 모드: 대상 {len(targets)}개, 동시 실행 {concurrency}개")
+    if agent_token is None and any(target.is_remote for target in targets):
+        logger.log("ERROR", f"원격 대상이 있으면 {fleet_path}에 agent_token을 지정해야 합니다.")
+        return None
+    # 대상별 설정은 config.yaml을 바탕으로 Steam 경로와 날짜만 바꿔 씁니다.
+    config = Config()
+    cache = None
+    if config.use_local_mirror:
+        cache = PackageCache(config.package_cache_dir, config.package_cache_max_mb * 1024 * 1024)
+    summary = FleetRunner(targets, concurrency, local_executor=LocalExecutor(config=config), cache=cache,
+                          logger=logger, agent_token=agent_token).run()
+    log_summary(logger, summary)
+    return summary
+
+
+def list_builds():
+    """클라이언트 빌드 저장소에 있는 빌드와 사용 용량을 출력합니다."""
+    from src.util.logger import Logger
+    from src.helper.config import Config
+    from src.steam.client_store import ClientStore
+
+    logger = Logger()
+    config = Config()
+    store = ClientStore(config.client_store_dir)
+    active = store.active_build(config.get_steam_path())
+    for build, record in sorted(store.builds().items()):
+        created = time.strftime("%Y-%m-%d %H:%M", time.localtime(record.created))
+        marker = " (현재)" if build == active else ""
+        logger.log("INFO", f"빌드 {build}{marker}: {record.label or '-'}, 파일 {len(record.files)}개, "
+                           f"{record.total_bytes / 1024 / 1024:.1f}MB, {created}")
+    stored, logical = store.disk_usage()
+    logger.log("INFO", f"저장소 사용량 {stored / 1024 / 1024:.1f}MB (빌드 합계 {logical / 1024 / 1024:.1f}MB)")
+
+
+def switch_build(build: str) -> bool:
+    """저장소에 있는 빌드(예: 다운그레이드 전 스냅샷)로 Steam 클라이언트를 전환합니다."""
+    return _downgrader().switch_build(build)
+
+
+def _downgrader():
+    from src.util.steam_downgrader import SteamDowngrader
+    return SteamDowngrader()
+
+
+def run_ssfn(args) -> bool:
+    """SSFN 파일만 교체합니다."""
+    from src.helper.config import Config
+    from ssfn import SSFNHandler
+
+    config = Config()
+    return SSFNHandler(config.ssfn_store_dir).use_local_ssfn(args.ssfn_path or default_ssfn_path(), config.get_steam_path())
+
+
+def run_catalog(args) -> bool:
+    """보관된 클라이언트 빌드 카탈로그를 갱신하거나 조회합니다. (조회는 네트워크 없이 로컬 색인만 사용)"""
+    from src.util.logger import Logger
+    from src.helper.config import Config
+    from src.steam.build_catalog import BuildCatalog, CatalogIngester
+
+    logger = Logger()
+    config = Config()
+
+    def describe(entry) -> str:
+        return (f"{entry.timestamp} ({entry.date} UTC): 빌드 {entry.build}, 패키지 {entry.package_count}개, "
+                f"{entry.total_bytes / 1024 / 1024:.1f}MB")
+
+    with BuildCatalog(config.build_catalog_path) as catalog:
+        if args.action == "update":
+            ingester = CatalogIngester(catalog, config.catalog_cdx_url, config.catalog_snapshot_url)
+            try:
+                report = ingester.update(args.date_from, args.date_to, retry_failed=args.retry_failed)
+            except ValueError as e:
+                logger.log("ERROR", f"카탈로그를 갱신하지 못했습니다: {e}")
+                return False
+            except OSError as e:
+                # urllib.error.URLError(연결 실패, HTTP 오류)와 시간 초과
+                logger.log("ERROR", f"CDX 목록을 받지 못했습니다 ({config.catalog_cdx_url}): {e}")
+                return False
+            logger.log("OK", f"카탈로그 갱신: 목록 {report.listed}개, 새 스냅샷 {report.new_snapshots}개, "
+                             f"매니페스트 {report.fetched}개 받음, 실패 {len(report.failed)}개 ({report.elapsed:.1f}초)")
+            for digest, error in report.failed[:10]:
+                logger.log("WARNING", f"매니페스트를 받지 못했습니다 ({digest}): {error}")
+            return not report.failed
+        if args.action == "lookup":
+            try:
+                entry = catalog.resolve(args.value)
+            except ValueError as e:
+                logger.log("ERROR", f"날짜 형식이 잘못되었습니다. (예: 20230531, 2023-05-31, 20230531000000): {e}")
+                return False
+            if entry is None:
+                logger.log("ERROR", "카탈로그에 빌드 정보가 없습니다. 먼저 'catalog update'를 실행하세요.")
+                return False
+            logger.log("INFO", f"{args.value} -> 가장 가까운 스냅샷 {describe(entry)}")
+            return True
+        if args.action == "build":
+            if not args.value.isdigit():
+                logger.log("ERROR", f"빌드 번호는 숫자여야 합니다: {args.value}")
+                return False
+            snapshots = catalog.snapshots_of(args.value)
+            if not snapshots:
+                nearest = catalog.nearest_build(args.value)
+                if nearest is None:
+                    logger.log("ERROR", "카탈로그에 빌드 정보가 없습니다. 먼저 'catalog update'를 실행하세요.")
+                    return False
+                logger.log("WARNING", f"빌드 {args.value}이(가) 카탈로그에 없습니다. 가장 가까운 빌드: {describe(nearest)}")
+                return False
+            for entry in snapshots:
+                logger.log("INFO", describe(entry))
+            logger.log("OK", f"downgrade_wayback_date로 쓸 수 있는 날짜: {snapshots[0].timestamp}")
+            return True
+        for build, package_count, total_bytes, first, last, count in catalog.builds():
+            logger.log("INFO", f"빌드 {build}: 패키지 {package_count}개, {total_bytes / 1024 / 1024:.1f}MB, "
+                               f"스냅샷 {count}개 ({first} ~ {last})")
+        return True
+
+
+def run_history_path():
+    """
+    실행 기록 파일 경로 (config.yaml의 run_history_path, 비어 있으면 기록하지 않음).
+    Steam 경로를 찾지 못해 실패한 실행도 기록해야 하므로 Config를 만들지 않고 config.yaml 값만 읽습니다.
+    """
+    from src.helper.env_probe import get_probe
+    try:
+        return get_probe().config.get("run_history_path", DEFAULT_RUN_HISTORY_PATH) or None
+    except Exception:
+        return None
+
+
+def record_run(command: str, started: float, elapsed: float, outcome: str, error: str = None):
+    """이번 실행의 결과와 단계별 소요 시간(Tracer)을 실행 기록에 남깁니다. 기록에 실패해도 실행 결과는 바뀌지 않습니다."""
+    path = run_history_path()
+    if not path:
+        return None
+    from src.util.run_ledger import RunLedger
+
+    tracer = tracing.get_tracer()
+    metrics = dict(tracer.metrics)
+    error = error or metrics.get("failure") or metrics.get("failed_step")
+    try:
+        with RunLedger(path) as ledger:
+            return ledger.record(command, outcome, started, elapsed, tracer.totals(), metrics, error)
+    except Exception as e:
+        from src.util.logger import Logger
+        Logger().log("WARNING", f"실행 기록을 남기지 못했습니다 ({path}): {e}")
+        return None
+
+
+def run_watch(args) -> bool:
+    """
+    Steam 루트의 민감한 파일(ssfn*, config/*)의 생성/변경/교체/삭제를 감시하고 알립니다. (읽기 전용, 내용은 복사하지 않음)
+    Ctrl+C 또는 --duration초 뒤에 끝나며, 예상하지 못한 변경이 있었으면 False
+    """
+    from src.util.logger import Logger
+    from src.helper.config import Config
+    from src.steam.artifact_watch import ArtifactMonitor, create_backend
+    from src.util.process_table import ProcessTable
+
+    logger = Logger()
+    config = Config()
+    descriptions = {"created": "생성", "modified": "내용 변경", "replaced": "다른 파일로 교체", "deleted": "삭제",
+                    "touched": "시각/속성만 변경"}
+
+    def alert(event):
+        before, after = event.before, event.after
+        running = {True: "Steam 실행 중", False: "Steam 실행 중 아님", None: "Steam 실행 여부 모름"}[event.steam_running]
+        sizes = " -> ".join(str(state.size) for state in (before, after) if state is not None)
+        logger.log("WARNING" if event.unexpected else "INFO",
+                   f"보호 파일 {descriptions[event.kind]}: {event.path} ({sizes}바이트, {running})",
+                   event=event.kind, path=event.path, unexpected=event.unexpected, steam_running=event.steam_running,
+                   sha256_before=before and before.digest, sha256_after=after and after.digest)
+
+    backend = create_backend(args.backend or config.artifact_watch_backend,
+                             args.interval or config.artifact_watch_poll_interval)
+    monitor = ArtifactMonitor(config.get_steam_path(), backend=backend, process_table=ProcessTable(), on_event=alert,
+                              rescan_interval=config.artifact_watch_rescan_interval)
+    try:
+        monitor.scan(report=False)
+        logger.log("OK", f"보호 파일 {len(monitor.index)}개 감시 시작 ({backend.name}): {monitor.steam_path}")
+        monitor.run(args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        monitor.close()
+    unexpected = [event for event in monitor.events if event.unexpected]
+    logger.log("INFO", f"감시 종료: 변경 {len(monitor.events)}건 (예상하지 못한 변경 {len(unexpected)}건), "
+                       f"확인 {monitor.scans}회, 해시 계산 {monitor.hashed}회")
+    return not unexpected
+
+
+def run_scan(args) -> bool:
+    """
+    폴더 트리의 스크립트와 바이너리에서 Steam 인증 정보를 노리는 지표(레지스트리 경로, ssfn*, loginusers.vdf,
+    브라우저 쿠키, steamLoginSecure)를 찾습니다. 지표가 --min-indicators개 이상인 파일이 있으면 False
+    """
+    from src.util.logger import Logger
+    from src.steam.indicator_scan import IndicatorScanner
+
+    logger = Logger()
+    scanner = IndicatorScanner(max_workers=args.workers or None, min_indicators=args.min_indicators,
+                               max_file_size=args.max_size_mb * 1024 * 1024 if args.max_size_mb else None,
+                               extensions=args.ext)
+    report = scanner.scan(args.paths)
+    tracing.record(scan_files=report.files, scan_bytes=report.total_bytes, scan_throughput=report.throughput)
+
+    suspicious = report.suspicious
+    for result in suspicious if not args.all else report.results:
+        hits = ", ".join(f"{name}({encoding}) {count}회 @{', '.join(hex(offset) for offset in offsets[:3])}"
+                         for (name, encoding), (count, offsets) in sorted(result.hits.items()))
+        flagged = result in suspicious
+        logger.log("WARNING" if flagged else "INFO",
+                   f"{'의심 파일' if flagged else '일치'}: {result.path} (지표 {len(result.indicators)}개): {hits}",
+                   path=result.path, indicators=sorted(result.indicators), suspicious=flagged,
+                   offsets={f"{name}/{encoding}": offsets for (name, encoding), (_, offsets) in result.hits.items()})
+    for path, error in report.errors[:10]:
+        logger.log("WARNING", f"읽지 못한 파일: {path} ({error})")
+    logger.log("OK" if not suspicious else "WARNING",
+               f"검사 완료: 파일 {report.files}개, {report.total_bytes / 1024 / 1024:.1f}MB, {report.elapsed:.2f}초 "
+               f"({report.throughput / 1024 / 1024:.1f}MB/s, 프로세스 {report.workers}개), 일치 {len(report.results)}개, "
+               f"의심 {len(suspicious)}개, 읽기 실패 {len(report.errors)}개")
+    return not suspicious
+
+
+class RecordedRun:
+    """with 블록 하나(명령 한 번)를 실행 기록 한 건으로 남깁니다. 하위 명령이 False를 반환하면 failed를 설정합니다."""
+
+    def __init__(self, command: str, enabled: bool = True):
+        self.command = command
+        self.enabled = enabled
+        self.failed = False
+
+    def __enter__(self):
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.enabled:
+            return False
+        from src.util.run_ledger import OUTCOME_FAILED, OUTCOME_INTERRUPTED, OUTCOME_OK
+
+        outcome, error = (OUTCOME_FAILED if self.failed else OUTCOME_OK), None
+        if exc_type is KeyboardInterrupt:
+            outcome = OUTCOME_INTERRUPTED
+        elif exc_type is SystemExit:
+            # exit_program()은 종료 코드 없이(None) 끝냅니다.
+            if exc.code is None:
+                outcome, error = OUTCOME_FAILED, "exit_program"
+            elif exc.code != 0:
+                outcome, error = OUTCOME_FAILED, f"SystemExit({exc.code})"
+        elif exc_type is not None:
+            outcome, error = OUTCOME_FAILED, f"{exc_type.__name__}: {exc}"
+        record_run(self.command, self.started_at, time.perf_counter() - self.started, outcome, error)
+        return False
+
+
+def run_history(args) -> bool:
+    """최근 실행 목록, 단계별 소요 시간 백분위수, 최근 실행에서 느려진 단계를 출력합니다. 느려진 단계가 있으면 False"""
+    from src.util.logger import Logger
+    from src.util.run_ledger import DEFAULT_MIN_DELTA, DEFAULT_THRESHOLD, DEFAULT_WINDOW, PERCENTILES, RunLedger
+
+    logger = Logger()
+    path = run_history_path()
+    if not path or not os.path.isfile(path):
+        logger.log("ERROR", "실행 기록이 없습니다. (config.yaml의 run_history_path 확인)")
+        return False
+    window = args.window or DEFAULT_WINDOW
+    threshold = DEFAULT_THRESHOLD if args.threshold is None else args.threshold
+    min_delta = DEFAULT_MIN_DELTA if args.min_delta is None else args.min_delta
+
+    with RunLedger(path) as ledger:
+        for run in reversed(ledger.runs(args.history_command, limit=args.limit)):
+            details = [f"빌드 {run.build_before or '?'} -> {run.target_build or run.build_after or '?'}"]
+            if run.install_method:
+                details.append(run.install_method)
+            if run.bytes_downloaded is not None:
+                details.append(f"{run.bytes_downloaded / 1024 / 1024:.1f}MB 받음")
+            if run.cache_hit_rate is not None:
+                details.append(f"캐시 적중 {run.cache_hit_rate * 100:.0f}%")
+            if run.error:
+                details.append(f"오류: {run.error}")
+            logger.log("INFO", f"#{run.id} {run.date} {run.command} {run.outcome} {run.elapsed:.2f}초 "
+                               f"(wayback {run.wayback_date or '-'}) {', '.join(details)}")
+
+        command = args.history_command
+        if command is None:
+            recorded = ledger.commands()
+            if not recorded:
+                logger.log("ERROR", "실행 기록이 없습니다.")
+                return False
+            command = recorded[0][0]
+        stats = ledger.phase_stats(command, window)
+        if not stats:
+            logger.log("WARNING", f"'{command}' 명령의 성공한 실행 기록이 없습니다.")
+            return True
+        logger.log("INFO", f"'{command}' 최근 성공 실행 {max(item.count for item in stats)}건의 단계별 소요 시간:")
+        for item in stats:
+            quantiles = "  ".join(f"p{q} {item.percentiles[q]:.3f}초" for q in PERCENTILES)
+            latest = f"  최근 {item.latest:.3f}초" if item.latest is not None else ""
+            logger.log("INFO", f"  {item.name:<22} {quantiles}{latest}  (n={item.count})")
+
+        latest, regressions = ledger.regressions(command, threshold, window, min_delta)
+        for regression in regressions:
+            logger.log("WARNING", f"느려진 단계 (#{latest.id}): {regression.name} {regression.baseline:.3f}초 -> "
+                                  f"{regression.latest:.3f}초 (x{regression.ratio:.2f}, 이전 {regression.samples}건 중앙값 대비)")
+        if latest is not None and not regressions:
+            logger.log("OK", f"최근 실행(#{latest.id})에서 기준보다 {threshold * 100:.0f}% 이상 느려진 단계가 없습니다.")
+        return not regressions
+
+
+# 단계 하나만 실행하는 하위 명령. 반환값이 False이면 종료 코드 1
+COMMANDS = {
+    "ssfn": run_ssfn,
+    "kill": lambda args: _downgrader().kill_steam(),
+    "download": lambda args: _downgrader().download_client(),
+    "lock-updates": lambda args: _downgrader().lock_updates(),
+    "offline-login": lambda args: _downgrader().offline_login(),
+    "verify": lambda args: _downgrader().verify_client(),
+    "catalog": run_catalog,
+    "history": run_history,
+    "watch": run_watch,
+    "scan": run_scan,
+}
+# 관리자 권한 없이 실행하는 명령
+NO_ADMIN_COMMANDS = ("verify", "catalog", "history", "watch", "scan")
+# 실행 기록에 남기지 않는 명령 (조회/감시만 하는 명령)
+UNRECORDED_COMMANDS = ("history", "watch")
+
+
+def run_agent(port: int, fleet_path: str, host: str = "127.0.0.1"):
+    """
+    플릿 러너의 요청을 받는 에이전트를 실행합니다. (VM마다 하나)
+    실행할 대상과 토큰은 이 PC의 fleet_path(fleet.yaml 형식)에서 읽으며, 러너는 대상 이름만 보냅니다.
+    """
+    from src.util.logger import Logger
+    from src.helper.config import Config
+    from src.fleet.agent import FleetAgent
+    from src.fleet.target import load_fleet_file
+
+    logger = Logger()
+    if not fleet_path:
+        logger.log("ERROR", "에이전트가 실행할 대상 파일을 --fleet으로 지정하세요. (agent_token 포함)")
+        return
+    targets, _, agent_token = load_fleet_file(fleet_path)
+    if agent_token is None:
+        logger.log("ERROR", f"{fleet_path}에 agent_token이 없습니다. 인증 없이 에이전트를 실행하지 않습니다.")
+        return
+    agent = FleetAgent([target for target in targets if not target.is_remote], agent_token, host=host, port=port,
+                       config=Config())
+    logger.log("INFO", f"플릿 에이전트 대기 중: {host}:{port} (대상 {', '.join(agent.targets) or '없음'})")
+    agent.serve_forever()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="SSFN 파일 교체 및 Steam Rollback 도구")
+    parser.add_argument("--fleet", metavar="FLEET_YAML", help="fleet.yaml의 여러 대상에 동시에 실행")
+    parser.add_argument("--agent", metavar="PORT", type=int, nargs="?", const=8701,
+                        help="플릿 에이전트로 실행 (대상과 agent_token은 --fleet 파일에서 읽음)")
+    parser.add_argument("--agent-host", metavar="HOST", default="127.0.0.1",
+                        help="에이전트가 받을 주소 (기본 127.0.0.1, 다른 PC의 러너에게 열 때만 지정)")
+    parser.add_argument("--list-builds", action="store_true", help="클라이언트 빌드 저장소의 빌드 목록 출력")
+    parser.add_argument("--switch-build", metavar="BUILD", help="저장소에 있는 빌드로 전환 (예: 다운그레이드 전 빌드로 되돌리기)")
+    parser.add_argument("--trace", metavar="TRACE_JSON", help="단계별 소요 시간을 Chrome trace 형식으로 저장")
+    parser.add_argument("--profile", metavar="PHASE", action="append", default=[],
+                        help="지정한 단계(예: download, verify)를 프로파일링하여 trace 파일 옆에 저장 (여러 번 지정 가능)")
+    parser.add_argument("--profile-mode", choices=(tracing.PROFILE_CPROFILE, tracing.PROFILE_TRACEMALLOC),
+                        default=tracing.PROFILE_CPROFILE, help="프로파일 방식 (기본: cprofile)")
+
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND",
+                                     help="단계 하나만 실행 (지정하지 않으면 전체 과정 실행)")
+    ssfn = commands.add_parser("ssfn", help="SSFN 파일만 교체")
+    ssfn.add_argument("ssfn_path", nargs="?", help=f"교체할 SSFN 파일 (기본: main.py 옆의 {YOUR_SSFN_FILE_NAME})")
+    commands.add_parser("kill", help="Steam 프로세스 종료")
+    commands.add_parser("download", help="구 버전 클라이언트 다운로드 (또는 저장소 전환), 검사, 스냅샷")
+    commands.add_parser("lock-updates", help="steam.cfg를 만들어 Steam 업데이트 방지")
+    commands.add_parser("offline-login", help="loginusers.vdf에 오프라인 자동 로그인 설정")
+    commands.add_parser("verify", help="설치된 클라이언트 파일 무결성 검사")
+    catalog = commands.add_parser("catalog", help="보관된 클라이언트 빌드 카탈로그 갱신 / 조회")
+    catalog_actions = catalog.add_subparsers(dest="action", metavar="ACTION", required=True)
+    update = catalog_actions.add_parser("update", help="CDX 목록과 매니페스트를 받아 카탈로그 갱신")
+    update.add_argument("--from", dest="date_from", metavar="DATE", help="이 날짜 이후의 스냅샷만")
+    update.add_argument("--to", dest="date_to", metavar="DATE", help="이 날짜 이전의 스냅샷만")
+    update.add_argument("--retry-failed", action="store_true", help="전에 받지 못한 매니페스트 다시 받기")
+    catalog_actions.add_parser("lookup", help="날짜(downgrade_wayback_date)가 연결되는 빌드").add_argument("value", metavar="DATE")
+    catalog_actions.add_parser("build", help="빌드 번호가 담긴 스냅샷 날짜 (없으면 가장 가까운 빌드)").add_argument("value", metavar="BUILD")
+    catalog_actions.add_parser("list", help="카탈로그의 빌드 목록")
+    history = commands.add_parser("history", help="실행 기록, 단계별 소요 시간 백분위수, 느려진 단계 확인 (있으면 종료 코드 1)")
+    history.add_argument("--command", dest="history_command", metavar="COMMAND",
+                         help="집계할 명령 (예: downgrade = 전체 과정, download, verify / 기본: 마지막으로 실행한 명령)")
+    history.add_argument("--limit", type=int, default=10, help="출력할 최근 실행 수")
+    history.add_argument("--window", type=int, help="백분위수와 기준값을 계산할 최근 성공 실행 수 (기본 20)")
+    history.add_argument("--threshold", type=float, help="기준값(중앙값)보다 이 비율 이상 느려지면 회귀로 표시 (기본 0.25)")
+    history.add_argument("--min-delta", type=float, help="이보다 적게(초) 늘어난 단계는 무시 (기본 0.05)")
+    watch = commands.add_parser("watch", help="ssfn*, config/ 파일의 예상하지 못한 생성/변경/교체 감시 (읽기 전용)")
+    watch.add_argument("--backend", choices=("auto", "inotify", "windows", "poll"),
+                       help="변경 알림 방식 (기본: config.yaml의 artifact_watch_backend)")
+    watch.add_argument("--interval", type=float, help="poll 방식의 확인 간격 (초)")
+    watch.add_argument("--duration", type=float, help="이 시간(초)만 감시 (기본: Ctrl+C까지)")
+    scan = commands.add_parser("scan", help="스크립트/바이너리에서 Steam 인증 정보를 노리는 지표 검색 (의심 파일이 있으면 종료 코드 1)")
+    scan.add_argument("paths", nargs="+", metavar="PATH", help="검사할 폴더 또는 파일")
+    scan.add_argument("--workers", type=int, default=0, help="검사 프로세스 수 (0: CPU 수)")
+    scan.add_argument("--min-indicators", type=int, default=3, help="서로 다른 지표가 이만큼 나오면 의심 파일 (기본 3)")
+    scan.add_argument("--ext", action="append", metavar=".EXT", help="이 확장자만 검사 (여러 번 지정 가능, 예: --ext .exe --ext .ps1)")
+    scan.add_argument("--max-size-mb", type=int, help="이보다 큰 파일은 건너뜀")
+    scan.add_argument("--all", action="store_true", help="의심 파일이 아니어도 일치한 파일을 모두 출력")
+    return parser
+
+
 if __name__ == "__main__":
-    if not pyuac.isUserAdmin():
-        print("관리자 권한으로 다시 시작합니다! 이 창은 닫으셔도 됩니다.")
-        pyuac.runAsAdmin()
+    args = build_parser().parse_args()
+
+    import logging
+    from src.util import log_pipeline
+
+    # 로깅 시스템 설정: Logger와 표준 logging 모두 공유 파이프라인을 거쳐 콘솔과 JSON-lines 파일에 기록됩니다.
+    # (다른 스크립트가 Main을 가져다 쓸 때는 파일을 만들지 않도록 직접 실행할 때만 설정합니다.)
+    log_pipeline.configure(json_path="ssfntool.jsonl")
+    logging.basicConfig(handlers=[log_pipeline.PipelineHandler()], level=logging.ERROR, format='%(message)s')
+
+    trace_path = args.trace or ("trace.json" if args.profile else None)
+    if trace_path:
+        tracing.set_tracer(tracing.Tracer(profile_phases=args.profile, profile_mode=args.profile_mode,
+                                          output_dir=os.path.dirname(os.path.abspath(trace_path))))
+
+    def export_trace(logger):
+        if trace_path:
+            tracing.get_tracer().export(trace_path)
+            totals = ", ".join(f"{name} {elapsed:.2f}초" for name, elapsed in tracing.get_tracer().totals().items())
+            logger.log("INFO", f"단계별 소요 시간 ({trace_path}): {totals}")
+
+    if args.command not in NO_ADMIN_COMMANDS:
+        import pyuac
+        if not pyuac.isUserAdmin():
+            print("관리자 권한으로 다시 시작합니다! 이 창은 닫으셔도 됩니다.")
+            pyuac.runAsAdmin()
+            raise SystemExit
+
+    from src.util.logger import Logger
+
+    if args.command:
+        try:
+            with RecordedRun(args.command, enabled=args.command not in UNRECORDED_COMMANDS) as run:
+                ok = COMMANDS[args.command](args)
+                run.failed = ok is False
+        finally:
+            export_trace(Logger())
+        Logger().flush()
+        raise SystemExit(0 if ok is not False else 1)
+    elif args.agent:
+        run_agent(args.agent, args.fleet, args.agent_host)
+    elif args.fleet:
+        run_fleet(args.fleet)
+    elif args.list_builds:
+        list_builds()
+    elif args.switch_build:
+        switch_build(args.switch_build)
     else:
-        app = Main()
-        app.start()
-        input("모든 작업이 완료되었습니다. 창을 닫으려면 Enter를 누르세요...")
\ No newline at end of file
+        try:
+            with RecordedRun("downgrade"):
+                app = Main()
+                app.start()
+        finally:
+            export_trace(Logger())
+        app.logger.flush()
+        input("모든 작업이 완료되었습니다. 창을 닫으려면 Enter를 누르세요...")
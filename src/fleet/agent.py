@@ -0,0 +1,134 @@
+import hmac
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.fleet import stages
+from src.fleet.stages import StageError
+
+DEFAULT_AGENT_PORT = 8701
+# 러너가 공유 비밀 값(fleet.yaml의 agent_token)을 보내는 헤더
+TOKEN_HEADER = "X-Fleet-Token"
+# 요청 본문 최대 크기 (단계 이름과 대상 이름만 받습니다)
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+class _AgentHandler(BaseHTTPRequestHandler):
+    server_version = "SteamFleetAgent/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, {"ok": True})
+        else:
+            self._reply(404, {"ok": False, "error": "not found"})
+
+    def _authorized(self) -> bool:
+        token = self.headers.get(TOKEN_HEADER) or ""
+        return hmac.compare_digest(token.encode("utf-8"), self.server.agent.token.encode("utf-8"))
+
+    def do_POST(self):
+        if self.path != "/stage":
+            self._reply(404, {"ok": False, "error": "not found"})
+            return
+        if not self._authorized():
+            self._reply(401, {"ok": False, "error": "인증 실패: 에이전트 토큰이 맞지 않습니다."})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            if not 0 <= length <= MAX_REQUEST_BYTES:
+                raise ValueError(f"본문 크기 {length}")
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+            stage, name = request["stage"], request["target"]
+            if not isinstance(stage, str) or not isinstance(name, str):
+                raise ValueError("stage와 target은 문자열이어야 합니다.")
+        except (ValueError, KeyError, TypeError) as e:
+            self._reply(400, {"ok": False, "error": f"잘못된 요청: {e}"})
+            return
+
+        # 요청은 단계와 대상 이름만 고릅니다. 경로와 URL은 에이전트 쪽 설정에 있는 값만 씁니다.
+        agent = self.server.agent
+        target = agent.targets.get(name)
+        if target is None:
+            self._reply(404, {"ok": False, "error": f"에이전트에 없는 대상입니다: {name}"})
+            return
+        try:
+            if stage in stages.EXCLUSIVE_STAGES:
+                with agent.steam_lock:
+                    detail = stages.run_stage(stage, target, agent.backend, config=agent.config)
+            else:
+                detail = stages.run_stage(stage, target, agent.backend, config=agent.config)
+        except (StageError, OSError, ValueError) as e:
+            self._reply(200, {"ok": False, "error": str(e)})
+            return
+        except Exception as e:
+            self._reply(500, {"ok": False, "error": f"에이전트 내부 오류: {e.__class__.__name__}: {e}"})
+            return
+        self._reply(200, {"ok": True, "detail": detail})
+
+
+class FleetAgent:
+    """
+    플릿 러너의 요청을 받아 이 PC(VM)에서 다운그레이드 단계를 실행하는 에이전트입니다.
+    VM마다 하나씩 실행하거나, 테스트 시 로컬에서 대역(stand-in)으로 실행합니다.
+    - 실행할 수 있는 대상은 에이전트 쪽에서 읽은 targets뿐이며, 요청은 그 이름만 고릅니다.
+    - 모든 단계 요청은 공유 비밀 값(token)이 맞아야 실행합니다.
+    - 기본적으로 127.0.0.1에서만 받습니다. 다른 PC의 러너에게 열려면 host를 직접 지정합니다.
+    """
+
+    def __init__(self, targets: list, token: str, host: str = "127.0.0.1", port: int = DEFAULT_AGENT_PORT,
+                 backend=None, config=None):
+        if not token:
+            raise ValueError("에이전트 토큰(agent_token)이 지정되지 않았습니다.")
+        self.targets = {target.name: target for target in targets}
+        self.token = token
+        self.host = host
+        self.port = port
+        self.backend = backend
+        self.config = config
+        self.steam_lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        self._server = ThreadingHTTPServer((self.host, self.port), _AgentHandler)
+        self._server.daemon_threads = True
+        self._server.agent = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fleet-agent", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def serve_forever(self):
+        self.start()
+        self._thread.join()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
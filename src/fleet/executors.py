@@ -0,0 +1,75 @@
+import abc
+import asyncio
+import json
+import urllib.error
+import urllib.request
+from src.fleet import stages
+from src.fleet.agent import TOKEN_HEADER
+from src.fleet.stages import StageError
+from src.util.steam_downgrader import DOWNLOAD_TIMEOUT, KILL_STEP_TIMEOUT
+
+# 다운로드 단계는 미리 받기, Steam 다운로드(자체 종료 대기 포함), 남은 프로세스 정리를 거칩니다.
+AGENT_TIMEOUT = 3 * DOWNLOAD_TIMEOUT + 2 * KILL_STEP_TIMEOUT + 60
+
+
+class Executor(abc.ABC):
+    """대상 하나의 단계를 실행하는 방법 (로컬 / 원격 에이전트)"""
+
+    @abc.abstractmethod
+    async def run_stage(self, stage: str, target, mirror=None) -> str:
+        """stage를 target에 대해 실행하고 결과 요약 문자열을 반환합니다. 실패하면 StageError"""
+
+
+class LocalExecutor(Executor):
+    """
+    이 PC에서 직접 단계를 실행합니다. 블로킹 작업은 스레드에서 실행합니다.
+    Steam 프로세스는 PC당 하나만 실행될 수 있으므로 종료/다운로드 단계는 대상끼리 순서대로 실행하고,
+    파일만 다루는 단계는 동시에 실행합니다.
+    """
+
+    def __init__(self, backend=None, config=None):
+        self.backend = backend
+        self.config = config
+        self._steam_lock = None
+
+    async def run_stage(self, stage: str, target, mirror=None) -> str:
+        if stage in stages.EXCLUSIVE_STAGES:
+            if self._steam_lock is None:
+                self._steam_lock = asyncio.Lock()
+            async with self._steam_lock:
+                return await asyncio.to_thread(stages.run_stage, stage, target, self.backend, mirror, self.config)
+        return await asyncio.to_thread(stages.run_stage, stage, target, self.backend, mirror, self.config)
+
+
+class RemoteAgentExecutor(Executor):
+    """
+    원격 PC(VM)의 에이전트(src/fleet/agent.py)에 HTTP로 단계를 요청합니다.
+    에이전트가 같은 PC의 Steam을 다루므로 에이전트별 직렬화는 에이전트 쪽에서 합니다.
+    대상은 이름으로만 요청하며, 경로와 패키지 주소는 에이전트가 자기 설정에서 정합니다.
+    """
+
+    def __init__(self, agent_url: str, token: str, timeout: float = AGENT_TIMEOUT):
+        self.agent_url = agent_url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+
+    def _post(self, stage: str, target) -> str:
+        body = json.dumps({"stage": stage, "target": target.name}).encode("utf-8")
+        request = urllib.request.Request(f"{self.agent_url}/stage", data=body, method="POST",
+                                         headers={"Content-Type": "application/json", TOKEN_HEADER: self.token or ""})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                result = json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            try:
+                result = json.loads(e.read().decode("utf-8"))
+            except ValueError:
+                raise StageError(f"에이전트 오류: HTTP {e.code}")
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise StageError(f"에이전트에 연결할 수 없습니다: {self.agent_url} ({e})")
+        if not result.get("ok"):
+            raise StageError(result.get("error") or "에이전트가 실패를 반환했습니다.")
+        return result.get("detail", "")
+
+    async def run_stage(self, stage: str, target, mirror=None) -> str:
+        return await asyncio.to_thread(self._post, stage, target)
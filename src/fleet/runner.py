@@ -0,0 +1,163 @@
+import asyncio
+import time
+from src.fleet import stages
+from src.fleet.target import DEFAULT_CONCURRENCY
+from src.fleet.executors import LocalExecutor, RemoteAgentExecutor
+from src.net.mirror_server import PackageMirror, wayback_client_url
+
+
+class StageResult:
+    __slots__ = ("stage", "ok", "elapsed", "detail")
+
+    def __init__(self, stage: str, ok: bool, elapsed: float, detail: str):
+        self.stage = stage
+        self.ok = ok
+        self.elapsed = elapsed
+        self.detail = detail
+
+    def __repr__(self):
+        return f"StageResult({self.stage!r}, ok={self.ok}, {self.elapsed * 1000:.0f}ms)"
+
+
+class TargetResult:
+    def __init__(self, target):
+        self.target = target
+        self.stages = []
+        self.elapsed = 0.0
+        self.queued = 0.0      # 동시 실행 제한 때문에 기다린 시간
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.stages) and all(stage.ok for stage in self.stages)
+
+    @property
+    def failed_stage(self):
+        return next((stage for stage in self.stages if not stage.ok), None)
+
+    def __repr__(self):
+        return f"TargetResult({self.target.name!r}, ok={self.ok}, {self.elapsed:.1f}s)"
+
+
+class FleetSummary:
+    def __init__(self, results: list, elapsed: float):
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def succeeded(self) -> list:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> list:
+        return [result for result in self.results if not result.ok]
+
+    def stage_totals(self) -> dict:
+        """단계별 전체 소요 시간 합계 (초)"""
+        totals = {}
+        for result in self.results:
+            for stage in result.stages:
+                totals[stage.stage] = totals.get(stage.stage, 0.0) + stage.elapsed
+        return totals
+
+
+class FleetRunner:
+    """
+    여러 Steam 루트 / VM에 다운그레이드 단계를 asyncio로 동시에 실행합니다.
+    - 동시에 실행하는 대상 수는 concurrency로 제한합니다.
+    - 한 대상이 실패하면 그 대상의 남은 단계만 건너뛰고 다른 대상은 계속 진행합니다.
+    - cache를 주면 로컬 대상들은 원본(wayback 날짜)마다 하나의 로컬 미러를 함께 사용합니다.
+    - 원격 대상은 agent_token으로 에이전트에 인증합니다.
+    """
+
+    def __init__(self, targets: list, concurrency: int = DEFAULT_CONCURRENCY, pipeline=stages.PIPELINE,
+                 local_executor: LocalExecutor = None, cache=None, logger=None, agent_token: str = None):
+        self.targets = targets
+        self.concurrency = max(1, concurrency)
+        self.pipeline = tuple(pipeline)
+        self.local_executor = local_executor or LocalExecutor()
+        self.cache = cache
+        self.logger = logger
+        self.agent_token = agent_token
+        self._remote_executors = {}
+        self._mirrors = {}
+
+    def _log(self, type, message):
+        if self.logger is not None:
+            self.logger.log(type, message)
+
+    def _executor_for(self, target):
+        if not target.is_remote:
+            return self.local_executor
+        executor = self._remote_executors.get(target.agent)
+        if executor is None:
+            executor = self._remote_executors[target.agent] = RemoteAgentExecutor(target.agent, self.agent_token)
+        return executor
+
+    def _mirror_for(self, target):
+        if target.is_remote or self.cache is None or not target.wayback_date:
+            return None
+        origin = wayback_client_url(target.wayback_date)
+        mirror = self._mirrors.get(origin)
+        if mirror is None:
+            mirror = self._mirrors[origin] = PackageMirror(self.cache, origin)
+            mirror.start()
+            self._log("INFO", f"플릿 공용 패키지 미러 시작: {mirror.base_url} -> {origin}")
+        return mirror
+
+    async def _run_target(self, target, slots: asyncio.Semaphore) -> TargetResult:
+        result = TargetResult(target)
+        queued_at = time.perf_counter()
+        async with slots:
+            started = time.perf_counter()
+            result.queued = started - queued_at
+            executor = self._executor_for(target)
+            try:
+                mirror = self._mirror_for(target)
+            except OSError as e:
+                self._log("WARNING", f"[{target.name}] 공용 미러를 시작하지 못해 대상마다 미러를 시작합니다: {e}")
+                mirror = None
+
+            for stage in self.pipeline:
+                stage_started = time.perf_counter()
+                try:
+                    detail = await executor.run_stage(stage, target, mirror)
+                    ok = True
+                except Exception as e:
+                    detail = str(e) or e.__class__.__name__
+                    ok = False
+                elapsed = time.perf_counter() - stage_started
+                result.stages.append(StageResult(stage, ok, elapsed, detail))
+                if ok:
+                    self._log("INFO", f"[{target.name}] {stage} 완료 ({elapsed * 1000:.0f}ms): {detail}")
+                else:
+                    self._log("ERROR", f"[{target.name}] {stage} 실패 ({elapsed * 1000:.0f}ms): {detail}")
+                    break
+            result.elapsed = time.perf_counter() - started
+        return result
+
+    async def run_async(self) -> FleetSummary:
+        started = time.perf_counter()
+        slots = asyncio.Semaphore(self.concurrency)
+        try:
+            results = await asyncio.gather(*(self._run_target(target, slots) for target in self.targets))
+        finally:
+            for mirror in self._mirrors.values():
+                mirror.stop()
+            self._mirrors = {}
+        return FleetSummary(list(results), time.perf_counter() - started)
+
+    def run(self) -> FleetSummary:
+        return asyncio.run(self.run_async())
+
+
+def log_summary(logger, summary: FleetSummary):
+    for result in summary.results:
+        timings = ", ".join(f"{stage.stage} {stage.elapsed * 1000:.0f}ms" for stage in result.stages)
+        if result.ok:
+            logger.log("OK", f"[{result.target.name}] 완료 {result.elapsed:.1f}초 (대기 {result.queued:.1f}초): {timings}")
+        else:
+            failed = result.failed_stage
+            logger.log("ERROR", f"[{result.target.name}] {failed.stage} 단계 실패: {failed.detail} ({timings})")
+    totals = ", ".join(f"{stage} {elapsed:.1f}초" for stage, elapsed in summary.stage_totals().items())
+    logger.log("INFO", f"플릿 실행 완료: 대상 {len(summary.results)}개 중 성공 {len(summary.succeeded)}개, "
+                       f"실패 {len(summary.failed)}개, 전체 {summary.elapsed:.1f}초 (단계별 합계: {totals})")
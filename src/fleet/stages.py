@@ -0,0 +1,97 @@
+"""
+플릿 모드에서 대상마다 실행하는 다운그레이드 단계입니다.
+각 단계는 대상(FleetTarget)을 받아 결과 설명 문자열을 반환하고, 실패하면 StageError를 발생시킵니다.
+SSFN 교체를 뺀 단계는 대상의 Steam 경로로 만든 SteamDowngrader로 실행하므로, 단일 PC 실행과 같은
+미러/미리 받기, bootstrap 로그 감시, 무결성 검사를 거칩니다. 로컬 실행기와 원격 에이전트가 같은 함수를 사용합니다.
+"""
+import os
+from src.helper.config import Config
+from src.steam.ssfn_slots import activate_ssfn
+from src.util.steam_downgrader import DOWNLOAD_STEPS, SteamDowngrader
+
+STAGE_SSFN = "ssfn"
+STAGE_KILL = "kill"
+STAGE_DOWNLOAD = "download"
+STAGE_CFG = "cfg"
+STAGE_VDF = "vdf"
+
+# 실행 순서
+PIPELINE = (STAGE_SSFN, STAGE_KILL, STAGE_DOWNLOAD, STAGE_CFG, STAGE_VDF)
+# 같은 PC의 Steam 프로세스를 건드리는 단계 (한 PC에서 동시에 하나만 실행)
+EXCLUSIVE_STAGES = (STAGE_KILL, STAGE_DOWNLOAD)
+
+
+class StageError(Exception):
+    pass
+
+
+def _downgrader(target, backend=None, mirror=None, config: Config = None) -> SteamDowngrader:
+    """대상의 Steam 경로와 날짜로 바꾼 설정의 SteamDowngrader"""
+    config = (config or Config()).for_target(target.steam_path, target.wayback_date)
+    return SteamDowngrader(process_backend=backend, config=config, steam_exe_path=target.steam_exe_path, mirror=mirror)
+
+
+def swap_ssfn(target, backend=None, mirror=None, config: Config = None) -> str:
+    ssfn_path = target.ssfn_path
+    if not ssfn_path:
+        return "SSFN 파일이 지정되지 않아 건너뜀"
+    if not os.path.isfile(ssfn_path):
+        raise StageError(f"로컬 SSFN 파일을 찾을 수 없습니다: {ssfn_path}")
+    result = activate_ssfn(ssfn_path, target.steam_path)
+    if not result.changed:
+        return f"'{result.name}'이(가) 이미 있어 건너뜀"
+    return f"기존 SSFN {len(result.removed)}개 제거, '{result.name}' 배치 ({result.method or '유지'})"
+
+
+def _run_steps(downgrader: SteamDowngrader, steps):
+    """build_steps()에서 steps와 그 선행 단계만 실행합니다. 실패한 단계가 있으면 StageError"""
+    report = downgrader.run_steps(downgrader.build_steps().subgraph(steps))
+    if not report.ok:
+        raise StageError(f"실패한 단계: {', '.join(result.name for result in report.failed)}")
+    return report
+
+
+def kill_steam(target, backend=None, mirror=None, config: Config = None) -> str:
+    report = _run_steps(_downgrader(target, backend, mirror, config), ("kill_steam",))
+    wait = report.results["kill_steam"].value
+    if not wait.ok:
+        raise StageError(f"Steam 프로세스가 종료되지 않았습니다. (pid: {', '.join(map(str, wait.pids))})")
+    return f"Steam 종료 확인, {wait.elapsed_ms:.0f}ms 대기"
+
+
+def download_client(target, backend=None, mirror=None, config: Config = None) -> str:
+    report = _run_steps(_downgrader(target, backend, mirror, config), DOWNLOAD_STEPS)
+    return f"다운로드 단계 {len(report.results)}개, {report.elapsed:.1f}초"
+
+
+def write_steam_cfg(target, backend=None, mirror=None, config: Config = None) -> str:
+    _downgrader(target, backend, mirror, config).lock_updates()
+    return "steam.cfg 생성"
+
+
+def edit_loginusers(target, backend=None, mirror=None, config: Config = None) -> str:
+    _downgrader(target, backend, mirror, config).offline_login()
+    return "loginusers.vdf 오프라인 로그인 설정"
+
+
+STAGE_FUNCTIONS = {
+    STAGE_SSFN: swap_ssfn,
+    STAGE_KILL: kill_steam,
+    STAGE_DOWNLOAD: download_client,
+    STAGE_CFG: write_steam_cfg,
+    STAGE_VDF: edit_loginusers,
+}
+
+
+def run_stage(stage: str, target, backend=None, mirror=None, config: Config = None) -> str:
+    """
+    단계 하나를 실행합니다. mirror는 러너가 로컬 대상들에 함께 쓰는 PackageMirror입니다.
+    SteamDowngrader가 오류를 기록하고 프로그램을 끝내려 하면(SystemExit) 이 대상의 단계 실패로 바꿉니다.
+    """
+    function = STAGE_FUNCTIONS.get(stage)
+    if function is None:
+        raise StageError(f"알 수 없는 단계입니다: {stage}")
+    try:
+        return function(target, backend=backend, mirror=mirror, config=config)
+    except SystemExit:
+        raise StageError(f"'{stage}' 단계가 실패했습니다. 자세한 내용은 로그를 확인하세요.")
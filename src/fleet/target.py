@@ -0,0 +1,70 @@
+import os
+import yaml
+from yaml import SafeLoader
+
+DEFAULT_CONCURRENCY = 8
+
+
+class FleetTarget:
+    """
+    플릿 모드에서 다운그레이드를 실행할 대상 하나 (Steam 루트 + 실행 위치).
+    agent가 없으면 이 PC에서 직접 실행하고, 있으면 해당 주소의 원격 에이전트에 단계를 요청합니다.
+    """
+
+    def __init__(self, name: str, steam_path: str, steam_exe_path: str = None, ssfn_path: str = None,
+                 wayback_date: str = None, agent: str = None):
+        self.name = name
+        self.steam_path = steam_path
+        self.steam_exe_path = steam_exe_path or os.path.join(steam_path, "steam.exe")
+        self.ssfn_path = ssfn_path
+        self.wayback_date = wayback_date
+        self.agent = agent
+
+    @property
+    def is_remote(self) -> bool:
+        return bool(self.agent)
+
+    @classmethod
+    def from_dict(cls, data: dict, defaults: dict = None):
+        merged = dict(defaults or {})
+        merged.update({key: value for key, value in data.items() if value is not None})
+        if not merged.get("steam_path"):
+            raise ValueError(f"플릿 대상에 steam_path가 없습니다: {data}")
+        return cls(
+            name=merged.get("name") or os.path.basename(os.path.normpath(merged["steam_path"])),
+            steam_path=merged["steam_path"],
+            steam_exe_path=merged.get("steam_exe_path") or merged.get("steam_exe"),
+            ssfn_path=merged.get("ssfn_path") or merged.get("ssfn"),
+            wayback_date=merged.get("wayback_date") or merged.get("downgrade_wayback_date"),
+            agent=merged.get("agent"),
+        )
+
+    def __repr__(self):
+        where = self.agent or "local"
+        return f"FleetTarget({self.name!r}, {self.steam_path!r}, {where})"
+
+
+def load_fleet_file(path: str):
+    """
+    fleet.yaml을 읽어 (대상 목록, 동시 실행 수, 에이전트 토큰)을 반환합니다.
+    agent_token은 러너와 에이전트가 함께 쓰는 비밀 값입니다. 에이전트도 자기 PC의 대상을 같은 형식의 파일로 읽습니다.
+
+    concurrency: 8
+    agent_token: "임의의 긴 문자열"
+    defaults:
+      wayback_date: "20230531000000"
+    targets:
+      - name: vm01
+        steam_path: "C:/Program Files (x86)/Steam"
+        agent: "http://127.0.0.1:8701"
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=SafeLoader) or {}
+    defaults = data.get("defaults") or {}
+    targets = [FleetTarget.from_dict(item, defaults) for item in data.get("targets") or []]
+    names = [target.name for target in targets]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"플릿 대상 이름이 중복되었습니다: {', '.join(sorted(duplicates))}")
+    token = data.get("agent_token")
+    return targets, int(data.get("concurrency", DEFAULT_CONCURRENCY)), str(token) if token else None
@@ -1,39 +1,79 @@
-import yaml
-from yaml import SafeLoader
-import os
-from src.steam.reg import SteamReg
+import copy
+from src.helper.env_probe import EnvironmentProbe, get_probe
+from src.util.logger import Logger
 
 class Config():
-    def __init__(self):
+    def __init__(self, probe: EnvironmentProbe = None):
+        # config.yaml과 레지스트리는 공유 EnvironmentProbe가 한 번만 읽습니다.
+        self.probe = probe or get_probe()
+        logger = Logger()
         try:
-            with open("config.yaml", "r", encoding='utf-8') as file:
-                self.config = yaml.load(file, Loader=SafeLoader)
+            self.config = self.probe.config
 
             self.build_version: str = "1.5"
             self.username: str = self.config["username"]
 
             # --- Steam 경로 자동 감지 로직 ---
-            self.steam_reg = SteamReg()
-            detected_steam_path = None # 이 변수는 임시로 사용하며, 없으면 None으로 설정
-            try:
-                detected_steam_path = self.steam_reg.get_steam_path()
-                if detected_steam_path and not os.path.isdir(detected_steam_path):
-                    detected_steam_path = None # 유효하지 않은 경로면 None으로 처리
-            except Exception:
-                pass # 레지스트리에서 찾지 못하거나 오류 발생 시 무시
-
-            if detected_steam_path:
-                self.steam_path = detected_steam_path
-            else:
-                print(f"경고: Steam 경로를 자동으로 감지하지 못했습니다.")
-                print("config.yaml 파일의 'steam_path'에 Steam 설치 경로를 수동으로 입력하거나, 레지스트리 설정을 확인하세요.")
-                
-                self.steam_path = self.config.get("steam_path") # config.yaml에서 폴백
-                if not self.steam_path or not os.path.isdir(self.steam_path):
-                    raise ValueError("config.yaml에서도 유효한 Steam 경로를 찾을 수 없습니다. 경로를 설정해주세요.")
+            self.steam_reg = self.probe.steam_reg
+            if not self.probe.registry_steam_path:
+                logger.log("WARNING", "Steam 경로를 자동으로 감지하지 못했습니다.")
+                logger.log("WARNING", "config.yaml 파일의 'steam_path'에 Steam 설치 경로를 수동으로 입력하거나, 레지스트리 설정을 확인하세요.")
+
+            # 레지스트리에서 찾지 못하면 config.yaml의 경로를 사용합니다. 둘 다 유효하지 않으면 ValueError
+            self.steam_path = self.probe.steam_path
 
             self.downgrade_wayback_date: str = self.config["downgrade_wayback_date"] # config.yaml에서 날짜를 읽어옵니다.
 
+            # SSFN 슬롯 저장소 위치 (선택 항목)
+            self.ssfn_store_dir: str = self.config.get("ssfn_store_dir", "ssfn_slots")
+
+            # 로컬 패키지 캐시/미러 설정 (선택 항목)
+            self.use_local_mirror: bool = bool(self.config.get("use_local_mirror", True))
+            self.package_cache_dir: str = self.config.get("package_cache_dir", "package_cache")
+            self.package_cache_max_mb: int = int(self.config.get("package_cache_max_mb", 4096))
+            self.prefetch_workers: int = int(self.config.get("prefetch_workers", 8))
+            self.prefetch_per_host: int = int(self.config.get("prefetch_per_host", 4))
+            # 패키지 원본 주소 (선택 항목, 비어 있으면 downgrade_wayback_date의 web.archive.org 스냅샷)
+            self.package_origin_url: str = self.config.get("package_origin_url") or None
+
+            # 빌드별 클라이언트 파일 저장소 (선택 항목). 다운그레이드 전후 상태를 저장해 두고 빠르게 전환합니다.
+            self.use_client_store: bool = bool(self.config.get("use_client_store", True))
+            self.client_store_dir: str = self.config.get("client_store_dir", "client_store")
+
+            # 다운로드 후 설치 파일 무결성 검사 설정 (선택 항목, verify_workers가 0이면 CPU 수만큼 사용)
+            self.verify_after_download: bool = bool(self.config.get("verify_after_download", True))
+            self.verify_workers: int = int(self.config.get("verify_workers", 0))
+
+            # 패키지 설치 방식 (선택 항목)
+            # steam: 구 클라이언트가 받고 풉니다. direct: 미리 받은 패키지를 도구가 직접 풉니다. (Zstandard 패키지 지원)
+            self.package_install_mode: str = str(self.config.get("package_install_mode", "steam")).lower()
+            # 동시에 풀 패키지 수 (0이면 CPU 수에 맞춤)
+            self.extract_workers: int = int(self.config.get("extract_workers", 0))
+
+            # 다운로드 중 Steam의 logs/bootstrap_log.txt를 따라 읽어 진행 상황 출력 / 자체 업데이트 시 중단 (선택 항목)
+            self.watch_bootstrap_log: bool = bool(self.config.get("watch_bootstrap_log", True))
+
+            # 네트워크 차단 확인 방식 (선택 항목)
+            # auto: 연결 확인 주소에 닿지 않으면 바로 다음 단계로 진행, prompt: Enter 입력 대기
+            self.network_cut_mode: str = str(self.config.get("network_cut_mode", "auto")).lower()
+            self.network_probe_endpoints: list = list(self.config.get("network_probe_endpoints") or
+                                                         ["steamcommunity.com:443", "store.steampowered.com:443"])
+            self.network_probe_interval: float = float(self.config.get("network_probe_interval", 1.0))
+            # 이 시간(초) 안에 차단을 확인하지 못하면 Enter 입력 대기로 바뀝니다.
+            self.network_cut_timeout: float = float(self.config.get("network_cut_timeout", 600))
+
+            # 보관된 클라이언트 빌드 카탈로그 (선택 항목). main.py catalog 명령으로 갱신/조회합니다.
+            self.build_catalog_path: str = self.config.get("build_catalog_path", "build_catalog.sqlite")
+            self.catalog_cdx_url: str = self.config.get("catalog_cdx_url", "http://web.archive.org/cdx/search/cdx")
+            self.catalog_snapshot_url: str = self.config.get("catalog_snapshot_url", "http://web.archive.org/web/{timestamp}id_/{original}")
+
+            # 민감한 파일(ssfn*, config/*) 감시 (main.py watch, 선택 항목)
+            # auto: Linux inotify / Windows 변경 알림, 사용할 수 없으면 poll (stat만 확인)
+            self.artifact_watch_backend: str = str(self.config.get("artifact_watch_backend", "auto")).lower()
+            self.artifact_watch_poll_interval: float = float(self.config.get("artifact_watch_poll_interval", 2.0))
+            # 알림을 놓쳤을 때를 대비한 전체 확인 간격 (초)
+            self.artifact_watch_rescan_interval: float = float(self.config.get("artifact_watch_rescan_interval", 300))
+
             # self.rollback_path: str = self.config["rollback_path"]
             # self.rollback_exe_path: str = self.config["rollback_exe_path"]
             # self.github_url: str = self.config["github_url"]
@@ -41,17 +81,29 @@ class Config():
             # self.steam_rollback_url: str = self.config["steam_rollback_url"]
 
         except FileNotFoundError:
-            print("ERROR: config.yaml 파일을 찾을 수 없습니다. 프로젝트 루트 폴더에 있는지 확인하세요.")
-            exit()
+            logger.log("ERROR", "config.yaml 파일을 찾을 수 없습니다. 프로젝트 루트 폴더에 있는지 확인하세요.")
+            logger.exit_program()
         except KeyError as e:
-            print(f"ERROR: config.yaml 파일에 필수 키가 누락되었습니다: {e}. 파일을 확인하세요.")
-            exit()
+            logger.log("ERROR", f"config.yaml 파일에 필수 키가 누락되었습니다: {e}. 파일을 확인하세요.")
+            logger.exit_program()
         except ValueError as e:
-            print(f"CRITICAL ERROR: {e}")
-            exit()
+            logger.log("ERROR", str(e))
+            logger.exit_program()
         except Exception as e:
-            print(f"ERROR: config.yaml 로드 또는 Steam 경로 감지 중 오류 발생: {e}")
-            exit()
+            logger.log("ERROR", f"config.yaml 로드 또는 Steam 경로 감지 중 오류 발생: {e}")
+            logger.exit_program()
 
     def get_steam_path(self) -> str:
-        return self.steam_path
\ No newline at end of file
+        return self.steam_path
+
+    def for_target(self, steam_path: str, wayback_date: str = None) -> "Config":
+        """
+        Steam 경로(와 다운그레이드 날짜)만 바꾼 복사본을 반환합니다. (플릿 모드에서 대상마다 사용)
+        날짜를 주면 package_origin_url 대신 그 날짜의 web.archive.org 스냅샷을 씁니다.
+        """
+        config = copy.copy(self)
+        config.steam_path = steam_path
+        if wayback_date:
+            config.downgrade_wayback_date = wayback_date
+            config.package_origin_url = None
+        return config
\ No newline at end of file
@@ -0,0 +1,139 @@
+import os
+import threading
+import time
+import yaml
+from yaml import SafeLoader
+from src.steam.reg import RegistryBackend, SteamReg
+
+CONFIG_PATH = "config.yaml"
+
+# 어떤 값을 다시 확인하면 함께 다시 확인해야 하는 값
+_DEPENDENTS = {
+    "config": ("steam_path", "steam_exe_path"),
+    "registry": ("registry_steam_path", "steam_path", "steam_exe_path"),
+    "registry_steam_path": ("steam_path", "steam_exe_path"),
+    "steam_path": ("steam_exe_path",),
+}
+
+
+class EnvironmentProbe:
+    """
+    config.yaml, 레지스트리, 경로 검사 결과를 한 번만 확인하고 기억하여 모든 구성 요소가 공유합니다.
+    각 값은 처음 사용할 때 확인하며, 걸린 시간을 timings에 남깁니다.
+    값이 바뀌었을 수 있으면 invalidate()로 다시 확인하게 합니다.
+    """
+
+    def __init__(self, config_path: str = CONFIG_PATH, registry: RegistryBackend = None):
+        self.config_path = config_path
+        self.steam_reg = SteamReg(registry)
+        self.timings = {}   # 항목 -> 처음 확인에 걸린 시간 (초, 다른 항목 확인 시간 제외)
+        self._values = {}
+        self._nested = []
+        self._lock = threading.RLock()
+
+    def _memo(self, name: str, resolve):
+        with self._lock:
+            if name not in self._values:
+                # 다른 값을 확인하는 중에 불린 경우, 그 시간은 바깥 값의 시간에서 뺍니다. (중복 합산 방지)
+                self._nested.append(0.0)
+                started = time.perf_counter()
+                try:
+                    self._values[name] = (resolve(), None)
+                except Exception as e:
+                    # 실패도 기억하여 같은 오류를 반복해서 확인하지 않습니다.
+                    self._values[name] = (None, e)
+                elapsed = time.perf_counter() - started
+                self.timings[name] = elapsed - self._nested.pop()
+                if self._nested:
+                    self._nested[-1] += elapsed
+            value, error = self._values[name]
+        if error is not None:
+            raise error
+        return value
+
+    def invalidate(self, *names):
+        """기억한 값을 (그 값에 의존하는 값과 함께) 지웁니다. 이름을 주지 않으면 모두 지웁니다."""
+        with self._lock:
+            if not names:
+                self._values.clear()
+                self.timings.clear()
+                self.steam_reg.invalidate()
+                return
+            names = set(names)
+            for name in list(names):
+                names.update(_DEPENDENTS.get(name, ()))
+            for name in names:
+                self._values.pop(name, None)
+                self.timings.pop(name, None)
+            if "registry" in names:
+                self.steam_reg.invalidate()
+
+    @property
+    def config(self) -> dict:
+        """config.yaml 내용. 파일이 없으면 FileNotFoundError"""
+        def load():
+            with open(self.config_path, "r", encoding="utf-8") as file:
+                return yaml.load(file, Loader=SafeLoader) or {}
+        return self._memo("config", load)
+
+    @property
+    def registry(self) -> dict:
+        """Steam 레지스트리 값 (SteamPath, SteamExe). 키는 한 번만 엽니다."""
+        return self._memo("registry", self.steam_reg.values)
+
+    @property
+    def registry_steam_path(self):
+        """레지스트리에 기록된 Steam 경로. 없거나 폴더가 아니면 None"""
+        def resolve():
+            path = self.registry.get("SteamPath")
+            return path if path and os.path.isdir(path) else None
+        return self._memo("registry_steam_path", resolve)
+
+    @property
+    def steam_path(self) -> str:
+        """레지스트리 -> config.yaml 순서로 찾은 유효한 Steam 경로. 없으면 ValueError"""
+        def resolve():
+            path = self.registry_steam_path
+            if path:
+                return path
+            path = self.config.get("steam_path")
+            if not path or not os.path.isdir(path):
+                raise ValueError("config.yaml에서도 유효한 Steam 경로를 찾을 수 없습니다. 경로를 설정해주세요.")
+            return path
+        return self._memo("steam_path", resolve)
+
+    @property
+    def steam_exe_path(self) -> str:
+        """레지스트리의 SteamExe. 없으면 Steam 경로 아래의 steam.exe"""
+        def resolve():
+            path = self.registry.get("SteamExe")
+            return path if path else os.path.join(self.steam_path, "steam.exe")
+        return self._memo("steam_exe_path", resolve)
+
+    @property
+    def cold_start_ms(self) -> float:
+        return sum(self.timings.values()) * 1000
+
+    def report(self) -> str:
+        details = ", ".join(f"{name} {elapsed * 1000:.1f}ms" for name, elapsed in self.timings.items())
+        return f"환경 확인 {self.cold_start_ms:.1f}ms ({details})"
+
+
+_shared_probe = None
+_shared_lock = threading.Lock()
+
+
+def get_probe() -> EnvironmentProbe:
+    """프로세스 전체에서 공유하는 EnvironmentProbe를 반환합니다."""
+    global _shared_probe
+    with _shared_lock:
+        if _shared_probe is None:
+            _shared_probe = EnvironmentProbe()
+        return _shared_probe
+
+
+def set_probe(probe: EnvironmentProbe):
+    """공유 EnvironmentProbe를 교체합니다. (테스트, 가짜 레지스트리 사용 시)"""
+    global _shared_probe
+    with _shared_lock:
+        _shared_probe = probe
@@ -8,6 +8,57 @@ steam_path: "C:/Program Files (x86)/Steam"
 rollback_path: "src/util/rollback"
 rollback_exe_path: "src/util/rollback/steam-rollback.exe"
 
+# SSFN slot store (sentry files are linked from here into the Steam folder)
+ssfn_store_dir: "ssfn_slots"
+
+# Local package cache / mirror
+use_local_mirror: true
+package_cache_dir: "package_cache"
+package_cache_max_mb: 4096
+prefetch_workers: 8
+prefetch_per_host: 4
+# package_origin_url: http://127.0.0.1:8000/client  (default: web.archive.org snapshot of downgrade_wayback_date)
+
+# Client build store (pre-downgrade snapshot and stored builds, switched with hardlinks)
+use_client_store: true
+client_store_dir: "client_store"
+
+# Integrity check after download (verify_workers: 0 = CPU count)
+verify_after_download: true
+verify_workers: 0
+
+# How downloaded packages are installed
+# steam: the old client downloads and unpacks them, direct: unpack prefetched packages without launching Steam
+# (needed for Zstandard packages, which old clients cannot unpack; zstd needs Python 3.14 or `pip install zstandard`)
+package_install_mode: steam
+extract_workers: 0
+
+# Follow logs/bootstrap_log.txt during the download (progress, abort when Steam starts updating itself)
+watch_bootstrap_log: true
+
+# Network isolation check before the offline launch
+# auto: continue as soon as none of the endpoints are reachable, prompt: wait for Enter
+network_cut_mode: auto
+network_probe_endpoints:
+  - steamcommunity.com:443
+  - store.steampowered.com:443
+network_probe_interval: 1.0
+network_cut_timeout: 600
+
+# Archived client build catalog (python main.py catalog update / lookup <date> / build <id> / list)
+build_catalog_path: "build_catalog.sqlite"
+# catalog_cdx_url: http://web.archive.org/cdx/search/cdx
+# catalog_snapshot_url: "http://web.archive.org/web/{timestamp}id_/{original}"
+
+# Run history with per-phase timings (python main.py history / empty: do not record)
+run_history_path: "run_history.sqlite"
+
+# Sensitive file watcher (python main.py watch): alerts on changes to ssfn* and config/ files, never copies them
+# auto: inotify on Linux / change notifications on Windows, poll: stat only
+artifact_watch_backend: auto
+artifact_watch_poll_interval: 2.0
+artifact_watch_rescan_interval: 300
+
 # Github urls
 steam_rollback_url: https://github.com/IMXNOOBX/steam-rollback/releases/download/steam-rollback/steam-rollback.exe
 """
@@ -0,0 +1,195 @@
+import os
+import socket
+import threading
+import time
+import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_ENDPOINTS = ("steamcommunity.com:443", "store.steampowered.com:443")
+DEFAULT_PROBE_TIMEOUT = 2.0
+DEFAULT_INTERVAL = 1.0
+# 연속으로 이만큼 모든 프로브가 실패해야 차단으로 판단합니다. (일시적인 패킷 손실 방지)
+DEFAULT_CONFIRMATIONS = 2
+
+STATE_UNKNOWN = "unknown"
+STATE_ONLINE = "online"
+STATE_ISOLATED = "isolated"
+
+
+class ConnectivityProbe:
+    """연결 상태를 확인하는 방법 하나. check()는 연결되어 있으면 True"""
+
+    name = "probe"
+
+    def check(self) -> bool:
+        raise NotImplementedError
+
+
+class TcpProbe(ConnectivityProbe):
+    """host:port에 TCP 연결이 되는지 확인합니다. (이름 조회 실패도 연결 안 됨으로 봅니다)"""
+
+    def __init__(self, host: str, port: int, timeout: float = DEFAULT_PROBE_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.name = f"{host}:{port}"
+
+    def check(self) -> bool:
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout):
+                return True
+        except OSError:
+            return False
+
+
+class InterfaceProbe(ConnectivityProbe):
+    """
+    네트워크 어댑터 상태로 확인합니다.
+    - Windows: wininet InternetGetConnectedState
+    - Linux: /sys/class/net/<이름>/operstate (이름이 없으면 루프백을 뺀 모든 어댑터)
+    """
+
+    def __init__(self, interface: str = None, sys_net_root: str = "/sys/class/net"):
+        self.interface = interface
+        self.sys_net_root = sys_net_root
+        self.name = f"iface:{interface}" if interface else "iface"
+        if os.name != "nt" and not os.path.isdir(sys_net_root):
+            raise ValueError(f"네트워크 어댑터 상태를 읽을 수 없습니다: {sys_net_root}")
+
+    def check(self) -> bool:
+        if os.name == "nt":
+            import ctypes
+            flags = ctypes.c_ulong(0)
+            return bool(ctypes.windll.wininet.InternetGetConnectedState(ctypes.byref(flags), 0))
+        names = [self.interface] if self.interface else [name for name in os.listdir(self.sys_net_root) if name != "lo"]
+        for name in names:
+            try:
+                with open(os.path.join(self.sys_net_root, name, "operstate"), "r", encoding="ascii") as f:
+                    if f.read().strip() == "up":
+                        return True
+            except OSError:
+                continue
+        return False
+
+
+def parse_probe(spec: str, timeout: float = DEFAULT_PROBE_TIMEOUT) -> ConnectivityProbe:
+    """
+    설정 문자열을 프로브로 바꿉니다.
+      "host:port"            TCP 연결
+      "http(s)://host[:port]/..."  URL의 host/port로 TCP 연결
+      "iface" / "iface:<이름>"  네트워크 어댑터 상태
+    """
+    spec = spec.strip()
+    if spec == "iface" or spec.startswith("iface:"):
+        return InterfaceProbe(spec.partition(":")[2] or None)
+    if "://" in spec:
+        url = urllib.parse.urlsplit(spec)
+        if not url.hostname:
+            raise ValueError(f"잘못된 연결 확인 주소입니다: {spec}")
+        return TcpProbe(url.hostname, url.port or (443 if url.scheme == "https" else 80), timeout)
+    host, sep, port = spec.rpartition(":")
+    if not sep or not host or not port.isdigit():
+        raise ValueError(f"연결 확인 주소는 host:port 형식이어야 합니다: {spec}")
+    return TcpProbe(host.strip("[]"), int(port), timeout)
+
+
+class ConnectivityMonitor:
+    """
+    백그라운드 스레드에서 프로브를 주기적으로 동시에 확인하고 상태(online / isolated)를 갱신합니다.
+    - 프로브 하나라도 연결되면 online, confirmations번 연속으로 모두 실패하면 isolated입니다.
+    - 제한 시간 안에 답하지 않은 프로브는 연결 안 됨으로 봅니다.
+    - wait_for_isolation()은 상태가 바뀔 때 Condition 알림으로 깨어나므로 따로 폴링하지 않습니다.
+    """
+
+    def __init__(self, probes, interval: float = DEFAULT_INTERVAL, confirmations: int = DEFAULT_CONFIRMATIONS,
+                 on_change=None):
+        self.probes = list(probes)
+        if not self.probes:
+            raise ValueError("연결 확인 프로브가 없습니다.")
+        self.interval = interval
+        self.confirmations = max(1, confirmations)
+        self.on_change = on_change
+        self.state = STATE_UNKNOWN
+        self.seen_online = False
+        self.checks = 0
+        self.changed_at = None
+        self._failures = 0
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=len(self.probes) * 2, thread_name_prefix="net-probe")
+
+    def check_once(self) -> bool:
+        """모든 프로브를 동시에 실행해 하나라도 연결되면 True. 가장 오래 걸리는 프로브의 제한 시간까지만 기다립니다."""
+        timeout = max(getattr(probe, "timeout", DEFAULT_PROBE_TIMEOUT) for probe in self.probes) + 0.5
+        futures = [self._executor.submit(probe.check) for probe in self.probes]
+        deadline = time.monotonic() + timeout
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None and future.result():
+                    return True
+        return False
+
+    def _update(self, online: bool):
+        with self._condition:
+            self.checks += 1
+            if online:
+                self._failures = 0
+                self.seen_online = True
+                state = STATE_ONLINE
+            else:
+                self._failures += 1
+                state = STATE_ISOLATED if self._failures >= self.confirmations else self.state
+            changed = state != self.state
+            if changed:
+                self.state = state
+                self.changed_at = time.monotonic()
+            self._condition.notify_all()
+        if changed and self.on_change is not None:
+            self.on_change(state)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._update(self.check_once())
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="connectivity-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def wait_for_state(self, state: str, timeout: float = None) -> bool:
+        """상태가 state가 될 때까지 기다립니다. 제한 시간 안에 되지 않거나 모니터가 멈추면 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self.state != state:
+                if self._stop.is_set():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def wait_for_isolation(self, timeout: float = None) -> bool:
+        return self.wait_for_state(STATE_ISOLATED, timeout)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
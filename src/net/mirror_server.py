@@ -0,0 +1,222 @@
+import hashlib
+import os
+import re
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.net.package_cache import PackageCache, COPY_BUFFER_SIZE
+
+# Steam이 -overridepackageurl 아래에서 요청하는 경로 접두사
+CLIENT_PREFIX = "/client"
+ORIGIN_TIMEOUT = 60
+# 받은 캐시 파일이 보내기 전에 제거되었을 때 다시 받는 횟수
+FETCH_ATTEMPTS = 2
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+def wayback_client_url(wayback_date: str) -> str:
+    return f"http://web.archive.org/web/{wayback_date}if_/media.steampowered.com/client"
+
+
+class OriginError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _MirrorHandler(BaseHTTPRequestHandler):
+    server_version = "SteamPackageMirror/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # 요청마다 콘솔에 출력하지 않습니다.
+        pass
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body: bool):
+        mirror = self.server.mirror
+        path = self.path.split("?", 1)[0]
+        if not path.startswith(CLIENT_PREFIX + "/"):
+            self.send_error(404)
+            return
+        name = path[len(CLIENT_PREFIX) + 1:]
+        if not name or "/" in name or name in (".", ".."):
+            self.send_error(404)
+            return
+
+        # 캐시 항목은 다른 요청이 새 파일을 넣으면서 지울 수 있으므로, 파일을 연 뒤의 크기와 내용을 씁니다.
+        # (열기 전에 지워졌으면 한 번 더 받습니다)
+        blob = None
+        for _ in range(FETCH_ATTEMPTS):
+            try:
+                blob_path = mirror.fetch(name)
+            except OriginError as e:
+                self.send_error(e.status, explain=str(e))
+                return
+            if blob_path is None:
+                continue
+            try:
+                blob = open(blob_path, "rb")
+                break
+            except FileNotFoundError:
+                continue
+        if blob is None:
+            self.send_error(503, explain="캐시 파일이 제거되어 보낼 수 없습니다. 다시 시도하세요.")
+            return
+        with blob:
+            self._send_blob(blob, send_body)
+
+    def _send_blob(self, f, send_body: bool):
+        size = os.fstat(f.fileno()).st_size
+        start, end = 0, size - 1
+        status = 200
+        range_header = self.headers.get("Range")
+        if range_header:
+            match = _RANGE_RE.match(range_header.strip())
+            if match and (match.group(1) or match.group(2)):
+                if match.group(1):
+                    start = int(match.group(1))
+                    end = int(match.group(2)) if match.group(2) else size - 1
+                else:
+                    start = max(0, size - int(match.group(2)))
+                end = min(end, size - 1)
+                if start > end:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status = 206
+
+        length = end - start + 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if not send_body:
+            return
+
+        sent = 0
+        try:
+            # 가능하면 sendfile로 커널에서 바로 전송합니다.
+            out_fd, in_fd = self.connection.fileno(), f.fileno()
+            while sent < length:
+                count = os.sendfile(out_fd, in_fd, start + sent, length - sent)
+                if count == 0:
+                    break
+                sent += count
+        except (AttributeError, OSError, ValueError):
+            # sendfile이 없거나 도중에 실패하면 읽어서 보냅니다. 이미 보낸 바이트는 다시 보내지 않습니다.
+            f.seek(start + sent)
+            remaining = length - sent
+            while remaining > 0:
+                chunk = f.read(min(COPY_BUFFER_SIZE, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+
+class PackageMirror:
+    """
+    Steam이 기대하는 경로(<base>/client/<이름>)로 매니페스트와 패키지를 제공하는 로컬 HTTP 서버입니다.
+    캐시에 있으면 디스크에서 바로 보내고, 없으면 원본(web.archive.org 등)에서 받아 캐시에 저장한 뒤 보냅니다.
+    """
+
+    def __init__(self, cache: PackageCache, origin_base: str, host: str = "127.0.0.1", port: int = 0):
+        self.cache = cache
+        self.origin_base = origin_base.rstrip("/")
+        self.host = host
+        self.port = port
+        self.bytes_from_origin = 0
+        self._stats_lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self._fetch_locks = {}
+        self._fetch_locks_guard = threading.Lock()
+
+    def cache_key(self, name: str) -> str:
+        return f"{self.origin_base}/{name}"
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}{CLIENT_PREFIX}"
+
+    def _lock_for(self, name: str):
+        with self._fetch_locks_guard:
+            return self._fetch_locks.setdefault(name, threading.Lock())
+
+    def fetch(self, name: str) -> str:
+        """캐시된 파일 경로를 반환합니다. 없으면 원본에서 받아 캐시에 저장합니다."""
+        key = self.cache_key(name)
+        blob_path = self.cache.lookup(key)
+        if blob_path:
+            return blob_path
+
+        # 같은 파일을 동시에 여러 번 받지 않도록 이름별로 잠급니다.
+        with self._lock_for(name):
+            blob_path = self.cache.lookup(key, record=False)
+            if blob_path:
+                return blob_path
+
+            url = key
+            fd, temp_path = self.cache.new_temp_file()
+            digest = hashlib.sha256()
+            try:
+                with os.fdopen(fd, "wb") as out, urllib.request.urlopen(url, timeout=ORIGIN_TIMEOUT) as response:
+                    while True:
+                        chunk = response.read(COPY_BUFFER_SIZE)
+                        if not chunk:
+                            break
+                        digest.update(chunk)
+                        out.write(chunk)
+                        # 여러 요청 스레드가 동시에 받으므로 잠그고 더합니다.
+                        with self._stats_lock:
+                            self.bytes_from_origin += len(chunk)
+            except urllib.error.HTTPError as e:
+                os.remove(temp_path)
+                raise OriginError(e.code, f"원본 서버 오류: {e.code} {url}")
+            except (urllib.error.URLError, OSError) as e:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise OriginError(502, f"원본 서버에 연결할 수 없습니다: {url} ({e})")
+
+            self.cache.store_file(key, temp_path, digest.hexdigest())
+            return self.cache.lookup(key, record=False)
+
+    def start(self) -> str:
+        self._server = ThreadingHTTPServer((self.host, self.port), _MirrorHandler)
+        self._server.daemon_threads = True
+        self._server.mirror = self
+        self.port = self._server.server_address[1]
+        # shutdown()은 poll 주기만큼 기다리므로 기본값(0.5초)보다 짧게 둡니다. (임계 경로의 stop_mirror)
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                                        name="package-mirror", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
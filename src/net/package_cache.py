@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+INDEX_NAME = "index.json"
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class PackageCache:
+    """
+    내용 해시(SHA-256)로 저장하는 로컬 패키지 캐시입니다.
+    key(원본 URL) -> digest 인덱스를 두고, 같은 내용은 한 번만 저장합니다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다(LRU).
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.blob_dir = os.path.join(root, "blobs")
+        self.index_path = os.path.join(root, INDEX_NAME)
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.entries = {}  # key -> {"digest", "size", "last_used"}
+        if os.path.isfile(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f).get("entries", {})
+            except (OSError, ValueError):
+                self.entries = {}
+        # 인덱스에는 있지만 실제 파일이 없는 항목은 버립니다.
+        self.entries = {key: entry for key, entry in self.entries.items() if os.path.isfile(self.blob_path(entry["digest"]))}
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            sizes = {entry["digest"]: entry["size"] for entry in self.entries.values()}
+            return sum(sizes.values())
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def _save_index(self):
+        fd, temp_path = tempfile.mkstemp(prefix=".index.", dir=self.root)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"entries": self.entries}, f)
+        os.replace(temp_path, self.index_path)
+
+    def lookup(self, key: str, record: bool = True):
+        """캐시된 파일 경로를 반환합니다. 없으면 None. record=False이면 적중률 통계에 넣지 않습니다."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or not os.path.isfile(self.blob_path(entry["digest"])):
+                if record:
+                    self.misses += 1
+                return None
+            entry["last_used"] = time.time()
+            if record:
+                self.hits += 1
+            return self.blob_path(entry["digest"])
+
+    def digest_of(self, key: str):
+        with self._lock:
+            entry = self.entries.get(key)
+            return entry["digest"] if entry else None
+
+    def contains_digest(self, digest: str) -> bool:
+        return os.path.isfile(self.blob_path(digest))
+
+    def new_temp_file(self):
+        """캐시와 같은 파일 시스템에 임시 파일을 만듭니다. (fd, 경로)"""
+        return tempfile.mkstemp(prefix=".incoming.", dir=self.root)
+
+    def store_file(self, key: str, temp_path: str, digest: str = None) -> str:
+        """
+        임시 파일을 캐시에 넣고 digest를 반환합니다. 임시 파일은 이동되거나 삭제됩니다.
+        digest를 이미 계산했다면 넘겨서 다시 해시하지 않도록 할 수 있습니다.
+        """
+        if digest is None:
+            digest = hash_file(temp_path)
+        size = os.path.getsize(temp_path)
+        blob_path = self.blob_path(digest)
+        with self._lock:
+            if os.path.isfile(blob_path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.replace(temp_path, blob_path)
+            self.entries[key] = {"digest": digest, "size": size, "last_used": time.time()}
+            # 방금 넣은 내용은 max_bytes보다 커도 지우지 않습니다. (호출한 쪽이 바로 읽습니다)
+            self._evict(keep=digest)
+            self._save_index()
+        return digest
+
+    def import_file(self, key: str, source_path: str, expected_digest: str = None):
+        """
+        캐시 밖의 파일을 복사하며 해시를 계산해 캐시에 넣습니다. 원본 파일은 그대로 둡니다.
+        expected_digest와 다르거나 읽을 수 없으면 넣지 않고 None을 반환합니다.
+        """
+        if expected_digest and self.contains_digest(expected_digest):
+            return expected_digest if self.link_key(key, expected_digest) else None
+        fd, temp_path = self.new_temp_file()
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as out, open(source_path, "rb") as f:
+                while True:
+                    chunk = f.read(COPY_BUFFER_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    out.write(chunk)
+        except OSError:
+            os.remove(temp_path)
+            return None
+        if expected_digest and digest.hexdigest() != expected_digest:
+            os.remove(temp_path)
+            return None
+        return self.store_file(key, temp_path, digest.hexdigest())
+
+    def store_bytes(self, key: str, data: bytes) -> str:
+        fd, temp_path = self.new_temp_file()
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return self.store_file(key, temp_path, hashlib.sha256(data).hexdigest())
+
+    def link_key(self, key: str, digest: str) -> bool:
+        """이미 저장된 내용을 다른 key로도 찾을 수 있게 연결합니다."""
+        with self._lock:
+            blob_path = self.blob_path(digest)
+            if not os.path.isfile(blob_path):
+                return False
+            self.entries[key] = {"digest": digest, "size": os.path.getsize(blob_path), "last_used": time.time()}
+            self._save_index()
+            return True
+
+    def _evict(self, keep: str = None):
+        """가장 오래 사용하지 않은 항목부터 지웁니다. keep(digest)을 가리키는 항목은 남깁니다."""
+        total = self.total_bytes
+        if total <= self.max_bytes:
+            return
+        referenced = {}
+        for entry in self.entries.values():
+            referenced[entry["digest"]] = referenced.get(entry["digest"], 0) + 1
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if entry["digest"] == keep:
+                continue
+            del self.entries[key]
+            digest = entry["digest"]
+            referenced[digest] -= 1
+            # 같은 내용을 가리키는 다른 key가 없을 때만 실제 파일을 지웁니다.
+            if referenced[digest] == 0:
+                try:
+                    os.remove(self.blob_path(digest))
+                except OSError:
+                    pass
+                total -= entry["size"]
+
+    def clear(self):
+        with self._lock:
+            self.entries = {}
+            shutil.rmtree(self.blob_dir, ignore_errors=True)
+            os.makedirs(self.blob_dir, exist_ok=True)
+            self._save_index()
+
+
+def hash_file(path: str, algorithm: str = "sha256") -> str:
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(COPY_BUFFER_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,306 @@
+import hashlib
+import http.client
+import os
+import random
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from src.net.package_cache import PackageCache, COPY_BUFFER_SIZE
+from src.steam.client_manifest import ClientManifest, CLIENT_MANIFEST_NAME
+
+MAX_REDIRECTS = 5
+# 재시도할 HTTP 상태 코드 (일시적인 서버 오류 / 요청 제한)
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+def is_safe_name(name: str) -> bool:
+    """캐시 폴더 안의 파일 이름으로 쓸 수 있는 이름인지 (경로 구분자, 드라이브, '..' 없음)"""
+    return bool(name) and not any(char in name for char in "/\\:\0") and name not in (".", "..")
+
+
+class PrefetchError(Exception):
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class PrefetchResult:
+    __slots__ = ("name", "ok", "bytes", "elapsed", "attempts", "from_cache", "resumed_from", "error")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.ok = False
+        self.bytes = 0
+        self.elapsed = 0.0
+        self.attempts = 0
+        self.from_cache = False
+        self.resumed_from = 0
+        self.error = None
+
+    def __repr__(self):
+        state = "cache" if self.from_cache else ("ok" if self.ok else f"error: {self.error}")
+        return f"PrefetchResult({self.name!r}, {state}, bytes={self.bytes}, attempts={self.attempts})"
+
+
+class PrefetchSummary:
+    def __init__(self, results: list, elapsed: float):
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def downloaded_bytes(self) -> int:
+        return sum(result.bytes for result in self.results if not result.from_cache)
+
+    @property
+    def failed(self) -> list:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def cached(self) -> int:
+        return sum(1 for result in self.results if result.from_cache)
+
+    @property
+    def throughput(self) -> float:
+        """초당 다운로드 바이트"""
+        return self.downloaded_bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ConnectionPool:
+    """호스트별 keep-alive 연결을 재사용하는 간단한 연결 풀입니다."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, scheme: str, netloc: str):
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop()
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def release(self, scheme: str, netloc: str, connection):
+        with self._lock:
+            self._idle.setdefault((scheme, netloc), []).append(connection)
+
+    def close(self):
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle = {}
+
+
+class PackagePrefetcher:
+    """
+    클라이언트 매니페스트와 패키지를 Steam 실행 전에 미리 캐시에 받아 둡니다.
+    - 연결 풀을 공유하는 스레드 풀로 동시에 받으며, 호스트별 동시 연결 수를 제한합니다.
+    - 중단된 파일은 partial/ 아래에 남겨 두었다가 HTTP Range로 이어 받습니다.
+    - 일시적인 오류는 지수 백오프로 재시도하고, 받은 파일은 크기와 SHA-256을 확인합니다.
+    - cancel(threading.Event)이 설정되면 새 파일을 시작하지 않고, 받는 중인 파일은 다음 읽기에서 멈춥니다.
+    """
+
+    def __init__(self, cache: PackageCache, origin_base: str, max_workers: int = 8, per_host_limit: int = 4,
+                 retries: int = 4, backoff: float = 0.5, timeout: float = 60, logger=None,
+                 cancel: threading.Event = None):
+        self.cache = cache
+        self.origin_base = origin_base.rstrip("/")
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.retries = retries
+        self.backoff = backoff
+        self.logger = logger
+        self.cancel = cancel
+        self.partial_dir = os.path.join(cache.root, "partial")
+        self.pool = ConnectionPool(timeout)
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+        os.makedirs(self.partial_dir, exist_ok=True)
+
+    def _log(self, type, message):
+        if self.logger is not None:
+            self.logger.log(type, message)
+
+    def cache_key(self, name: str) -> str:
+        return f"{self.origin_base}/{name}"
+
+    def _cancelled(self) -> bool:
+        return self.cancel is not None and self.cancel.is_set()
+
+    def _host_slot(self, netloc: str):
+        with self._host_slots_lock:
+            return self._host_slots.setdefault(netloc, threading.BoundedSemaphore(self.per_host_limit))
+
+    def _request(self, url: str, headers: dict):
+        """리다이렉트를 따라가며 요청하고 (응답, 연결, scheme, netloc)을 반환합니다."""
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+            connection = self.pool.acquire(parts.scheme, parts.netloc)
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                raise PrefetchError(f"요청 실패: {url} ({e})")
+
+            if response.status in (301, 302, 303, 307, 308):
+                location = response.getheader("Location")
+                response.read()
+                self.pool.release(parts.scheme, parts.netloc, connection)
+                if not location:
+                    raise PrefetchError(f"Location 없는 리다이렉트: {url}", retryable=False)
+                url = urllib.parse.urljoin(url, location)
+                continue
+            return response, connection, parts.scheme, parts.netloc
+        raise PrefetchError(f"리다이렉트가 너무 많습니다: {url}", retryable=False)
+
+    def _download_once(self, url: str, part_path: str, result: PrefetchResult):
+        """part 파일에 이어 받습니다. 완료되면 전체 파일의 sha256 객체를 반환합니다."""
+        digest = hashlib.sha256()
+        offset = 0
+        if os.path.exists(part_path):
+            # 이어 받기 전에 이미 받은 부분을 해시에 반영합니다.
+            with open(part_path, "rb") as f:
+                while True:
+                    chunk = f.read(COPY_BUFFER_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    offset += len(chunk)
+
+        headers = {"Accept-Encoding": "identity"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+
+        netloc = urllib.parse.urlsplit(url).netloc
+        with self._host_slot(netloc):
+            response, connection, scheme, response_netloc = self._request(url, headers)
+            reusable = False
+            try:
+                if response.status == 416 and offset:
+                    # 이미 끝까지 받은 파일입니다.
+                    response.read()
+                    reusable = True
+                    return digest
+                if response.status in RETRY_STATUSES:
+                    raise PrefetchError(f"HTTP {response.status}: {url}")
+                if response.status not in (200, 206):
+                    raise PrefetchError(f"HTTP {response.status}: {url}", retryable=False)
+
+                mode = "ab"
+                if response.status == 200 and offset:
+                    # 서버가 Range를 무시하면 처음부터 다시 받습니다.
+                    digest = hashlib.sha256()
+                    offset = 0
+                    mode = "wb"
+                if offset:
+                    result.resumed_from = offset
+
+                content_length = response.getheader("Content-Length")
+                received = 0
+                with open(part_path, mode) as out:
+                    while True:
+                        if self._cancelled():
+                            # 받은 부분은 part 파일에 남겨 두고 다음 실행에서 이어 받습니다.
+                            raise PrefetchError(f"취소되었습니다: {url}", retryable=False)
+                        chunk = response.read(COPY_BUFFER_SIZE)
+                        if not chunk:
+                            break
+                        out.write(chunk)
+                        digest.update(chunk)
+                        received += len(chunk)
+                        result.bytes += len(chunk)
+                if content_length is not None and content_length.isdigit() and received < int(content_length):
+                    # 받은 부분은 part 파일에 남겨 두고 다음 시도에서 이어 받습니다.
+                    raise PrefetchError(f"연결이 중간에 끊겼습니다: {url} ({received}/{content_length} bytes)")
+                reusable = not response.will_close
+                return digest
+            except (OSError, http.client.HTTPException) as e:
+                raise PrefetchError(f"다운로드 중단: {url} ({e})")
+            finally:
+                if reusable:
+                    self.pool.release(scheme, response_netloc, connection)
+                else:
+                    connection.close()
+
+    def fetch(self, name: str, expected_size: int = None, expected_sha256: str = None) -> PrefetchResult:
+        """파일 하나를 캐시에 받아 둡니다. 이미 캐시에 있으면 아무것도 하지 않습니다."""
+        result = PrefetchResult(name)
+        started = time.monotonic()
+        if not is_safe_name(name):
+            # 이름은 원격 매니페스트에서 오므로, 미러와 같이 partial/ 밖을 가리키는 이름은 받지 않습니다.
+            result.error = f"잘못된 파일 이름입니다: {name!r}"
+            return result
+        key = self.cache_key(name)
+        if self.cache.lookup(key):
+            result.ok = result.from_cache = True
+            return result
+        # 같은 내용이 다른 URL로 이미 캐시되어 있으면 연결만 추가합니다.
+        if expected_sha256 and self.cache.link_key(key, expected_sha256.lower()):
+            result.ok = result.from_cache = True
+            return result
+
+        url = key
+        part_path = os.path.join(self.partial_dir, name + ".part")
+        for attempt in range(1, self.retries + 2):
+            if self._cancelled():
+                result.error = "취소되었습니다."
+                break
+            result.attempts = attempt
+            try:
+                digest = self._download_once(url, part_path, result)
+                size = os.path.getsize(part_path)
+                hexdigest = digest.hexdigest()
+                if expected_size is not None and size != expected_size:
+                    # 덜 받은 파일은 이어 받고, 더 큰 파일은 손상된 것으로 보고 처음부터 받습니다.
+                    if size > expected_size:
+                        os.remove(part_path)
+                    raise PrefetchError(f"크기 불일치: {name} (예상 {expected_size}, 실제 {size})")
+                if expected_sha256 and hexdigest != expected_sha256.lower():
+                    os.remove(part_path)
+                    raise PrefetchError(f"해시 불일치: {name}")
+                self.cache.store_file(key, part_path, hexdigest)
+                result.ok = True
+                break
+            except PrefetchError as e:
+                result.error = str(e)
+                if not e.retryable or attempt > self.retries:
+                    break
+                delay = self.backoff * (2 ** (attempt - 1)) * (0.5 + random.random())
+                self._log("WARNING", f"'{name}' 다운로드 재시도 {attempt}/{self.retries} ({delay:.1f}초 후): {e}")
+                if self.cancel is not None:
+                    self.cancel.wait(delay)
+                else:
+                    time.sleep(delay)
+
+        result.elapsed = time.monotonic() - started
+        return result
+
+    def fetch_manifest(self, name: str = CLIENT_MANIFEST_NAME) -> ClientManifest:
+        result = self.fetch(name)
+        if not result.ok:
+            raise PrefetchError(f"클라이언트 매니페스트를 받을 수 없습니다: {result.error}", retryable=False)
+        with open(self.cache.lookup(self.cache_key(name), record=False), "r", encoding="utf-8", errors="replace") as f:
+            return ClientManifest.parse(f.read())
+
+    def prefetch(self, packages) -> PrefetchSummary:
+        """패키지 목록(ClientPackage)을 동시에 받아 캐시에 넣습니다."""
+        started = time.monotonic()
+        packages = list(packages)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prefetch") as executor:
+            futures = [
+                executor.submit(self.fetch, package.download_name, package.download_size, package.download_sha2)
+                for package in packages
+            ]
+            results = [future.result() for future in futures]
+        return PrefetchSummary(results, time.monotonic() - started)
+
+    def close(self):
+        self.pool.close()
@@ -0,0 +1,536 @@
+import abc
+import collections
+import fnmatch
+import hashlib
+import os
+import select
+import stat
+import struct
+import sys
+import threading
+import time
+
+EVENT_CREATED = "created"       # 새 파일
+EVENT_MODIFIED = "modified"     # 같은 파일의 내용이 바뀜
+EVENT_REPLACED = "replaced"     # 다른 파일로 바뀜 (이름 바꾸기로 덮어쓰기, 지우고 다시 만들기)
+EVENT_DELETED = "deleted"
+EVENT_TOUCHED = "touched"       # 수정 시각/속성만 바뀌고 내용은 같음
+
+BACKEND_AUTO = "auto"
+BACKEND_INOTIFY = "inotify"
+BACKEND_WINDOWS = "windows"
+BACKEND_POLL = "poll"
+
+DEFAULT_POLL_INTERVAL = 2.0
+# 변경 알림을 쓰더라도 놓친 알림(큐 넘침 등)에 대비해 이 간격(초)마다 전체를 다시 확인합니다.
+DEFAULT_RESCAN_INTERVAL = 300.0
+# 알림을 받은 뒤 이어지는 쓰기를 한 번에 확인하기 위해 기다리는 시간 (초)
+SETTLE_DELAY = 0.05
+
+# 감시하는 파일 (Steam 루트 기준 폴더, 파일 이름 패턴). README의 위협 모델에서 정보 탈취 대상으로 든 파일입니다.
+WATCHED = (
+    ("", ("ssfn*",)),           # 장치 인증 토큰
+    ("config", ("*",)),         # loginusers.vdf, config.vdf 등 계정 설정 파일
+)
+# Steam 자신이 만들지 않는 파일이라 Steam 실행 중에도 항상 알리는 패턴
+ALWAYS_ALERT = ("ssfn*",)
+
+_HASH_CHUNK = 1 << 16
+
+
+class ArtifactState:
+    """색인에 보관하는 파일 정보 (내용은 보관하지 않고 해시만 둡니다)"""
+
+    __slots__ = ("size", "mtime_ns", "ctime_ns", "identity", "is_link", "digest")
+
+    def __init__(self, st: os.stat_result, digest: str = None):
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+        self.ctime_ns = st.st_ctime_ns
+        self.identity = (st.st_dev, st.st_ino)
+        self.is_link = stat.S_ISLNK(st.st_mode)
+        self.digest = digest
+
+    def same_signature(self, other) -> bool:
+        return (self.size, self.mtime_ns, self.ctime_ns, self.is_link) == (other.size, other.mtime_ns, other.ctime_ns, other.is_link)
+
+    def __repr__(self):
+        return f"ArtifactState(size={self.size}, mtime_ns={self.mtime_ns}, digest={self.digest and self.digest[:12]})"
+
+
+class ArtifactEvent:
+    __slots__ = ("kind", "path", "before", "after", "detected", "steam_running")
+
+    def __init__(self, kind: str, path: str, before: ArtifactState = None, after: ArtifactState = None,
+                 steam_running: bool = None):
+        self.kind = kind
+        self.path = path                    # Steam 루트 기준 상대 경로
+        self.before = before
+        self.after = after
+        self.detected = time.time()
+        self.steam_running = steam_running  # 확인하지 못했으면 None
+
+    @property
+    def content_changed(self) -> bool:
+        if self.before is None or self.after is None:
+            return True
+        return self.before.digest != self.after.digest
+
+    @property
+    def unexpected(self) -> bool:
+        """
+        Steam이 실행 중이 아닐 때의 변경, 또는 Steam이 스스로 만들지 않는 파일(ssfn*)의 생성/교체/변경.
+        Steam은 실행 중에 config.vdf, loginusers.vdf를 직접 다시 씁니다.
+        """
+        if self.kind == EVENT_TOUCHED:
+            return False
+        if self.steam_running is not True:
+            return True
+        name = os.path.basename(self.path)
+        return any(fnmatch.fnmatch(name, pattern) for pattern in ALWAYS_ALERT)
+
+    def __repr__(self):
+        return f"ArtifactEvent({self.kind}, {self.path}, unexpected={self.unexpected})"
+
+
+def file_digest(path: str) -> str:
+    """파일 내용의 sha256. 내용은 해시 계산에만 쓰고 보관하거나 복사하지 않습니다."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ChangeBackend(abc.ABC):
+    """
+    감시 폴더의 변경 알림을 기다리는 방법.
+    wait()는 {폴더 절대 경로: 바뀐 파일 이름 set (모르면 None)}, 제한 시간이 지나면 {}, 무엇이 바뀌었는지 모르면 None을 반환합니다.
+    """
+
+    name = "backend"
+
+    def watch(self, directories):
+        """directories(절대 경로)를 감시합니다. 이미 감시 중인 폴더는 그대로 둡니다."""
+
+    @abc.abstractmethod
+    def wait(self, timeout: float):
+        """변경 알림을 timeout초까지 기다립니다. 반환값은 위와 같습니다."""
+
+    def wake(self):
+        """wait()를 바로 끝냅니다. (다른 스레드에서 호출)"""
+
+    def close(self):
+        pass
+
+
+class PollingBackend(ChangeBackend):
+    """알림 없이 interval초마다 모든 폴더를 다시 확인합니다. (stat만 사용)"""
+
+    name = BACKEND_POLL
+
+    def __init__(self, interval: float = DEFAULT_POLL_INTERVAL):
+        self.interval = interval
+        self._wake = threading.Event()
+
+    def wait(self, timeout: float):
+        if self._wake.wait(min(self.interval, timeout)):
+            self._wake.clear()
+            return {}
+        return None
+
+    def wake(self):
+        self._wake.set()
+
+
+class InotifyBackend(ChangeBackend):
+    """Linux inotify (ctypes로 libc 직접 호출). 대기 중에는 select()에서 잠들어 CPU를 쓰지 않습니다."""
+
+    name = BACKEND_INOTIFY
+
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_MOVE_SELF = 0x800
+    IN_MODIFY = 0x002
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            | IN_DELETE_SELF | IN_MOVE_SELF)
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        self.ctypes = ctypes
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify를 사용할 수 없습니다.")
+        self.fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self._wake_read, self._wake_write = os.pipe()
+        self.watches = {}   # wd -> 폴더
+
+    def watch(self, directories):
+        watched = set(self.watches.values())
+        for directory in directories:
+            if directory in watched or not os.path.isdir(directory):
+                continue
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+            if wd < 0:
+                raise OSError(self.ctypes.get_errno(), f"inotify_add_watch 실패: {directory}")
+            self.watches[wd] = directory
+
+    def _read_events(self, changed: dict) -> bool:
+        """쌓인 이벤트를 changed에 모읍니다. 큐가 넘쳐 놓친 이벤트가 있으면 False"""
+        complete = True
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return complete
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & self.IN_Q_OVERFLOW:
+                    complete = False
+                    continue
+                directory = self.watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & self.IN_IGNORED:
+                    # 폴더가 지워지거나 옮겨졌습니다. 다시 생기면 watch()가 새로 등록합니다.
+                    del self.watches[wd]
+                    changed[directory] = None
+                elif name and changed.get(directory, set()) is not None:
+                    changed.setdefault(directory, set()).add(name)
+                else:
+                    changed[directory] = None
+
+    def wait(self, timeout: float):
+        readable, _, _ = select.select([self.fd, self._wake_read], [], [], timeout)
+        if self._wake_read in readable:
+            os.read(self._wake_read, 512)
+            return {}
+        if not readable:
+            return {}
+        # 이어지는 쓰기(IN_MODIFY 여러 번)를 한 번에 처리합니다.
+        time.sleep(SETTLE_DELAY)
+        changed = {}
+        return changed if self._read_events(changed) else None
+
+    def wake(self):
+        os.write(self._wake_write, b"\0")
+
+    def close(self):
+        for fd in (self.fd, self._wake_read, self._wake_write):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class WindowsChangeBackend(ChangeBackend):
+    """
+    Windows FindFirstChangeNotificationW. 폴더마다 알림 핸들 하나를 두고 WaitForMultipleObjects로 잠들어 기다립니다.
+    알림에는 파일 이름이 없으므로 알림이 온 폴더만 다시 확인합니다.
+    """
+
+    name = BACKEND_WINDOWS
+
+    FILE_NOTIFY_CHANGE_FILE_NAME = 0x01
+    FILE_NOTIFY_CHANGE_DIR_NAME = 0x02
+    FILE_NOTIFY_CHANGE_ATTRIBUTES = 0x04
+    FILE_NOTIFY_CHANGE_SIZE = 0x08
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x10
+    FILTER = (FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_DIR_NAME | FILE_NOTIFY_CHANGE_ATTRIBUTES
+              | FILE_NOTIFY_CHANGE_SIZE | FILE_NOTIFY_CHANGE_LAST_WRITE)
+    WAIT_OBJECT_0 = 0
+    WAIT_TIMEOUT = 0x102
+    WAIT_FAILED = 0xFFFFFFFF
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        self.ctypes = ctypes
+        self.wintypes = wintypes
+        self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self.kernel32.FindFirstChangeNotificationW.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+        self.kernel32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        self.kernel32.FindNextChangeNotification.argtypes = [wintypes.HANDLE]
+        self.kernel32.FindCloseChangeNotification.argtypes = [wintypes.HANDLE]
+        self.kernel32.CreateEventW.argtypes = [ctypes.c_void_p, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+        self.kernel32.CreateEventW.restype = wintypes.HANDLE
+        self.kernel32.SetEvent.argtypes = [wintypes.HANDLE]
+        self.kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self.kernel32.WaitForMultipleObjects.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD]
+        self.kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+        self.kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        self.kernel32.WaitForSingleObject.restype = wintypes.DWORD
+        self._wake_event = self.kernel32.CreateEventW(None, False, False, None)
+        if not self._wake_event:
+            raise OSError(ctypes.get_last_error(), "CreateEventW 실패")
+        self.handles = {}   # 폴더 -> 알림 핸들
+
+    def watch(self, directories):
+        invalid = self.ctypes.c_void_p(-1).value
+        for directory in directories:
+            if directory in self.handles or not os.path.isdir(directory):
+                continue
+            handle = self.kernel32.FindFirstChangeNotificationW(directory, False, self.FILTER)
+            if handle in (None, invalid):
+                raise OSError(self.ctypes.get_last_error(), f"FindFirstChangeNotificationW 실패: {directory}")
+            self.handles[directory] = handle
+
+    def _forget(self, directory: str):
+        self.kernel32.FindCloseChangeNotification(self.handles.pop(directory))
+
+    def wait(self, timeout: float):
+        directories = list(self.handles)
+        handles = [self.handles[directory] for directory in directories] + [self._wake_event]
+        array = (self.wintypes.HANDLE * len(handles))(*handles)
+        result = self.kernel32.WaitForMultipleObjects(len(handles), array, False, int(timeout * 1000))
+        if result == self.WAIT_TIMEOUT or result == self.WAIT_OBJECT_0 + len(directories):
+            return {}
+        if result == self.WAIT_FAILED or result >= len(directories):
+            raise OSError(self.ctypes.get_last_error(), "WaitForMultipleObjects 실패")
+        time.sleep(SETTLE_DELAY)
+        # 알림이 온 폴더와, 그 사이 알림이 쌓인 다른 폴더를 모두 다시 확인합니다.
+        changed = {}
+        for index, directory in enumerate(directories):
+            if index != result and self.kernel32.WaitForSingleObject(handles[index], 0) != self.WAIT_OBJECT_0:
+                continue
+            changed[directory] = None
+            if not self.kernel32.FindNextChangeNotification(self.handles[directory]):
+                # 폴더가 지워졌습니다. 다시 생기면 watch()가 새로 등록합니다.
+                self._forget(directory)
+        return changed
+
+    def wake(self):
+        self.kernel32.SetEvent(self._wake_event)
+
+    def close(self):
+        for directory in list(self.handles):
+            self._forget(directory)
+        self.kernel32.CloseHandle(self._wake_event)
+
+
+def create_backend(kind: str = BACKEND_AUTO, poll_interval: float = DEFAULT_POLL_INTERVAL) -> ChangeBackend:
+    """
+    변경 알림 백엔드를 만듭니다. auto이면 Linux는 inotify, Windows는 FindFirstChangeNotification을 쓰고,
+    사용할 수 없으면 stat 폴링으로 대신합니다.
+    """
+    if kind == BACKEND_POLL:
+        return PollingBackend(poll_interval)
+    if kind == BACKEND_INOTIFY:
+        return InotifyBackend()
+    if kind == BACKEND_WINDOWS:
+        return WindowsChangeBackend()
+    if kind != BACKEND_AUTO:
+        raise ValueError(f"알 수 없는 감시 방식: {kind}")
+    try:
+        if os.name == "nt":
+            return WindowsChangeBackend()
+        if sys.platform.startswith("linux"):
+            return InotifyBackend()
+    except OSError:
+        pass
+    return PollingBackend(poll_interval)
+
+
+class ArtifactMonitor:
+    """
+    Steam 루트의 민감한 파일(ssfn*, config/*)을 메모리 색인(크기, 수정 시각, 파일 식별자, sha256)으로 유지하고
+    생성/변경/교체/삭제를 on_event로 알립니다. 파일을 읽는 것은 해시 계산뿐이며 내용을 복사하거나 보관하지 않습니다.
+    - 변경 알림 백엔드가 알린 폴더만 stat으로 다시 확인하고, 크기/시각이 바뀐 파일만 해시를 다시 계산합니다.
+    - 대기 중에는 백엔드 안에서 잠들고, rescan_interval마다 한 번 전체를 확인합니다.
+    - process_table을 주면 변경이 있을 때만 Steam 실행 여부를 확인해 이벤트에 남깁니다.
+    """
+
+    def __init__(self, steam_path: str, backend: ChangeBackend = None, process_table=None, on_event=None,
+                 rescan_interval: float = DEFAULT_RESCAN_INTERVAL, watched=WATCHED, history: int = 1000):
+        self.steam_path = os.path.abspath(steam_path)
+        self.backend = backend or create_backend()
+        self.process_table = process_table
+        self.on_event = on_event
+        self.rescan_interval = rescan_interval
+        self.watched = tuple(watched)
+        self.index = {}     # 상대 경로 -> ArtifactState
+        self.events = collections.deque(maxlen=history)
+        self.scans = 0
+        self.hashed = 0
+        self._directories = {os.path.join(self.steam_path, folder) if folder else self.steam_path: (folder, patterns)
+                             for folder, patterns in self.watched}
+        self._subfolders = {folder for folder, _ in self.watched if folder}
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_full_scan = 0.0
+
+    def _steam_running(self):
+        if self.process_table is None:
+            return None
+        from src.util.process_supervisor import STEAM_PROCESS_NAMES
+        try:
+            return bool(self.process_table.match(STEAM_PROCESS_NAMES, include_children=False))
+        except OSError:
+            return None
+
+    def _list(self, directory: str, folder: str, patterns) -> dict:
+        """폴더에서 패턴에 맞는 파일 {상대 경로: lstat 결과}. 폴더가 없으면 {}"""
+        found = {}
+        try:
+            entries = list(os.scandir(directory))
+        except (FileNotFoundError, NotADirectoryError):
+            return found
+        for entry in entries:
+            if not any(fnmatch.fnmatch(entry.name.lower(), pattern) for pattern in patterns):
+                continue
+            try:
+                # Windows의 DirEntry.stat()에는 파일 식별자가 없으므로 os.lstat으로 다시 읽습니다.
+                st = os.lstat(entry.path)
+            except FileNotFoundError:
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                continue
+            found[os.path.join(folder, entry.name) if folder else entry.name] = st
+        return found
+
+    def _digest(self, relative: str, st: os.stat_result):
+        if stat.S_ISLNK(st.st_mode):
+            return "link:" + os.readlink(os.path.join(self.steam_path, relative))
+        try:
+            self.hashed += 1
+            return file_digest(os.path.join(self.steam_path, relative))
+        except OSError:
+            # 다른 프로그램이 잠근 파일 (Windows). 다음 확인에서 다시 시도합니다.
+            return None
+
+    def _compare(self, relative: str, st: os.stat_result, report: bool):
+        after = ArtifactState(st)
+        before = self.index.get(relative)
+        if (before is not None and before.identity == after.identity and before.same_signature(after)
+                and before.digest is not None):
+            return None
+        after.digest = self._digest(relative, st)
+        self.index[relative] = after
+        if not report:
+            return None
+        if before is None:
+            return EVENT_CREATED, before, after
+        if before.identity != after.identity:
+            return EVENT_REPLACED, before, after
+        if before.digest != after.digest:
+            return EVENT_MODIFIED, before, after
+        return EVENT_TOUCHED, before, after
+
+    def scan(self, directories=None, report: bool = True) -> list:
+        """
+        directories(절대 경로, None이면 전체)를 다시 확인해 색인을 갱신하고 이벤트 목록을 반환합니다.
+        report=False이면 이벤트 없이 색인만 만듭니다. (처음 시작할 때)
+        """
+        self.scans += 1
+        changes = []
+        for directory, (folder, patterns) in self._directories.items():
+            if directories is not None and directory not in directories:
+                continue
+            current = self._list(directory, folder, patterns)
+            for relative, st in current.items():
+                change = self._compare(relative, st, report)
+                if change is not None:
+                    changes.append((relative, change))
+            for relative in [path for path in self.index
+                             if os.path.dirname(path) == folder and path not in current]:
+                before = self.index.pop(relative)
+                if report:
+                    changes.append((relative, (EVENT_DELETED, before, None)))
+        self.backend.watch([directory for directory in self._directories if os.path.isdir(directory)])
+        if not changes:
+            return []
+
+        steam_running = self._steam_running()
+        events = [ArtifactEvent(kind, relative, before, after, steam_running)
+                  for relative, (kind, before, after) in changes]
+        for event in events:
+            self.events.append(event)
+            if self.on_event is not None:
+                self.on_event(event)
+        return events
+
+    def _relevant(self, changed: dict):
+        """알림 결과에서 다시 확인할 폴더. 감시 패턴과 관계없는 파일만 바뀌었으면 빈 set"""
+        directories = set()
+        for directory, names in changed.items():
+            watched = self._directories.get(directory)
+            if watched is None:
+                continue
+            _, patterns = watched
+            if names is None or any(fnmatch.fnmatch(name.lower(), pattern) for name in names for pattern in patterns):
+                directories.add(directory)
+            if directory == self.steam_path:
+                # 감시하는 하위 폴더(config)가 새로 생기거나 바뀌면 알림을 등록하기 전에 생긴 파일도 확인합니다.
+                folders = self._subfolders if names is None else names & self._subfolders
+                directories.update(os.path.join(self.steam_path, folder) for folder in folders)
+        return directories
+
+    def run(self, duration: float = None):
+        """stop()이 호출되거나 duration초가 지날 때까지 변경을 감시합니다."""
+        deadline = None if duration is None else time.monotonic() + duration
+        if not self._last_full_scan:
+            self.scan(report=False)
+            self._last_full_scan = time.monotonic()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+            timeout = self._last_full_scan + self.rescan_interval - now
+            if deadline is not None:
+                timeout = min(timeout, deadline - now)
+            changed = self.backend.wait(max(0.0, timeout))
+            if self._stop.is_set():
+                break
+            if changed is None or time.monotonic() >= self._last_full_scan + self.rescan_interval:
+                self.scan()
+                self._last_full_scan = time.monotonic()
+            elif changed:
+                directories = self._relevant(changed)
+                if directories:
+                    self.scan(directories)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            if not self._last_full_scan:
+                self.scan(report=False)
+                self._last_full_scan = time.monotonic()
+            self._thread = threading.Thread(target=self.run, name="artifact-watch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.backend.wake()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        self.backend.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,296 @@
+import mmap
+import os
+import struct
+
+# 바이너리 KeyValues 값 타입
+TYPE_NODE = 0x00
+TYPE_STRING = 0x01
+TYPE_INT32 = 0x02
+TYPE_FLOAT32 = 0x03
+TYPE_POINTER = 0x04
+TYPE_WSTRING = 0x05
+TYPE_COLOR = 0x06
+TYPE_UINT64 = 0x07
+TYPE_END = 0x08
+TYPE_INT64 = 0x0A
+TYPE_END_ALT = 0x0B
+
+_FIXED_SIZES = {
+    TYPE_INT32: 4,
+    TYPE_FLOAT32: 4,
+    TYPE_POINTER: 4,
+    TYPE_COLOR: 4,
+    TYPE_UINT64: 8,
+    TYPE_INT64: 8,
+}
+
+_STRUCTS = {
+    TYPE_INT32: struct.Struct("<i"),
+    TYPE_FLOAT32: struct.Struct("<f"),
+    TYPE_POINTER: struct.Struct("<I"),
+    TYPE_COLOR: struct.Struct("<I"),
+    TYPE_UINT64: struct.Struct("<Q"),
+    TYPE_INT64: struct.Struct("<q"),
+}
+
+_UINT32 = struct.Struct("<I")
+
+# appcache/packageinfo.vdf 헤더 매직 값
+PACKAGEINFO_MAGIC_27 = 0x06565527
+PACKAGEINFO_MAGIC_28 = 0x06565528
+
+
+class BinaryVdfError(ValueError):
+    pass
+
+
+def _read_cstring(data, offset: int):
+    end = data.find(b"\x00", offset)
+    if end < 0:
+        raise BinaryVdfError(f"바이너리 VDF 오류: 위치 {offset}의 문자열이 끝나지 않았습니다.")
+    return bytes(data[offset:end]).decode("utf-8", errors="replace"), end + 1
+
+
+def _wstring_end(data, offset: int) -> int:
+    end = offset
+    while True:
+        end = data.find(b"\x00\x00", end)
+        if end < 0:
+            raise BinaryVdfError(f"바이너리 VDF 오류: 위치 {offset}의 UTF-16 문자열이 끝나지 않았습니다.")
+        if (end - offset) % 2 == 0:
+            return end
+        end += 1
+
+
+def _skip_value(data, value_type: int, offset: int) -> int:
+    """값을 해석하지 않고 다음 항목의 오프셋만 계산합니다."""
+    if value_type == TYPE_NODE:
+        return _skip_node(data, offset)
+    if value_type == TYPE_STRING:
+        end = data.find(b"\x00", offset)
+        if end < 0:
+            raise BinaryVdfError(f"바이너리 VDF 오류: 위치 {offset}의 문자열이 끝나지 않았습니다.")
+        return end + 1
+    if value_type == TYPE_WSTRING:
+        return _wstring_end(data, offset) + 2
+    size = _FIXED_SIZES.get(value_type)
+    if size is None:
+        raise BinaryVdfError(f"바이너리 VDF 오류: 위치 {offset - 1}의 알 수 없는 타입 0x{value_type:02x}")
+    return offset + size
+
+
+def _skip_node(data, offset: int) -> int:
+    length = len(data)
+    while offset < length:
+        value_type = data[offset]
+        offset += 1
+        if value_type in (TYPE_END, TYPE_END_ALT):
+            return offset
+        key_end = data.find(b"\x00", offset)
+        if key_end < 0:
+            raise BinaryVdfError(f"바이너리 VDF 오류: 위치 {offset}의 키가 끝나지 않았습니다.")
+        offset = _skip_value(data, value_type, key_end + 1)
+    raise BinaryVdfError("바이너리 VDF 오류: 노드가 끝나기 전에 파일이 끝났습니다.")
+
+
+def is_binary_kv(path: str) -> bool:
+    """파일이 바이너리 KeyValues인지 (첫 바이트가 노드 타입 0x00이고 첫 키가 NUL로 끝나는지)"""
+    with open(path, "rb") as f:
+        head = f.read(256)
+    return head[:1] == bytes((TYPE_NODE,)) and b"\x00" in head[1:]
+
+
+class BinaryKVNode:
+    """
+    바이너리 KeyValues 노드를 필요할 때만 해석하는 지연 노드입니다.
+    처음 접근할 때 한 단계의 자식만 스캔하여 key -> (타입, 값 오프셋) 인덱스를 만들고,
+    하위 노드는 건너뛰기만 하므로 전체 트리를 메모리에 올리지 않습니다.
+    같은 키가 여러 번 나오면 get()은 첫 값을, items() / get_all()은 모든 값을 반환합니다.
+    """
+
+    __slots__ = ("_data", "offset", "end", "_index", "_order")
+
+    def __init__(self, data, offset: int):
+        self._data = data
+        self.offset = offset
+        self.end = None
+        self._index = None
+        self._order = None
+
+    def _build_index(self):
+        if self._index is not None:
+            return
+        data = self._data
+        index = {}
+        order = []
+        offset = self.offset
+        length = len(data)
+        while True:
+            if offset >= length:
+                raise BinaryVdfError("바이너리 VDF 오류: 노드가 끝나기 전에 파일이 끝났습니다.")
+            value_type = data[offset]
+            offset += 1
+            if value_type in (TYPE_END, TYPE_END_ALT):
+                break
+            key, value_offset = _read_cstring(data, offset)
+            offset = _skip_value(data, value_type, value_offset)
+            index.setdefault(key.lower(), (value_type, value_offset))
+            order.append((key, value_type, value_offset))
+        self.end = offset
+        self._index = index
+        self._order = order
+
+    def keys(self):
+        self._build_index()
+        return [key for key, _, _ in self._order]
+
+    def __contains__(self, key: str) -> bool:
+        self._build_index()
+        return key.lower() in self._index
+
+    def __len__(self) -> int:
+        self._build_index()
+        return len(self._order)
+
+    def _decode(self, value_type: int, offset: int):
+        data = self._data
+        if value_type == TYPE_NODE:
+            return BinaryKVNode(data, offset)
+        if value_type == TYPE_STRING:
+            return _read_cstring(data, offset)[0]
+        if value_type == TYPE_WSTRING:
+            end = _wstring_end(data, offset)
+            return bytes(data[offset:end]).decode("utf-16-le", errors="replace")
+        return _STRUCTS[value_type].unpack_from(data, offset)[0]
+
+    def get(self, key: str, default=None):
+        self._build_index()
+        entry = self._index.get(key.lower())
+        if entry is None:
+            return default
+        return self._decode(*entry)
+
+    def __getitem__(self, key: str):
+        self._build_index()
+        entry = self._index.get(key.lower())
+        if entry is None:
+            raise KeyError(key)
+        return self._decode(*entry)
+
+    def find(self, path: str, default=None):
+        """'a/b/c' 형태의 경로로 하위 값을 찾습니다."""
+        node = self
+        for part in path.split("/"):
+            if not isinstance(node, BinaryKVNode):
+                return default
+            node = node.get(part)
+            if node is None:
+                return default
+        return node
+
+    def get_all(self, key: str) -> list:
+        """같은 키가 여러 번 나오면 모든 값을 순서대로 반환합니다."""
+        self._build_index()
+        key = key.lower()
+        return [self._decode(value_type, offset) for name, value_type, offset in self._order if name.lower() == key]
+
+    def items(self):
+        """(키, 값)을 파일 순서대로 반환합니다. 같은 키가 여러 번 나오면 각각의 값을 그대로 반환합니다."""
+        self._build_index()
+        for key, value_type, offset in self._order:
+            yield key, self._decode(value_type, offset)
+
+    def to_dict(self) -> dict:
+        """전체 하위 트리를 dict로 변환합니다. (디버깅/내보내기 용도)"""
+        result = {}
+        for key, value in self.items():
+            # 같은 키가 여러 번 나오면 get()과 같이 첫 값을 남깁니다.
+            result.setdefault(key, value.to_dict() if isinstance(value, BinaryKVNode) else value)
+        return result
+
+
+class BinaryVdfFile:
+    """바이너리 KeyValues 파일을 mmap으로 열어 지연 해석합니다."""
+
+    def __init__(self, path: str, offset: int = 0):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            # 빈 파일은 mmap할 수 없으므로 빈 bytes로 대체합니다.
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        except Exception:
+            self._file.close()
+            raise
+        self.root = BinaryKVNode(self.data, offset)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class PackageInfoFile(BinaryVdfFile):
+    """
+    appcache/packageinfo.vdf 리더입니다.
+    열 때 패키지 헤더만 스캔하여 package id -> KV 오프셋 인덱스를 만들고,
+    각 패키지의 KeyValues는 조회할 때 해석합니다.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        data = self.data
+        if len(data) < 8:
+            self.close()
+            raise BinaryVdfError(f"'{path}'는 올바른 packageinfo.vdf 파일이 아닙니다.")
+        magic, self.universe = struct.unpack_from("<II", data, 0)
+        if magic not in (PACKAGEINFO_MAGIC_27, PACKAGEINFO_MAGIC_28):
+            self.close()
+            raise BinaryVdfError(f"'{path}'의 packageinfo 매직 값을 인식할 수 없습니다: 0x{magic:08x}")
+        self.magic = magic
+        self.index = {}
+        try:
+            self._build_index()
+        except BinaryVdfError:
+            self.close()
+            raise
+
+    def _build_index(self):
+        data = self.data
+        # 패키지 헤더: package id, sha1(20), change number, (28부터) PICS 토큰(8)
+        header_size = 24 + (8 if self.magic == PACKAGEINFO_MAGIC_28 else 0)
+        offset = 8
+        length = len(data)
+        while offset + 4 <= length:
+            package_id = _UINT32.unpack_from(data, offset)[0]
+            offset += 4
+            if package_id == 0xFFFFFFFF:
+                break
+            if offset + header_size > length:
+                raise BinaryVdfError(f"'{self.path}'의 패키지 {package_id} 헤더가 잘렸습니다.")
+            sha1 = bytes(data[offset:offset + 20])
+            change_number = _UINT32.unpack_from(data, offset + 20)[0]
+            offset += header_size
+            self.index[package_id] = (change_number, sha1, offset)
+            offset = _skip_node(data, offset)
+
+    def package_ids(self):
+        return list(self.index)
+
+    def change_number(self, package_id: int):
+        entry = self.index.get(package_id)
+        return entry[0] if entry else None
+
+    def get(self, package_id: int):
+        entry = self.index.get(package_id)
+        if entry is None:
+            return None
+        # 각 패키지의 KV는 "<package id>" 하위 노드 하나로 감싸져 있습니다.
+        wrapper = BinaryKVNode(self.data, entry[2])
+        return wrapper.get(str(package_id), wrapper)
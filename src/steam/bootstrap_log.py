@@ -0,0 +1,224 @@
+import collections
+import os
+import re
+import threading
+import time
+
+BOOTSTRAP_LOG_NAME = "bootstrap_log.txt"
+
+EVENT_MANIFEST_REQUEST = "manifest_request"     # 매니페스트 다운로드 시작 (url)
+EVENT_MANIFEST = "manifest"                     # 매니페스트 받음 (version이 있을 수도 있음)
+EVENT_PACKAGE = "package"                       # 패키지 N / M (index, count, name)
+EVENT_BYTES = "bytes"                           # 받은 양 / 전체 (done, total 바이트)
+EVENT_VERIFY = "verify"                         # 설치 파일 검사
+EVENT_INSTALL = "install"                       # 압축 풀기 / 설치
+EVENT_UPDATE_DETECTED = "update_detected"       # Steam이 스스로 최신 버전으로 업데이트하려 함
+EVENT_ERROR = "error"
+EVENT_EXIT = "exit"
+
+# 타임스탬프 접두사: [2023-05-31 10:00:00]
+_PREFIX = re.compile(r"^\[(?P<time>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]\s*")
+
+
+def _kb(value: str) -> int:
+    return int(value.replace(",", "")) * 1024
+
+
+# (이벤트 종류, 정규식, 필드 변환) - 위에서부터 처음 일치하는 규칙을 사용합니다.
+PATTERNS = [
+    (EVENT_MANIFEST_REQUEST, re.compile(r"Downloading manifest:?\s*(?P<url>\S+)", re.I), {}),
+    (EVENT_MANIFEST, re.compile(r"Downloaded new manifest(?:.*?version\D*(?P<version>\d+))?", re.I), {}),
+    (EVENT_MANIFEST, re.compile(r"Manifest version:?\s*(?P<version>\d+)", re.I), {}),
+    (EVENT_PACKAGE, re.compile(r"Downloading package (?P<index>\d+) of (?P<count>\d+)(?::\s*(?P<name>\S+))?", re.I),
+     {"index": int, "count": int}),
+    (EVENT_BYTES, re.compile(r"Downloading update \((?P<done>[\d,]+) of (?P<total>[\d,]+) KB\)", re.I),
+     {"done": _kb, "total": _kb}),
+    (EVENT_UPDATE_DETECTED, re.compile(r"Update available|needs to be updated|Downloading update for", re.I), {}),
+    (EVENT_VERIFY, re.compile(r"Verifying installation|Verification complete", re.I), {}),
+    (EVENT_INSTALL, re.compile(r"Extracting package|Installing update", re.I), {}),
+    (EVENT_EXIT, re.compile(r"Shutdown|Update complete, launching|Exiting", re.I), {}),
+    (EVENT_ERROR, re.compile(r"\b(?:error|failed|failure)\b", re.I), {}),
+]
+
+
+def get_bootstrap_log_path(steam_path: str) -> str:
+    return os.path.join(steam_path, "logs", BOOTSTRAP_LOG_NAME)
+
+
+class BootstrapEvent:
+    __slots__ = ("kind", "fields", "line", "logged_at", "received")
+
+    def __init__(self, kind: str, fields: dict, line: str, logged_at: str = None):
+        self.kind = kind
+        self.fields = fields
+        self.line = line
+        self.logged_at = logged_at
+        self.received = time.monotonic()
+
+    def __repr__(self):
+        return f"BootstrapEvent({self.kind}, {self.fields})"
+
+
+def parse_line(line: str):
+    """bootstrap_log 한 줄을 이벤트로 바꿉니다. 관심 없는 줄이면 None"""
+    line = line.rstrip("\r\n")
+    logged_at = None
+    match = _PREFIX.match(line)
+    if match:
+        logged_at = match.group("time")
+        line = line[match.end():]
+    for kind, pattern, converters in PATTERNS:
+        match = pattern.search(line)
+        if match:
+            fields = {key: value for key, value in match.groupdict().items() if value is not None}
+            for key, convert in converters.items():
+                if key in fields:
+                    fields[key] = convert(fields[key])
+            return BootstrapEvent(kind, fields, line, logged_at)
+    return None
+
+
+class LogTail:
+    """
+    파일에 새로 추가된 줄만 읽습니다. (tail -F)
+    - 처음에는 파일 끝에서 시작해 이전 실행의 기록은 건너뜁니다.
+    - 파일이 줄어들거나(잘림) 다른 파일로 바뀌면(교체) 처음부터 다시 읽습니다.
+    - 줄 끝이 아직 쓰이지 않은 마지막 줄은 다음 읽기까지 보관합니다.
+    """
+
+    def __init__(self, path: str, from_start: bool = False):
+        self.path = path
+        self.offset = 0
+        self.identity = None
+        self._partial = b""
+        if not from_start and os.path.exists(path):
+            stat = os.stat(path)
+            self.offset = stat.st_size
+            self.identity = (stat.st_dev, stat.st_ino)
+
+    def read_lines(self) -> list:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        identity = (stat.st_dev, stat.st_ino)
+        if identity != self.identity or stat.st_size < self.offset:
+            self.identity = identity
+            self.offset = 0
+            self._partial = b""
+        if stat.st_size == self.offset:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+        self.offset += len(data)
+        data = self._partial + data
+        lines = data.split(b"\n")
+        self._partial = lines.pop()
+        return [line.decode("utf-8", errors="replace") for line in lines]
+
+
+class DownloadProgress:
+    """이벤트에서 모은 진행 상황과 최근 구간의 처리량"""
+
+    def __init__(self, window: float = 5.0):
+        self.window = window
+        self.manifest_version = None
+        self.package_index = 0
+        self.package_count = 0
+        self.bytes_done = 0
+        self.bytes_total = 0
+        self._samples = collections.deque()     # (시각, 누적 바이트)
+        self._completed = 0                      # 끝난 업데이트 묶음들의 바이트 합
+
+    def update(self, event: BootstrapEvent):
+        if event.kind == EVENT_MANIFEST and "version" in event.fields:
+            self.manifest_version = event.fields["version"]
+        elif event.kind == EVENT_PACKAGE:
+            self.package_index = event.fields["index"]
+            self.package_count = event.fields["count"]
+        elif event.kind == EVENT_BYTES:
+            done, total = event.fields["done"], event.fields["total"]
+            if done < self.bytes_done - self._completed:
+                # 다음 묶음의 진행 표시가 0부터 다시 시작합니다.
+                self._completed = self.bytes_done
+            self.bytes_done = self._completed + done
+            self.bytes_total = self._completed + total
+            self._samples.append((event.received, self.bytes_done))
+            while self._samples and event.received - self._samples[0][0] > self.window:
+                self._samples.popleft()
+
+    @property
+    def throughput(self) -> float:
+        """최근 window초 동안의 초당 바이트"""
+        if len(self._samples) < 2:
+            return 0.0
+        (start, start_bytes), (end, end_bytes) = self._samples[0], self._samples[-1]
+        return (end_bytes - start_bytes) / (end - start) if end > start else 0.0
+
+
+class BootstrapLogWatcher:
+    """
+    Steam의 logs/bootstrap_log.txt를 백그라운드에서 따라 읽어 이벤트를 on_event로 전달합니다.
+    expected_url을 주면 다른 주소에서 매니페스트를 받기 시작하는 것(Steam 자체 업데이트)을 update_detected로 알립니다.
+    """
+
+    def __init__(self, log_path: str, on_event=None, expected_url: str = None, poll_interval: float = 0.1):
+        self.tail = LogTail(log_path)
+        self.on_event = on_event
+        self.expected_url = expected_url.rstrip("/") if expected_url else None
+        self.poll_interval = poll_interval
+        self.progress = DownloadProgress()
+        self.events = []
+        self.update_detected = threading.Event()
+        self.exited = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _classify(self, event: BootstrapEvent) -> BootstrapEvent:
+        if (event.kind == EVENT_MANIFEST_REQUEST and self.expected_url
+                and not event.fields.get("url", "").startswith(self.expected_url)):
+            return BootstrapEvent(EVENT_UPDATE_DETECTED, dict(event.fields, reason="manifest_url"), event.line, event.logged_at)
+        return event
+
+    def poll(self) -> list:
+        """새 줄을 읽어 이벤트를 처리하고 반환합니다. (스레드 없이 직접 호출해도 됩니다)"""
+        events = []
+        for line in self.tail.read_lines():
+            event = parse_line(line)
+            if event is None:
+                continue
+            event = self._classify(event)
+            self.progress.update(event)
+            self.events.append(event)
+            events.append(event)
+            if event.kind == EVENT_UPDATE_DETECTED:
+                self.update_detected.set()
+            elif event.kind == EVENT_EXIT:
+                self.exited.set()
+            if self.on_event is not None:
+                self.on_event(event)
+        return events
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            self.poll()
+        self.poll()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="bootstrap-log", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,289 @@
+import calendar
+import json
+import sqlite3
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from src.steam.client_manifest import CLIENT_MANIFEST_NAME, ClientManifest
+
+MANIFEST_URL = f"media.steampowered.com/client/{CLIENT_MANIFEST_NAME}"
+# web.archive.org CDX 검색 API와 원본 그대로(id_) 스냅샷 주소
+DEFAULT_CDX_URL = "http://web.archive.org/cdx/search/cdx"
+DEFAULT_SNAPSHOT_URL = "http://web.archive.org/web/{timestamp}id_/{original}"
+FETCH_TIMEOUT = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    timestamp TEXT PRIMARY KEY,
+    epoch INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    original TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_epoch ON snapshots (epoch);
+CREATE INDEX IF NOT EXISTS snapshots_digest ON snapshots (digest);
+CREATE TABLE IF NOT EXISTS manifests (
+    digest TEXT PRIMARY KEY,
+    build TEXT,
+    package_count INTEGER,
+    total_bytes INTEGER,
+    error TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS manifests_build ON manifests (build);
+"""
+
+
+def normalize_timestamp(value) -> str:
+    """'20230531', '2023-05-31', '20230531000000' 등을 14자리 Wayback 시각으로 바꿉니다. 형식이 틀리면 ValueError"""
+    digits = "".join(ch for ch in str(value) if ch.isdigit())
+    if len(digits) < 4 or len(digits) > 14:
+        raise ValueError(f"잘못된 날짜입니다: {value}")
+    # 빠진 월/일은 01, 시/분/초는 00으로 채웁니다.
+    padded = digits + "0101000000"[len(digits) - 4:] if len(digits) < 14 else digits
+    try:
+        time.strptime(padded, "%Y%m%d%H%M%S")
+    except ValueError:
+        raise ValueError(f"잘못된 날짜입니다: {value}") from None
+    return padded
+
+
+def timestamp_epoch(timestamp: str) -> int:
+    return calendar.timegm(time.strptime(normalize_timestamp(timestamp), "%Y%m%d%H%M%S"))
+
+
+class CatalogEntry:
+    __slots__ = ("timestamp", "digest", "build", "package_count", "total_bytes", "error")
+
+    def __init__(self, timestamp: str, digest: str, build: str = None, package_count: int = None,
+                 total_bytes: int = None, error: str = None):
+        self.timestamp = timestamp
+        self.digest = digest
+        self.build = build
+        self.package_count = package_count
+        self.total_bytes = total_bytes
+        self.error = error
+
+    @property
+    def date(self) -> str:
+        t = self.timestamp
+        return f"{t[0:4]}-{t[4:6]}-{t[6:8]} {t[8:10]}:{t[10:12]}:{t[12:14]}"
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"CatalogEntry({self.timestamp}, build={self.build}, packages={self.package_count}, bytes={self.total_bytes})"
+
+
+class IngestReport:
+    def __init__(self):
+        self.listed = 0
+        self.new_snapshots = 0
+        self.fetched = 0
+        self.failed = []        # [(digest, 오류)]
+        self.elapsed = 0.0
+
+    def __repr__(self):
+        return (f"IngestReport(listed={self.listed}, new={self.new_snapshots}, fetched={self.fetched}, "
+                f"failed={len(self.failed)}, elapsed={self.elapsed:.2f}s)")
+
+
+def parse_cdx(text: str) -> list:
+    """
+    CDX 목록을 [{"timestamp", "original", "statuscode", "digest"}]로 바꿉니다.
+    output=json(첫 행이 필드 이름인 배열)과 기본 텍스트 형식(공백으로 나눈 urlkey timestamp original mimetype statuscode digest length)을 모두 읽습니다.
+    """
+    text = text.strip()
+    if not text:
+        return []
+    if text.startswith("["):
+        rows = json.loads(text)
+        if not rows:
+            return []
+        header, rows = rows[0], rows[1:]
+    else:
+        header = ["urlkey", "timestamp", "original", "mimetype", "statuscode", "digest", "length"]
+        rows = [line.split() for line in text.splitlines() if line.strip()]
+    records = []
+    for row in rows:
+        record = dict(zip(header, row))
+        if "timestamp" in record and "digest" in record:
+            records.append(record)
+    return records
+
+
+class BuildCatalog:
+    """
+    Wayback 스냅샷 시각 -> 클라이언트 매니페스트(빌드 번호, 패키지 수, 전체 크기) 색인 (SQLite)
+    - 같은 내용(digest)의 스냅샷은 매니페스트를 한 번만 받습니다.
+    - 날짜/빌드 조회는 색인만 사용하므로 네트워크 없이 바로 답합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_snapshots(self, records) -> int:
+        """CDX 레코드를 추가하고 새로 추가된 수를 반환합니다. 200 응답이 아닌 스냅샷은 건너뜁니다."""
+        rows = []
+        for record in records:
+            status = record.get("statuscode", "200")
+            if status not in ("200", "-"):
+                continue
+            timestamp = normalize_timestamp(record["timestamp"])
+            rows.append((timestamp, timestamp_epoch(timestamp), record["digest"], record.get("original") or MANIFEST_URL))
+        with self._lock, self._db:
+            before = self._db.total_changes
+            self._db.executemany("INSERT OR IGNORE INTO snapshots VALUES (?, ?, ?, ?)", rows)
+            return self._db.total_changes - before
+
+    def pending_digests(self, retry_failed: bool = False) -> list:
+        """매니페스트를 아직 받지 않은 digest와 그 digest의 가장 이른 스냅샷 [(digest, timestamp, original)]"""
+        condition = "m.digest IS NULL" + (" OR m.build IS NULL" if retry_failed else "")
+        with self._lock:
+            return self._db.execute(
+                f"SELECT s.digest, MIN(s.timestamp), s.original FROM snapshots s "
+                f"LEFT JOIN manifests m ON m.digest = s.digest WHERE {condition} GROUP BY s.digest").fetchall()
+
+    def record_manifest(self, digest: str, manifest: ClientManifest = None, error: str = None):
+        row = (digest, manifest.version if manifest else None, len(manifest.packages) if manifest else None,
+               manifest.total_size if manifest else None, error, time.time())
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO manifests VALUES (?, ?, ?, ?, ?, ?)", row)
+
+    def _entry(self, row) -> CatalogEntry:
+        return CatalogEntry(*row) if row else None
+
+    _SELECT = ("SELECT s.timestamp, s.digest, m.build, m.package_count, m.total_bytes, m.error "
+               "FROM snapshots s LEFT JOIN manifests m ON m.digest = s.digest")
+
+    def entries(self) -> list:
+        with self._lock:
+            return [self._entry(row) for row in self._db.execute(f"{self._SELECT} ORDER BY s.epoch")]
+
+    def resolve(self, date) -> CatalogEntry:
+        """
+        날짜에 가장 가까운 스냅샷 (web.archive.org가 그 날짜 주소를 받으면 연결하는 스냅샷과 같은 규칙).
+        빌드를 알고 있는 스냅샷만 봅니다. 없으면 None
+        """
+        epoch = timestamp_epoch(date)
+        known = f"{self._SELECT} WHERE m.build IS NOT NULL AND "
+        with self._lock:
+            before = self._db.execute(f"{known} s.epoch <= ? ORDER BY s.epoch DESC LIMIT 1", (epoch,)).fetchone()
+            after = self._db.execute(f"{known} s.epoch >= ? ORDER BY s.epoch ASC LIMIT 1", (epoch,)).fetchone()
+        candidates = [row for row in (before, after) if row]
+        if not candidates:
+            return None
+        return self._entry(min(candidates, key=lambda row: abs(timestamp_epoch(row[0]) - epoch)))
+
+    def build_at(self, date) -> CatalogEntry:
+        """그 날짜 또는 그 이전의 가장 최근 스냅샷 (그 날짜에 배포 중이던 빌드)"""
+        with self._lock:
+            row = self._db.execute(f"{self._SELECT} WHERE m.build IS NOT NULL AND s.epoch <= ? "
+                                   f"ORDER BY s.epoch DESC LIMIT 1", (timestamp_epoch(date),)).fetchone()
+        return self._entry(row)
+
+    def snapshots_of(self, build: str) -> list:
+        """build가 담긴 스냅샷 목록 (오래된 순). downgrade_wayback_date로 쓸 수 있는 날짜들입니다."""
+        with self._lock:
+            rows = self._db.execute(f"{self._SELECT} WHERE m.build = ? ORDER BY s.epoch", (str(build),)).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def nearest_build(self, build: str) -> CatalogEntry:
+        """
+        빌드 번호가 build와 가장 가까운 빌드의 첫 스냅샷. (Steam 빌드 번호는 빌드 시각의 Unix 시간입니다)
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT build FROM manifests WHERE build IS NOT NULL "
+                "ORDER BY ABS(CAST(build AS INTEGER) - ?) LIMIT 1", (int(build),)).fetchone()
+        if row is None:
+            return None
+        snapshots = self.snapshots_of(row[0])
+        return snapshots[0] if snapshots else None
+
+    def builds(self) -> list:
+        """[(빌드, 패키지 수, 전체 크기, 첫 스냅샷, 마지막 스냅샷, 스냅샷 수)] (빌드 번호 순)"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT m.build, m.package_count, m.total_bytes, MIN(s.timestamp), MAX(s.timestamp), COUNT(*) "
+                "FROM manifests m JOIN snapshots s ON s.digest = m.digest WHERE m.build IS NOT NULL "
+                "GROUP BY m.build ORDER BY CAST(m.build AS INTEGER)").fetchall()
+
+
+class CatalogIngester:
+    """CDX 목록을 받아 새 스냅샷을 카탈로그에 넣고, 아직 모르는 매니페스트만 동시에 받아 기록합니다."""
+
+    def __init__(self, catalog: BuildCatalog, cdx_url: str = DEFAULT_CDX_URL, snapshot_url: str = DEFAULT_SNAPSHOT_URL,
+                 max_workers: int = 4, timeout: float = FETCH_TIMEOUT):
+        self.catalog = catalog
+        self.cdx_url = cdx_url
+        self.snapshot_url = snapshot_url
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    def _get(self, url: str) -> bytes:
+        request = urllib.request.Request(url, headers={"User-Agent": "steam-downgrader-catalog"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def listing_url(self, date_from: str = None, date_to: str = None) -> str:
+        # collapse=digest를 쓰면 같은 매니페스트가 이어진 구간의 첫 스냅샷만 남아, 구간 끝 근처 날짜를
+        # web.archive.org처럼 가장 가까운 스냅샷으로 연결할 수 없습니다. 매니페스트는 digest마다 한 번만 받으므로
+        # 모든 스냅샷을 받아 둡니다.
+        query = {"url": MANIFEST_URL, "output": "json", "filter": "statuscode:200"}
+        if date_from:
+            query["from"] = normalize_timestamp(date_from)
+        if date_to:
+            query["to"] = normalize_timestamp(date_to)
+        separator = "&" if "?" in self.cdx_url else "?"
+        return f"{self.cdx_url}{separator}{urllib.parse.urlencode(query)}"
+
+    def _fetch_manifest(self, digest: str, timestamp: str, original: str):
+        url = self.snapshot_url.format(timestamp=timestamp, original=original)
+        try:
+            manifest = ClientManifest.parse(self._get(url).decode("utf-8", errors="replace"))
+            if not manifest.version:
+                raise ValueError("매니페스트에 version이 없습니다.")
+            self.catalog.record_manifest(digest, manifest)
+            return None
+        except Exception as e:
+            self.catalog.record_manifest(digest, error=str(e))
+            return str(e)
+
+    def ingest_listing(self, text: str, retry_failed: bool = False) -> IngestReport:
+        started = time.monotonic()
+        report = IngestReport()
+        records = parse_cdx(text)
+        report.listed = len(records)
+        report.new_snapshots = self.catalog.add_snapshots(records)
+
+        pending = self.catalog.pending_digests(retry_failed)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="catalog") as executor:
+            errors = list(executor.map(lambda row: self._fetch_manifest(*row), pending))
+        for (digest, _, _), error in zip(pending, errors):
+            if error is None:
+                report.fetched += 1
+            else:
+                report.failed.append((digest, error))
+        report.elapsed = time.monotonic() - started
+        return report
+
+    def update(self, date_from: str = None, date_to: str = None, retry_failed: bool = False) -> IngestReport:
+        """CDX 목록을 받아 카탈로그를 갱신합니다. 이미 아는 digest의 매니페스트는 다시 받지 않습니다."""
+        text = self._get(self.listing_url(date_from, date_to)).decode("utf-8", errors="replace")
+        return self.ingest_listing(text, retry_failed)
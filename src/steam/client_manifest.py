@@ -0,0 +1,133 @@
+import os
+import re
+from src.steam import vdf
+from src.steam.binary_vdf import BinaryKVNode, BinaryVdfFile, is_binary_kv
+
+_VZ_SIZE_RE = re.compile(r"_(\d+)$")
+
+# Steam 클라이언트 패키지 매니페스트 이름 (Windows 클라이언트 기준)
+CLIENT_MANIFEST_NAME = "steam_client_win32"
+
+
+class ClientPackage:
+    """매니페스트에 기록된 클라이언트 패키지 하나의 정보"""
+
+    __slots__ = ("name", "file", "size", "sha2", "zipvz", "sha2vz", "is_bootstrapper")
+
+    def __init__(self, name: str, file: str, size: int, sha2: str, zipvz: str = None, sha2vz: str = None, is_bootstrapper: bool = False):
+        self.name = name
+        self.file = file
+        self.size = size
+        self.sha2 = sha2
+        self.zipvz = zipvz
+        self.sha2vz = sha2vz
+        self.is_bootstrapper = is_bootstrapper
+
+    @property
+    def download_name(self) -> str:
+        """서버에서 받아야 하는 파일 이름 (압축본이 있으면 압축본)"""
+        return self.zipvz or self.file
+
+    @property
+    def download_size(self):
+        """받을 파일의 크기. 압축본은 이름 끝의 _<크기>에서 읽으며, 알 수 없으면 None"""
+        if self.zipvz:
+            match = _VZ_SIZE_RE.search(self.zipvz)
+            return int(match.group(1)) if match else None
+        return self.size or None
+
+    @property
+    def download_sha2(self):
+        return self.sha2vz if self.zipvz else self.sha2
+
+    def __repr__(self):
+        return f"ClientPackage({self.name!r}, {self.file!r}, size={self.size})"
+
+
+class ClientManifest:
+    """steam_client_win32 매니페스트 (텍스트 VDF)"""
+
+    def __init__(self, version: str, packages: dict):
+        self.version = version
+        self.packages = packages
+
+    @property
+    def total_size(self) -> int:
+        return sum(package.size for package in self.packages.values())
+
+    @classmethod
+    def from_document(cls, document):
+        # 최상위 노드 이름은 플랫폼 이름("win32")입니다.
+        root = next((node for _, node in document.children()), None)
+        if root is None:
+            raise ValueError("클라이언트 매니페스트에 플랫폼 노드가 없습니다.")
+
+        packages = {}
+        for name, node in root.children():
+            file = node.get("file")
+            if not isinstance(file, str):
+                continue
+            size = node.get("size", "0")
+            packages[name] = ClientPackage(
+                name=name,
+                file=file,
+                size=int(size) if str(size).isdigit() else 0,
+                sha2=node.get("sha2"),
+                zipvz=node.get("zipvz"),
+                sha2vz=node.get("sha2vz"),
+                is_bootstrapper=node.get("IsBootstrapperPackage") == "1",
+            )
+        return cls(root.get("version"), packages)
+
+    @classmethod
+    def parse(cls, text: str):
+        return cls.from_document(vdf.loads(text))
+
+    @classmethod
+    def load(cls, path: str):
+        return cls.from_document(vdf.load_file(path))
+
+
+def get_installed_manifest_path(steam_path: str) -> str:
+    return os.path.join(steam_path, "package", f"{CLIENT_MANIFEST_NAME}.manifest")
+
+
+def _read_binary_manifest_version(path: str):
+    """바이너리 KeyValues 매니페스트의 <플랫폼>/version. 다른 패키지 노드는 해석하지 않습니다."""
+    with BinaryVdfFile(path) as manifest:
+        root = next((node for _, node in manifest.root.items() if isinstance(node, BinaryKVNode)), None)
+        return root.get("version") if root is not None else None
+
+
+def get_installed_client_version(steam_path: str):
+    """
+    설치된 클라이언트의 빌드 번호를 반환합니다. 확인할 수 없으면 None을 반환합니다.
+    Steam을 실행하지 않고 package/ 폴더의 매니페스트에서 "version" 값만 읽습니다.
+    매니페스트가 바이너리 KeyValues로 저장되어 있으면 binary_vdf로 필요한 노드만 해석합니다.
+    """
+    manifest_path = get_installed_manifest_path(steam_path)
+    if os.path.isfile(manifest_path):
+        try:
+            if is_binary_kv(manifest_path):
+                version = _read_binary_manifest_version(manifest_path)
+            else:
+                with open(manifest_path, "r", encoding="utf-8", newline="") as f:
+                    document = vdf.load(f)
+                root = next((node for _, node in document.children()), None)
+                version = root.get("version") if root is not None else None
+            if version:
+                return str(version)
+        except (OSError, ValueError):
+            pass
+
+    # 매니페스트가 없으면 부트스트래퍼가 남기는 .installed 파일을 확인합니다.
+    installed_path = os.path.join(steam_path, "package", f"{CLIENT_MANIFEST_NAME}.installed")
+    if os.path.isfile(installed_path):
+        try:
+            with open(installed_path, "r", encoding="utf-8", errors="ignore") as f:
+                version = f.read().strip()
+            if version:
+                return version
+        except OSError:
+            pass
+    return None
@@ -0,0 +1,379 @@
+import json
+import lzma
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.net.package_cache import hash_file
+from src.steam.client_manifest import ClientManifest, get_installed_manifest_path
+from src.steam.integrity import IntegrityError, read_package_entries
+from src.steam.ssfn_slots import clone_file
+
+OBJECTS_DIR = "objects"
+BUILDS_DIR = "builds"
+INDEX_NAME = "objects.json"
+STATE_NAME = "state.json"
+
+
+def _relative_to_native(root: str, relative_path: str) -> str:
+    return os.path.join(root, *relative_path.split("/"))
+
+
+def _same_file(stat_a, stat_b) -> bool:
+    return (stat_a.st_dev, stat_a.st_ino) == (stat_b.st_dev, stat_b.st_ino)
+
+
+class BuildRecord:
+    """저장소에 보관한 클라이언트 빌드 하나의 파일 목록 (상대 경로 -> (sha256, 크기))"""
+
+    def __init__(self, build: str, files: dict, label: str = None, created: float = None, stats: dict = None):
+        self.build = build
+        self.files = files
+        self.label = label
+        self.created = created or time.time()
+        # 스냅샷할 때 본 Steam 루트 파일의 (크기, 수정 시각, inode). 그대로면 다음 스냅샷에서 다시 해시하지 않습니다.
+        self.stats = stats or {}
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(size for _, size in self.files.values())
+
+    def to_dict(self) -> dict:
+        return {"build": self.build, "label": self.label, "created": self.created,
+                "files": {path: [digest, size] for path, (digest, size) in self.files.items()},
+                "stats": self.stats}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        files = {path: (entry[0], entry[1]) for path, entry in data.get("files", {}).items()}
+        return cls(data["build"], files, data.get("label"), data.get("created"), data.get("stats"))
+
+    def __repr__(self):
+        return f"BuildRecord({self.build!r}, files={len(self.files)}, label={self.label!r})"
+
+
+class StoreReport:
+    """스냅샷/전환 한 번의 결과. bytes_added는 저장소가 실제로 새로 차지한 용량입니다."""
+
+    def __init__(self, build: str):
+        self.build = build
+        self.linked = 0          # 스냅샷: 저장소에 새로 넣은 파일 수, 전환: Steam 루트에 새로 놓은 파일 수
+        self.unchanged = 0       # 이미 같은 파일이라 건드리지 않은 파일 수
+        self.removed = 0         # 대상 빌드에 없어 지운 파일 수
+        self.copied = 0          # 복제(reflink)를 쓸 수 없어 전체를 복사한 파일 수
+        self.bytes_linked = 0
+        self.bytes_added = 0
+        self.errors = []         # (상대 경로, 오류)
+        self.elapsed = 0.0
+
+    @property
+    def touched(self) -> int:
+        return self.linked + self.removed
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def __repr__(self):
+        return (f"StoreReport({self.build!r}, linked={self.linked}, unchanged={self.unchanged}, removed={self.removed}, "
+                f"copied={self.copied}, added={self.bytes_added}, errors={len(self.errors)}, elapsed={self.elapsed:.3f}s)")
+
+
+class ClientStore:
+    """
+    빌드별 클라이언트 파일 목록을 내용 해시(SHA-256)로 저장하는 로컬 저장소입니다.
+    - objects/<앞 2자리>/<sha256>: 같은 내용의 파일은 모든 빌드가 하나를 공유합니다.
+    - builds/<빌드>.json: 빌드의 상대 경로 -> (sha256, 크기)
+    스냅샷은 저장소에 없는 내용만 복제(reflink, 안 되면 복사)해 넣습니다. Steam이 파일을 제자리에서 덮어써도
+    저장된 빌드가 망가지지 않아야 하므로 스냅샷에는 하드링크를 쓰지 않습니다.
+    전환도 같은 이유로 저장소 파일을 Steam 루트에 복제(안 되면 복사)한 뒤 os.replace로 바꿉니다. 놓은 파일의
+    (크기, 수정 시각, inode)를 빌드 기록에 남겨 두고 그대로인 파일은 건드리지 않으므로 전환 비용은 달라진 파일 수에
+    비례합니다. 객체마다 (크기, 수정 시각)을 기록해 두고, 객체 자체가 바뀌었으면 버리고 다음 스냅샷에서 다시 가져옵니다.
+    """
+
+    def __init__(self, root: str, max_workers: int = None):
+        self.root = root
+        self.objects_dir = os.path.join(root, OBJECTS_DIR)
+        self.builds_dir = os.path.join(root, BUILDS_DIR)
+        self.index_path = os.path.join(root, INDEX_NAME)
+        self.state_path = os.path.join(root, STATE_NAME)
+        self.max_workers = max_workers or min(8, os.cpu_count() or 4)
+        self._lock = threading.RLock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.builds_dir, exist_ok=True)
+        self.objects = self._read_json(self.index_path).get("objects", {})  # sha256 -> [크기, mtime_ns]
+        self.state = self._read_json(self.state_path)                       # Steam 루트 -> 활성 빌드
+
+    @staticmethod
+    def _read_json(path: str) -> dict:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_json(self, path: str, data: dict):
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp.", dir=self.root)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+
+    def _save(self):
+        with self._lock:
+            self._write_json(self.index_path, {"objects": self.objects})
+            self._write_json(self.state_path, self.state)
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    @staticmethod
+    def _root_key(steam_path: str) -> str:
+        return os.path.normcase(os.path.abspath(steam_path))
+
+    # --- 빌드 목록 ---
+
+    def build_path(self, build: str) -> str:
+        return os.path.join(self.builds_dir, f"{build}.json")
+
+    def builds(self) -> dict:
+        records = {}
+        for entry in os.scandir(self.builds_dir):
+            if entry.name.endswith(".json"):
+                data = self._read_json(entry.path)
+                if data.get("build"):
+                    records[data["build"]] = BuildRecord.from_dict(data)
+        return records
+
+    def get(self, build: str):
+        data = self._read_json(self.build_path(build))
+        return BuildRecord.from_dict(data) if data.get("build") else None
+
+    def has(self, build: str) -> bool:
+        return bool(build) and os.path.isfile(self.build_path(build))
+
+    def active_build(self, steam_path: str):
+        return self.state.get(self._root_key(steam_path))
+
+    def disk_usage(self) -> tuple:
+        """(저장소가 실제로 차지하는 바이트, 모든 빌드 크기의 합)"""
+        with self._lock:
+            stored = sum(entry[0] for entry in self.objects.values())
+        logical = sum(record.total_bytes for record in self.builds().values())
+        return stored, logical
+
+    # --- 객체 ---
+
+    def _object_valid(self, digest: str):
+        """객체 파일의 stat. 없거나 기록과 다르면(제자리 수정) None"""
+        entry = self.objects.get(digest)
+        try:
+            stat = os.stat(self.object_path(digest))
+        except OSError:
+            return None
+        if entry is None or stat.st_size != entry[0] or stat.st_mtime_ns != entry[1]:
+            return None
+        return stat
+
+    def _import(self, digest: str, source_path: str, report: StoreReport):
+        """source 파일을 객체로 넣습니다. 파일 시스템이 복제를 지원하지 않으면 복사합니다."""
+        object_path = self.object_path(digest)
+        with self._lock:
+            if self._object_valid(digest) is not None:
+                return
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=".incoming.", dir=self.root)
+            os.close(fd)
+            os.remove(temp_path)
+            try:
+                clone_file(source_path, temp_path)
+            except (OSError, ImportError):
+                shutil.copyfile(source_path, temp_path)
+                report.copied += 1
+            os.replace(temp_path, object_path)
+            stat = os.stat(object_path)
+            self.objects[digest] = [stat.st_size, stat.st_mtime_ns]
+            report.bytes_added += stat.st_size
+
+    # --- 스냅샷 ---
+
+    def installed_files(self, steam_path: str) -> tuple:
+        """
+        설치된 매니페스트 기준 클라이언트 파일의 (상대 경로 목록, 매니페스트 버전).
+        매니페스트 자체, package/ 안의 패키지 파일, 각 패키지에 들어 있는 파일이 대상입니다.
+        """
+        manifest_path = get_installed_manifest_path(steam_path)
+        manifest = ClientManifest.load(manifest_path)
+        package_dir = os.path.join(steam_path, "package")
+        paths = {"package/" + os.path.basename(manifest_path)}
+        for package in manifest.packages.values():
+            path = os.path.join(package_dir, package.download_name)
+            if not os.path.isfile(path):
+                continue
+            paths.add(f"package/{package.download_name}")
+            try:
+                paths.update(read_package_entries(path))
+            except (OSError, IntegrityError, lzma.LZMAError):
+                pass
+        return sorted(paths), manifest.version
+
+    def snapshot(self, steam_path: str, build: str = None, label: str = None) -> StoreReport:
+        """
+        Steam 루트의 현재 클라이언트 파일을 빌드로 저장합니다. build를 주지 않으면 설치된 매니페스트의 버전을 씁니다.
+        저장소 객체와 같은 inode이거나 지난 스냅샷 때와 (크기, 수정 시각, inode)가 같은 파일은 다시 해시하지 않습니다.
+        """
+        started = time.perf_counter()
+        paths, version = self.installed_files(steam_path)
+        build = build or version
+        if not build:
+            raise ValueError("설치된 매니페스트에 버전이 없어 빌드 이름을 정할 수 없습니다.")
+        report = StoreReport(build)
+        previous = self.get(build) or self.get(self.active_build(steam_path) or "")
+
+        def fingerprint(relative_path: str):
+            full_path = _relative_to_native(steam_path, relative_path)
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                return relative_path, None, None, None
+            signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+            known = previous.files.get(relative_path) if previous else None
+            if known is not None:
+                if previous.stats.get(relative_path) == signature:
+                    return relative_path, known[0], stat.st_size, signature
+                object_stat = self._object_valid(known[0])
+                if object_stat is not None and _same_file(stat, object_stat):
+                    return relative_path, known[0], stat.st_size, signature
+            return relative_path, hash_file(full_path), stat.st_size, signature
+
+        files = {}
+        stats = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="client-store") as executor:
+            for relative_path, digest, size, signature in executor.map(fingerprint, paths):
+                if digest is None:
+                    continue
+                files[relative_path] = (digest, size)
+                stats[relative_path] = signature
+
+        for relative_path, (digest, size) in files.items():
+            try:
+                if self._object_valid(digest) is not None:
+                    report.unchanged += 1
+                    continue
+                self._import(digest, _relative_to_native(steam_path, relative_path), report)
+                report.linked += 1
+                report.bytes_linked += size
+            except OSError as e:
+                report.errors.append((relative_path, str(e)))
+
+        # 이미 있는 빌드를 다시 저장할 때는 처음 붙인 이름(예: pre-downgrade)을 유지합니다.
+        existing = self.get(build)
+        record = BuildRecord(build, files, existing.label if existing and existing.label else label, stats=stats)
+        with self._lock:
+            self._write_json(self.build_path(build), record.to_dict())
+            self.state[self._root_key(steam_path)] = build
+            self._save()
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    # --- 전환 ---
+
+    def switch(self, steam_path: str, build: str) -> StoreReport:
+        """
+        Steam 루트의 클라이언트 파일을 저장된 build로 바꿉니다.
+        저장소 객체와 같은 inode이거나 마지막으로 놓았을 때와 (크기, 수정 시각, inode)가 같은 파일은 건드리지 않고,
+        현재 빌드에만 있는 파일은 지웁니다.
+        현재 빌드를 모르면 (스냅샷 없이 설치된 경우) 지우는 파일 없이 대상 파일만 연결합니다.
+        """
+        started = time.perf_counter()
+        target = self.get(build)
+        if target is None:
+            raise KeyError(f"저장소에 빌드가 없습니다: {build}")
+        report = StoreReport(build)
+        current_build = self.active_build(steam_path)
+        current = self.get(current_build) if current_build and current_build != build else None
+
+        # 전환 중 다른 파일에 앞서 매니페스트를 바꾸면, 중간에 실패했을 때 설치 상태를 잘못 믿게 되므로 마지막에 바꿉니다.
+        manifest_path = "package/" + os.path.basename(get_installed_manifest_path(steam_path))
+        ordered = sorted(target.files.items(), key=lambda item: item[0] == manifest_path)
+
+        def placed(relative_path: str, digest: str, signature: list) -> bool:
+            """이 파일을 지난번에 놓은 그대로인지 (대상 빌드나 현재 빌드가 같은 내용으로 기록한 서명과 같은지)"""
+            for record in (target, current):
+                if record is not None and record.files.get(relative_path, (None,))[0] == digest \
+                        and record.stats.get(relative_path) == signature:
+                    return True
+            return False
+
+        for relative_path, (digest, size) in ordered:
+            object_stat = self._object_valid(digest)
+            if object_stat is None:
+                report.errors.append((relative_path, "저장소 객체가 없거나 변경되었습니다."))
+                continue
+            full_path = _relative_to_native(steam_path, relative_path)
+            try:
+                stat = os.stat(full_path)
+                signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+                if _same_file(stat, object_stat) or placed(relative_path, digest, signature):
+                    target.stats[relative_path] = signature
+                    report.unchanged += 1
+                    continue
+            except OSError:
+                pass
+            try:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                temp_path = f"{full_path}.{os.getpid()}.switch"
+                if os.path.lexists(temp_path):
+                    os.remove(temp_path)
+                # 하드링크는 Steam이 파일을 제자리에서 고칠 때 저장소 객체까지 바꾸므로 쓰지 않습니다.
+                try:
+                    clone_file(self.object_path(digest), temp_path)
+                except (OSError, ImportError):
+                    shutil.copyfile(self.object_path(digest), temp_path)
+                    report.copied += 1
+                os.replace(temp_path, full_path)
+                stat = os.stat(full_path)
+                target.stats[relative_path] = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+                report.linked += 1
+                report.bytes_linked += size
+            except OSError as e:
+                report.errors.append((relative_path, str(e)))
+
+        if current is not None:
+            for relative_path in current.files.keys() - target.files.keys():
+                try:
+                    os.remove(_relative_to_native(steam_path, relative_path))
+                    report.removed += 1
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    report.errors.append((relative_path, str(e)))
+
+        with self._lock:
+            self._write_json(self.build_path(build), target.to_dict())
+            if report.ok:
+                self.state[self._root_key(steam_path)] = build
+            self._save()
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def remove_build(self, build: str):
+        """빌드 기록을 지우고, 다른 빌드가 쓰지 않는 객체를 정리합니다."""
+        with self._lock:
+            try:
+                os.remove(self.build_path(build))
+            except FileNotFoundError:
+                return
+            referenced = set()
+            for record in self.builds().values():
+                referenced.update(digest for digest, _ in record.files.values())
+            for digest in list(self.objects):
+                if digest not in referenced:
+                    try:
+                        os.remove(self.object_path(digest))
+                    except OSError:
+                        pass
+                    del self.objects[digest]
+            self.state = {root: active for root, active in self.state.items() if active != build}
+            self._save()
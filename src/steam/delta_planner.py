@@ -0,0 +1,173 @@
+import os
+from src.steam.client_manifest import ClientManifest, get_installed_manifest_path
+
+# 계획에서 각 패키지에 대한 처리
+ACTION_KEEP = "keep"        # 설치된 것과 같음 -> 받지 않음
+ACTION_REUSE = "reuse"      # 같은 내용의 파일이 package/ 에 있음 -> 로컬 파일을 캐시에 넣음
+ACTION_FETCH = "fetch"      # 새로 받아야 함
+
+
+class InstalledPackageIndex:
+    """
+    Steam 루트의 package/ 폴더 상태를 조회용 해시 인덱스로 만든 것입니다.
+    - by_name: 설치된 매니페스트의 패키지 이름 -> ClientPackage
+    - by_digest: 받은 파일의 SHA-256 -> package/ 안의 파일 경로 (파일이 실제로 있는 것만)
+    - files: package/ 안의 파일 이름 -> 크기
+    """
+
+    def __init__(self, manifest: ClientManifest, package_dir: str, files: dict):
+        self.manifest = manifest
+        self.package_dir = package_dir
+        self.files = files
+        self.by_name = dict(manifest.packages) if manifest else {}
+        self.by_digest = {}
+        for package in self.by_name.values():
+            digest = package.download_sha2
+            if digest and self.has_file(package):
+                self.by_digest.setdefault(digest.lower(), os.path.join(package_dir, package.download_name))
+
+    @property
+    def version(self):
+        return self.manifest.version if self.manifest else None
+
+    def has_file(self, package) -> bool:
+        size = self.files.get(package.download_name)
+        if size is None:
+            return False
+        expected = package.download_size
+        return expected is None or size == expected
+
+    @classmethod
+    def scan(cls, steam_path: str):
+        package_dir = os.path.join(steam_path, "package")
+        files = {}
+        try:
+            with os.scandir(package_dir) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        files[entry.name] = entry.stat().st_size
+        except OSError:
+            pass
+
+        manifest = None
+        manifest_path = get_installed_manifest_path(steam_path)
+        if os.path.isfile(manifest_path):
+            try:
+                manifest = ClientManifest.load(manifest_path)
+            except (OSError, ValueError):
+                manifest = None
+        return cls(manifest, package_dir, files)
+
+
+class PackageDelta:
+    __slots__ = ("package", "action", "local_path")
+
+    def __init__(self, package, action: str, local_path: str = None):
+        self.package = package
+        self.action = action
+        self.local_path = local_path
+
+    def __repr__(self):
+        return f"PackageDelta({self.package.name!r}, {self.action})"
+
+
+class DeltaPlan:
+    """대상 매니페스트와 설치 상태를 비교한 결과"""
+
+    def __init__(self, target_version, installed_version, deltas: list, removed: list):
+        self.target_version = target_version
+        self.installed_version = installed_version
+        self.deltas = deltas
+        self.removed = removed      # 설치되어 있지만 대상 매니페스트에는 없는 패키지 이름
+
+    def _select(self, *actions) -> list:
+        return [delta for delta in self.deltas if delta.action in actions]
+
+    @property
+    def keep(self) -> list:
+        return self._select(ACTION_KEEP)
+
+    @property
+    def reuse(self) -> list:
+        return self._select(ACTION_REUSE)
+
+    @property
+    def fetch(self) -> list:
+        return [delta.package for delta in self._select(ACTION_FETCH)]
+
+    @property
+    def local(self) -> list:
+        """로컬 파일로 대신할 수 있는 패키지 (keep + reuse)"""
+        return self._select(ACTION_KEEP, ACTION_REUSE)
+
+    @property
+    def fetch_bytes(self) -> int:
+        return sum(package.download_size or 0 for package in self.fetch)
+
+    @property
+    def local_bytes(self) -> int:
+        return sum(delta.package.download_size or 0 for delta in self.local)
+
+    @property
+    def is_noop(self) -> bool:
+        """이미 대상 빌드가 설치되어 있어 받을 것도 바꿀 것도 없는지 여부"""
+        return (self.target_version is not None and self.target_version == self.installed_version
+                and not self.fetch and not self.reuse and not self.removed)
+
+    def __repr__(self):
+        return (f"DeltaPlan({self.installed_version} -> {self.target_version}, keep={len(self.keep)}, "
+                f"reuse={len(self.reuse)}, fetch={len(self.fetch)}, removed={len(self.removed)})")
+
+
+class DeltaPlanner:
+    """
+    대상 클라이언트 매니페스트와 설치된 package/ 상태를 비교하여 최소한의 받을 목록을 만듭니다.
+    양쪽을 이름/해시 인덱스로 만들어 두므로 비교는 패키지 수에 비례합니다.
+    """
+
+    def __init__(self, steam_path: str):
+        self.steam_path = steam_path
+
+    def plan(self, target: ClientManifest, installed: InstalledPackageIndex = None) -> DeltaPlan:
+        if installed is None:
+            installed = InstalledPackageIndex.scan(self.steam_path)
+
+        deltas = []
+        for name, package in target.packages.items():
+            digest = (package.download_sha2 or "").lower()
+            current = installed.by_name.get(name)
+            if (current is not None and digest and (current.download_sha2 or "").lower() == digest
+                    and current.download_name == package.download_name and installed.has_file(package)):
+                deltas.append(PackageDelta(package, ACTION_KEEP, os.path.join(installed.package_dir, package.download_name)))
+                continue
+            local_path = installed.by_digest.get(digest) if digest else None
+            if local_path is not None:
+                deltas.append(PackageDelta(package, ACTION_REUSE, local_path))
+            else:
+                deltas.append(PackageDelta(package, ACTION_FETCH))
+
+        removed = [name for name in installed.by_name if name not in target.packages]
+        return DeltaPlan(target.version, installed.version, deltas, removed)
+
+
+def seed_cache(plan: DeltaPlan, cache, cache_key) -> tuple:
+    """
+    로컬에 있는 패키지 파일을 캐시에 넣어 미러가 원본 대신 디스크에서 제공하도록 합니다.
+    cache_key는 패키지 이름을 캐시 key로 바꾸는 함수입니다. (넣은 개수, 실패한 PackageDelta 목록)을 반환합니다.
+    """
+    seeded = 0
+    failed = []
+    for delta in plan.local:
+        package = delta.package
+        key = cache_key(package.download_name)
+        if cache.lookup(key, record=False):
+            seeded += 1
+            continue
+        if cache.import_file(key, delta.local_path, package.download_sha2.lower()):
+            seeded += 1
+        else:
+            # 로컬 파일이 매니페스트와 다르면 원본에서 받도록 합니다.
+            delta.action = ACTION_FETCH
+            delta.local_path = None
+            failed.append(delta)
+    return seeded, failed
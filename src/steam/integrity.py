@@ -0,0 +1,369 @@
+import hashlib
+import json
+import lzma
+import os
+import struct
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from src.net.package_cache import COPY_BUFFER_SIZE
+from src.steam.client_manifest import ClientManifest
+
+# .zip.vz 압축 헤더/푸터 ("VZa" + 4바이트, LZMA 속성 5바이트 ... crc32, 크기, "zv")
+VZ_MAGIC = b"VZa"
+VZ_HEADER_SIZE = 7
+VZ_FOOTER_SIZE = 10
+# Zstandard 프레임 시작 바이트. 2025년부터 클라이언트 패키지가 Zstandard로 압축됩니다.
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# 패키지 파일 형식 (파일 앞부분으로 구분)
+FORMAT_ZIP = "zip"
+FORMAT_VZ = "vz"
+FORMAT_ZSTD = "zstd"
+# 압축 해제한 zip을 메모리에 둘 최대 크기. 넘으면 임시 파일로 옮깁니다.
+SPOOL_MAX_SIZE = 64 * 1024 * 1024
+# 패키지를 만들 때 섞여 들어간 임시 파일. 설치하거나 검사하지 않습니다.
+TEMP_FILE_SUFFIXES = (".tmp", ".temp", ".part", ".partial", "~")
+TEMP_FILE_PREFIXES = ("~$", ".~")
+
+
+class IntegrityError(ValueError):
+    pass
+
+
+def _open_vz(path: str):
+    """.zip.vz 파일을 풀어 zip 파일 객체(SpooledTemporaryFile)를 반환합니다."""
+    with open(path, "rb") as f:
+        header = f.read(VZ_HEADER_SIZE + 5)
+        if len(header) < VZ_HEADER_SIZE + 5 or header[:3] != VZ_MAGIC:
+            raise IntegrityError(f"지원하지 않는 패키지 압축 형식입니다: {os.path.basename(path)}")
+        props = header[VZ_HEADER_SIZE]
+        dict_size = struct.unpack_from("<I", header, VZ_HEADER_SIZE + 1)[0]
+        lc, props = props % 9, props // 9
+        lp, pb = props % 5, props // 5
+        decompressor = lzma.LZMADecompressor(lzma.FORMAT_RAW, filters=[
+            {"id": lzma.FILTER_LZMA1, "dict_size": dict_size, "lc": lc, "lp": lp, "pb": pb},
+        ])
+
+        f.seek(-VZ_FOOTER_SIZE, os.SEEK_END)
+        footer = f.read(VZ_FOOTER_SIZE)
+        expected_crc, expected_size = struct.unpack_from("<II", footer, 0)
+        remaining = f.tell() - VZ_FOOTER_SIZE - (VZ_HEADER_SIZE + 5)
+        f.seek(VZ_HEADER_SIZE + 5)
+
+        out = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        crc = 0
+        written = 0
+        while remaining > 0 and written < expected_size:
+            chunk = f.read(min(COPY_BUFFER_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            data = decompressor.decompress(chunk, expected_size - written)
+            crc = zlib.crc32(data, crc)
+            written += len(data)
+            out.write(data)
+        if written != expected_size or crc != expected_crc:
+            out.close()
+            raise IntegrityError(f"패키지 압축 해제 결과가 올바르지 않습니다: {os.path.basename(path)}")
+    out.seek(0)
+    return out
+
+
+def zstd_decompressobj():
+    """
+    Zstandard 스트림 해제기를 만듭니다. decompress(데이터)로 조금씩 풉니다.
+    Python 3.14의 compression.zstd를 먼저 쓰고, 없으면 zstandard 모듈을 사용합니다. (선택 의존성)
+    """
+    try:
+        from compression import zstd
+        return zstd.ZstdDecompressor()
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise IntegrityError("Zstandard로 압축된 패키지를 풀려면 zstandard 모듈이 필요합니다. (pip install zstandard)")
+    return zstandard.ZstdDecompressor().decompressobj()
+
+
+def _open_zst(path: str):
+    """zip 전체를 Zstandard로 압축한 패키지를 풀어 zip 파일 객체(SpooledTemporaryFile)를 반환합니다."""
+    decompressor = zstd_decompressobj()
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(COPY_BUFFER_SIZE)
+                if not chunk:
+                    break
+                out.write(decompressor.decompress(chunk))
+    except IntegrityError:
+        out.close()
+        raise
+    except Exception as e:
+        # compression.zstd와 zstandard의 예외 종류가 달라 함께 처리합니다.
+        out.close()
+        raise IntegrityError(f"패키지 압축 해제 결과가 올바르지 않습니다: {os.path.basename(path)} ({e})") from e
+    if not getattr(decompressor, "eof", True):
+        out.close()
+        raise IntegrityError(f"패키지 압축 데이터가 중간에 끝났습니다: {os.path.basename(path)}")
+    out.seek(0)
+    return out
+
+
+def package_format(path: str) -> str:
+    """패키지 파일의 앞부분을 읽어 형식(FORMAT_ZIP / FORMAT_VZ / FORMAT_ZSTD)을 반환합니다."""
+    with open(path, "rb") as f:
+        magic = f.read(len(ZSTD_MAGIC))
+    if magic.startswith(VZ_MAGIC):
+        return FORMAT_VZ
+    if magic == ZSTD_MAGIC:
+        return FORMAT_ZSTD
+    if magic.startswith(b"PK"):
+        return FORMAT_ZIP
+    raise IntegrityError(f"지원하지 않는 패키지 압축 형식입니다: {os.path.basename(path)}")
+
+
+def open_package(path: str, package_type: str = None):
+    """패키지를 zip으로 읽을 수 있는 파일 객체로 엽니다. 압축된 패키지(.vz, Zstandard)는 먼저 풉니다."""
+    package_type = package_type or package_format(path)
+    if package_type == FORMAT_VZ:
+        return _open_vz(path)
+    if package_type == FORMAT_ZSTD:
+        return _open_zst(path)
+    return open(path, "rb")
+
+
+def is_temporary_file(path: str) -> bool:
+    """패키지 항목 경로가 임시 파일(편집기/다운로드 도구가 남긴 파일)인지"""
+    name = path.replace("\\", "/").rsplit("/", 1)[-1].lower()
+    return name.endswith(TEMP_FILE_SUFFIXES) or name.startswith(TEMP_FILE_PREFIXES)
+
+
+def read_package_entries(path: str) -> dict:
+    """패키지(.zip, .zip.vz, Zstandard)의 중앙 디렉터리에서 파일 경로 -> (크기, crc32)를 읽습니다. 임시 파일은 뺍니다."""
+    source = open_package(path)
+    try:
+        with zipfile.ZipFile(source) as archive:
+            return {
+                info.filename.replace("\\", "/"): (info.file_size, info.CRC)
+                for info in archive.infolist()
+                if not info.is_dir() and not is_temporary_file(info.filename)
+            }
+    except zipfile.BadZipFile as e:
+        raise IntegrityError(f"패키지를 zip으로 읽을 수 없습니다: {os.path.basename(path)} ({e})")
+    finally:
+        source.close()
+
+
+class ExpectedFile:
+    """검증할 파일 하나. sha256이나 crc32 중 아는 값만 비교합니다."""
+
+    __slots__ = ("path", "size", "sha256", "crc32", "package")
+
+    def __init__(self, path: str, size: int = None, sha256: str = None, crc32: int = None, package: str = None):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.crc32 = crc32
+        self.package = package
+
+
+class DigestCache:
+    """
+    (경로, 크기, 수정 시각) -> (sha256, crc32) 캐시입니다.
+    크기와 수정 시각이 그대로인 파일은 다시 해시하지 않습니다.
+    패키지 zip의 파일 목록도 패키지 SHA-256 기준으로 저장하여 매번 압축을 풀지 않습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries = {}
+        self.archives = {}      # 패키지 sha256 -> {경로: [크기, crc32]}
+        if path and os.path.isfile(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.entries = data.get("entries", {})
+                self.archives = data.get("archives", {})
+            except (OSError, ValueError):
+                self.entries = {}
+                self.archives = {}
+
+    def get(self, path: str, stat):
+        entry = self.entries.get(path)
+        if entry is None or entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+            return None
+        return entry[2], entry[3]
+
+    def put(self, path: str, stat, sha256: str, crc32: int):
+        with self._lock:
+            self.entries[path] = [stat.st_size, stat.st_mtime_ns, sha256, crc32]
+            self._dirty = True
+
+    def get_archive(self, digest: str):
+        entries = self.archives.get(digest) if digest else None
+        return {path: tuple(value) for path, value in entries.items()} if entries is not None else None
+
+    def put_archive(self, digest: str, entries: dict):
+        if not digest:
+            return
+        with self._lock:
+            self.archives[digest] = {path: list(value) for path, value in entries.items()}
+            self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".digests.", dir=directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"entries": self.entries, "archives": self.archives}, f)
+        os.replace(temp_path, self.path)
+        self._dirty = False
+
+
+class VerifyReport:
+    def __init__(self):
+        self.checked = 0
+        self.cached = 0
+        self.hashed_bytes = 0
+        self.elapsed = 0.0
+        self.missing = []       # ExpectedFile
+        self.mismatched = []    # (ExpectedFile, 이유)
+        self.skipped = []       # (패키지 이름, 이유) - 내용을 읽지 못한 패키지
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.mismatched
+
+    @property
+    def throughput(self) -> float:
+        """초당 해시한 바이트"""
+        return self.hashed_bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (f"VerifyReport(checked={self.checked}, cached={self.cached}, missing={len(self.missing)}, "
+                f"mismatched={len(self.mismatched)}, {self.throughput / 1024 / 1024:.1f}MB/s)")
+
+
+class IntegrityVerifier:
+    """
+    설치된 Steam 클라이언트 파일을 대상 매니페스트와 비교합니다.
+    - package/ 안의 패키지 파일은 매니페스트의 SHA-256과 비교합니다.
+    - 각 패키지 zip에 들어 있는 파일은 Steam 루트에 풀린 파일의 크기와 CRC32를 비교합니다.
+    hashlib/zlib은 큰 버퍼를 처리할 때 GIL을 놓으므로 스레드 풀로 여러 코어를 사용합니다.
+    """
+
+    def __init__(self, steam_path: str, digest_cache_path: str = None, max_workers: int = None):
+        self.steam_path = steam_path
+        self.package_dir = os.path.join(steam_path, "package")
+        self.digest_cache = DigestCache(digest_cache_path)
+        self.max_workers = max_workers or os.cpu_count() or 4
+
+    def expected_files(self, manifest: ClientManifest, report: VerifyReport) -> list:
+        expected = []
+        archives = []
+        for package in manifest.packages.values():
+            name = package.download_name
+            expected.append(ExpectedFile(f"package/{name}", package.download_size,
+                                         (package.download_sha2 or "").lower() or None, package=package.name))
+            archives.append((package.name, os.path.join(self.package_dir, name), (package.download_sha2 or "").lower()))
+
+        def read(item):
+            package_name, path, digest = item
+            entries = self.digest_cache.get_archive(digest)
+            if entries is not None:
+                return package_name, entries, None
+            try:
+                entries = read_package_entries(path)
+            except (OSError, IntegrityError, lzma.LZMAError) as e:
+                return package_name, None, str(e)
+            # 패키지 파일 자체가 매니페스트와 일치할 때만 목록을 캐시합니다.
+            try:
+                if digest and self._digest(f"package/{os.path.basename(path)}", path)[1][0] == digest:
+                    self.digest_cache.put_archive(digest, entries)
+            except OSError:
+                pass
+            return package_name, entries, None
+
+        # 여러 패키지가 같은 파일을 담고 있으면 매니페스트 순서상 뒤의 패키지가 이깁니다. (Steam 설치 순서)
+        files = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="verify-index") as executor:
+            for package_name, entries, error in executor.map(read, archives):
+                if entries is None:
+                    report.skipped.append((package_name, error))
+                    continue
+                for path, (size, crc) in entries.items():
+                    files[path] = ExpectedFile(path, size, crc32=crc, package=package_name)
+        expected.extend(files.values())
+        return expected
+
+    def _digest(self, relative_path: str, full_path: str):
+        stat = os.stat(full_path)
+        cached = self.digest_cache.get(relative_path, stat)
+        if cached is not None:
+            return stat, cached, True
+        sha256 = hashlib.sha256()
+        crc = 0
+        with open(full_path, "rb") as f:
+            while True:
+                chunk = f.read(COPY_BUFFER_SIZE)
+                if not chunk:
+                    break
+                sha256.update(chunk)
+                crc = zlib.crc32(chunk, crc)
+        digest = (sha256.hexdigest(), crc)
+        self.digest_cache.put(relative_path, stat, *digest)
+        return stat, digest, False
+
+    def _check(self, expected: ExpectedFile, report: VerifyReport, lock: threading.Lock):
+        full_path = os.path.join(self.steam_path, *expected.path.split("/"))
+        try:
+            stat, (sha256, crc), from_cache = self._digest(expected.path, full_path)
+        except FileNotFoundError:
+            with lock:
+                report.missing.append(expected)
+            return
+        except OSError as e:
+            with lock:
+                report.mismatched.append((expected, f"읽기 실패: {e}"))
+            return
+
+        reason = None
+        if expected.size is not None and stat.st_size != expected.size:
+            reason = f"크기 불일치 (예상 {expected.size}, 실제 {stat.st_size})"
+        elif expected.sha256 and sha256 != expected.sha256:
+            reason = "SHA-256 불일치"
+        elif expected.crc32 is not None and crc != expected.crc32:
+            reason = "CRC32 불일치"
+        with lock:
+            report.checked += 1
+            if from_cache:
+                report.cached += 1
+            else:
+                report.hashed_bytes += stat.st_size
+            if reason:
+                report.mismatched.append((expected, reason))
+
+    def verify(self, manifest: ClientManifest) -> VerifyReport:
+        report = VerifyReport()
+        started = time.perf_counter()
+        expected = self.expected_files(manifest, report)
+        lock = threading.Lock()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="verify") as executor:
+            for _ in executor.map(lambda item: self._check(item, report, lock), expected):
+                pass
+        report.elapsed = time.perf_counter() - started
+        try:
+            self.digest_cache.save()
+        except OSError:
+            pass
+        return report
@@ -0,0 +1,342 @@
+import os
+import shutil
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from src.net.package_cache import COPY_BUFFER_SIZE
+from src.steam.client_manifest import ClientManifest, get_installed_manifest_path
+from src.steam.integrity import (IntegrityError, is_temporary_file, open_package, package_format,
+                                 zstd_decompressobj)
+from src.steam.ssfn_slots import clone_file
+
+# zip 항목의 Zstandard 압축 방식 번호 (APPNOTE 4.4.5). zipfile은 Python 3.14부터 지원합니다.
+ZIP_ZSTANDARD = 93
+# zip 로컬 헤더: 시그니처, 버전, 플래그, 방식, 시각, 날짜, crc32, 압축 크기, 원래 크기, 이름 길이, 추가 필드 길이
+_LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+
+
+class PackageResult:
+    """패키지 하나를 푼 결과. elapsed는 패키지를 열고(압축 해제 포함) 파일을 모두 쓰기까지의 시간입니다."""
+
+    __slots__ = ("name", "source", "format", "files", "unchanged", "skipped", "bytes_in", "bytes_out", "elapsed", "error")
+
+    def __init__(self, name: str, source: str = None):
+        self.name = name
+        self.source = source
+        self.format = None
+        self.files = 0          # 새로 쓴 파일 수
+        self.unchanged = 0      # 이미 같은 내용이라 건너뛴 파일 수
+        self.skipped = 0        # 임시 파일이라 쓰지 않은 항목 수
+        self.bytes_in = 0       # 패키지 파일 크기
+        self.bytes_out = 0      # 쓴 바이트
+        self.elapsed = 0.0
+        self.error = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def throughput(self) -> float:
+        """초당 쓴 바이트"""
+        return self.bytes_out / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (f"PackageResult({self.name!r}, {self.format}, files={self.files}, unchanged={self.unchanged}, "
+                f"out={self.bytes_out}, elapsed={self.elapsed:.3f}s, error={self.error!r})")
+
+
+class ExtractReport:
+    def __init__(self, results: list, elapsed: float):
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def failed(self) -> list:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    @property
+    def files(self) -> int:
+        return sum(result.files for result in self.results)
+
+    @property
+    def bytes_out(self) -> int:
+        return sum(result.bytes_out for result in self.results)
+
+    @property
+    def throughput(self) -> float:
+        """전체 시간 기준 초당 쓴 바이트"""
+        return self.bytes_out / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (f"ExtractReport(packages={len(self.results)}, failed={len(self.failed)}, files={self.files}, "
+                f"{self.throughput / 1024 / 1024:.1f}MB/s)")
+
+
+class _OpenedPackage:
+    """열어 둔 패키지 (zip 파일 객체와 항목 목록)"""
+
+    def __init__(self, package, result: PackageResult):
+        self.package = package
+        self.result = result
+        self.source = None
+        self.archive = None
+        self.entries = {}       # 대상 상대 경로 -> ZipInfo
+        self.owned = []         # 이 패키지가 써야 하는 ZipInfo
+
+    def close(self):
+        if self.archive is not None:
+            self.archive.close()
+        if self.source is not None:
+            self.source.close()
+
+
+def _target_path(filename: str):
+    """zip 항목 이름을 Steam 루트 기준 상대 경로로 바꿉니다. 루트 밖을 가리키면 None"""
+    path = os.path.normpath(filename.replace("\\", "/")).replace("\\", "/")
+    if os.path.isabs(path) or path == ".." or path.startswith("../") or ":" in path.split("/")[0]:
+        return None
+    return path
+
+
+class PackageExtractor:
+    """
+    클라이언트 패키지를 Steam 없이 직접 Steam 루트에 풉니다. (구 클라이언트가 풀지 못하는 Zstandard 패키지 포함)
+    - 패키지는 캐시(sha256)나 package_dir에서 읽고, zip / .zip.vz / Zstandard로 압축한 zip과 Zstandard 항목을 지원합니다.
+    - 패키지마다 스레드 하나가 열고 풀며, 여러 패키지를 동시에 처리합니다. (zlib/lzma/zstd는 GIL을 놓습니다)
+    - 항목은 임시 폴더를 거치지 않고 최종 경로 옆의 임시 파일에 바로 푼 뒤 확인이 끝나면 os.replace로 바꿔 넣으며,
+      스레드마다 하나의 버퍼를 재사용합니다. (실패해도 설치된 파일은 이전 그대로입니다)
+    - 패키지에 섞인 임시 파일(integrity.is_temporary_file)은 쓰지 않습니다.
+    - 여러 패키지가 같은 파일을 담고 있으면 Steam 설치 순서대로 매니페스트의 뒤 패키지가 이깁니다.
+    digest_cache(integrity.DigestCache)를 주면 크기와 CRC32가 이미 같은 파일은 다시 쓰지 않습니다.
+    """
+
+    def __init__(self, target_root: str, cache=None, package_dir: str = None, max_workers: int = None,
+                 digest_cache=None, buffer_size: int = COPY_BUFFER_SIZE):
+        self.target_root = target_root
+        self.cache = cache
+        self.package_dir = package_dir or os.path.join(target_root, "package")
+        self.max_workers = max_workers or min(8, os.cpu_count() or 4)
+        self.digest_cache = digest_cache
+        self.buffer_size = buffer_size
+        self._local = threading.local()
+
+    def locate(self, package):
+        """패키지 파일 경로. 캐시에 같은 sha256이 있으면 캐시를, 없으면 package_dir의 파일을 씁니다. 둘 다 없으면 None"""
+        digest = (package.download_sha2 or "").lower()
+        if self.cache is not None and digest and self.cache.contains_digest(digest):
+            return self.cache.blob_path(digest)
+        path = os.path.join(self.package_dir, package.download_name)
+        return path if os.path.isfile(path) else None
+
+    def _buffer(self) -> memoryview:
+        view = getattr(self._local, "buffer", None)
+        if view is None:
+            view = self._local.buffer = memoryview(bytearray(self.buffer_size))
+        return view
+
+    # --- 열기 ---
+
+    def _open(self, package) -> _OpenedPackage:
+        started = time.perf_counter()
+        opened = _OpenedPackage(package, PackageResult(package.name, self.locate(package)))
+        result = opened.result
+        try:
+            if result.source is None:
+                raise IntegrityError(f"패키지 파일이 캐시와 package 폴더에 없습니다: {package.download_name}")
+            result.bytes_in = os.path.getsize(result.source)
+            result.format = package_format(result.source)
+            opened.source = open_package(result.source, result.format)
+            opened.archive = zipfile.ZipFile(opened.source)
+            for info in opened.archive.infolist():
+                if info.is_dir():
+                    continue
+                if is_temporary_file(info.filename):
+                    result.skipped += 1
+                    continue
+                path = _target_path(info.filename)
+                if path is None:
+                    raise IntegrityError(f"Steam 폴더 밖을 가리키는 항목이 있습니다: {info.filename}")
+                opened.entries[path] = info
+        except (OSError, IntegrityError, zipfile.BadZipFile) as e:
+            result.error = str(e)
+            opened.close()
+        result.elapsed = time.perf_counter() - started
+        return opened
+
+    # --- 쓰기 ---
+
+    def _unchanged(self, relative_path: str, full_path: str, info: zipfile.ZipInfo) -> bool:
+        if self.digest_cache is None:
+            return False
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return False
+        cached = self.digest_cache.get(relative_path, stat)
+        return cached is not None and stat.st_size == info.file_size and cached[1] == info.CRC
+
+    def _copy_zstd_member(self, opened: _OpenedPackage, info: zipfile.ZipInfo, out) -> int:
+        """zipfile이 모르는 Zstandard 항목은 로컬 헤더 뒤의 압축 데이터를 직접 읽어 풉니다."""
+        source = opened.source
+        source.seek(info.header_offset)
+        header = _LOCAL_HEADER.unpack(source.read(_LOCAL_HEADER.size))
+        if header[0] != b"PK\x03\x04":
+            raise IntegrityError(f"zip 로컬 헤더가 올바르지 않습니다: {info.filename}")
+        source.seek(info.header_offset + _LOCAL_HEADER.size + header[9] + header[10])
+
+        view = self._buffer()
+        decompressor = zstd_decompressobj()
+        remaining = info.compress_size
+        written = 0
+        crc = 0
+        try:
+            while remaining > 0:
+                count = source.readinto(view[:min(len(view), remaining)])
+                if not count:
+                    break
+                remaining -= count
+                data = decompressor.decompress(view[:count])
+                crc = zlib.crc32(data, crc)
+                written += len(data)
+                out.write(data)
+        except IntegrityError:
+            raise
+        except Exception as e:
+            raise IntegrityError(f"항목 압축 해제 실패: {info.filename} ({e})") from e
+        if written != info.file_size or crc != info.CRC:
+            raise IntegrityError(f"항목 압축 해제 결과가 올바르지 않습니다: {info.filename}")
+        return written
+
+    def _copy_member(self, opened: _OpenedPackage, info: zipfile.ZipInfo, out) -> int:
+        if info.compress_type == ZIP_ZSTANDARD and not hasattr(zipfile, "ZIP_ZSTANDARD"):
+            return self._copy_zstd_member(opened, info, out)
+        view = self._buffer()
+        written = 0
+        # zipfile이 CRC32를 확인하고, 맞지 않으면 마지막 읽기에서 BadZipFile을 냅니다.
+        with opened.archive.open(info) as member:
+            while True:
+                count = member.readinto(view)
+                if not count:
+                    break
+                out.write(view[:count])
+                written += count
+        return written
+
+    def _write(self, opened: _OpenedPackage) -> PackageResult:
+        result = opened.result
+        if not result.ok:
+            return result
+        started = time.perf_counter()
+        created = set()
+        try:
+            for info in opened.owned:
+                relative_path = _target_path(info.filename)
+                full_path = os.path.join(self.target_root, *relative_path.split("/"))
+                if self._unchanged(relative_path, full_path, info):
+                    result.unchanged += 1
+                    continue
+                directory = os.path.dirname(full_path)
+                if directory not in created:
+                    os.makedirs(directory, exist_ok=True)
+                    created.add(directory)
+                # 같은 폴더의 임시 파일에 끝까지 풀고 확인한 뒤에만 바꿔 넣습니다. 중간에 실패해도(디스크 부족, 손상된
+                # 항목) 설치된 파일은 그대로 남고, 저장소(ClientStore) 객체와 하드링크된 파일도 덮어쓰지 않습니다.
+                temp_path = f"{full_path}.{os.getpid()}.extract"
+                try:
+                    with open(temp_path, "wb", buffering=0) as out:
+                        written = self._copy_member(opened, info, out)
+                    if written != info.file_size:
+                        raise IntegrityError(f"항목 크기가 올바르지 않습니다: {info.filename} "
+                                             f"(예상 {info.file_size}, 실제 {written})")
+                    os.replace(temp_path, full_path)
+                except BaseException:
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+                    raise
+                result.bytes_out += written
+                result.files += 1
+        except (OSError, IntegrityError, zipfile.BadZipFile, NotImplementedError) as e:
+            result.error = str(e)
+        finally:
+            opened.close()
+        result.elapsed += time.perf_counter() - started
+        return result
+
+    def extract(self, manifest: ClientManifest) -> ExtractReport:
+        """매니페스트의 패키지를 모두 Steam 루트에 풉니다. 실패한 패키지가 있어도 나머지는 계속 풉니다."""
+        started = time.perf_counter()
+        packages = list(manifest.packages.values())
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="extract") as executor:
+            opened = list(executor.map(self._open, packages))
+            # 같은 경로는 매니페스트 순서상 마지막 패키지만 씁니다.
+            owners = {}
+            for item in opened:
+                for path in item.entries:
+                    owners[path] = item
+            for item in opened:
+                item.owned = [info for path, info in item.entries.items() if owners[path] is item]
+            # 큰 패키지부터 시작해야 마지막에 큰 패키지 하나만 남아 기다리는 일이 줄어듭니다.
+            order = sorted(opened, key=lambda item: sum(info.file_size for info in item.owned), reverse=True)
+            list(executor.map(self._write, order))
+        return ExtractReport([item.result for item in opened], time.perf_counter() - started)
+
+    def place_package_files(self, manifest: ClientManifest) -> list:
+        """
+        패키지 파일 자체를 Steam 루트의 package/에 둡니다. (Steam과 무결성 검사, 저장소 스냅샷이 이 파일을 봅니다)
+        캐시 객체와 블록을 나누지 않도록 복제(reflink)하고, 안 되면 복사합니다. (Steam이 package/의 파일을 제자리에서
+        고쳐 써도 캐시는 그대로입니다) 넣지 못한 (이름, 오류) 목록을 반환합니다.
+        """
+        target_dir = os.path.join(self.target_root, "package")
+        os.makedirs(target_dir, exist_ok=True)
+        errors = []
+        for package in manifest.packages.values():
+            source = self.locate(package)
+            target = os.path.join(target_dir, package.download_name)
+            if source is None:
+                errors.append((package.download_name, "패키지 파일 없음"))
+                continue
+            if source == target:
+                continue
+            temp_path = f"{target}.{os.getpid()}.place"
+            try:
+                if os.path.lexists(temp_path):
+                    os.remove(temp_path)
+                try:
+                    clone_file(source, temp_path)
+                except (OSError, ImportError):
+                    shutil.copyfile(source, temp_path)
+                os.replace(temp_path, target)
+            except OSError as e:
+                errors.append((package.download_name, str(e)))
+        return errors
+
+    def install(self, manifest: ClientManifest, manifest_source: str) -> ExtractReport:
+        """
+        패키지를 풀고 package/에 패키지 파일을 둔 뒤, 마지막에 매니페스트(manifest_source)를 설치된 매니페스트로 바꿉니다.
+        실패하면 매니페스트를 바꾸지 않으므로 설치된 빌드 번호는 이전 그대로 남습니다.
+        """
+        report = self.extract(manifest)
+        if not report.ok:
+            return report
+        started = time.perf_counter()
+        for name, error in self.place_package_files(manifest):
+            failed = PackageResult(name)
+            failed.error = error
+            report.results.append(failed)
+        if report.ok:
+            manifest_path = get_installed_manifest_path(self.target_root)
+            temp_path = f"{manifest_path}.{os.getpid()}.install"
+            shutil.copyfile(manifest_source, temp_path)
+            os.replace(temp_path, manifest_path)
+        report.elapsed += time.perf_counter() - started
+        return report
@@ -1,13 +1,79 @@
-import winreg
+import os
+
+
+class RegistryBackend:
+    """레지스트리 조회 구현의 공통 인터페이스"""
+
+    def read_values(self, path: str, names) -> dict:
+        """HKEY_CURRENT_USER\\path 키를 한 번 열어 names 값을 읽습니다. 없는 값은 결과에서 빠집니다."""
+        raise NotImplementedError
+
+
+class WinRegBackend(RegistryBackend):
+    def read_values(self, path: str, names) -> dict:
+        import winreg
+
+        values = {}
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, path) as key:
+                for name in names:
+                    try:
+                        values[name] = winreg.QueryValueEx(key, name)[0]
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+        return values
+
+
+class FakeRegistryBackend(RegistryBackend):
+    """테스트나 Windows가 아닌 환경에서 사용하는 메모리 내 레지스트리입니다."""
+
+    def __init__(self, values: dict = None):
+        self.values = values or {}  # path -> {이름: 값}
+        self.reads = 0
+
+    def read_values(self, path: str, names) -> dict:
+        self.reads += 1
+        key = self.values.get(path, {})
+        return {name: key[name] for name in names if name in key}
+
+
+def default_registry_backend() -> RegistryBackend:
+    if os.name == "nt":
+        return WinRegBackend()
+    return FakeRegistryBackend()
+
 
 class SteamReg:
-    def __init__(self):
+    """
+    Steam 레지스트리 값 조회. 키를 한 번만 열어 필요한 값을 모두 읽고 결과를 기억합니다.
+    값이 바뀌었을 수 있으면 invalidate()를 호출합니다.
+    """
+
+    VALUE_NAMES = ("SteamPath", "SteamExe")
+
+    def __init__(self, backend: RegistryBackend = None):
         self.reg_path = r"SOFTWARE\Valve\Steam"
+        self.backend = backend or default_registry_backend()
+        self._values = None
+
+    def values(self) -> dict:
+        if self._values is None:
+            self._values = self.backend.read_values(self.reg_path, self.VALUE_NAMES)
+        return self._values
+
+    def invalidate(self):
+        self._values = None
+
+    def _get(self, name: str):
+        value = self.values().get(name)
+        if value is None:
+            raise FileNotFoundError(f"레지스트리 값 '{self.reg_path}\\{name}'을(를) 찾을 수 없습니다.")
+        return value
 
     def get_steam_path(self):
-        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.reg_path) as key:
-            return winreg.QueryValueEx(key, 'SteamPath')[0]
+        return self._get("SteamPath")
 
     def get_steam_exe_path(self):
-        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.reg_path) as key:
-            return winreg.QueryValueEx(key, 'SteamExe')[0]
\ No newline at end of file
+        return self._get("SteamExe")
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+INDEX_NAME = "slots.json"
+SSFN_PREFIX = "ssfn"
+
+LINK_AUTO = "auto"
+LINK_HARDLINK = "hardlink"
+LINK_REFLINK = "reflink"
+LINK_COPY = "copy"
+LINK_MODES = (LINK_AUTO, LINK_HARDLINK, LINK_REFLINK, LINK_COPY)
+
+# linux/fs.h: _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _same_content(source_path: str, source_stat, target_path: str, target_stat) -> bool:
+    """같은 inode(하드링크)이면 읽지 않고 일치로 보고, 아니면 크기와 SHA-256을 비교합니다."""
+    if (source_stat.st_dev, source_stat.st_ino) == (target_stat.st_dev, target_stat.st_ino):
+        return True
+    if source_stat.st_size != target_stat.st_size:
+        return False
+    return file_sha256(source_path) == file_sha256(target_path)
+
+
+def clone_file(source_path: str, target_path: str):
+    """파일 시스템의 복제(reflink)로 target을 만듭니다. 지원하지 않으면 OSError"""
+    import fcntl
+
+    with open(source_path, "rb") as source, open(target_path, "wb") as target:
+        try:
+            fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+        except OSError:
+            target.close()
+            os.remove(target_path)
+            raise
+
+
+def _place(source_path: str, temp_path: str, link_mode: str) -> str:
+    """
+    source를 temp_path에 리플링크/복사(또는 지정한 경우에만 하드링크)하고 사용한 방식을 반환합니다.
+    Steam은 SSFN 파일을 제자리에서 고쳐 쓰므로, 기본(auto)은 원본과 블록을 나누지 않는 리플링크나 복사만 씁니다.
+    """
+    if link_mode == LINK_HARDLINK:
+        os.link(source_path, temp_path)
+        return LINK_HARDLINK
+    if link_mode in (LINK_AUTO, LINK_REFLINK) and os.name != "nt":
+        try:
+            clone_file(source_path, temp_path)
+            return LINK_REFLINK
+        except (OSError, ImportError):
+            if link_mode == LINK_REFLINK:
+                raise
+    shutil.copyfile(source_path, temp_path)
+    return LINK_COPY
+
+
+class ActivationResult:
+    __slots__ = ("name", "changed", "method", "removed", "elapsed")
+
+    def __init__(self, name: str, changed: bool, method: str = None, removed=(), elapsed: float = 0.0):
+        self.name = name
+        self.changed = changed
+        self.method = method      # None이면 이미 같은 파일이라 아무것도 하지 않음
+        self.removed = list(removed)
+        self.elapsed = elapsed
+
+    @property
+    def elapsed_ms(self) -> float:
+        return self.elapsed * 1000
+
+    def __repr__(self):
+        return (f"ActivationResult({self.name!r}, changed={self.changed}, method={self.method}, "
+                f"removed={len(self.removed)}, elapsed={self.elapsed_ms:.2f}ms)")
+
+
+def activate_ssfn(source_path: str, steam_path: str, link_mode: str = LINK_AUTO) -> ActivationResult:
+    """
+    source 파일을 Steam 루트의 같은 이름으로 배치하고 다른 ssfn* 파일을 제거합니다.
+    - Steam 루트는 os.scandir로 한 번만 훑습니다.
+    - 이미 같은 내용의 파일만 있으면 아무것도 쓰지 않습니다.
+    - 새 파일은 임시 이름으로 만든 뒤 os.replace로 바꾸고, 그다음에 오래된 파일을 지우므로
+      Steam 루트에 SSFN 파일이 하나도 없는 순간이 없습니다.
+    """
+    started = time.perf_counter()
+    name = os.path.basename(source_path)
+    target_path = os.path.join(steam_path, name)
+    source_stat = os.stat(source_path)
+
+    current = None
+    stale = []
+    with os.scandir(steam_path) as entries:
+        for entry in entries:
+            if not entry.name.startswith(SSFN_PREFIX) or not entry.is_file(follow_symlinks=False):
+                continue
+            if entry.name == name:
+                current = entry.stat(follow_symlinks=False)
+            else:
+                stale.append(entry.path)
+
+    method = None
+    if current is None or not _same_content(source_path, source_stat, target_path, current):
+        # 임시 이름은 ssfn으로 시작하지 않게 하여 Steam과 정리 단계가 건드리지 않게 합니다.
+        temp_path = os.path.join(steam_path, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        if os.path.lexists(temp_path):
+            os.remove(temp_path)
+        method = _place(source_path, temp_path, link_mode)
+        try:
+            os.replace(temp_path, target_path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+
+    removed = []
+    for path in stale:
+        try:
+            os.remove(path)
+            removed.append(path)
+        except FileNotFoundError:
+            pass
+    return ActivationResult(name, method is not None or bool(removed), method, removed, time.perf_counter() - started)
+
+
+class SSFNSlot:
+    __slots__ = ("name", "file_name", "sha256", "size")
+
+    def __init__(self, name: str, file_name: str, sha256: str, size: int):
+        self.name = name
+        self.file_name = file_name
+        self.sha256 = sha256
+        self.size = size
+
+    def to_dict(self) -> dict:
+        return {"file_name": self.file_name, "sha256": self.sha256, "size": self.size}
+
+    def __repr__(self):
+        return f"SSFNSlot({self.name!r}, {self.file_name!r}, {self.sha256[:12]})"
+
+
+class SSFNSlotStore:
+    """
+    이름 붙은 SSFN 슬롯을 Steam 루트 밖의 저장소(<store_dir>/<슬롯>/<ssfn 파일>)에 보관합니다.
+    활성화는 저장소 파일을 Steam 루트에 리플링크(지원하지 않으면 복사)하므로, Steam이 활성 파일을 고쳐 써도 슬롯은 그대로입니다.
+    link_mode="hardlink"로 하드링크를 쓰면 슬롯도 함께 바뀔 수 있으므로, 활성화할 때 슬롯 지문을 다시 확인하고
+    add()는 저장된 파일이 지문과 다르면 다시 가져옵니다.
+    """
+
+    def __init__(self, store_dir: str, link_mode: str = LINK_AUTO):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"알 수 없는 링크 방식입니다: {link_mode}")
+        self.store_dir = store_dir
+        self.link_mode = link_mode
+        self.index_path = os.path.join(store_dir, INDEX_NAME)
+        self._lock = threading.RLock()
+        self._slots = None
+
+    def _load(self) -> dict:
+        if self._slots is None:
+            slots = {}
+            if os.path.isfile(self.index_path):
+                try:
+                    with open(self.index_path, "r", encoding="utf-8") as f:
+                        data = json.load(f).get("slots", {})
+                    slots = {name: SSFNSlot(name, **entry) for name, entry in data.items()}
+                except (OSError, ValueError, TypeError):
+                    slots = {}
+            self._slots = slots
+        return self._slots
+
+    def _save(self):
+        os.makedirs(self.store_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".slots.", dir=self.store_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"slots": {name: slot.to_dict() for name, slot in self._slots.items()}}, f, indent=2)
+        os.replace(temp_path, self.index_path)
+
+    def slots(self) -> dict:
+        with self._lock:
+            return dict(self._load())
+
+    def path(self, slot: SSFNSlot) -> str:
+        return os.path.join(self.store_dir, slot.name, slot.file_name)
+
+    def get(self, name: str) -> SSFNSlot:
+        with self._lock:
+            slot = self._load().get(name)
+        if slot is None:
+            raise KeyError(f"SSFN 슬롯이 없습니다: {name}")
+        return slot
+
+    def _intact(self, slot: SSFNSlot) -> bool:
+        """저장된 슬롯 파일이 기록한 크기/지문과 같은지"""
+        path = self.path(slot)
+        try:
+            return os.path.getsize(path) == slot.size and file_sha256(path) == slot.sha256
+        except OSError:
+            return False
+
+    def add(self, name: str, source_path: str) -> SSFNSlot:
+        """
+        source 파일을 슬롯으로 저장합니다. 같은 내용이 이미 있으면 다시 쓰지 않습니다.
+        저장된 파일이 기록한 지문과 달라졌으면(예: 하드링크한 파일을 Steam이 고쳐 씀) 다시 가져옵니다.
+        """
+        file_name = os.path.basename(source_path)
+        if not file_name.startswith(SSFN_PREFIX):
+            raise ValueError(f"SSFN 파일 이름은 '{SSFN_PREFIX}'로 시작해야 합니다: {file_name}")
+        sha256 = file_sha256(source_path)
+        with self._lock:
+            slots = self._load()
+            existing = slots.get(name)
+            if (existing is not None and existing.file_name == file_name and existing.sha256 == sha256
+                    and self._intact(existing)):
+                return existing
+
+            slot_dir = os.path.join(self.store_dir, name)
+            os.makedirs(slot_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=".ssfn.", dir=slot_dir)
+            os.close(fd)
+            shutil.copyfile(source_path, temp_path)
+            slot = SSFNSlot(name, file_name, sha256, os.path.getsize(temp_path))
+            # 기존 파일이 Steam 루트와 하드링크되어 있어도 교체(os.replace)하므로 Steam 쪽 파일은 바뀌지 않습니다.
+            os.replace(temp_path, self.path(slot))
+            if existing is not None and existing.file_name != file_name:
+                try:
+                    os.remove(self.path(existing))
+                except FileNotFoundError:
+                    pass
+            slots[name] = slot
+            self._save()
+            return slot
+
+    def remove(self, name: str):
+        with self._lock:
+            slot = self._load().pop(name, None)
+            if slot is None:
+                return
+            shutil.rmtree(os.path.join(self.store_dir, name), ignore_errors=True)
+            self._save()
+
+    def activate(self, name: str, steam_path: str) -> ActivationResult:
+        """슬롯을 Steam 루트의 활성 SSFN 파일로 만듭니다. 슬롯 파일이 바뀌었으면 ValueError"""
+        slot = self.get(name)
+        path = self.path(slot)
+        stat = os.stat(path)
+        if stat.st_size != slot.size or file_sha256(path) != slot.sha256:
+            raise ValueError(f"SSFN 슬롯 '{name}'의 파일이 저장할 때와 다릅니다. 슬롯을 다시 추가하세요.")
+        return activate_ssfn(path, steam_path, self.link_mode)
+
+    def active_slot(self, steam_path: str):
+        """Steam 루트의 SSFN 파일과 내용이 같은 슬롯 이름. 없으면 None"""
+        by_file = {}
+        for slot in self.slots().values():
+            by_file.setdefault(slot.file_name, []).append(slot)
+        with os.scandir(steam_path) as entries:
+            for entry in entries:
+                candidates = by_file.get(entry.name)
+                if not candidates or not entry.is_file(follow_symlinks=False):
+                    continue
+                sha256 = file_sha256(entry.path)
+                for slot in candidates:
+                    if slot.sha256 == sha256:
+                        return slot.name
+        return None
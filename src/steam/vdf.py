@@ -0,0 +1,565 @@
+import io
+import os
+import re
+import shutil
+import tempfile
+
+# 텍스트 KeyValues(VDF) 토큰 종류
+STRING = "STRING"       # "따옴표 문자열"
+BARE = "BARE"           # 따옴표 없는 문자열
+OPEN = "OPEN"           # {
+CLOSE = "CLOSE"         # }
+CONDITION = "CONDITION" # [$WIN32] 같은 조건식
+SPACE = "SPACE"         # 공백/개행
+COMMENT = "COMMENT"     # // 주석
+
+_TOKEN_RE = re.compile(
+    r'(?P<SPACE>\s+)'
+    r'|(?P<COMMENT>//[^\n]*)'
+    r'|(?P<STRING>"(?:[^"\\]|\\.)*")'
+    r'|(?P<OPEN>\{)'
+    r'|(?P<CLOSE>\})'
+    r'|(?P<CONDITION>\[[^\]\n]*\])'
+    r'|(?P<BARE>[^\s{}"\[\]]+)',
+    re.S,
+)
+
+_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+
+CHUNK_SIZE = 64 * 1024
+# 이보다 작은 loginusers.vdf는 청크 스트리밍 대신 메모리에서 한 번에 편집합니다.
+IN_MEMORY_LIMIT = 1024 * 1024
+
+# 오프라인 자동 로그인을 위해 loginusers.vdf의 각 사용자에게 설정할 값
+OFFLINE_LOGIN_FLAGS = {
+    "RememberPassword": "1",
+    "WantsOfflineMode": "1",
+    "SkipOfflineModeWarning": "1",
+    "AllowAutoLogin": "1",
+}
+
+
+class VdfSyntaxError(ValueError):
+    pass
+
+
+class Token:
+    __slots__ = ("kind", "raw")
+
+    def __init__(self, kind: str, raw: str):
+        self.kind = kind
+        self.raw = raw
+
+    @property
+    def value(self) -> str:
+        """따옴표와 이스케이프를 제거한 실제 값"""
+        if self.kind != STRING:
+            return self.raw
+        body = self.raw[1:-1]
+        if "\\" not in body:
+            return body
+        return re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), m.group(0)), body)
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.raw!r})"
+
+
+def quote(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def iter_tokens(fp, chunk_size: int = CHUNK_SIZE):
+    """
+    파일 객체에서 토큰을 순차적으로 읽어옵니다.
+    청크 단위로 읽기 때문에 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+    모든 토큰의 raw 값을 이어 붙이면 원본과 정확히 같습니다 (무손실).
+    """
+    buf = ""
+    pos = 0
+    eof = False
+    while True:
+        if not eof and len(buf) - pos < chunk_size:
+            chunk = fp.read(chunk_size)
+            buf = buf[pos:] + chunk
+            pos = 0
+            eof = not chunk
+        if pos >= len(buf):
+            if eof:
+                return
+            continue
+
+        match = _TOKEN_RE.match(buf, pos)
+        # 토큰이 버퍼 끝에 닿았다면 다음 청크에서 이어질 수 있으므로 더 읽습니다.
+        if not eof and (match is None or match.end() == len(buf)):
+            chunk = fp.read(chunk_size)
+            if chunk:
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            eof = True
+            match = _TOKEN_RE.match(buf, pos)
+
+        if match is None:
+            raise VdfSyntaxError(f"VDF 구문 오류: 위치 {pos} 근처의 토큰을 해석할 수 없습니다: {buf[pos:pos + 20]!r}")
+
+        yield Token(match.lastgroup, match.group())
+        pos = match.end()
+
+
+class KVNode:
+    """
+    무손실 VDF 문서 모델의 노드입니다.
+    각 항목은 (key 토큰, 값) 형태이고 값은 문자열 토큰이거나 하위 KVNode입니다.
+    항목 사이의 공백/주석은 trivia로 보존되어 dump() 시 원본과 동일하게 출력됩니다.
+    """
+
+    def __init__(self):
+        # ("entry", key_token, between, value) 또는 ("trivia", raw)
+        self.items = []
+
+    def keys(self):
+        return [item[1].value for item in self.items if item[0] == "entry"]
+
+    def _find(self, key: str):
+        lowered = key.lower()
+        for index, item in enumerate(self.items):
+            if item[0] == "entry" and item[1].value.lower() == lowered:
+                return index
+        return -1
+
+    def get(self, key: str, default=None):
+        index = self._find(key)
+        if index < 0:
+            return default
+        value = self.items[index][3]
+        return value if isinstance(value, KVNode) else value.value
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) >= 0
+
+    def children(self):
+        for item in self.items:
+            if item[0] == "entry" and isinstance(item[3], KVNode):
+                yield item[1].value, item[3]
+
+    def set(self, key: str, value: str) -> bool:
+        """값을 설정하거나 추가합니다. 실제로 변경이 있었으면 True를 반환합니다."""
+        index = self._find(key)
+        if index >= 0:
+            kind, key_token, between, old = self.items[index]
+            if isinstance(old, KVNode):
+                raise VdfSyntaxError(f"'{key}'는 하위 노드이므로 문자열 값으로 설정할 수 없습니다.")
+            if old.value == value:
+                return False
+            self.items[index] = (kind, key_token, between, Token(STRING, quote(value)))
+            return True
+
+        prefix, between = self._entry_layout()
+        insert_at = len(self.items)
+        trailing = insert_at and self.items[-1][0] == "trivia" and self.items[-1][1].isspace()
+        # 닫는 괄호 앞 공백(개행 + 괄호 들여쓰기)은 그대로 마지막에 둡니다.
+        if trailing:
+            insert_at -= 1
+        self.items[insert_at:insert_at] = [
+            ("trivia", prefix),
+            ("entry", Token(STRING, quote(key)), between, Token(STRING, quote(value))),
+        ]
+        if not trailing:
+            self.items.append(("trivia", "\r\n" if "\r\n" in prefix else "\n"))
+        return True
+
+    def _entry_layout(self):
+        """기존 항목의 들여쓰기와 key-value 구분자를 추정합니다."""
+        previous = None
+        for item in self.items:
+            if item[0] == "trivia":
+                previous = item[1]
+            elif previous is not None:
+                newline_at = previous.rfind("\n")
+                if newline_at > 0 and previous[newline_at - 1] == "\r":
+                    newline_at -= 1
+                return previous[newline_at:] if newline_at >= 0 else previous, item[2]
+        return "\n\t", "\t\t"
+
+    def dump(self, out):
+        for item in self.items:
+            if item[0] == "trivia":
+                out.append(item[1])
+                continue
+            _, key_token, between, value = item
+            out.append(key_token.raw)
+            out.append(between)
+            if isinstance(value, KVNode):
+                out.append("{")
+                value.dump(out)
+                out.append("}")
+            else:
+                out.append(value.raw)
+
+
+class VdfDocument(KVNode):
+
+    def dumps(self) -> str:
+        out = []
+        self.dump(out)
+        return "".join(out)
+
+
+def _parse_node(tokens, node: KVNode, top_level: bool):
+    pending_key = None
+    between = []
+    for token in tokens:
+        if token.kind in (SPACE, COMMENT, CONDITION):
+            if pending_key is None:
+                node.items.append(("trivia", token.raw))
+            else:
+                between.append(token.raw)
+            continue
+
+        if token.kind == CLOSE:
+            if top_level or pending_key is not None:
+                raise VdfSyntaxError("VDF 구문 오류: 예상하지 못한 '}'")
+            return
+
+        if pending_key is None:
+            if token.kind == OPEN:
+                raise VdfSyntaxError("VDF 구문 오류: 키 없이 '{'가 나타났습니다.")
+            pending_key = token
+            continue
+
+        if token.kind == OPEN:
+            child = KVNode()
+            _parse_node(tokens, child, top_level=False)
+            node.items.append(("entry", pending_key, "".join(between), child))
+        else:
+            node.items.append(("entry", pending_key, "".join(between), token))
+        pending_key = None
+        between = []
+
+    if not top_level:
+        raise VdfSyntaxError("VDF 구문 오류: 닫히지 않은 '{'")
+    if pending_key is not None:
+        raise VdfSyntaxError(f"VDF 구문 오류: '{pending_key.value}' 키에 값이 없습니다.")
+
+
+def loads(text: str) -> VdfDocument:
+    return load(io.StringIO(text))
+
+
+def load(fp) -> VdfDocument:
+    document = VdfDocument()
+    _parse_node(iter_tokens(fp), document, top_level=True)
+    return document
+
+
+def load_file(path: str) -> VdfDocument:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return load(f)
+
+
+# 편집기 전용 패턴: 앞쪽 공백/주석/조건식과 key-value 쌍을 한 번에 매칭하여 매칭 횟수를 줄입니다.
+# 그룹: 1 앞쪽 trivia, 2 key, 3 key와 값 사이, 4 값, 5 '{', 6 '}'
+_TRIVIA = r'\s*(?:(?://[^\n]*(?![^\n])|\[[^\]\n]*\])\s*)*'
+_ATOM = r'"[^"\\]*(?:\\.[^"\\]*)*"|(?!//)[^\s{}"\[\]]+(?![^\s{}"\[\]])'
+_EDIT_RE = re.compile(
+    rf'({_TRIVIA})(?:({_ATOM})({_TRIVIA})(?:({_ATOM})|(\{{))|(\}}))',
+    re.S,
+)
+_TRIVIA_RE = re.compile(_TRIVIA + r'\Z', re.S)
+
+
+class _UserScope:
+    __slots__ = ("brace_indent", "indent", "between", "seen", "newline")
+
+    def __init__(self, brace_indent: str, newline: str):
+        self.brace_indent = brace_indent
+        self.indent = None
+        self.between = None
+        self.seen = set()
+        self.newline = newline
+
+
+def _indent_of(space: str) -> str:
+    newline_at = space.rfind("\n")
+    return space[newline_at + 1:] if newline_at >= 0 else ""
+
+
+def _unquote(raw: str) -> str:
+    return Token(STRING, raw).value if raw[0] == '"' else raw
+
+
+def _rewrite_to_temp(path: str, flags: dict, chunk_size: int):
+    """rewrite_user_flags의 본체. 바뀐 내용을 임시 파일에 쓰고 (stats, 임시 파일 경로 또는 None)을 반환합니다."""
+    wanted = {key.lower(): (key, value) for key, value in flags.items()}
+    # 토큰 원문으로 바로 조회할 수 있도록 따옴표 있는/없는 형태를 모두 등록합니다.
+    raw_keys = {}
+    for lowered, (key, value) in wanted.items():
+        accepted = {quote(value), value}
+        raw_keys[quote(lowered)] = (lowered, quote(value), accepted)
+        raw_keys[lowered] = (lowered, quote(value), accepted)
+    stats = {"users": 0, "updated": 0, "inserted": 0, "changed": False}
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".loginusers.", suffix=".tmp", dir=directory)
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as src, \
+                os.fdopen(fd, "w", encoding="utf-8", newline="") as dst:
+            stack = []          # 열린 노드의 key 목록
+            scope = None        # 현재 users/<SteamID64> 노드 상태
+
+            buf = ""
+            pos = 0             # 다음에 해석할 위치
+            copied = 0          # 임시 파일에 이미 기록한 위치
+            eof = False
+
+            while True:
+                if not eof:
+                    chunk = src.read(chunk_size)
+                    if chunk:
+                        dst.write(buf[copied:pos])
+                        buf = buf[pos:] + chunk
+                        pos = copied = 0
+                    else:
+                        eof = True
+
+                need_more = False
+                for match in _EDIT_RE.finditer(buf, pos):
+                    # 청크 경계에 걸친 토큰은 다음 청크를 읽은 뒤 다시 해석합니다.
+                    if match.start() != pos or (not eof and match.end() == len(buf)):
+                        if eof:
+                            raise VdfSyntaxError(f"VDF 구문 오류: 해석할 수 없는 토큰: {buf[pos:pos + 20]!r}")
+                        need_more = True
+                        break
+
+                    space, key, between, value, opened, closed = match.groups()
+
+                    if value is not None:
+                        if scope is not None and len(stack) == 2:
+                            if scope.indent is None:
+                                scope.indent = _indent_of(space)
+                                scope.between = between
+                            entry = raw_keys.get(key.lower())
+                            if entry is None and "\\" in key:
+                                entry = raw_keys.get(_unquote(key).lower())
+                            if entry is not None:
+                                lowered, quoted_target, accepted = entry
+                                scope.seen.add(lowered)
+                                if value not in accepted and _unquote(value) != wanted[lowered][1]:
+                                    dst.write(buf[copied:match.start(4)])
+                                    dst.write(quoted_target)
+                                    copied = match.end()
+                                    stats["updated"] += 1
+                                    stats["changed"] = True
+
+                    elif opened is not None:
+                        stack.append(_unquote(key))
+                        if len(stack) == 2 and stack[0].lower() == "users":
+                            newline = "\r\n" if "\r\n" in space else "\n"
+                            scope = _UserScope(_indent_of(space), newline)
+                            stats["users"] += 1
+
+                    else:
+                        if not stack:
+                            raise VdfSyntaxError("VDF 구문 오류: 예상하지 못한 '}'")
+                        if scope is not None and len(stack) == 2:
+                            missing = [item for lowered, item in wanted.items() if lowered not in scope.seen]
+                            if missing:
+                                indent = scope.indent if scope.indent is not None else scope.brace_indent + "\t"
+                                between = scope.between or "\t\t"
+                                newline = "\r\n" if "\r\n" in space else scope.newline
+                                dst.write(buf[copied:match.start()])
+                                for key, value in missing:
+                                    dst.write(f"{newline}{indent}{quote(key)}{between}{quote(value)}")
+                                    stats["inserted"] += 1
+                                if "\n" not in space:
+                                    dst.write(newline + scope.brace_indent)
+                                copied = match.start()
+                                stats["changed"] = True
+                            scope = None
+                        stack.pop()
+
+                    pos = match.end()
+
+                if need_more:
+                    continue
+                if eof:
+                    break
+                # 남은 내용이 공백/주석뿐이면 다음 청크를 읽습니다.
+
+            if not _TRIVIA_RE.match(buf, pos):
+                raise VdfSyntaxError(f"VDF 구문 오류: 해석할 수 없는 토큰: {buf[pos:pos + 20]!r}")
+            if stack:
+                raise VdfSyntaxError("VDF 구문 오류: 닫히지 않은 '{'")
+            dst.write(buf[copied:])
+
+        if stats["changed"]:
+            shutil.copymode(path, temp_path)
+            # 임시 파일은 호출한 쪽이 교체하거나 지웁니다.
+            kept, temp_path = temp_path, None
+            return stats, kept
+        return stats, None
+    finally:
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+# 메모리 편집용 패턴. 역슬래시, 주석, 조건식이 없으면 토큰은 따옴표 문자열과 따옴표 없는 문자열뿐이므로
+# users 노드와 그 아래의 평평한 사용자 노드를 정규식 몇 개로 바로 확인할 수 있습니다.
+_FAST_ATOM = r'"[^"]*"|[^\s{}"]+(?![^\s{}"])'
+_FAST_ROOT_RE = re.compile(r'\s*(?i:"users"|users)\s*\{')
+_FAST_USER_RE = re.compile(rf'(\s*)(?:{_FAST_ATOM})\s*\{{((?:\s*(?:{_FAST_ATOM})\s*(?:{_FAST_ATOM}))*)(\s*)\}}')
+_FAST_PAIR_RE = re.compile(rf'(\s*)({_FAST_ATOM})(\s*)({_FAST_ATOM})')
+_FAST_END_RE = re.compile(r'\s*\}\s*\Z')
+
+
+def _rewrite_in_memory(text: str, flags: dict):
+    """
+    작은 파일용 rewrite_user_flags 본체. 사용자 노드 단위로 정규식 매칭만 하고 바꿀 사용자 노드만 다시 조립합니다.
+    결과는 _rewrite_to_temp와 같습니다. 역슬래시/주석/조건식이 있거나, 최상위가 users 하나가 아니거나,
+    사용자 노드 안에 하위 노드가 있거나, 구문이 맞지 않으면 None을 반환해 스트리밍 편집기에 맡깁니다.
+    반환값: (stats, 새 내용)
+    """
+    if "\\" in text or "//" in text or "[" in text or "]" in text:
+        return None
+    match = _FAST_ROOT_RE.match(text)
+    if match is None:
+        return None
+    wanted = {key.lower(): (key, value) for key, value in flags.items()}
+    # _rewrite_to_temp와 같이 key 원문(소문자)으로 바로 조회합니다. 역슬래시가 없으므로 값은 두 형태만 허용됩니다.
+    raw_keys = {}
+    for lowered, (key, value) in wanted.items():
+        entry = (lowered, quote(value), {quote(value), value})
+        raw_keys[quote(lowered)] = raw_keys[lowered] = entry
+    stats = {"users": 0, "updated": 0, "inserted": 0, "changed": False}
+
+    out = []
+    copied = 0
+    pos = match.end()
+    while True:
+        match = _FAST_USER_RE.match(text, pos)
+        if match is None:
+            break
+        pos = match.end()
+        stats["users"] += 1
+        space, body, closing_space = match.groups()
+        pairs = _FAST_PAIR_RE.findall(body)
+        seen = set()
+        changed = False
+        for index, pair in enumerate(pairs):
+            entry = raw_keys.get(pair[1].lower())
+            if entry is None:
+                continue
+            lowered, quoted_target, accepted = entry
+            seen.add(lowered)
+            if pair[3] not in accepted:
+                pairs[index] = (pair[0], pair[1], pair[2], quoted_target)
+                stats["updated"] += 1
+                changed = True
+        if not changed and len(seen) == len(wanted):
+            continue
+        missing = [item for lowered, item in wanted.items() if lowered not in seen]
+
+        parts = ["".join(pair) for pair in pairs]
+        if missing:
+            brace_indent = _indent_of(space)
+            indent = _indent_of(pairs[0][0]) if pairs else brace_indent + "\t"
+            between = pairs[0][2] if pairs else "\t\t"
+            newline = "\r\n" if "\r\n" in closing_space or "\r\n" in space else "\n"
+            for key, value in missing:
+                parts.append(f"{newline}{indent}{quote(key)}{between}{quote(value)}")
+                stats["inserted"] += 1
+            if "\n" not in closing_space:
+                parts.append(newline + brace_indent)
+        out.append(text[copied:match.start(2)])
+        out.append("".join(parts))
+        copied = match.end(2)
+        stats["changed"] = True
+
+    if not _FAST_END_RE.match(text, pos):
+        return None
+    out.append(text[copied:])
+    return stats, "".join(out)
+
+
+def _write_replacing(path: str, content: str):
+    """content를 같은 디렉터리의 임시 파일에 쓰고 권한을 복사한 뒤 원자적으로 교체합니다."""
+    fd, temp_path = tempfile.mkstemp(prefix=".loginusers.", suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _file_signature(path: str):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+class PreparedRewrite:
+    """
+    prepare_user_flags로 미리 계산한 loginusers.vdf 변경 결과입니다.
+    in_memory_limit 이하인 파일은 새 내용을 메모리에 들고 있고, 큰 파일은 임시 파일에 써 둡니다.
+    commit()할 때 원본이 준비 이후 바뀌었으면(Steam이 다시 썼으면) 버리고 다시 계산합니다.
+    """
+
+    def __init__(self, path: str, flags: dict, chunk_size: int, in_memory_limit: int = IN_MEMORY_LIMIT):
+        self.path = path
+        self.flags = flags
+        self.chunk_size = chunk_size
+        self.in_memory_limit = in_memory_limit
+        self.temp_path = None
+        self._prepare()
+
+    def _prepare(self):
+        self.signature = _file_signature(self.path)
+        self.content = None
+        if self.signature[0] <= self.in_memory_limit:
+            with open(self.path, "r", encoding="utf-8", newline="") as f:
+                result = _rewrite_in_memory(f.read(), self.flags)
+            if result is not None:
+                self.stats, content = result
+                # 바뀐 바이트가 없으면 파일을 쓰지 않습니다.
+                self.content = content if self.stats["changed"] else None
+                return
+        self.stats, self.temp_path = _rewrite_to_temp(self.path, self.flags, self.chunk_size)
+
+    def commit(self) -> dict:
+        try:
+            if _file_signature(self.path) != self.signature:
+                self.discard()
+                self._prepare()
+            if self.temp_path is not None:
+                os.replace(self.temp_path, self.path)
+                self.temp_path = None
+            elif self.content is not None:
+                _write_replacing(self.path, self.content)
+            return self.stats
+        finally:
+            self.discard()
+
+    def discard(self):
+        if self.temp_path is not None and os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+        self.temp_path = None
+
+
+def prepare_user_flags(path: str, flags: dict, chunk_size: int = CHUNK_SIZE,
+                       in_memory_limit: int = IN_MEMORY_LIMIT) -> PreparedRewrite:
+    """rewrite_user_flags의 계산(읽기, 새 내용 준비)만 먼저 합니다. 적용은 commit()으로 합니다."""
+    return PreparedRewrite(path, flags, chunk_size, in_memory_limit)
+
+
+def rewrite_user_flags(path: str, flags: dict, chunk_size: int = CHUNK_SIZE, in_memory_limit: int = IN_MEMORY_LIMIT) -> dict:
+    """
+    loginusers.vdf의 모든 users/<SteamID64> 노드에 대해 flags의 값을 설정하거나 추가합니다.
+    작은 파일은 메모리에서 편집하고, in_memory_limit를 넘는 파일은 청크 단위로 한 번만 순차적으로 읽으며
+    바뀌지 않은 구간을 그대로 임시 파일에 복사합니다. 어느 쪽이든 변경 사항이 있을 때만 원자적으로 교체합니다.
+
+    반환값: {"users": 처리한 사용자 수, "updated": 변경된 값 수, "inserted": 추가된 키 수, "changed": 파일 변경 여부}
+    """
+    return prepare_user_flags(path, flags, chunk_size, in_memory_limit).commit()
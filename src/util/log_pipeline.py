@@ -0,0 +1,265 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from colorama import Fore, Style
+
+# 로그 타입별 수준 (싱크마다 이 값 이상만 기록)
+LEVELS = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "OK": 20,
+    "ROLLBACK": 20,
+    "SLEEP": 20,
+    "WARNING": 30,
+    "ERROR": 40,
+}
+DEFAULT_LEVEL = 20
+
+# 콘솔에 출력할 로그 타입별 색상
+LOG_COLORS = {
+    "INFO": Fore.CYAN,
+    "OK": Fore.GREEN,
+    "WARNING": Fore.YELLOW,
+    "ROLLBACK": Fore.YELLOW,
+    "SLEEP": Fore.YELLOW,
+    "ERROR": Fore.RED,
+}
+
+# 한 번에 꺼내 처리할 최대 레코드 수
+BATCH_SIZE = 256
+
+_STOP = object()
+
+
+class LogRecord:
+    __slots__ = ("type", "message", "wall", "mono", "thread", "fields")
+
+    def __init__(self, type: str, message: str, fields: dict = None):
+        self.type = type
+        self.message = message
+        self.wall = time.time()
+        self.mono = time.monotonic()
+        self.thread = threading.current_thread().name
+        self.fields = fields
+
+    @property
+    def level(self) -> int:
+        return LEVELS.get(self.type, DEFAULT_LEVEL)
+
+
+class LogSink:
+    """파이프라인의 출력 대상. write_batch는 기록 스레드에서만 호출됩니다."""
+
+    def __init__(self, min_level: int = 0):
+        self.min_level = min_level
+
+    def write_batch(self, records: list):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class ConsoleSink(LogSink):
+    """colorama 색상으로 콘솔에 출력합니다. 모인 레코드는 한 번에 씁니다."""
+
+    def __init__(self, colors: dict, min_level: int = 0, stream=None):
+        super().__init__(min_level)
+        self.colors = colors
+        self.stream = stream
+
+    def format(self, record: LogRecord) -> str:
+        color = self.colors.get(record.type, Fore.WHITE)  # 정의되지 않은 타입에 대비하여 기본 색상 설정
+        current_time = time.strftime("%d/%m/%Y - %H:%M:%S", time.localtime(record.wall))
+        return (f"{Style.DIM}{current_time} - {Style.RESET_ALL}{Style.BRIGHT}{color}[{Style.RESET_ALL}{record.type}"
+                f"{Style.BRIGHT}{color}] {Style.RESET_ALL}{Style.BRIGHT}{Fore.WHITE}{record.message}")
+
+    def write_batch(self, records: list):
+        stream = self.stream or sys.stdout
+        stream.write("".join(self.format(record) + "\n" for record in records))
+
+    def flush(self):
+        (self.stream or sys.stdout).flush()
+
+
+class JsonLinesSink(LogSink):
+    """
+    레코드를 한 줄에 하나씩 JSON으로 기록하고, 파일이 max_bytes를 넘으면 .1, .2 ... 로 돌려 씁니다.
+    mono는 프로세스 안에서 단조 증가하는 시각(초)이라 단계 사이 간격을 계산할 때 사용합니다.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 3, min_level: int = 0):
+        super().__init__(min_level)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._size = os.path.getsize(path)
+
+    def _rotate(self):
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._size = 0
+
+    def write_batch(self, records: list):
+        for record in records:
+            entry = {
+                "ts": round(record.wall, 6),
+                "mono": round(record.mono, 6),
+                "type": record.type,
+                "thread": record.thread,
+                "message": record.message,
+            }
+            if record.fields:
+                entry.update(record.fields)
+            # JSON으로 바꿀 수 없는 값은 문자열로 남겨, 레코드 하나 때문에 묶음 전체를 잃지 않도록 합니다.
+            try:
+                line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+            except (TypeError, ValueError):
+                # 문자열이 아닌 키나 순환 참조는 default로도 처리되지 않습니다.
+                entry.update((str(key), str(value)) for key, value in record.fields.items())
+                for key in [key for key in entry if not isinstance(key, str)]:
+                    del entry[key]
+                line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+            size = len(line.encode("utf-8"))
+            if self.max_bytes and self._size and self._size + size > self.max_bytes:
+                self._rotate()
+            self._file.write(line)
+            self._size += size
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class LogPipeline:
+    """
+    로그 호출 스레드는 큐에 넣기만 하고, 기록 스레드 하나가 모아서 각 싱크에 씁니다.
+    동시에 실행되는 단계(다운로드, 검사, 플릿 실행)가 콘솔 출력 때문에 서로 기다리지 않습니다.
+    """
+
+    def __init__(self, sinks: list = None):
+        self.sinks = list(sinks or [])
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.dropped = 0
+
+    def add_sink(self, sink: LogSink):
+        self.flush()
+        self.sinks.append(sink)
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                    self._thread.start()
+
+    def submit(self, record: LogRecord):
+        self._ensure_started()
+        self._queue.put(record)
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            batch = [record]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            records = [item for item in batch if item is not _STOP and not isinstance(item, threading.Event)]
+            for sink in self.sinks:
+                selected = [item for item in records if item.level >= sink.min_level]
+                if not selected:
+                    continue
+                try:
+                    sink.write_batch(selected)
+                    sink.flush()
+                except Exception:
+                    # 로그 기록 실패로 프로그램이 멈추지 않도록 합니다.
+                    self.dropped += len(selected)
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if stop:
+                return
+
+    def flush(self, timeout: float = 5.0):
+        """지금까지 넣은 레코드가 모두 기록될 때까지 기다립니다. (input() 전, 종료 전)"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout=5)
+        self._thread = None
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception:
+                pass
+
+
+class PipelineHandler(logging.Handler):
+    """표준 logging 레코드를 파이프라인으로 보냅니다."""
+
+    def __init__(self, pipeline: LogPipeline = None, level=logging.NOTSET):
+        super().__init__(level)
+        self.pipeline = pipeline
+
+    def emit(self, record: logging.LogRecord):
+        pipeline = self.pipeline or get_pipeline()
+        type = record.levelname if record.levelname in LEVELS else ("ERROR" if record.levelno >= logging.ERROR else "INFO")
+        pipeline.submit(LogRecord(type, self.format(record), {"logger": record.name}))
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline() -> LogPipeline:
+    """프로세스 전체에서 공유하는 파이프라인. 처음에는 콘솔 싱크만 가집니다."""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = LogPipeline([ConsoleSink(LOG_COLORS)])
+            atexit.register(_pipeline.close)
+        return _pipeline
+
+
+def configure(json_path: str = None, console_level: str = "INFO", file_level: str = "INFO",
+              max_bytes: int = 10 * 1024 * 1024, backup_count: int = 3) -> LogPipeline:
+    """공유 파이프라인의 콘솔 수준을 정하고, json_path가 있으면 JSON-lines 파일 싱크를 추가합니다."""
+    pipeline = get_pipeline()
+    for sink in pipeline.sinks:
+        if isinstance(sink, ConsoleSink):
+            sink.min_level = LEVELS.get(console_level, DEFAULT_LEVEL)
+    if json_path:
+        pipeline.add_sink(JsonLinesSink(json_path, max_bytes, backup_count, LEVELS.get(file_level, DEFAULT_LEVEL)))
+    return pipeline
@@ -1,32 +1,31 @@
 import time
 from sys import exit
 from os import system, name
-from datetime import datetime
-from colorama import Fore, Style
+from src.util import log_pipeline
+
 
 class Logger:
 
-    def __init__(self):
-        self.log_types = {
-            "INFO": Fore.CYAN,
-            "OK": Fore.GREEN,
-            "WARNING": Fore.YELLOW,
-            "ROLLBACK": Fore.YELLOW,
-            "SLEEP": Fore.YELLOW,
-            "ERROR": Fore.RED,
-        }
+    def __init__(self, pipeline: log_pipeline.LogPipeline = None):
+        self.log_types = log_pipeline.LOG_COLORS
+        # 모든 Logger는 기본적으로 하나의 공유 파이프라인에 기록합니다.
+        self.pipeline = pipeline or log_pipeline.get_pipeline()
 
     def clear(self):
+        self.flush()
         system("cls" if name in ("nt", "dos") else "clear")
 
+    def flush(self):
+        """큐에 남은 로그를 모두 출력합니다. input()으로 입력을 받기 전에 호출합니다."""
+        self.pipeline.flush()
+
     def exit_program(self):
         self.log("INFO", "Bye!")
+        self.flush()
         time.sleep(2)
         exit()
 
 
-    def log(self, type, message):
-        color = self.log_types.get(type, Fore.WHITE) # 정의되지 않은 타입에 대비하여 기본 색상 설정
-        now = datetime.now()
-        current_time = now.strftime("%d/%m/%Y - %H:%M:%S")
-        print(f"{Style.DIM}{current_time} - {Style.RESET_ALL}{Style.BRIGHT}{color}[{Style.RESET_ALL}{type}{Style.BRIGHT}{color}] {Style.RESET_ALL}{Style.BRIGHT}{Fore.WHITE}{message}")
\ No newline at end of file
+    def log(self, type, message, **fields):
+        # 호출한 스레드에서는 레코드를 큐에 넣기만 하고, 출력은 기록 스레드가 합니다.
+        self.pipeline.submit(log_pipeline.LogRecord(type, message, fields or None))
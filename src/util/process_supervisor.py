@@ -0,0 +1,461 @@
+import os
+import select
+import subprocess
+import threading
+import time
+
+# Steam 관련 프로세스 이름 (소문자)
+STEAM_PROCESS_NAMES = ("steam.exe", "steamwebhelper.exe", "steamservice.exe")
+# run(cancel=...)에서 취소 요청을 확인하는 간격 (초)
+CANCEL_POLL_INTERVAL = 0.05
+# 프로세스 종료를 기다리는 제한 시간 (초)
+KILL_WAIT_TIMEOUT = 15
+# /proc/<pid>/stat의 comm 최대 길이 (TASK_COMM_LEN - 1). 이보다 긴 이름은 잘려 있습니다.
+COMM_LENGTH = 15
+
+
+class WaitResult:
+    """프로세스 대기 결과. elapsed는 실제로 관찰한 대기 시간(초)입니다."""
+
+    __slots__ = ("ok", "elapsed", "pids", "returncode")
+
+    def __init__(self, ok: bool, elapsed: float, pids=(), returncode=None):
+        self.ok = ok
+        self.elapsed = elapsed
+        self.pids = tuple(pids)
+        self.returncode = returncode
+
+    @property
+    def elapsed_ms(self) -> float:
+        return self.elapsed * 1000
+
+    def __bool__(self):
+        return self.ok
+
+    def __repr__(self):
+        return f"WaitResult(ok={self.ok}, elapsed={self.elapsed_ms:.1f}ms, pids={self.pids}, returncode={self.returncode})"
+
+
+class ProcessBackend:
+    """플랫폼별 프로세스 조회/대기 구현의 공통 인터페이스"""
+
+    def find(self, names) -> list:
+        """이름이 names 중 하나인 실행 중 프로세스의 pid 목록"""
+        raise NotImplementedError
+
+    def wait_pids(self, pids, timeout: float) -> bool:
+        """pids가 모두 종료될 때까지 대기합니다. 시간 안에 종료되면 True"""
+        raise NotImplementedError
+
+    def snapshot(self) -> list:
+        """실행 중인 모든 프로세스의 (pid, ppid, 소문자 이름) 목록"""
+        raise NotImplementedError
+
+    def terminate(self, pid: int):
+        """프로세스를 강제로 종료합니다. 실패하면 OSError를 발생시킵니다."""
+        raise NotImplementedError
+
+    def start_time(self, pid: int):
+        """
+        프로세스 생성 시각. 같은 백엔드가 돌려준 값끼리만 비교할 수 있습니다.
+        알 수 없거나(종료됨, 접근 거부) 지원하지 않으면 None
+        """
+        return None
+
+    def wait_spawn(self, names, timeout: float) -> list:
+        """names 중 하나가 실행될 때까지 대기하고 pid 목록을 반환합니다."""
+        deadline = time.monotonic() + timeout
+        while True:
+            pids = self.find(names)
+            if pids:
+                return pids
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            time.sleep(min(0.05, remaining))
+
+    def spawn(self, command, shell: bool = False):
+        creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+        return subprocess.Popen(command, shell=shell, creationflags=creationflags)
+
+
+class WindowsProcessBackend(ProcessBackend):
+    """Toolhelp32 스냅샷으로 조회하고 프로세스 핸들에서 종료 이벤트를 기다립니다."""
+
+    PROCESS_TERMINATE = 0x0001
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    SYNCHRONIZE = 0x00100000
+    ERROR_INVALID_PARAMETER = 87
+    TH32CS_SNAPPROCESS = 0x00000002
+    WAIT_OBJECT_0 = 0x00000000
+    WAIT_TIMEOUT = 0x00000102
+    MAXIMUM_WAIT_OBJECTS = 64
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        self.ctypes = ctypes
+        self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+        class PROCESSENTRY32W(ctypes.Structure):
+            _fields_ = [
+                ("dwSize", wintypes.DWORD),
+                ("cntUsage", wintypes.DWORD),
+                ("th32ProcessID", wintypes.DWORD),
+                ("th32DefaultHeapID", ctypes.c_void_p),
+                ("th32ModuleID", wintypes.DWORD),
+                ("cntThreads", wintypes.DWORD),
+                ("th32ParentProcessID", wintypes.DWORD),
+                ("pcPriClassBase", ctypes.c_long),
+                ("dwFlags", wintypes.DWORD),
+                ("szExeFile", wintypes.WCHAR * 260),
+            ]
+
+        self.PROCESSENTRY32W = PROCESSENTRY32W
+        self.kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        self.kernel32.OpenProcess.restype = wintypes.HANDLE
+        self.kernel32.WaitForMultipleObjects.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD]
+        self.kernel32.GetProcessTimes.argtypes = [wintypes.HANDLE] + [ctypes.POINTER(wintypes.FILETIME)] * 4
+
+    def snapshot(self):
+        """(pid, ppid, 소문자 이름) 목록"""
+        ctypes = self.ctypes
+        handle = self.kernel32.CreateToolhelp32Snapshot(self.TH32CS_SNAPPROCESS, 0)
+        if handle in (None, ctypes.c_void_p(-1).value):
+            raise OSError(ctypes.get_last_error(), "CreateToolhelp32Snapshot 실패")
+        entries = []
+        try:
+            entry = self.PROCESSENTRY32W()
+            entry.dwSize = ctypes.sizeof(entry)
+            ok = self.kernel32.Process32FirstW(handle, ctypes.byref(entry))
+            while ok:
+                entries.append((entry.th32ProcessID, entry.th32ParentProcessID, entry.szExeFile.lower()))
+                ok = self.kernel32.Process32NextW(handle, ctypes.byref(entry))
+        finally:
+            self.kernel32.CloseHandle(handle)
+        return entries
+
+    def find(self, names) -> list:
+        wanted = {name.lower() for name in names}
+        return [pid for pid, _, name in self.snapshot() if name in wanted]
+
+    def terminate(self, pid: int):
+        handle = self.kernel32.OpenProcess(self.PROCESS_TERMINATE, False, pid)
+        if not handle:
+            error = self.ctypes.get_last_error()
+            # 이미 종료된 프로세스는 성공으로 취급합니다.
+            if error == self.ERROR_INVALID_PARAMETER:
+                return
+            raise OSError(error, f"OpenProcess 실패 (pid {pid})")
+        try:
+            if not self.kernel32.TerminateProcess(handle, 1):
+                raise OSError(self.ctypes.get_last_error(), f"TerminateProcess 실패 (pid {pid})")
+        finally:
+            self.kernel32.CloseHandle(handle)
+
+    def start_time(self, pid: int):
+        """GetProcessTimes의 생성 시각 (FILETIME, 100ns 단위)"""
+        from ctypes import wintypes
+        handle = self.kernel32.OpenProcess(self.PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return None
+        try:
+            times = [wintypes.FILETIME() for _ in range(4)]
+            if not self.kernel32.GetProcessTimes(handle, *(self.ctypes.byref(value) for value in times)):
+                return None
+            return (times[0].dwHighDateTime << 32) | times[0].dwLowDateTime
+        finally:
+            self.kernel32.CloseHandle(handle)
+
+    def wait_pids(self, pids, timeout: float) -> bool:
+        from ctypes import wintypes
+        handles = []
+        try:
+            for pid in pids:
+                handle = self.kernel32.OpenProcess(self.SYNCHRONIZE, False, pid)
+                # 이미 종료되어 핸들을 열 수 없으면 대기할 필요가 없습니다.
+                if handle:
+                    handles.append(handle)
+            deadline = time.monotonic() + timeout
+            for start in range(0, len(handles), self.MAXIMUM_WAIT_OBJECTS):
+                batch = handles[start:start + self.MAXIMUM_WAIT_OBJECTS]
+                remaining_ms = max(0, int((deadline - time.monotonic()) * 1000))
+                array = (wintypes.HANDLE * len(batch))(*batch)
+                result = self.kernel32.WaitForMultipleObjects(len(batch), array, True, remaining_ms)
+                if result == self.WAIT_TIMEOUT or result >= self.WAIT_OBJECT_0 + len(batch):
+                    return False
+            return True
+        finally:
+            for handle in handles:
+                self.kernel32.CloseHandle(handle)
+
+
+class ProcfsProcessBackend(ProcessBackend):
+    """Linux /proc 기반 구현. 가능하면 pidfd로 종료 이벤트를 기다립니다."""
+
+    def __init__(self, proc_root: str = "/proc"):
+        self.proc_root = proc_root
+
+    def snapshot(self):
+        entries = []
+        for entry in os.scandir(self.proc_root):
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(os.path.join(entry.path, "stat"), "r", encoding="utf-8", errors="replace") as f:
+                    stat = f.read()
+            except OSError:
+                continue
+            # stat 형식: pid (comm) state ppid ...
+            name = stat[stat.find("(") + 1:stat.rfind(")")]
+            fields = stat[stat.rfind(")") + 2:].split()
+            # 좀비 프로세스는 이미 종료된 것으로 취급합니다.
+            if fields[0] == "Z":
+                continue
+            if len(name) >= COMM_LENGTH:
+                name = self._full_name(entry.path, name)
+            entries.append((int(entry.name), int(fields[1]), name.lower()))
+        return entries
+
+    @staticmethod
+    def _full_name(pid_path: str, comm: str) -> str:
+        """
+        커널은 comm을 15자에서 자르므로 ("steamwebhelper.exe" -> "steamwebhelper.") 잘린 이름은 cmdline의 argv[0]
+        파일 이름으로 바꿉니다. Wine 프로세스의 argv[0]은 Windows 경로이므로 ntpath로 자릅니다.
+        argv[0]이 comm으로 시작하지 않으면 (argv를 바꾼 프로세스, 커널 스레드) comm을 그대로 씁니다.
+        """
+        import ntpath
+        try:
+            with open(os.path.join(pid_path, "cmdline"), "rb") as f:
+                argv0 = f.read(4096).split(b"\0", 1)[0].decode("utf-8", errors="replace")
+        except OSError:
+            return comm
+        name = ntpath.basename(argv0)
+        return name if name.lower().startswith(comm.lower()) else comm
+
+    def find(self, names) -> list:
+        wanted = {name.lower() for name in names}
+        return [pid for pid, _, name in self.snapshot() if name in wanted]
+
+    def terminate(self, pid: int):
+        import signal
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def start_time(self, pid: int):
+        """/proc/<pid>/stat의 starttime (부팅 후 클럭 틱)"""
+        try:
+            with open(os.path.join(self.proc_root, str(pid), "stat"), "r", encoding="utf-8", errors="replace") as f:
+                stat = f.read()
+        except OSError:
+            return None
+        # ")" 뒤 필드는 3번째(state)부터 시작하므로 22번째 필드(starttime)는 20번째 값입니다.
+        return int(stat[stat.rfind(")") + 2:].split()[19])
+
+    def _alive(self, pid: int) -> bool:
+        try:
+            with open(os.path.join(self.proc_root, str(pid), "stat"), "r", encoding="utf-8", errors="replace") as f:
+                stat = f.read()
+        except OSError:
+            return False
+        return stat[stat.rfind(")") + 2:stat.rfind(")") + 3] != "Z"
+
+    def wait_pids(self, pids, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        pidfd_open = getattr(os, "pidfd_open", None)
+        for pid in pids:
+            fd = None
+            if pidfd_open is not None:
+                try:
+                    fd = pidfd_open(pid)
+                except OSError:
+                    fd = None
+            try:
+                if fd is not None:
+                    poller = select.poll()
+                    poller.register(fd, select.POLLIN)
+                    remaining = max(0.0, deadline - time.monotonic())
+                    if not poller.poll(remaining * 1000):
+                        return False
+                    continue
+                while self._alive(pid):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    time.sleep(min(0.02, remaining))
+            finally:
+                if fd is not None:
+                    os.close(fd)
+        return True
+
+
+class FakeProcessBackend(ProcessBackend):
+    """
+    테스트/벤치마크용 메모리 내 프로세스 테이블입니다.
+    add()/exit()로 프로세스 생성과 종료를 흉내 내며, 대기 중인 스레드는 즉시 깨어납니다.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._processes = {}  # pid -> (ppid, 소문자 이름)
+        self._started = {}    # pid -> 생성 순서 (start_time)
+        self._next_pid = 1000
+        self._clock = 0
+        self.spawned = []
+        self.protected = set()  # terminate()가 실패하도록 지정한 pid (접근 거부 흉내)
+        self.terminated = []
+
+    def add(self, name: str, ppid: int = 0, pid: int = None, started: int = None) -> int:
+        """started를 주면 그 값을 생성 시각으로 씁니다. (부모보다 먼저 생긴 프로세스, pid 재사용 흉내)"""
+        with self._condition:
+            if pid is None:
+                self._next_pid += 1
+                pid = self._next_pid
+            self._clock = self._clock + 1 if started is None else max(self._clock, started)
+            self._processes[pid] = (ppid, name.lower())
+            self._started[pid] = self._clock if started is None else started
+            self._condition.notify_all()
+            return pid
+
+    def exit(self, pid: int):
+        with self._condition:
+            self._processes.pop(pid, None)
+            self._started.pop(pid, None)
+            self._condition.notify_all()
+
+    def exit_later(self, pid: int, delay: float):
+        timer = threading.Timer(delay, self.exit, args=(pid,))
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def terminate(self, pid: int):
+        if pid in self.protected:
+            raise PermissionError(5, f"액세스가 거부되었습니다 (pid {pid})")
+        self.terminated.append(pid)
+        self.exit(pid)
+
+    def snapshot(self):
+        with self._condition:
+            return [(pid, ppid, name) for pid, (ppid, name) in self._processes.items()]
+
+    def start_time(self, pid: int):
+        with self._condition:
+            return self._started.get(pid)
+
+    def find(self, names) -> list:
+        wanted = {name.lower() for name in names}
+        with self._condition:
+            return [pid for pid, (_, name) in self._processes.items() if name in wanted]
+
+    def wait_pids(self, pids, timeout: float) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: not any(pid in self._processes for pid in pids), timeout)
+
+    def wait_spawn(self, names, timeout: float) -> list:
+        wanted = {name.lower() for name in names}
+        with self._condition:
+            self._condition.wait_for(lambda: any(name in wanted for _, name in self._processes.values()), timeout)
+            return [pid for pid, (_, name) in self._processes.items() if name in wanted]
+
+    def spawn(self, command, shell: bool = False):
+        self.spawned.append(command)
+        return subprocess.Popen(command, shell=shell)
+
+
+def _as_events(cancel) -> tuple:
+    """cancel 인자(None, Event, Event 목록)를 Event 튜플로 바꿉니다."""
+    if cancel is None:
+        return ()
+    if isinstance(cancel, (list, tuple)):
+        return tuple(event for event in cancel if event is not None)
+    return (cancel,)
+
+
+def default_backend() -> ProcessBackend:
+    if os.name == "nt":
+        return WindowsProcessBackend()
+    return ProcfsProcessBackend()
+
+
+class ProcessSupervisor:
+    """
+    고정 시간 sleep 대신 실제 프로세스 종료/생성 이벤트를 기다립니다.
+    모든 대기는 관찰된 지연 시간을 WaitResult로 돌려줍니다.
+    """
+
+    def __init__(self, backend: ProcessBackend = None):
+        self.backend = backend or default_backend()
+
+    def wait_for_exit(self, names=STEAM_PROCESS_NAMES, timeout: float = 15.0, cancel=None) -> WaitResult:
+        """
+        names 프로세스가 모두 종료될 때까지 대기합니다. 대기 중 새로 생긴 인스턴스도 기다립니다.
+        cancel(Event 또는 Event 목록)이 설정되면 더 기다리지 않고 ok=False를 반환합니다.
+        """
+        cancels = _as_events(cancel)
+        started = time.monotonic()
+        deadline = started + timeout
+        seen = set()
+        while True:
+            pids = self.backend.find(names)
+            if not pids:
+                return WaitResult(True, time.monotonic() - started, seen)
+            seen.update(pids)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or any(event.is_set() for event in cancels):
+                return WaitResult(False, time.monotonic() - started, seen)
+            if not self.backend.wait_pids(pids, min(remaining, CANCEL_POLL_INTERVAL) if cancels else remaining):
+                if not cancels or time.monotonic() >= deadline:
+                    return WaitResult(False, time.monotonic() - started, seen)
+
+    def wait_for_spawn(self, names=STEAM_PROCESS_NAMES, timeout: float = 15.0) -> WaitResult:
+        started = time.monotonic()
+        pids = self.backend.wait_spawn(names, timeout)
+        return WaitResult(bool(pids), time.monotonic() - started, pids)
+
+    def run(self, command, timeout: float = None, shell: bool = False, cancel=None,
+            kill_names=STEAM_PROCESS_NAMES) -> WaitResult:
+        """
+        명령을 실행하고 종료될 때까지 대기합니다. 시간이 초과되면 실행한 프로세스와 kill_names 프로세스 트리를
+        종료한 뒤 ok=False를 반환합니다.
+        cancel(Event 또는 Event 목록) 중 하나가 설정되면 더 기다리지 않고 ok=False(returncode None)를 반환합니다.
+        (프로세스 종료는 호출한 쪽에서)
+        """
+        cancels = _as_events(cancel)
+        started = time.monotonic()
+        process = self.backend.spawn(command, shell=shell)
+        deadline = None if timeout is None else started + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                self._kill_timed_out(process, kill_names)
+                return WaitResult(False, time.monotonic() - started, (process.pid,))
+            try:
+                if not cancels:
+                    returncode = process.wait(timeout=remaining)
+                else:
+                    returncode = process.wait(timeout=CANCEL_POLL_INTERVAL if remaining is None else min(remaining, CANCEL_POLL_INTERVAL))
+                return WaitResult(returncode == 0, time.monotonic() - started, (process.pid,), returncode)
+            except subprocess.TimeoutExpired:
+                if any(event.is_set() for event in cancels):
+                    return WaitResult(False, time.monotonic() - started, (process.pid,))
+
+    def _kill_timed_out(self, process, kill_names):
+        """시간이 초과된 프로세스와 그 프로세스가 띄운 kill_names 프로세스 트리를 종료합니다."""
+        # process_table이 이 모듈을 가져오므로 여기서 가져옵니다.
+        from src.util.process_table import ProcessTable
+
+        try:
+            process.kill()
+        except OSError:
+            pass
+        if kill_names:
+            ProcessTable(self.backend).kill_tree(kill_names)
+            self.wait_for_exit(kill_names, timeout=KILL_WAIT_TIMEOUT)
+        try:
+            process.wait(timeout=KILL_WAIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            pass
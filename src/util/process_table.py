@@ -0,0 +1,113 @@
+import time
+from src.util.process_supervisor import ProcessBackend, default_backend
+
+
+class ProcessInfo:
+    __slots__ = ("pid", "ppid", "name")
+
+    def __init__(self, pid: int, ppid: int, name: str):
+        self.pid = pid
+        self.ppid = ppid
+        self.name = name
+
+    def __repr__(self):
+        return f"ProcessInfo(pid={self.pid}, ppid={self.ppid}, name={self.name!r})"
+
+
+class KillResult:
+    """프로세스 트리 종료 결과"""
+
+    def __init__(self, matched: list, terminated: list, failed: dict, elapsed: float):
+        self.matched = matched          # 이름으로 찾은 프로세스와 그 자식 (ProcessInfo)
+        self.terminated = terminated    # 종료에 성공한 pid
+        self.failed = failed            # pid -> 예외
+        self.elapsed = elapsed
+
+    @property
+    def was_running(self) -> bool:
+        return bool(self.matched)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def __repr__(self):
+        return f"KillResult(matched={len(self.matched)}, terminated={len(self.terminated)}, failed={len(self.failed)}, elapsed={self.elapsed * 1000:.1f}ms)"
+
+
+class ProcessTable:
+    """
+    프로세스 테이블을 프로세스 내에서 직접 조회하고 종료합니다.
+    taskkill 같은 외부 명령을 실행하지 않으므로 서브프로세스 비용과 로케일에 따른 출력 차이가 없습니다.
+    """
+
+    def __init__(self, backend: ProcessBackend = None):
+        self.backend = backend or default_backend()
+
+    def snapshot(self) -> list:
+        return [ProcessInfo(pid, ppid, name) for pid, ppid, name in self.backend.snapshot()]
+
+    def match(self, names, include_children: bool = True) -> list:
+        """
+        이름이 일치하는 프로세스와 (선택적으로) 모든 자손 프로세스를 반환합니다.
+        자손이 부모보다 먼저 오도록 정렬하여 그대로 종료 순서로 사용할 수 있습니다.
+        Windows는 부모가 종료되어도 ppid를 바꾸지 않고 pid를 재사용하므로, taskkill /T처럼
+        부모보다 나중에 생성된 프로세스만 자식으로 봅니다. (부모 pid를 물려받은 관계없는 프로세스 제외)
+        """
+        wanted = {name.lower() for name in names}
+        processes = self.snapshot()
+        roots = [process for process in processes if process.name in wanted]
+        if not include_children:
+            return roots
+
+        children = {}
+        for process in processes:
+            children.setdefault(process.ppid, []).append(process)
+
+        ordered = []
+        visited = set()
+        started = {}
+
+        def start_time(pid):
+            if pid not in started:
+                started[pid] = self.backend.start_time(pid)
+            return started[pid]
+
+        def is_child(parent, child) -> bool:
+            # pid 재사용으로 자기 자신을 가리키는 경우를 방지합니다.
+            if child.pid == parent.pid:
+                return False
+            parent_started = start_time(parent.pid)
+            if parent_started is None:
+                # 생성 시각을 지원하지 않는 백엔드 (또는 부모를 열 수 없음)
+                return True
+            child_started = start_time(child.pid)
+            # 자식의 생성 시각을 확인할 수 없거나 부모보다 먼저 생성되었으면 다른 프로세스가 pid를 물려받은 것입니다.
+            return child_started is not None and child_started >= parent_started
+
+        def visit(process):
+            if process.pid in visited:
+                return
+            visited.add(process.pid)
+            for child in children.get(process.pid, ()):
+                if is_child(process, child):
+                    visit(child)
+            ordered.append(process)
+
+        for root in roots:
+            visit(root)
+        return ordered
+
+    def kill_tree(self, names) -> KillResult:
+        """이름이 일치하는 프로세스와 그 자손을 한 번에 종료합니다."""
+        started = time.monotonic()
+        matched = self.match(names)
+        terminated = []
+        failed = {}
+        for process in matched:
+            try:
+                self.backend.terminate(process.pid)
+                terminated.append(process.pid)
+            except OSError as e:
+                failed[process.pid] = e
+        return KillResult(matched, terminated, failed, time.monotonic() - started)
@@ -0,0 +1,240 @@
+import json
+import platform
+import sqlite3
+import threading
+import time
+
+OUTCOME_OK = "ok"
+OUTCOME_FAILED = "failed"
+OUTCOME_INTERRUPTED = "interrupted"
+
+# 기준값(이전 실행의 중앙값)보다 이 비율 이상 느려진 단계를 회귀로 봅니다.
+DEFAULT_THRESHOLD = 0.25
+# 기준값을 계산할 이전 성공 실행 수
+DEFAULT_WINDOW = 20
+# 이보다 적게 늘어난 단계는 비율이 커도 회귀로 보지 않습니다. (몇 ms 단계의 흔들림 제외)
+DEFAULT_MIN_DELTA = 0.05
+PERCENTILES = (50, 90, 95)
+_ANY = object()
+
+# 자주 조회하는 값은 열로 두고, 나머지 실행 결과 값은 metrics(JSON)에 모두 넣습니다.
+RUN_COLUMNS = ("target_build", "build_before", "build_after", "wayback_date", "install_method",
+               "bytes_downloaded", "cache_hits", "cache_misses")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    elapsed REAL NOT NULL,
+    command TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    error TEXT,
+    host TEXT,
+    target_build TEXT,
+    build_before TEXT,
+    build_after TEXT,
+    wayback_date TEXT,
+    install_method TEXT,
+    bytes_downloaded INTEGER,
+    cache_hits INTEGER,
+    cache_misses INTEGER,
+    metrics TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_command ON runs (command, id);
+CREATE TABLE IF NOT EXISTS phases (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    elapsed REAL NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS phases_name ON phases (name, run_id);
+"""
+
+
+def percentile(values: list, q: float) -> float:
+    """정렬된 values의 q 백분위수 (선형 보간). 값이 없으면 None"""
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class RunRecord:
+    """실행 기록 한 건"""
+
+    __slots__ = ("id", "started", "elapsed", "command", "outcome", "error", "host") + RUN_COLUMNS + ("metrics", "phases")
+
+    def __init__(self, row: tuple, phases: dict = None):
+        for name, value in zip(self.__slots__, row):
+            setattr(self, name, value)
+        self.metrics = json.loads(self.metrics) if self.metrics else {}
+        self.phases = phases or {}
+
+    @property
+    def cache_hit_rate(self):
+        if self.cache_hits is None or self.cache_misses is None:
+            return None
+        total = self.cache_hits + self.cache_misses
+        return self.cache_hits / total if total else None
+
+    @property
+    def date(self) -> str:
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started))
+
+    def __repr__(self):
+        return f"RunRecord(#{self.id} {self.command} {self.outcome}, {self.elapsed:.2f}s, build={self.target_build})"
+
+
+class PhaseStats:
+    __slots__ = ("name", "count", "percentiles", "latest")
+
+    def __init__(self, name: str, values: list, latest: float = None):
+        ordered = sorted(values)
+        self.name = name
+        self.count = len(ordered)
+        self.percentiles = {q: percentile(ordered, q) for q in PERCENTILES}
+        self.latest = latest
+
+    def __repr__(self):
+        return f"PhaseStats({self.name}, n={self.count}, p50={self.percentiles[50]})"
+
+
+class Regression:
+    """최근 실행에서 기준값보다 느려진 단계"""
+
+    __slots__ = ("name", "latest", "baseline", "samples")
+
+    def __init__(self, name: str, latest: float, baseline: float, samples: int):
+        self.name = name
+        self.latest = latest
+        self.baseline = baseline
+        self.samples = samples
+
+    @property
+    def ratio(self) -> float:
+        return self.latest / self.baseline if self.baseline > 0 else float("inf")
+
+    def __repr__(self):
+        return f"Regression({self.name}, {self.baseline:.3f}s -> {self.latest:.3f}s, x{self.ratio:.2f})"
+
+
+class RunLedger:
+    """
+    main.py 실행 기록 (SQLite). 실행마다 명령, 결과, 대상 빌드, 받은 바이트, 캐시 적중과 단계별 소요 시간을 남깁니다.
+    단계 시간은 Tracer.totals()(같은 이름의 구간 합)이며, 명령별로 백분위수와 회귀 여부를 계산합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def record(self, command: str, outcome: str, started: float, elapsed: float, phases: dict,
+               metrics: dict = None, error: str = None) -> int:
+        """실행 한 건을 기록하고 id를 반환합니다. started는 time.time() 기준 시작 시각입니다."""
+        metrics = dict(metrics or {})
+        columns = [metrics.pop(name, None) for name in RUN_COLUMNS]
+        row = (started, elapsed, command, outcome, error, platform.node(), *columns,
+               json.dumps(metrics, ensure_ascii=False, default=str) if metrics else None)
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                f"INSERT INTO runs (started, elapsed, command, outcome, error, host, {', '.join(RUN_COLUMNS)}, metrics) "
+                f"VALUES ({', '.join('?' * len(row))})", row)
+            run_id = cursor.lastrowid
+            self._db.executemany("INSERT INTO phases VALUES (?, ?, ?)",
+                                 [(run_id, name, float(value)) for name, value in phases.items()])
+        return run_id
+
+    def _phases_of(self, run_ids: list) -> dict:
+        phases = {run_id: {} for run_id in run_ids}
+        if run_ids:
+            placeholders = ", ".join("?" * len(run_ids))
+            for run_id, name, elapsed in self._db.execute(
+                    f"SELECT run_id, name, elapsed FROM phases WHERE run_id IN ({placeholders})", run_ids):
+                phases[run_id][name] = elapsed
+        return phases
+
+    def runs(self, command: str = None, limit: int = 20, outcome: str = None, up_to: int = None,
+             install_method=_ANY) -> list:
+        """최근 실행부터 limit건 (RunRecord, 단계 시간 포함). up_to를 주면 그 id 이하의 실행만"""
+        conditions, params = [], []
+        if install_method is not _ANY:
+            conditions.append("install_method IS ?")
+            params.append(install_method)
+        if command:
+            conditions.append("command = ?")
+            params.append(command)
+        if outcome:
+            conditions.append("outcome = ?")
+            params.append(outcome)
+        if up_to is not None:
+            conditions.append("id <= ?")
+            params.append(up_to)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        columns = ", ".join(RunRecord.__slots__[:-1])
+        with self._lock:
+            rows = self._db.execute(f"SELECT {columns} FROM runs {where} ORDER BY id DESC LIMIT ?",
+                                    (*params, limit)).fetchall()
+            phases = self._phases_of([row[0] for row in rows])
+        return [RunRecord(row, phases[row[0]]) for row in rows]
+
+    def commands(self) -> list:
+        """기록된 명령과 실행 수 [(명령, 실행 수, 마지막 실행 시각)]"""
+        with self._lock:
+            return self._db.execute("SELECT command, COUNT(*), MAX(started) FROM runs GROUP BY command "
+                                    "ORDER BY MAX(started) DESC").fetchall()
+
+    def phase_stats(self, command: str, window: int = DEFAULT_WINDOW) -> list:
+        """command의 최근 성공 실행 window건에서 단계별 백분위수 (전체 실행 시간은 'total')"""
+        runs = self.runs(command, limit=window, outcome=OUTCOME_OK)
+        samples = {"total": [run.elapsed for run in runs]} if runs else {}
+        for run in runs:
+            for name, elapsed in run.phases.items():
+                samples.setdefault(name, []).append(elapsed)
+        latest = dict(runs[0].phases, total=runs[0].elapsed) if runs else {}
+        stats = [PhaseStats(name, values, latest.get(name)) for name, values in samples.items()]
+        return sorted(stats, key=lambda item: item.percentiles[50], reverse=True)
+
+    def regressions(self, command: str, threshold: float = DEFAULT_THRESHOLD, window: int = DEFAULT_WINDOW,
+                    min_delta: float = DEFAULT_MIN_DELTA, run_id: int = None) -> tuple:
+        """
+        최근 성공 실행(run_id를 주면 그 실행)의 단계 시간을 그 이전 성공 실행 window건의 중앙값과 비교합니다.
+        이전 실행은 설치 방법(install_method)이 같은 실행만 씁니다. (변경 없음 실행과 전체 다운로드는 단계 구성이 다름)
+        (비교한 RunRecord, [Regression]) - 비교할 실행이 없으면 (None, [])
+        """
+        runs = self.runs(command, limit=1, outcome=OUTCOME_OK, up_to=run_id)
+        if not runs:
+            return None, []
+        latest = runs[0]
+        previous = self.runs(command, limit=window, outcome=OUTCOME_OK, up_to=latest.id - 1,
+                             install_method=latest.install_method)
+        history = {"total": [run.elapsed for run in previous]}
+        for run in previous:
+            for name, elapsed in run.phases.items():
+                history.setdefault(name, []).append(elapsed)
+
+        found = []
+        for name, elapsed in dict(latest.phases, total=latest.elapsed).items():
+            values = sorted(history.get(name, ()))
+            if not values:
+                continue
+            baseline = percentile(values, 50)
+            if elapsed > baseline * (1 + threshold) and elapsed - baseline >= min_delta:
+                found.append(Regression(name, elapsed, baseline, len(values)))
+        return latest, sorted(found, key=lambda item: item.latest - item.baseline, reverse=True)
@@ -1,40 +1,408 @@
 import os
+import threading
 import time
-import subprocess
+from src.util import tracing
 from src.util.logger import Logger
+from src.util.tracing import traced
+from src.util.step_graph import STATUS_TIMEOUT, StepGraph, StepScheduler, current_cancel_event
 from src.helper.config import Config
-from src.steam.reg import SteamReg
+from src.steam import vdf
+from src.steam.bootstrap_log import (EVENT_BYTES, EVENT_ERROR, EVENT_EXIT, EVENT_MANIFEST, EVENT_PACKAGE,
+                                     EVENT_UPDATE_DETECTED, BootstrapLogWatcher, get_bootstrap_log_path)
+from src.steam.client_manifest import (CLIENT_MANIFEST_NAME, ClientManifest, get_installed_client_version,
+                                       get_installed_manifest_path)
+from src.util.process_supervisor import (KILL_WAIT_TIMEOUT, ProcessBackend, ProcessSupervisor, STEAM_PROCESS_NAMES,
+                                        default_backend)
+from src.util.process_table import ProcessTable
+# 미러/미리 받기/검사/저장소/연결 확인 모듈(http, socket 등)은 사용하는 단계에서 불러옵니다.
+# (steam.cfg 생성처럼 단계 하나만 실행하는 명령이 빠르게 시작되도록)
+
+# 다운로드 대기 제한 시간 (초)
+DOWNLOAD_TIMEOUT = 30 * 60
+# 종료 단계는 종료 요청과 대기를 합친 시간으로 제한합니다.
+KILL_STEP_TIMEOUT = KILL_WAIT_TIMEOUT + 30
+# 동시에 실행할 수 있는 단계 수
+STEP_WORKERS = 6
+NETWORK_CUT_AUTO = "auto"
+PACKAGE_INSTALL_DIRECT = "direct"
+# 다운로드 진행 상황 출력 간격 (초)
+PROGRESS_LOG_INTERVAL = 2.0
+# download 명령이 실행하는 마지막 단계들 (선행 단계는 자동으로 포함)
+DOWNLOAD_STEPS = ("check_version", "snapshot_downgraded", "kill_after_download", "stop_mirror")
 
 class SteamDowngrader:
 
-    def __init__(self):
+    def __init__(self, process_backend: ProcessBackend = None, config: Config = None, steam_exe_path: str = None,
+                 mirror=None):
         self.logger = Logger()
-        self.config = Config()
-        self.steam_reg = SteamReg()
+        # Config와 레지스트리 값은 공유 EnvironmentProbe에서 가져오므로 다시 읽지 않습니다.
+        self.config = config or Config()
+        self.steam_reg = self.config.steam_reg
         self.steam_path = self.config.get_steam_path()
-        self.steam_exe_path = self.steam_reg.get_steam_exe_path()
+        self.steam_exe_path = steam_exe_path or self.config.probe.steam_exe_path
+        # 플릿 모드에서 러너가 여러 대상에 함께 쓰는 미러. 있으면 직접 시작하거나 멈추지 않습니다.
+        self.shared_mirror = mirror
+        process_backend = process_backend or default_backend()
+        self.supervisor = ProcessSupervisor(process_backend)
+        self.process_table = ProcessTable(process_backend)
+        self._network_monitor = None
 
 
+    @traced("kill_steam")
     def _kill_steam_process(self):
-        """실행 중인 Steam 프로세스를 종료합니다."""
+        """실행 중인 Steam 프로세스를 종료하고 실제로 종료될 때까지 대기합니다."""
         self.logger.log("INFO", "Steam 프로세스를 종료하는 중...")
         try:
-            result = subprocess.run(["taskkill", "/f", "/im", "steam.exe"], capture_output=True, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
+            result = self.process_table.kill_tree(STEAM_PROCESS_NAMES)
 
-            if result.returncode == 0:
-                self.logger.log("INFO", "Steam 프로세스 종료 완료.")
-            elif "프로세스 \"steam.exe\"을(를) 찾을 수 없습니다." in result.stderr or result.returncode == 128:
+            if not result.was_running:
                 self.logger.log("WARNING", f"Steam 종료 중 경고: Steam 프로세스가 실행 중이 아니었습니다.")
+            elif result.ok:
+                self.logger.log("INFO", f"Steam 프로세스 {len(result.terminated)}개 종료 요청 완료. ({result.elapsed * 1000:.0f}ms)")
             else:
-                self.logger.log("ERROR", f"Steam 종료 중 알 수 없는 오류 발생 (오류 코드: {result.returncode}): {result.stderr.strip()}")
-
-            time.sleep(1)
+                for pid, error in result.failed.items():
+                    self.logger.log("ERROR", f"Steam 프로세스(pid {pid}) 종료 실패: {error}")
 
         except Exception as e:
             self.logger.log("ERROR", f"Steam 종료 중 예상치 못한 예외 발생: {e} (관리자 권한으로 실행했는지 확인하세요.)")
-            time.sleep(1)
 
+        # 고정 시간 대기 대신 Steam 프로세스가 실제로 종료될 때까지 기다립니다.
+        wait = self.supervisor.wait_for_exit(STEAM_PROCESS_NAMES, timeout=KILL_WAIT_TIMEOUT, cancel=current_cancel_event())
+        if wait.ok:
+            self.logger.log("INFO", f"Steam 프로세스 종료 확인. ({wait.elapsed_ms:.0f}ms 대기)")
+        else:
+            self.logger.log("WARNING", f"{KILL_WAIT_TIMEOUT}초 안에 Steam 프로세스가 종료되지 않았습니다. (pid: {', '.join(map(str, wait.pids))})")
+        return wait
+
+    @traced("probe_client_version")
+    def _get_installed_client_version(self):
+        """설치된 클라이언트 빌드 번호를 Steam 실행 없이 확인합니다."""
+        started = time.perf_counter()
+        version = get_installed_client_version(self.steam_path)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if version:
+            self.logger.log("INFO", f"설치된 Steam 클라이언트 빌드: {version} (확인 {elapsed_ms:.1f}ms)")
+        else:
+            self.logger.log("WARNING", "설치된 Steam 클라이언트 빌드를 확인할 수 없습니다. (package 폴더의 매니페스트 없음)")
+        return version
+
+    @traced("start_mirror")
+    def _start_package_mirror(self, origin_url: str):
+        """로컬 캐시 미러를 시작합니다. 사용하지 않거나 시작에 실패하면 None을 반환합니다."""
+        if self.shared_mirror is not None:
+            return self.shared_mirror
+        if not self.config.use_local_mirror:
+            return None
+        from src.net.package_cache import PackageCache
+        from src.net.mirror_server import PackageMirror
+        try:
+            cache = PackageCache(self.config.package_cache_dir, self.config.package_cache_max_mb * 1024 * 1024)
+            mirror = PackageMirror(cache, origin_url)
+            mirror.start()
+            self.logger.log("INFO", f"로컬 패키지 미러 시작: {mirror.base_url} (캐시 {len(cache.entries)}개, {cache.total_bytes / 1024 / 1024:.1f}MB)")
+            return mirror
+        except Exception as e:
+            self.logger.log("WARNING", f"로컬 패키지 미러를 시작하지 못했습니다. 원본 URL을 직접 사용합니다: {e}")
+            return None
+
+    @traced("stop_mirror")
+    def _stop_package_mirror(self, mirror):
+        if mirror is None or mirror is self.shared_mirror:
+            # 공용 미러는 모든 대상이 끝난 뒤 러너가 멈춥니다.
+            return
+        mirror.stop()
+        cache = mirror.cache
+        tracing.add("bytes_downloaded", mirror.bytes_from_origin)
+        tracing.record(cache_hits=cache.hits, cache_misses=cache.misses)
+        self.logger.log("INFO", f"로컬 패키지 미러 종료. 캐시 적중 {cache.hits}회 / 미스 {cache.misses}회, 원본에서 받은 용량 {mirror.bytes_from_origin / 1024 / 1024:.1f}MB")
+
+    @traced("prefetch")
+    def _prefetch_packages(self, mirror):
+        """
+        Steam을 실행하기 전에 대상 매니페스트를 받아 설치된 package/ 상태와 비교하고,
+        달라진 패키지만 캐시에 동시에 받아 둡니다. 설치된 것과 같은 패키지는 로컬 파일을 캐시에 넣어
+        Steam이 요청해도 원본에서 다시 받지 않습니다.
+        실패한 패키지는 Steam이 요청할 때 미러가 다시 원본에서 받으므로 경고만 출력합니다.
+        비교 결과(DeltaPlan)를 반환하며, 미러가 없거나 매니페스트를 받지 못하면 None을 반환합니다.
+        """
+        if mirror is None:
+            return None
+        from src.net.prefetcher import PackagePrefetcher
+        from src.steam.delta_planner import DeltaPlanner, seed_cache
+        prefetcher = PackagePrefetcher(mirror.cache, mirror.origin_base, max_workers=self.config.prefetch_workers,
+                                       per_host_limit=self.config.prefetch_per_host, logger=self.logger,
+                                       cancel=current_cancel_event())
+        try:
+            manifest = prefetcher.fetch_manifest()
+            self.logger.log("ROLLBACK", f"대상 클라이언트 매니페스트: 빌드 {manifest.version}, 패키지 {len(manifest.packages)}개")
+
+            started = time.perf_counter()
+            plan = DeltaPlanner(self.steam_path).plan(manifest)
+            tracing.record(target_build=manifest.version, packages_fetched=len(plan.fetch))
+            seeded, mismatched = seed_cache(plan, mirror.cache, mirror.cache_key)
+            for delta in mismatched:
+                self.logger.log("WARNING", f"로컬 패키지가 매니페스트와 다릅니다. 원본에서 받습니다: {delta.package.download_name}")
+            self.logger.log("ROLLBACK", f"설치 상태 비교 완료 ({(time.perf_counter() - started) * 1000:.0f}ms): "
+                                        f"유지 {len(plan.keep)}개, 재사용 {len(plan.reuse)}개, 받을 패키지 {len(plan.fetch)}개 "
+                                        f"({plan.fetch_bytes / 1024 / 1024:.1f}MB, 로컬 {plan.local_bytes / 1024 / 1024:.1f}MB 절약)")
+
+            summary = prefetcher.prefetch(plan.fetch)
+            tracing.add("bytes_downloaded", summary.downloaded_bytes)
+            self.logger.log("ROLLBACK", f"패키지 미리 받기 완료: {len(summary.results)}개 중 캐시 {summary.cached}개, "
+                                        f"{summary.downloaded_bytes / 1024 / 1024:.1f}MB, {summary.elapsed:.1f}초 "
+                                        f"({summary.throughput / 1024 / 1024:.1f}MB/s)")
+            for result in summary.failed:
+                self.logger.log("WARNING", f"패키지 미리 받기 실패: {result.name} ({result.error})")
+            return plan
+        except Exception as e:
+            self.logger.log("WARNING", f"패키지 미리 받기에 실패했습니다. Steam이 미러를 통해 직접 받습니다: {e}")
+            return None
+        finally:
+            prefetcher.close()
+
+    @traced("download")
+    def _run_package_download(self, package_url: str):
+        """Steam을 실행하여 package_url에서 클라이언트 패키지를 받게 하고, 스스로 종료될 때까지 기다립니다."""
+        # Steam 실행 명령어 구성 (구 버전 파일 다운로드 용도)
+        # -textmode: GUI 없이 백그라운드에서 업데이트 진행
+        # -exitsteam: 업데이트 완료 후 Steam 자동 종료 (매우 중요)
+        # 경로와 URL은 셸을 거치지 않고 인자 하나씩 그대로 넘깁니다.
+        launch_command_download = [
+            self.steam_exe_path,
+            "-forcesteamupdate",
+            "-forcepackagedownload",
+            "-overridepackageurl", package_url,
+            "-textmode",
+            "-exitsteam", # 다운로드 완료 후 Steam이 스스로 종료되도록 함
+            "-clearbeta"
+        ]
+        
+        self.logger.log("ROLLBACK", f"Steam 구 버전 파일 다운로드 실행 중: {' '.join(launch_command_download)}")
+        self.logger.log("WARNING", "이 단계에서 Steam이 자동으로 백그라운드에서 실행될 수 있으며, 완료 후 종료됩니다.")
+
+        # bootstrap_log를 따라 읽어 진행 상황을 출력하고, Steam이 스스로 최신 버전으로 업데이트하기 시작하면 바로 중단합니다.
+        abort = threading.Event()
+        # 단계가 제한 시간을 넘기면 설정됩니다. (StepScheduler)
+        cancel = current_cancel_event()
+        watcher = None
+        if self.config.watch_bootstrap_log:
+            watcher = BootstrapLogWatcher(get_bootstrap_log_path(self.steam_path), expected_url=package_url)
+            watcher.on_event = self._download_event_handler(watcher, abort)
+            watcher.start()
+
+        # 외부 프로세스를 실행하고 종료될 때까지 대기합니다.
+        # 이 단계에서는 네트워크가 연결되어 있어야 합니다.
+        try:
+            run = self.supervisor.run(launch_command_download, timeout=DOWNLOAD_TIMEOUT, cancel=(abort, cancel))
+        finally:
+            if watcher is not None:
+                watcher.stop()
+
+        if cancel is not None and cancel.is_set():
+            # 단계는 이미 제한 시간 초과로 기록되었으므로 Steam만 정리하고 끝냅니다.
+            self.process_table.kill_tree(STEAM_PROCESS_NAMES)
+            self.supervisor.wait_for_exit(STEAM_PROCESS_NAMES, timeout=KILL_WAIT_TIMEOUT)
+            self.logger.log("ERROR", f"다운로드 단계가 제한 시간을 넘겨 Steam을 종료했습니다. ({run.elapsed:.1f}초)")
+            return
 
+        if abort.is_set():
+            tracing.record(failure="steam_self_update")
+            self.process_table.kill_tree(STEAM_PROCESS_NAMES)
+            self.supervisor.wait_for_exit(STEAM_PROCESS_NAMES, timeout=KILL_WAIT_TIMEOUT)
+            self.logger.log("ERROR", f"Steam이 구 버전 대신 최신 버전으로 업데이트하려 하여 다운로드를 중단했습니다. ({run.elapsed:.1f}초)")
+            self.logger.log("ERROR", "가이드: downgrade_wayback_date가 가리키는 스냅샷을 확인하세요. (main.py catalog lookup <날짜>)")
+            self.logger.exit_program()
+        if not run.ok:
+            tracing.record(failure="download_timeout" if run.returncode is None else "download_failed")
+            if run.returncode is None:
+                self.logger.log("ERROR", f"Steam 구 버전 파일 다운로드가 {DOWNLOAD_TIMEOUT}초 안에 끝나지 않았습니다.")
+            else:
+                self.logger.log("ERROR", f"Steam 구 버전 파일 다운로드 실행 실패. (종료 코드: {run.returncode})")
+            self.logger.log("ERROR", "가이드: 'Steam이 레지스트리 경로 쓰기 불가 다이얼로그를 표시했다면, Repair를 클릭하세요.'")
+            self.logger.exit_program()
+        self.logger.log("ROLLBACK", f"Steam 구 버전 파일 다운로드 프로세스 완료. ({run.elapsed:.1f}초)")
+
+        if watcher is not None and watcher.exited.is_set():
+            # bootstrap_log에 종료가 기록되었으면 남은 프로세스가 곧 끝나므로 짧게만 기다립니다.
+            exit_timeout = KILL_WAIT_TIMEOUT
+        else:
+            exit_timeout = DOWNLOAD_TIMEOUT
+        # -exitsteam으로 Steam이 스스로 종료될 때까지 기다립니다.
+        wait = self.supervisor.wait_for_exit(STEAM_PROCESS_NAMES, timeout=exit_timeout, cancel=cancel)
+        if wait.ok:
+            self.logger.log("ROLLBACK", f"Steam 자동 종료 확인. ({wait.elapsed_ms:.0f}ms 대기)")
+        else:
+            self.logger.log("WARNING", "Steam이 자동으로 종료되지 않았습니다. 강제로 종료합니다.")
+
+    @traced("extract")
+    def _install_packages(self, mirror) -> bool:
+        """
+        미리 받아 캐시에 둔 대상 빌드 패키지를 Steam을 실행하지 않고 직접 설치합니다. (package_install_mode: direct)
+        구 클라이언트가 풀지 못하는 Zstandard 패키지도 설치할 수 있습니다.
+        패키지가 캐시에 모두 있지 않거나 하나라도 풀지 못하면 False를 반환하며, 이때는 Steam으로 받습니다.
+        """
+        from src.steam.integrity import DigestCache
+        from src.steam.package_extractor import PackageExtractor
+
+        manifest_source = mirror.cache.lookup(mirror.cache_key(CLIENT_MANIFEST_NAME), record=False)
+        if manifest_source is None:
+            return False
+        try:
+            manifest = ClientManifest.load(manifest_source)
+        except (OSError, ValueError) as e:
+            self.logger.log("WARNING", f"캐시의 대상 매니페스트를 읽을 수 없어 Steam으로 설치합니다: {e}")
+            return False
+        # 무결성 검사와 같은 해시 캐시를 써서 이미 같은 파일은 다시 쓰지 않습니다.
+        extractor = PackageExtractor(self.steam_path, cache=mirror.cache, max_workers=self.config.extract_workers or None,
+                                     digest_cache=DigestCache(os.path.join(self.config.package_cache_dir, "integrity.json")))
+        missing = [package.download_name for package in manifest.packages.values() if extractor.locate(package) is None]
+        if missing:
+            self.logger.log("WARNING", f"캐시에 없는 패키지가 있어 Steam으로 설치합니다: {', '.join(missing[:5])}")
+            return False
+
+        self.logger.log("ROLLBACK", f"패키지 직접 설치 중... (빌드 {manifest.version}, 패키지 {len(manifest.packages)}개)")
+        try:
+            report = extractor.install(manifest, manifest_source)
+        except OSError as e:
+            self.logger.log("WARNING", f"패키지 직접 설치에 실패하여 Steam으로 설치합니다: {e}")
+            return False
+        for result in sorted(report.results, key=lambda result: result.elapsed, reverse=True):
+            if result.ok:
+                self.logger.log("INFO", f"  {result.name} ({result.format}): 파일 {result.files}개 (유지 {result.unchanged}개, "
+                                        f"임시 파일 제외 {result.skipped}개), "
+                                        f"{result.bytes_out / 1024 / 1024:.1f}MB, {result.elapsed * 1000:.0f}ms "
+                                        f"({result.throughput / 1024 / 1024:.1f}MB/s)")
+            else:
+                self.logger.log("ERROR", f"  {result.name}: 설치 실패 - {result.error}")
+        if not report.ok:
+            self.logger.log("WARNING", "패키지 직접 설치에 실패한 패키지가 있어 Steam으로 설치합니다.")
+            return False
+        self.logger.log("ROLLBACK", f"패키지 직접 설치 완료: 파일 {report.files}개, {report.bytes_out / 1024 / 1024:.1f}MB, "
+                                    f"{report.elapsed:.2f}초 ({report.throughput / 1024 / 1024:.1f}MB/s)")
+        return True
+
+    def _download_event_handler(self, watcher: BootstrapLogWatcher, abort: threading.Event):
+        """bootstrap_log 이벤트를 로그로 출력합니다. 진행 상황은 PROGRESS_LOG_INTERVAL초에 한 번만 출력합니다."""
+        last_progress = [0.0]
+        logged_exit = threading.Event()
+
+        def handle(event):
+            if event.kind == EVENT_UPDATE_DETECTED:
+                if not abort.is_set():
+                    self.logger.log("ERROR", f"Steam 자체 업데이트 감지: {event.line}")
+                    abort.set()
+            elif event.kind == EVENT_MANIFEST:
+                version = event.fields.get("version")
+                self.logger.log("ROLLBACK", f"Steam이 매니페스트를 받았습니다.{f' (빌드 {version})' if version else ''}")
+            elif event.kind in (EVENT_PACKAGE, EVENT_BYTES):
+                now = time.monotonic()
+                if now - last_progress[0] < PROGRESS_LOG_INTERVAL:
+                    return
+                last_progress[0] = now
+                progress = watcher.progress
+                parts = []
+                if progress.package_count:
+                    parts.append(f"패키지 {progress.package_index}/{progress.package_count}")
+                if progress.bytes_total:
+                    parts.append(f"{progress.bytes_done / 1024 / 1024:.1f}/{progress.bytes_total / 1024 / 1024:.1f}MB, "
+                                 f"{progress.throughput / 1024 / 1024:.1f}MB/s")
+                if parts:
+                    self.logger.log("ROLLBACK", f"다운로드 진행: {', '.join(parts)}")
+            elif event.kind == EVENT_ERROR:
+                self.logger.log("WARNING", f"Steam bootstrap 로그 오류: {event.line}")
+            elif event.kind == EVENT_EXIT and not logged_exit.is_set():
+                logged_exit.set()
+                self.logger.log("ROLLBACK", "Steam bootstrap 종료 기록 확인.")
+        return handle
+
+    @traced("verify")
+    def _verify_installed_files(self, force: bool = False):
+        """
+        다운로드한 클라이언트 파일을 설치된 매니페스트와 비교합니다. (steamui.dll 로드 실패 등의 원인 확인)
+        해시 결과는 (경로, 크기, 수정 시각) 기준으로 캐시하므로 다음 검사에서는 바뀐 파일만 다시 읽습니다.
+        """
+        if not force and not self.config.verify_after_download:
+            return None
+        manifest_path = get_installed_manifest_path(self.steam_path)
+        try:
+            manifest = ClientManifest.load(manifest_path)
+        except (OSError, ValueError) as e:
+            self.logger.log("WARNING", f"클라이언트 매니페스트를 읽을 수 없어 무결성 검사를 건너뜁니다: {e}")
+            return None
+
+        self.logger.log("INFO", f"설치된 클라이언트 파일 무결성 검사 중... (빌드 {manifest.version}, 패키지 {len(manifest.packages)}개)")
+        from src.steam.integrity import IntegrityVerifier
+        verifier = IntegrityVerifier(self.steam_path, os.path.join(self.config.package_cache_dir, "integrity.json"),
+                                     max_workers=self.config.verify_workers or None)
+        report = verifier.verify(manifest)
+        tracing.record(verify_ok=report.ok, verify_files=report.checked)
+
+        for package_name, error in report.skipped:
+            self.logger.log("WARNING", f"패키지 '{package_name}'의 파일 목록을 읽지 못했습니다: {error}")
+        for expected in report.missing:
+            self.logger.log("ERROR", f"파일 없음: {expected.path} (패키지 {expected.package})")
+        for expected, reason in report.mismatched:
+            self.logger.log("ERROR", f"파일 불일치: {expected.path} - {reason} (패키지 {expected.package})")
+
+        summary = (f"파일 {report.checked}개 (캐시 {report.cached}개), {report.hashed_bytes / 1024 / 1024:.1f}MB 해시, "
+                   f"{report.elapsed:.1f}초 ({report.throughput / 1024 / 1024:.1f}MB/s)")
+        if report.ok:
+            self.logger.log("OK", f"무결성 검사 완료: 문제 없음. {summary}")
+        else:
+            self.logger.log("ERROR", f"무결성 검사 실패: 없음 {len(report.missing)}개, 불일치 {len(report.mismatched)}개. {summary}")
+            self.logger.log("ERROR", "가이드: 손상된 파일이 있으면 Steam이 steamui.dll 등을 불러오지 못할 수 있습니다. 다운로드 단계를 다시 실행하세요.")
+        return report
+
+    def _open_client_store(self):
+        """빌드 저장소를 엽니다. 사용하지 않거나 열 수 없으면 None을 반환합니다."""
+        if not self.config.use_client_store:
+            return None
+        from src.steam.client_store import ClientStore
+        try:
+            return ClientStore(self.config.client_store_dir)
+        except OSError as e:
+            self.logger.log("WARNING", f"클라이언트 빌드 저장소를 열 수 없습니다: {e}")
+            return None
+
+    @traced("snapshot")
+    def _snapshot_client(self, store, label: str):
+        """현재 설치된 클라이언트 파일을 저장소에 빌드로 저장합니다. 이미 저장된 파일은 다시 저장하지 않습니다."""
+        if store is None:
+            return None
+        try:
+            report = store.snapshot(self.steam_path, label=label)
+        except (OSError, ValueError) as e:
+            self.logger.log("WARNING", f"클라이언트 스냅샷을 만들지 못했습니다 ({label}): {e}")
+            return None
+        stored, logical = store.disk_usage()
+        self.logger.log("INFO", f"클라이언트 스냅샷 저장: 빌드 {report.build} ({label}), 새 파일 {report.linked}개 / 기존 {report.unchanged}개, "
+                                f"추가 용량 {report.bytes_added / 1024 / 1024:.1f}MB, {report.elapsed:.2f}초. "
+                                f"저장소 {stored / 1024 / 1024:.1f}MB (빌드 합계 {logical / 1024 / 1024:.1f}MB)")
+        for path, error in report.errors[:10]:
+            self.logger.log("WARNING", f"스냅샷에 넣지 못한 파일: {path} ({error})")
+        return report
+
+    @traced("switch_build")
+    def _switch_client(self, store, build: str) -> bool:
+        """저장소의 build로 Steam 루트를 전환합니다. 달라진 파일만 하드링크로 바꿉니다."""
+        report = store.switch(self.steam_path, build)
+        self.logger.log("ROLLBACK", f"저장된 빌드 {build}(으)로 전환: 변경 {report.linked}개, 삭제 {report.removed}개, "
+                                    f"유지 {report.unchanged}개, 복사 {report.copied}개, "
+                                    f"{report.bytes_linked / 1024 / 1024:.1f}MB 연결, {report.elapsed * 1000:.0f}ms")
+        for path, error in report.errors[:10]:
+            self.logger.log("ERROR", f"전환하지 못한 파일: {path} ({error})")
+        return report.ok
+
+    def switch_build(self, build: str) -> bool:
+        """Steam을 종료하고 저장소에 있는 빌드(예: 다운그레이드 전 스냅샷)로 되돌립니다."""
+        store = self._open_client_store()
+        if store is None or not store.has(build):
+            self.logger.log("ERROR", f"저장소에 빌드 {build}이(가) 없습니다.")
+            return False
+        self._kill_steam_process()
+        return self._switch_client(store, build)
+
+    @traced("steam_cfg")
     def _create_steam_cfg(self):
         # Steam 업데이트를 영구적으로 막는 steam.cfg 파일을 생성
         steam_cfg_path = os.path.join(self.steam_path, "steam.cfg")
@@ -48,108 +416,141 @@ class SteamDowngrader:
             self.logger.log("ERROR", f"'{steam_cfg_path}' 파일 생성 실패: {e}")
             self.logger.exit_program()
 
-    def _edit_loginusers_vdf_for_offline(self):
+    @traced("prepare_loginusers")
+    def _prepare_loginusers_vdf(self):
+        """
+        loginusers.vdf 변경 내용을 미리 계산해 둡니다. (Steam이 종료된 뒤, 다운로드와 동시에 실행)
+        파일이 없거나 읽지 못하면 None을 반환하고, 반영 단계에서 다시 시도합니다.
+        """
+        loginusers_vdf_path = os.path.join(self.steam_path, "config", "loginusers.vdf")
+        if not os.path.exists(loginusers_vdf_path):
+            return None
+        try:
+            return vdf.prepare_user_flags(loginusers_vdf_path, vdf.OFFLINE_LOGIN_FLAGS)
+        except Exception as e:
+            self.logger.log("WARNING", f"'{loginusers_vdf_path}' 파일을 미리 읽지 못했습니다. 반영할 때 다시 읽습니다: {e}")
+            return None
+
+    @traced("loginusers_vdf")
+    def _edit_loginusers_vdf_for_offline(self, prepared: vdf.PreparedRewrite = None):
         """
         loginusers.vdf 파일을 수정하여 특정 계정이 오프라인 모드로 자동 로그인되도록 합니다.
         이는 Steam이 로그인 창을 띄우는 대신 바로 오프라인 모드로 진입하게 할 수 있습니다.
+        prepared가 있으면 미리 계산한 결과를 반영합니다. (그사이 파일이 바뀌었으면 다시 계산)
         """
         loginusers_vdf_path = os.path.join(self.steam_path, "config", "loginusers.vdf")
 
         if not os.path.exists(loginusers_vdf_path):
+            if prepared is not None:
+                prepared.discard()
             self.logger.log("WARNING", f"'{loginusers_vdf_path}' 파일을 찾을 수 없습니다. 오프라인 로그인 설정 건너뜀.")
             return
 
         try:
-            with open(loginusers_vdf_path, "r+", encoding="utf-8") as f:
-                content = f.read()
-                f.seek(0) # 파일 포인터를 처음으로 이동
-
-                # 모든 사용자에 대해 RememberPassword, WantsOfflineMode, SkipOfflineModeWarning, AllowAutoLogin을 "1"로 설정
-                content = content.replace('"RememberPassword"		"0"', '"RememberPassword"		"1"')
-                content = content.replace('"RememberPassword"		"1"', '"RememberPassword"		"1"') # 이미 1인 경우 대비
-
-                if '"WantsOfflineMode"' not in content:
-                    # WantsOfflineMode가 없는 경우, 아무 SteamID64 뒤에 추가 (정확한 위치는 아닐 수 있으나 작동 가능성)
-                    self.logger.log("WARNING", "loginusers.vdf에서 'WantsOfflineMode'를 찾을 수 없습니다. 수동으로 추가해야 할 수도 있습니다.")
-                content = content.replace('"WantsOfflineMode"		"0"', '"WantsOfflineMode"		"1"')
-                content = content.replace('"WantsOfflineMode"		"1"', '"WantsOfflineMode"		"1"')
-
-                if '"SkipOfflineModeWarning"' not in content:
-                    self.logger.log("WARNING", "loginusers.vdf에서 'SkipOfflineModeWarning'를 찾을 수 없습니다. 수동으로 추가해야 할 수도 있습니다.")
-                content = content.replace('"SkipOfflineModeWarning"	"0"', '"SkipOfflineModeWarning"	"1"')
-                content = content.replace('"SkipOfflineModeWarning"	"1"', '"SkipOfflineModeWarning"	"1"')
-
-                if '"AllowAutoLogin"' not in content:
-                    self.logger.log("WARNING", "loginusers.vdf에서 'AllowAutoLogin'를 찾을 수 없습니다. 수동으로 추가해야 할 수도 있습니다.")
-                content = content.replace('"AllowAutoLogin"		"0"', '"AllowAutoLogin"		"1"')
-                content = content.replace('"AllowAutoLogin"		"1"', '"AllowAutoLogin"		"1"')
+            # 모든 사용자에 대해 RememberPassword, WantsOfflineMode, SkipOfflineModeWarning, AllowAutoLogin을 "1"로 설정
+            # 키가 없는 사용자에게는 해당 키를 추가합니다. 파일은 한 번만 읽고, 변경이 있을 때만 다시 씁니다.
+            if prepared is not None:
+                stats = prepared.commit()
+            else:
+                stats = vdf.rewrite_user_flags(loginusers_vdf_path, vdf.OFFLINE_LOGIN_FLAGS)
 
-                f.truncate(0) # 기존 내용 삭제
-                f.write(content)
-            self.logger.log("INFO", f"'{loginusers_vdf_path}' 파일 수정 완료. 오프라인 로그인 설정 시도.")
+            if stats["users"] == 0:
+                self.logger.log("WARNING", f"'{loginusers_vdf_path}'에서 사용자 항목을 찾을 수 없습니다. 오프라인 로그인 설정 건너뜀.")
+            elif stats["changed"]:
+                self.logger.log("INFO", f"'{loginusers_vdf_path}' 파일 수정 완료. 사용자 {stats['users']}명, 값 변경 {stats['updated']}개, 키 추가 {stats['inserted']}개.")
+            else:
+                self.logger.log("INFO", f"'{loginusers_vdf_path}' 파일이 이미 오프라인 로그인 설정 상태입니다. (사용자 {stats['users']}명)")
         except Exception as e:
             self.logger.log("ERROR", f"'{loginusers_vdf_path}' 파일 수정 실패: {e}")
             # 이 오류가 발생해도 프로그램 종료 대신 경고만 출력하여 다음 단계 진행 시도
             self.logger.log("WARNING", "loginusers.vdf 수정에 실패했으나, Steam 실행은 시도합니다.")
 
-    def execute_downgrader_online(self): # 함수 이름 변경 (오타 수정)
-        self.logger.log("ROLLBACK", "Steam 클라이언트 온라인 다운그레이드 시작 (파일 다운로드 단계)...")
-
-        # 1. Steam 강제 종료 (시작 전 혹시 모를 실행 중인 Steam 종료)
-        self._kill_steam_process()
-        time.sleep(2) # 종료 후 잠시 대기
-
-        # 2. web.archive.org를 통해 구 버전 파일 다운로드 명령 실행
-        wayback_date = self.config.downgrade_wayback_date
-        manifest_url_base = f"http://web.archive.org/web/{wayback_date}if_/media.steampowered.com/client"
-        
-        # Steam 실행 명령어 구성 (구 버전 파일 다운로드 용도)
-        # -textmode: GUI 없이 백그라운드에서 업데이트 진행
-        # -exitsteam: 업데이트 완료 후 Steam 자동 종료 (매우 중요)
-        launch_command_download = [
-            f'"{self.steam_exe_path}"',
-            "-forcesteamupdate",
-            "-forcepackagedownload",
-            f"-overridepackageurl {manifest_url_base}",
-            "-textmode",
-            "-exitsteam", # 다운로드 완료 후 Steam이 스스로 종료되도록 함
-            "-clearbeta"
-        ]
-        
-        self.logger.log("ROLLBACK", f"Steam 구 버전 파일 다운로드 실행 중: {' '.join(launch_command_download)}")
-        self.logger.log("WARNING", "이 단계에서 Steam이 자동으로 백그라운드에서 실행될 수 있으며, 완료 후 종료됩니다.")
-        
+    def _download_or_switch(self, store, plan, package_url: str, mirror=None):
+        """
+        대상 빌드가 이미 설치되어 있거나 저장소에 있으면 그대로 쓰고, direct 설치 방식이면 캐시의 패키지를 직접 풉니다.
+        그 외에는 Steam을 실행해 받습니다.
+        """
         try:
-            # subprocess.run을 사용하여 외부 프로세스 실행 및 완료 대기
-            # 이 단계에서는 네트워크가 연결되어 있어야 합니다.
-            subprocess.run(' '.join(launch_command_download), shell=True, check=True, creationflags=subprocess.CREATE_NO_WINDOW)
-            self.logger.log("ROLLBACK", "Steam 구 버전 파일 다운로드 프로세스 완료. Steam이 자동 종료되었을 것입니다.")
-            time.sleep(5) # 다운로드 프로세스 완료 및 종료 대기 (충분히 대기)
-
-        except subprocess.CalledProcessError as e:
-            self.logger.log("ERROR", f"Steam 구 버전 파일 다운로드 실행 실패. Stderr: {e.stderr.strip()}")
-            self.logger.log("ERROR", "가이드: 'Steam이 레지스트리 경로 쓰기 불가 다이얼로그를 표시했다면, Repair를 클릭하세요.'")
-            self.logger.exit_program()
+            if plan is not None and plan.is_noop:
+                # 설치된 패키지가 대상 빌드와 모두 같으면 Steam을 실행해 다시 받고 덮어쓸 필요가 없습니다.
+                tracing.record(install_method="noop")
+                self.logger.log("ROLLBACK", f"이미 대상 빌드({plan.target_version})의 패키지가 모두 설치되어 있습니다. 다운로드 단계를 건너뜁니다.")
+            elif plan is not None and store is not None and store.has(plan.target_version) and self._switch_client(store, plan.target_version):
+                # 전에 받아 둔 빌드는 Steam을 실행하지 않고 저장소에서 바로 전환합니다.
+                tracing.record(install_method="switch")
+                self.logger.log("ROLLBACK", f"저장소에 있는 빌드({plan.target_version})로 전환했습니다. 다운로드 단계를 건너뜁니다.")
+            elif (plan is not None and mirror is not None and self.config.package_install_mode == PACKAGE_INSTALL_DIRECT
+                    and self._install_packages(mirror)):
+                tracing.record(install_method="direct")
+                self.logger.log("ROLLBACK", f"대상 빌드({plan.target_version})를 직접 설치했습니다. Steam 다운로드 단계를 건너뜁니다.")
+            else:
+                tracing.record(install_method="steam")
+                self._run_package_download(package_url)
         except Exception as e:
             self.logger.log("ERROR", f"Steam 구 버전 파일 다운로드 중 예상치 못한 오류 발생: {e}")
             self.logger.exit_program()
 
-        # 3. Steam 강제 종료 (다운로드 후 혹시 모를 잔여 프로세스 정리)
-        self._kill_steam_process()
-        time.sleep(2) # 종료 후 잠시 대기
+    def _check_version_change(self, version_before: str):
+        version_after = self._get_installed_client_version()
+        tracing.record(build_before=version_before, build_after=version_after)
+        if version_before and version_after == version_before:
+            self.logger.log("WARNING", f"다운로드 후에도 클라이언트 빌드가 {version_after}(으)로 그대로입니다. 롤백이 적용되지 않았을 수 있습니다.")
+        elif version_after:
+            self.logger.log("ROLLBACK", f"클라이언트 빌드 변경 확인: {version_before} -> {version_after}")
+        return version_after
 
+    def _start_connectivity_monitor(self):
+        """
+        네트워크 차단을 자동으로 확인하는 모니터를 시작합니다. (다운로드 중에는 연결되어 있어야 하므로 처음부터 확인)
+        prompt 모드이거나 설정이 잘못되었으면 None을 반환하고, Enter 입력으로 확인합니다.
+        """
+        if self.config.network_cut_mode != NETWORK_CUT_AUTO:
+            return None
+        from src.net.connectivity import ConnectivityMonitor, parse_probe
+        try:
+            probes = [parse_probe(spec) for spec in self.config.network_probe_endpoints]
+            monitor = ConnectivityMonitor(probes, interval=self.config.network_probe_interval)
+        except ValueError as e:
+            self.logger.log("WARNING", f"네트워크 차단 자동 확인을 사용할 수 없습니다. Enter 입력으로 확인합니다: {e}")
+            return None
+        self._network_monitor = monitor.start()
+        return monitor
+
+    @traced("wait_network_cut")
+    def _wait_network_cut(self, monitor=None):
         # --- 이 지점에서 사용자에게 네트워크를 끊으라고 명확히 안내하고 대기 ---
         self.logger.log("INFO", "=== 다음 단계 진행 전 수동 작업 필요 ===")
         self.logger.log("WARNING", "지금 바로 가상 머신의 **네트워크 연결을 완전히 차단**하세요!")
-        self.logger.log("WARNING", "네트워크 차단 후 이 프롬프트에 **Enter**를 눌러 다음 단계로 진행하세요.")
-        input("네트워크 차단 후 Enter를 눌러주세요...") # 사용자 입력 대기
 
-        # 4. steam.cfg 파일 생성 (업데이트 방지)
-        self._create_steam_cfg()
+        if monitor is not None:
+            endpoints = ", ".join(probe.name for probe in monitor.probes)
+            self.logger.log("INFO", f"네트워크 차단을 자동으로 확인하는 중... ({endpoints}, 최대 {self.config.network_cut_timeout:.0f}초)")
+            self.logger.flush()
+            started = time.perf_counter()
+            try:
+                isolated = monitor.wait_for_isolation(timeout=self.config.network_cut_timeout)
+            finally:
+                monitor.stop()
+            if isolated and monitor.seen_online:
+                self.logger.log("OK", f"네트워크 차단 확인. ({time.perf_counter() - started:.1f}초 대기, 확인 {monitor.checks}회)")
+                return
+            if isolated:
+                # 한 번도 연결된 적이 없으면 차단 여부가 아니라 확인 주소 설정 문제일 수 있습니다.
+                self.logger.log("WARNING", "연결 확인 주소에 한 번도 연결되지 않았습니다. 설정(network_probe_endpoints)을 확인하세요.")
+            else:
+                self.logger.log("WARNING", f"{self.config.network_cut_timeout:.0f}초 안에 네트워크 차단을 확인하지 못했습니다.")
 
-        # 5. loginusers.vdf 수정 (오프라인 로그인 강제)
-        self._edit_loginusers_vdf_for_offline()
+        self.logger.log("WARNING", "네트워크 차단 후 이 프롬프트에 **Enter**를 눌러 다음 단계로 진행하세요.")
+        self.logger.flush() # 안내 메시지가 모두 출력된 뒤에 입력을 받습니다.
+        try:
+            input("네트워크 차단 후 Enter를 눌러주세요...") # 사용자 입력 대기
+        except EOFError:
+            # 입력을 받을 수 없는 무인 실행에서는 차단을 확인하지 못한 채 진행하지 않습니다.
+            self.logger.log("ERROR", "네트워크 차단을 확인할 수 없습니다. (입력 없음)")
+            self.logger.exit_program()
 
+    @traced("launch_offline")
+    def _launch_offline(self):
         # 6. 다운그레이드된 Steam 클라이언트 실행 시도 (오프라인 진입 시도)
         self.logger.log("INFO", "다운그레이드된 Steam 클라이언트 실행 시도 중 (오프라인 모드 진입)..")
         # -vgui 옵션을 추가하여 구형 UI 강제 (선택 사항이지만 도움이 될 수 있음)
@@ -157,13 +558,128 @@ class SteamDowngrader:
             f'"{self.steam_exe_path}"',
             "-vgui" # 구형 UI 강제
         ]
-        
+
         try:
-            # subprocess.Popen을 사용하여 Steam을 비동기적으로 실행하고 프로그램은 계속 진행
+            # 프로세스 백엔드로 Steam을 비동기적으로 실행하고 프로그램은 계속 진행
             # 이 시점에서는 네트워크가 차단되어 있어야 합니다.
-            subprocess.Popen(' '.join(final_launch_command), shell=True, creationflags=subprocess.CREATE_NO_WINDOW)
+            self.supervisor.backend.spawn(' '.join(final_launch_command), shell=True)
             self.logger.log("OK", "Steam 클라이언트가 실행될 것입니다. 오프라인 모드 진입을 확인하세요.")
             self.logger.log("INFO", "네트워크가 차단된 상태에서 Steam이 성공적으로 실행되었는지 확인하고, SSFN 파일을 통해 로그인 시도해 보세요.")
         except Exception as e:
             self.logger.log("ERROR", f"Steam 클라이언트 실행 실패: {e}")
-            self.logger.exit_program()
\ No newline at end of file
+            self.logger.exit_program()
+
+    def build_steps(self, graph: StepGraph = None) -> StepGraph:
+        """
+        온라인 다운그레이드 단계를 의존 관계와 함께 graph에 추가합니다.
+        - 미러 시작과 패키지 미리 받기는 Steam 종료 대기와 동시에 실행됩니다.
+        - loginusers.vdf는 Steam이 종료된 뒤 미리 계산해 두고, 네트워크 차단 뒤에 반영만 합니다.
+        - 검사/스냅샷과 남은 Steam 프로세스 정리는 다운로드가 끝난 뒤 동시에 실행됩니다.
+        """
+        from src.net.mirror_server import wayback_client_url
+
+        graph = graph or StepGraph()
+        # 다운그레이드 전 상태를 저장해 두면 --switch-build로 다시 받지 않고 되돌릴 수 있습니다.
+        store = self._open_client_store()
+        # web.archive.org를 통해 구 버전 파일 다운로드
+        manifest_url_base = self.config.package_origin_url or wayback_client_url(self.config.downgrade_wayback_date)
+        tracing.record(wayback_date=self.config.downgrade_wayback_date)
+
+        def download(values):
+            # 로컬 미러가 있으면 Steam은 미러에서 받고, 미러는 캐시에 없는 파일만 원본에서 받습니다.
+            mirror = values["start_mirror"]
+            package_url = mirror.base_url if mirror else manifest_url_base
+            try:
+                self._download_or_switch(store, values["prefetch"], package_url, mirror)
+            except BaseException:
+                # 실패하면 뒤의 stop_mirror 단계가 실행되지 않으므로 여기서 멈춥니다.
+                self._stop_package_mirror(mirror)
+                raise
+
+        def snapshot_downgraded(values):
+            # 받은 파일이 매니페스트와 일치할 때만 저장합니다.
+            report = values["verify"]
+            if report is None or report.ok:
+                self._snapshot_client(store, "downgraded")
+
+        graph.add("watch_network", lambda values: self._start_connectivity_monitor())
+        graph.add("version_before", lambda values: self._get_installed_client_version())
+        # 1. Steam 강제 종료 (시작 전 혹시 모를 실행 중인 Steam 종료)
+        graph.add("kill_steam", lambda values: self._kill_steam_process(), timeout=KILL_STEP_TIMEOUT)
+        graph.add("start_mirror", lambda values: self._start_package_mirror(manifest_url_base))
+        graph.add("prefetch", lambda values: self._prefetch_packages(values["start_mirror"]),
+                  deps=["start_mirror"], timeout=DOWNLOAD_TIMEOUT)
+        graph.add("snapshot_pre", lambda values: self._snapshot_client(store, "pre-downgrade"), deps=["kill_steam"])
+        graph.add("prepare_loginusers", lambda values: self._prepare_loginusers_vdf(), deps=["kill_steam"], optional=True)
+        # 2. 구 버전 파일 다운로드 (또는 저장소에서 전환)
+        graph.add("download", download, deps=["version_before", "snapshot_pre", "prefetch"],
+                  timeout=2 * DOWNLOAD_TIMEOUT + KILL_STEP_TIMEOUT)
+        # 미러 종료는 서버 스레드를 기다리므로 검사와 동시에 실행합니다.
+        graph.add("stop_mirror", lambda values: self._stop_package_mirror(values["start_mirror"]), deps=["download"])
+        graph.add("check_version", lambda values: self._check_version_change(values["version_before"]),
+                  deps=["version_before", "download"])
+        graph.add("verify", lambda values: self._verify_installed_files(), deps=["download"])
+        graph.add("snapshot_downgraded", snapshot_downgraded, deps=["verify"])
+        # 3. Steam 강제 종료 (다운로드 후 혹시 모를 잔여 프로세스 정리)
+        graph.add("kill_after_download", lambda values: self._kill_steam_process(), deps=["download"], timeout=KILL_STEP_TIMEOUT)
+        # 사용자 입력을 기다리므로 제한 시간을 두지 않습니다.
+        graph.add("wait_network_cut", lambda values: self._wait_network_cut(values["watch_network"]),
+                  deps=["watch_network", "check_version", "snapshot_downgraded", "kill_after_download", "stop_mirror"])
+        # 4. steam.cfg 파일 생성 (업데이트 방지)
+        graph.add("steam_cfg", lambda values: self._create_steam_cfg(), deps=["wait_network_cut"])
+        # 5. loginusers.vdf 수정 (오프라인 로그인 강제)
+        graph.add("loginusers_vdf", lambda values: self._edit_loginusers_vdf_for_offline(values["prepare_loginusers"]),
+                  deps=["wait_network_cut", "prepare_loginusers"])
+        graph.add("launch_offline", lambda values: self._launch_offline(), deps=["steam_cfg", "loginusers_vdf"])
+        return graph
+
+    @traced("downgrade")
+    def run_steps(self, graph: StepGraph):
+        """단계 그래프를 실행하고 임계 경로를 출력합니다. 필수 단계가 실패하면 프로그램을 종료합니다."""
+        try:
+            report = StepScheduler(graph, max_workers=STEP_WORKERS).run()
+        finally:
+            # 중간에 실패해 wait_network_cut까지 가지 못한 경우에도 확인 스레드를 멈춥니다.
+            if self._network_monitor is not None:
+                self._network_monitor.stop()
+                self._network_monitor = None
+        self.logger.log("INFO", report.format_critical_path(graph))
+        required = [result.name for result in report.failed if not graph.steps[result.name].optional]
+        if required:
+            # 실행 기록에 처음 실패한 필수 단계를 남깁니다.
+            tracing.record(failed_step=min(required, key=lambda name: report.results[name].end or 0))
+        if report.exit_error is not None:
+            raise report.exit_error
+        for result in report.failed:
+            if result.status == STATUS_TIMEOUT:
+                self.logger.log("ERROR", f"단계 '{result.name}'이(가) 제한 시간({graph.steps[result.name].timeout}초) 안에 끝나지 않았습니다.")
+            else:
+                self.logger.log("ERROR", f"단계 '{result.name}' 실행 중 예상치 못한 오류 발생: {result.error}")
+        if required:
+            self.logger.exit_program()
+        return report
+
+    # --- 단계 하나만 실행하는 명령 (main.py의 하위 명령) ---
+
+    def kill_steam(self) -> bool:
+        return self._kill_steam_process().ok
+
+    def download_client(self) -> bool:
+        """Steam 종료부터 다운로드(또는 저장소 전환), 검사, 스냅샷까지만 실행합니다. (네트워크 차단/오프라인 실행 제외)"""
+        graph = self.build_steps().subgraph(DOWNLOAD_STEPS)
+        return self.run_steps(graph).ok
+
+    def lock_updates(self):
+        self._create_steam_cfg()
+
+    def offline_login(self):
+        self._edit_loginusers_vdf_for_offline()
+
+    def verify_client(self) -> bool:
+        """설정(verify_after_download)과 관계없이 설치된 클라이언트 파일을 검사합니다."""
+        report = self._verify_installed_files(force=True)
+        return report is not None and report.ok
+
+    def execute_downgrader_online(self): # 함수 이름 변경 (오타 수정)
+        self.logger.log("ROLLBACK", "Steam 클라이언트 온라인 다운그레이드 시작 (파일 다운로드 단계)...")
+        return self.run_steps(self.build_steps())
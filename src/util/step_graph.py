@@ -0,0 +1,270 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_TIMEOUT = "timeout"
+STATUS_SKIPPED = "skipped"
+
+# 지금 스레드에서 실행 중인 단계의 취소 이벤트 (current_cancel_event)
+_current = threading.local()
+
+
+def current_cancel_event():
+    """
+    실행 중인 단계의 취소 이벤트. 단계가 제한 시간을 넘기면 설정됩니다. 단계 밖에서 부르면 None
+    오래 걸리는 단계는 이 이벤트를 대기에 넘기거나(ProcessSupervisor.run(cancel=...)) 주기적으로 확인해 곧 끝나야 합니다.
+    """
+    return getattr(_current, "cancel", None)
+
+
+class Step:
+    """
+    실행 단계 하나. func(values)는 끝난 단계들의 반환값 {이름: 값}을 받습니다.
+    optional 단계는 실패해도 뒤 단계가 실행되며, 그때 값은 None입니다.
+    timeout이 있는 단계는 current_cancel_event()를 지켜야 합니다. 제한 시간이 지나면 이 이벤트가 설정되며,
+    그 뒤에도 끝나지 않는 단계는 작업 스레드를 잡고 있어 프로세스 종료를 막습니다.
+    """
+
+    __slots__ = ("name", "func", "deps", "timeout", "optional")
+
+    def __init__(self, name: str, func, deps=(), timeout: float = None, optional: bool = False):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.timeout = timeout
+        self.optional = optional
+
+
+class StepResult:
+    __slots__ = ("name", "status", "value", "error", "start", "end", "thread", "cancel")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = STATUS_PENDING
+        self.value = None
+        self.error = None
+        self.start = None
+        self.end = None
+        self.thread = None
+        self.cancel = threading.Event()
+
+    @property
+    def elapsed(self) -> float:
+        if self.start is None:
+            return 0.0
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def __repr__(self):
+        return f"StepResult({self.name!r}, {self.status}, {self.elapsed * 1000:.1f}ms)"
+
+
+class StepGraph:
+    """단계와 의존 관계를 선언하는 그래프. 추가한 순서는 같은 시점에 준비된 단계의 실행 순서가 됩니다."""
+
+    def __init__(self):
+        self.steps = {}
+
+    def add(self, name: str, func, deps=(), timeout: float = None, optional: bool = False) -> Step:
+        if name in self.steps:
+            raise ValueError(f"이미 있는 단계입니다: {name}")
+        step = Step(name, func, deps, timeout, optional)
+        self.steps[name] = step
+        return step
+
+    def require(self, name: str, dep: str):
+        """이미 추가한 단계에 의존 관계를 더합니다."""
+        if dep not in self.steps[name].deps:
+            self.steps[name].deps.append(dep)
+
+    def subgraph(self, targets) -> "StepGraph":
+        """targets와 그 선행 단계만 담은 그래프 (단계 하나만 실행하는 명령용)"""
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.steps[name].deps)
+        graph = StepGraph()
+        graph.steps = {name: step for name, step in self.steps.items() if name in needed}
+        return graph
+
+    def validate(self):
+        """없는 단계에 대한 의존이나 순환이 있으면 ValueError"""
+        for step in self.steps.values():
+            for dep in step.deps:
+                if dep not in self.steps:
+                    raise ValueError(f"단계 '{step.name}'이(가) 없는 단계 '{dep}'에 의존합니다.")
+        remaining = {name: set(step.deps) for name, step in self.steps.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"단계 의존 관계에 순환이 있습니다: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+
+class RunReport:
+    def __init__(self, results: dict, started: float, ended: float, exit_error: SystemExit = None):
+        self.results = results
+        self.started = started
+        self.ended = ended
+        self.exit_error = exit_error
+
+    @property
+    def elapsed(self) -> float:
+        return self.ended - self.started
+
+    @property
+    def ok(self) -> bool:
+        return all(result.status == STATUS_OK for result in self.results.values())
+
+    @property
+    def failed(self) -> list:
+        """실패했거나 제한 시간을 넘긴 단계"""
+        return [result for result in self.results.values() if result.status in (STATUS_FAILED, STATUS_TIMEOUT)]
+
+    @property
+    def serial_time(self) -> float:
+        """모든 단계를 차례로 실행했을 때의 시간 (실행한 단계 시간의 합)"""
+        return sum(result.elapsed for result in self.results.values() if result.start is not None)
+
+    def critical_path(self, graph: StepGraph) -> list:
+        """
+        가장 늦게 끝난 단계에서 시작해, 매번 가장 늦게 끝난 선행 단계를 따라 거슬러 올라간 경로입니다.
+        이 경로의 단계가 전체 실행 시간을 결정합니다.
+        """
+        finished = [result for result in self.results.values() if result.end is not None]
+        if not finished:
+            return []
+        current = max(finished, key=lambda result: result.end)
+        path = [current]
+        while True:
+            deps = [self.results[dep] for dep in graph.steps[current.name].deps if self.results[dep].end is not None]
+            if not deps:
+                break
+            current = max(deps, key=lambda result: result.end)
+            path.append(current)
+        path.reverse()
+        return path
+
+    def format_critical_path(self, graph: StepGraph) -> str:
+        path = self.critical_path(graph)
+        steps = " -> ".join(f"{result.name} {result.elapsed:.2f}초" for result in path)
+        saved = max(0.0, self.serial_time - self.elapsed)
+        return (f"임계 경로: {steps} | 전체 {self.elapsed:.2f}초, 단계 합계 {self.serial_time:.2f}초, "
+                f"동시 실행으로 {saved:.2f}초 단축")
+
+
+class StepScheduler:
+    """
+    의존 단계가 모두 끝난 단계를 스레드 풀에서 동시에 실행합니다.
+    - 단계가 timeout 안에 끝나지 않으면 timeout으로 기록하고 더 기다리지 않으며, 그 단계의 취소 이벤트
+      (current_cancel_event())를 설정합니다. 단계는 이 이벤트를 보고 하던 일을 정리하고 끝나야 합니다.
+    - 필수 단계가 실패하면 새 단계를 시작하지 않고, 실행 중인 단계만 기다린 뒤 끝냅니다.
+    - 단계 안에서 발생한 SystemExit(exit_program)은 RunReport.exit_error에 담습니다. 호출한 쪽이 보고를 남긴 뒤 다시 발생시킵니다.
+    """
+
+    def __init__(self, graph: StepGraph, max_workers: int = 4):
+        self.graph = graph
+        self.max_workers = max_workers
+
+    def run(self) -> RunReport:
+        graph = self.graph
+        graph.validate()
+        results = {name: StepResult(name) for name in graph.steps}
+        values = {}
+        values_lock = threading.Lock()
+        running = {}        # future -> (step, deadline)
+        exit_error = None
+        stop = False
+        started = time.perf_counter()
+
+        def execute(step: Step, result: StepResult):
+            result.thread = threading.current_thread().name
+            result.start = time.perf_counter()
+            _current.cancel = result.cancel
+            try:
+                with values_lock:
+                    snapshot = dict(values)
+                return step.func(snapshot)
+            finally:
+                _current.cancel = None
+                if result.status != STATUS_TIMEOUT:
+                    result.end = time.perf_counter()
+
+        def settled(name: str) -> bool:
+            return results[name].status in (STATUS_OK, STATUS_FAILED, STATUS_TIMEOUT, STATUS_SKIPPED)
+
+        def usable(name: str) -> bool:
+            result = results[name]
+            return result.status == STATUS_OK or (graph.steps[name].optional and settled(name))
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="step")
+        try:
+            while True:
+                if not stop:
+                    for name, step in graph.steps.items():
+                        result = results[name]
+                        if result.status != STATUS_PENDING or not all(settled(dep) for dep in step.deps):
+                            continue
+                        if not all(usable(dep) for dep in step.deps):
+                            result.status = STATUS_SKIPPED
+                            continue
+                        result.status = STATUS_RUNNING
+                        deadline = time.perf_counter() + step.timeout if step.timeout else None
+                        running[executor.submit(execute, step, result)] = (step, deadline)
+                if not running:
+                    break
+
+                deadlines = [deadline for _, deadline in running.values() if deadline is not None]
+                timeout = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+                done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    step, _ = running.pop(future)
+                    result = results[step.name]
+                    try:
+                        value = future.result()
+                    except BaseException as e:
+                        result.status = STATUS_FAILED
+                        result.error = e
+                        if isinstance(e, SystemExit) and exit_error is None:
+                            exit_error = e
+                        if not step.optional:
+                            stop = True
+                        with values_lock:
+                            values[step.name] = None
+                        continue
+                    result.status = STATUS_OK
+                    result.value = value
+                    with values_lock:
+                        values[step.name] = value
+
+                now = time.perf_counter()
+                for future, (step, deadline) in list(running.items()):
+                    if deadline is not None and now >= deadline and not future.done():
+                        running.pop(future)
+                        result = results[step.name]
+                        result.status = STATUS_TIMEOUT
+                        result.error = TimeoutError(f"단계 '{step.name}'이(가) {step.timeout}초 안에 끝나지 않았습니다.")
+                        result.end = now
+                        result.cancel.set()
+                        if not step.optional:
+                            stop = True
+                        with values_lock:
+                            values[step.name] = None
+
+            for result in results.values():
+                if result.status == STATUS_PENDING:
+                    result.status = STATUS_SKIPPED
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return RunReport(results, started, time.perf_counter(), exit_error)
@@ -0,0 +1,209 @@
+import functools
+import json
+import os
+import threading
+import time
+
+PROFILE_CPROFILE = "cprofile"
+PROFILE_TRACEMALLOC = "tracemalloc"
+TRACEMALLOC_TOP = 30
+
+
+class Span:
+    __slots__ = ("name", "start", "end", "thread_id", "args")
+
+    def __init__(self, name: str, start: float, thread_id: int, args: dict):
+        self.name = name
+        self.start = start
+        self.end = None
+        self.thread_id = thread_id
+        self.args = args
+
+    @property
+    def elapsed(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+class Tracer:
+    """
+    실행 단계별 소요 시간을 기록하고 Chrome trace-event 형식(chrome://tracing, Perfetto)으로 내보냅니다.
+    profile_phases에 있는 단계는 cProfile 또는 tracemalloc으로 감싸 trace 파일 옆에 결과를 저장합니다.
+    """
+
+    def __init__(self, enabled: bool = True, profile_phases=(), profile_mode: str = PROFILE_CPROFILE,
+                 output_dir: str = "."):
+        self.enabled = enabled
+        self.profile_phases = set(profile_phases)
+        self.profile_mode = profile_mode
+        self.output_dir = output_dir
+        self.spans = []
+        self.profiles = []  # 저장한 프로파일 파일 경로
+        self.metrics = {}   # 실행 결과 값 (대상 빌드, 받은 바이트, 캐시 적중 등). 실행 기록(RunLedger)에 함께 저장합니다.
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **args):
+        return _SpanContext(self, name, args)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def record(self, **values):
+        """실행 결과 값을 기록합니다. 같은 이름은 덮어씁니다."""
+        with self._lock:
+            self.metrics.update(values)
+
+    def add(self, name: str, amount):
+        """누적 값(예: 여러 단계에서 받은 바이트)에 amount를 더합니다."""
+        with self._lock:
+            self.metrics[name] = self.metrics.get(name, 0) + amount
+
+    def totals(self) -> dict:
+        """단계 이름별 전체 소요 시간 (초)"""
+        totals = {}
+        with self._lock:
+            for span in self.spans:
+                totals[span.name] = totals.get(span.name, 0.0) + span.elapsed
+        return totals
+
+    def to_chrome_trace(self) -> dict:
+        pid = os.getpid()
+        events = []
+        with self._lock:
+            spans = sorted(self.spans, key=lambda item: item.start)
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id in {span.thread_id for span in spans}:
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id,
+                           "args": {"name": thread_names.get(thread_id, str(thread_id))}})
+        for span in spans:
+            events.append({
+                "name": span.name,
+                "ph": "X",
+                "ts": round((span.start - self._origin) * 1_000_000, 3),
+                "dur": round(span.elapsed * 1_000_000, 3),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False, default=str)
+        return path
+
+    def _profile_path(self, name: str, suffix: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        with self._lock:
+            index = sum(1 for path in self.profiles if os.path.basename(path).startswith(f"{name}."))
+        file_name = f"{name}.{suffix}" if index == 0 else f"{name}.{index}.{suffix}"
+        return os.path.join(self.output_dir, file_name)
+
+
+class _SpanContext:
+    __slots__ = ("tracer", "name", "args", "span", "_profiler", "_snapshot")
+
+    def __init__(self, tracer: Tracer, name: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.span = None
+        self._profiler = None
+        self._snapshot = None
+
+    def __enter__(self):
+        tracer = self.tracer
+        if not tracer.enabled:
+            return self
+        if self.name in tracer.profile_phases:
+            if tracer.profile_mode == PROFILE_TRACEMALLOC:
+                import tracemalloc
+
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(25)
+                self._snapshot = tracemalloc.take_snapshot()
+            else:
+                import cProfile
+
+                profiler = cProfile.Profile()
+                try:
+                    profiler.enable()
+                    self._profiler = profiler
+                except ValueError:
+                    # 다른 프로파일러가 이미 실행 중이면 (동시에 실행되는 같은 단계 등) 시간만 기록합니다.
+                    pass
+        self.span = Span(self.name, time.perf_counter(), threading.get_ident(), dict(self.args))
+        return self
+
+    def set(self, **args):
+        """진행 중인 구간에 결과 값을 추가합니다. (예: 받은 바이트 수)"""
+        if self.span is not None:
+            self.span.args.update(args)
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.span is None:
+            return False
+        self.span.end = time.perf_counter()
+        if exc_type is not None:
+            self.span.args["error"] = f"{exc_type.__name__}: {exc}"
+        tracer = self.tracer
+        if self._profiler is not None:
+            self._profiler.disable()
+            path = tracer._profile_path(self.name, "prof")
+            self._profiler.dump_stats(path)
+            tracer.profiles.append(path)
+        elif self._snapshot is not None:
+            import tracemalloc
+
+            after = tracemalloc.take_snapshot()
+            path = tracer._profile_path(self.name, "tracemalloc.txt")
+            current, peak = tracemalloc.get_traced_memory()
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"# {self.name}: current {current / 1024:.1f}KB, peak {peak / 1024:.1f}KB\n")
+                for stat in after.compare_to(self._snapshot, "lineno")[:TRACEMALLOC_TOP]:
+                    f.write(f"{stat}\n")
+            tracer.profiles.append(path)
+        tracer._finish(self.span)
+        return False
+
+
+_tracer = Tracer(enabled=True)
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Tracer):
+    global _tracer
+    _tracer = tracer
+
+
+def span(name: str, **args):
+    """공유 Tracer에 구간을 기록하는 컨텍스트 매니저"""
+    return _tracer.span(name, **args)
+
+
+def record(**values):
+    """공유 Tracer에 실행 결과 값을 기록합니다."""
+    _tracer.record(**values)
+
+
+def add(name: str, amount):
+    _tracer.add(name, amount)
+
+
+def traced(name: str = None):
+    """함수 전체를 하나의 구간으로 기록하는 데코레이터"""
+    def decorator(function):
+        span_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _tracer.span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,10 +1,14 @@
 import os
-import shutil
 from src.util.logger import Logger
+from src.steam.ssfn_slots import SSFNSlotStore
+
+# 사용자 SSFN 파일을 보관하는 슬롯 저장소 기본 위치
+SSFN_STORE_DIR = "ssfn_slots"
 
 class SSFNHandler:
-    def __init__(self):
+    def __init__(self, store_dir: str = SSFN_STORE_DIR):
         self.logger = Logger()
+        self.store = SSFNSlotStore(store_dir)
 
     def use_local_ssfn(self, local_ssfn_filepath: str, steam_path: str) -> bool:
         # 제공된 로컬 SSFN 파일이 실제로 존재하는지 확인합니다.
@@ -13,32 +17,27 @@ class SSFNHandler:
             return False
 
         try:
-            removed_files = 0
-            # 대상 Steam 디렉토리에서 기존 'ssfn' 파일을 모두 제거합니다.
-            self.logger.log("INFO", f"'{steam_path}'에서 기존 SSFN 파일을 확인하고 제거합니다.")
-            for file in os.listdir(steam_path):
-                if file.startswith('ssfn'):
-                    full_file_path = os.path.join(steam_path, file)
-                    os.remove(full_file_path)
-                    removed_files += 1
-                    self.logger.log("INFO", f"제거됨: {full_file_path}")
-
-            if removed_files > 0:
-                self.logger.log("INFO", f"'{steam_path}'에서 {removed_files}개의 오래된 SSFN 파일을 제거했습니다.")
-            else:
-                self.logger.log("INFO", f"'{steam_path}'에서 제거할 기존 SSFN 파일이 없습니다.")
-
-            # 제공된 로컬 파일 경로에서 파일 이름(예: 'ssfn1234567890')을 추출합니다.
+            # 로컬 파일을 같은 이름의 슬롯으로 저장합니다. (내용이 같으면 다시 복사하지 않음)
             ssfn_filename = os.path.basename(local_ssfn_filepath)
-            # SSFN 파일이 복사될 Steam 디렉토리 내의 최종 경로를 구성합니다.
-            destination_path = os.path.join(steam_path, ssfn_filename)
+            slot = self.store.add(ssfn_filename, local_ssfn_filepath)
 
-            # 사용자의 로컬 SSFN 파일을 Steam 디렉토리로 복사합니다.
-            shutil.copyfile(local_ssfn_filepath, destination_path)
-            self.logger.log("INFO", f"'{ssfn_filename}' 파일이 '{steam_path}'(으)로 성공적으로 복사되었습니다.")
+            # 슬롯 파일을 Steam 디렉토리에 리플링크(또는 복사)하고, 그 뒤에 기존 'ssfn' 파일을 제거합니다.
+            # Steam이 활성 파일을 고쳐 써도 슬롯은 바뀌지 않습니다.
+            self.logger.log("INFO", f"'{steam_path}'에서 기존 SSFN 파일을 확인하고 교체합니다.")
+            result = self.store.activate(slot.name, steam_path)
+
+            for removed_path in result.removed:
+                self.logger.log("INFO", f"제거됨: {removed_path}")
+            if not result.changed:
+                self.logger.log("INFO", f"'{ssfn_filename}' 파일이 이미 '{steam_path}'에 있습니다. 교체를 건너뜁니다. ({result.elapsed_ms:.1f}ms)")
+            elif result.method is None:
+                self.logger.log("INFO", f"'{steam_path}'에서 {len(result.removed)}개의 오래된 SSFN 파일을 제거했습니다. ({result.elapsed_ms:.1f}ms)")
+            else:
+                self.logger.log("INFO", f"'{ssfn_filename}' 파일이 '{steam_path}'(으)로 성공적으로 교체되었습니다. "
+                                        f"(방식: {result.method}, 오래된 파일 {len(result.removed)}개 제거, {result.elapsed_ms:.1f}ms)")
             return True
 
         except Exception as e:
             # 파일 작업 중 오류가 발생하면 로깅하고 False를 반환합니다.
             self.logger.log("ERROR", f"로컬 SSFN 파일을 사용하는 데 실패했습니다. 오류: {e}")
-            return False
\ No newline at end of file
+            return False
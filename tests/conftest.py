@@ -0,0 +1,5 @@
+import os
+import sys
+
+# bench/ 스크립트와 같이 저장소 루트에서 src 패키지를 가져옵니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,120 @@
+import struct
+
+import pytest
+
+from src.steam.binary_vdf import (PACKAGEINFO_MAGIC_27, PACKAGEINFO_MAGIC_28, TYPE_END, TYPE_INT32, TYPE_NODE,
+                                  TYPE_STRING, TYPE_UINT64, BinaryKVNode, BinaryVdfError, BinaryVdfFile,
+                                  PackageInfoFile)
+from src.steam.client_manifest import CLIENT_MANIFEST_NAME, get_installed_client_version
+
+
+def encode(items) -> bytes:
+    """[(키, 값)] -> 바이너리 KeyValues 노드 본문 (끝 표시 포함). 값이 list이면 하위 노드입니다."""
+    out = bytearray()
+    for key, value in items:
+        name = key.encode("utf-8") + b"\x00"
+        if isinstance(value, list):
+            out += bytes((TYPE_NODE,)) + name + encode(value)
+        elif isinstance(value, str):
+            out += bytes((TYPE_STRING,)) + name + value.encode("utf-8") + b"\x00"
+        elif value >= 1 << 31:
+            out += bytes((TYPE_UINT64,)) + name + struct.pack("<Q", value)
+        else:
+            out += bytes((TYPE_INT32,)) + name + struct.pack("<i", value)
+    return bytes(out + bytes((TYPE_END,)))
+
+
+def packageinfo(magic: int, packages: dict) -> bytes:
+    out = bytearray(struct.pack("<II", magic, 1))
+    for package_id, (change_number, items) in packages.items():
+        out += struct.pack("<I", package_id) + bytes(20) + struct.pack("<I", change_number)
+        if magic == PACKAGEINFO_MAGIC_28:
+            out += bytes(8)
+        out += encode([(str(package_id), items)])
+    return bytes(out + struct.pack("<I", 0xFFFFFFFF))
+
+
+def write(tmp_path, name: str, data: bytes) -> str:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_nested_nodes_are_decoded_on_demand(tmp_path):
+    path = write(tmp_path, "nested.vdf", encode([
+        ("root", [("name", "client"), ("Build", 1683580360), ("deep", [("inner", [("value", "x")])])]),
+        ("big", 1 << 40),
+    ]))
+    with BinaryVdfFile(path) as document:
+        root = document.root["root"]
+        assert isinstance(root, BinaryKVNode)
+        assert root.keys() == ["name", "Build", "deep"]
+        assert root.get("build") == 1683580360
+        assert root._index is not None and root["deep"]._index is None
+        assert document.root.find("root/deep/inner/value") == "x"
+        assert document.root.find("root/name/missing") is None
+        assert document.root["big"] == 1 << 40
+        assert document.root.to_dict()["root"]["deep"] == {"inner": {"value": "x"}}
+
+
+def test_duplicate_keys_yield_every_value(tmp_path):
+    path = write(tmp_path, "dup.vdf", encode([("depot", "a"), ("Depot", "b"), ("other", 1), ("depot", "c")]))
+    with BinaryVdfFile(path) as document:
+        assert list(document.root.items()) == [("depot", "a"), ("Depot", "b"), ("other", 1), ("depot", "c")]
+        assert document.root.get_all("DEPOT") == ["a", "b", "c"]
+        assert document.root["depot"] == "a"
+        assert len(document.root) == 4
+
+
+@pytest.mark.parametrize("magic", [PACKAGEINFO_MAGIC_27, PACKAGEINFO_MAGIC_28])
+def test_packageinfo_headers(tmp_path, magic):
+    path = write(tmp_path, "packageinfo.vdf", packageinfo(magic, {
+        7: (100, [("packageid", 7), ("appids", [("0", 7)])]),
+        1234: (205, [("packageid", 1234), ("billingtype", 10)]),
+    }))
+    with PackageInfoFile(path) as info:
+        assert info.magic == magic
+        assert info.package_ids() == [7, 1234]
+        assert info.change_number(1234) == 205
+        assert info.change_number(99) is None
+        assert info.get(1234)["billingtype"] == 10
+        assert info.get(7).find("appids/0") == 7
+
+
+def test_packageinfo_rejects_unknown_magic(tmp_path):
+    path = write(tmp_path, "packageinfo.vdf", struct.pack("<II", 0x06565526, 1))
+    with pytest.raises(BinaryVdfError):
+        PackageInfoFile(path)
+
+
+@pytest.mark.parametrize("cut", [4, 12, 30, -6, -1])
+def test_truncated_packageinfo(tmp_path, cut):
+    data = packageinfo(PACKAGEINFO_MAGIC_28, {5: (1, [("packageid", 5), ("name", "steam")])})[:-4]
+    path = write(tmp_path, "packageinfo.vdf", data[:cut])
+    with pytest.raises(BinaryVdfError):
+        PackageInfoFile(path)
+
+
+@pytest.mark.parametrize("cut", [1, 3, 9, -1])
+def test_truncated_node(tmp_path, cut):
+    data = encode([("root", [("name", "client"), ("build", 5)])])
+    path = write(tmp_path, "cut.vdf", data[:cut])
+    with BinaryVdfFile(path) as document:
+        with pytest.raises(BinaryVdfError):
+            document.root.keys()
+
+
+def test_installed_version_from_binary_manifest(tmp_path):
+    package_dir = tmp_path / "package"
+    package_dir.mkdir()
+    write(package_dir, f"{CLIENT_MANIFEST_NAME}.manifest", encode([
+        ("win32", [("version", "1683580360"), ("bins_win32", [("file", "bins_win32.zip"), ("size", "10")])]),
+    ]))
+    assert get_installed_client_version(str(tmp_path)) == "1683580360"
+
+
+def test_installed_version_from_text_manifest(tmp_path):
+    package_dir = tmp_path / "package"
+    package_dir.mkdir()
+    (package_dir / f"{CLIENT_MANIFEST_NAME}.manifest").write_text('"win32"\n{\n\t"version"\t\t"1700000000"\n}\n')
+    assert get_installed_client_version(str(tmp_path)) == "1700000000"
@@ -0,0 +1,120 @@
+import json
+import urllib.parse
+
+import pytest
+
+from src.steam.build_catalog import BuildCatalog, CatalogIngester, normalize_timestamp, parse_cdx
+
+ORIGINAL = "http://media.steampowered.com/client/steam_client_win32"
+# 스냅샷 시각 -> (digest, 빌드 번호). 같은 빌드의 스냅샷은 같은 digest입니다.
+SNAPSHOTS = {
+    "20230101120000": ("AAAA", "1672500000"),
+    "20230105120000": ("AAAA", "1672500000"),
+    "20230110120000": ("BBBB", "1673300000"),
+    "20230120120000": ("BBBB", "1673300000"),
+    "20230201000000": ("CCCC", "1675200000"),
+}
+BROKEN = ("20230301000000", "DDDD")
+
+
+def manifest(build: str) -> str:
+    return (f'"win32"\n{{\n\t"version"\t\t"{build}"\n'
+            f'\t"bins_win32"\n\t{{\n\t\t"file"\t\t"bins_win32.zip.{build}"\n\t\t"size"\t\t"1000"\n\t}}\n}}\n')
+
+
+def cdx_listing() -> str:
+    rows = [["urlkey", "timestamp", "original", "mimetype", "statuscode", "digest", "length"]]
+    for timestamp, (digest, _) in SNAPSHOTS.items():
+        rows.append(["com,steampowered,media)/client/steam_client_win32", timestamp, ORIGINAL, "text/plain", "200",
+                     digest, "100"])
+    rows.append(["com,steampowered,media)/client/steam_client_win32", BROKEN[0], ORIGINAL, "text/plain", "200",
+                 BROKEN[1], "5"])
+    return json.dumps(rows)
+
+
+class FixtureIngester(CatalogIngester):
+    """web.archive.org 대신 CDX 목록과 매니페스트를 메모리에서 돌려줍니다."""
+
+    def __init__(self, catalog):
+        super().__init__(catalog, cdx_url="http://cdx.test/cdx", snapshot_url="http://snap.test/{timestamp}/{original}")
+        self.requests = []
+
+    def _get(self, url: str) -> bytes:
+        self.requests.append(url)
+        if url.startswith("http://cdx.test/"):
+            return cdx_listing().encode("utf-8")
+        timestamp = urllib.parse.urlsplit(url).path.split("/")[1]
+        if timestamp == BROKEN[0]:
+            return b"not a manifest"
+        return manifest(SNAPSHOTS[timestamp][1]).encode("utf-8")
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    with BuildCatalog(str(tmp_path / "catalog.sqlite")) as catalog:
+        yield catalog
+
+
+def test_update_fetches_each_digest_once(catalog):
+    ingester = FixtureIngester(catalog)
+    report = ingester.update()
+
+    assert report.listed == 6 and report.new_snapshots == 6
+    assert report.fetched == 3
+    assert [digest for digest, _ in report.failed] == [BROKEN[1]]
+    # CDX 목록 1번 + digest마다 매니페스트 1번
+    assert len(ingester.requests) == 1 + 4
+
+    again = FixtureIngester(catalog).update()
+    assert (again.new_snapshots, again.fetched, again.failed) == (0, 0, [])
+
+
+@pytest.mark.parametrize("date, timestamp, build", [
+    ("20230101", "20230101120000", "1672500000"),
+    ("2023-01-07", "20230105120000", "1672500000"),
+    ("2023-01-08 12:00", "20230110120000", "1673300000"),
+    ("20230119", "20230120120000", "1673300000"),
+    ("2024", "20230201000000", "1675200000"),
+    ("2000", "20230101120000", "1672500000"),
+])
+def test_resolve_picks_nearest_known_capture(catalog, date, timestamp, build):
+    FixtureIngester(catalog).update()
+    entry = catalog.resolve(date)
+    assert (entry.timestamp, entry.build) == (timestamp, build)
+
+
+def test_build_at_and_snapshots_of(catalog):
+    FixtureIngester(catalog).update()
+    assert catalog.build_at("2023-01-19").build == "1673300000"
+    assert catalog.build_at("2022-12-31") is None
+    assert [entry.timestamp for entry in catalog.snapshots_of("1672500000")] == ["20230101120000", "20230105120000"]
+    assert catalog.nearest_build("1673000000").build == "1673300000"
+    assert [row[0] for row in catalog.builds()] == ["1672500000", "1673300000", "1675200000"]
+
+
+def test_empty_catalog_resolves_nothing(catalog):
+    assert catalog.resolve("20230101") is None
+    assert catalog.nearest_build("1673000000") is None
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("20230531", "20230531000000"),
+    ("2023-05-31 12:34:56", "20230531123456"),
+    ("2023", "20230101000000"),
+])
+def test_normalize_timestamp(value, expected):
+    assert normalize_timestamp(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "123", "2023-13-01", "20230231", "202305311200001"])
+def test_normalize_timestamp_rejects_bad_dates(value):
+    with pytest.raises(ValueError, match="잘못된 날짜"):
+        normalize_timestamp(value)
+
+
+def test_parse_cdx_text_format():
+    text = f"com,steampowered,media)/client/steam_client_win32 20230101120000 {ORIGINAL} text/plain 200 AAAA 100\n"
+    assert parse_cdx(text) == [{"urlkey": "com,steampowered,media)/client/steam_client_win32",
+                                "timestamp": "20230101120000", "original": ORIGINAL, "mimetype": "text/plain",
+                                "statuscode": "200", "digest": "AAAA", "length": "100"}]
+    assert parse_cdx("") == [] and parse_cdx("[]") == []
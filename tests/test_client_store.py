@@ -0,0 +1,86 @@
+import io
+import os
+import zipfile
+
+from src.steam.client_manifest import get_installed_manifest_path
+from src.steam.client_store import ClientStore
+
+
+def install_build(root, version: str, files: dict):
+    """version 매니페스트와 files를 담은 패키지 하나, 그 패키지를 푼 파일들로 Steam 루트를 채웁니다."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    package_name = f"bins_win32.zip.{version}"
+    (root / "package").mkdir(parents=True, exist_ok=True)
+    (root / "package" / package_name).write_bytes(buffer.getvalue())
+    with open(get_installed_manifest_path(str(root)), "w", encoding="utf-8") as f:
+        f.write(f'"win32"\n{{\n\t"version"\t\t"{version}"\n\t"bins_win32"\n\t{{\n\t\t"file"\t\t"{package_name}"\n\t}}\n}}\n')
+    for name, data in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+def snapshot_two_builds(tmp_path):
+    root = tmp_path / "steam"
+    store = ClientStore(str(tmp_path / "store"))
+    install_build(root, "100", {"bin/shared.dll": b"shared" * 100, "bin/steamui.dll": b"old ui"})
+    assert store.snapshot(str(root)).ok
+    os.remove(root / "package" / "bins_win32.zip.100")
+    install_build(root, "200", {"bin/shared.dll": b"shared" * 100, "bin/steamui.dll": b"new ui"})
+    assert store.snapshot(str(root)).ok
+    return root, store
+
+
+def test_switch_does_not_share_inode_with_store_objects(tmp_path):
+    root, store = snapshot_two_builds(tmp_path)
+
+    report = store.switch(str(root), "100")
+
+    assert report.ok, report.errors
+    ui = root / "bin" / "steamui.dll"
+    assert ui.read_bytes() == b"old ui"
+    # Steam이 파일을 제자리에서 고쳐 써도 저장된 빌드는 그대로여야 합니다.
+    with open(ui, "r+b") as f:
+        f.write(b"XX")
+    digest = store.get("100").files["bin/steamui.dll"][0]
+    with open(store.object_path(digest), "rb") as f:
+        assert f.read() == b"old ui"
+
+
+def test_switch_skips_files_placed_earlier(tmp_path):
+    root, store = snapshot_two_builds(tmp_path)
+    shared = root / "bin" / "shared.dll"
+    shared_inode = os.stat(shared).st_ino
+
+    report = store.switch(str(root), "100")
+    assert report.ok, report.errors
+    assert os.stat(shared).st_ino == shared_inode      # 두 빌드가 같은 내용이면 건드리지 않습니다.
+    assert report.linked == 3                          # steamui.dll, 패키지, 매니페스트
+    assert report.removed == 1                         # 빌드 200의 패키지
+
+    report = store.switch(str(root), "200")
+    assert report.ok, report.errors
+    assert (root / "bin" / "steamui.dll").read_bytes() == b"new ui"
+    assert os.stat(shared).st_ino == shared_inode
+    assert report.linked == 3
+
+    report = store.switch(str(root), "200")
+    assert report.ok, report.errors
+    assert report.linked == 0
+    assert report.unchanged == 4
+
+
+def test_switch_replaces_file_modified_after_placement(tmp_path):
+    root, store = snapshot_two_builds(tmp_path)
+    assert store.switch(str(root), "100").ok
+    ui = root / "bin" / "steamui.dll"
+    ui.write_bytes(b"patched")
+
+    report = store.switch(str(root), "100")
+
+    assert report.ok, report.errors
+    assert report.linked == 1
+    assert ui.read_bytes() == b"old ui"
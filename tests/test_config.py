@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.helper.config import Config
+from src.util import log_pipeline
+
+
+class _MemorySink(log_pipeline.LogSink):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def write_batch(self, records: list):
+        self.records.extend(records)
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    monkeypatch.setattr("src.util.logger.time.sleep", lambda seconds: None)
+    sink = _MemorySink()
+    pipeline = log_pipeline.LogPipeline([sink])
+    monkeypatch.setattr(log_pipeline, "_pipeline", pipeline)
+    yield sink
+    pipeline.close()
+
+
+def probe(config: dict, registry_steam_path="C:/Steam", steam_path="C:/Steam"):
+    return SimpleNamespace(config=config, steam_reg=None, registry_steam_path=registry_steam_path, steam_path=steam_path)
+
+
+def test_missing_key_is_logged_and_exits(sink, capsys):
+    with pytest.raises(SystemExit):
+        Config(probe({"username": "user"}))
+
+    assert [(record.type, record.message) for record in sink.records][0] == \
+        ("ERROR", "config.yaml 파일에 필수 키가 누락되었습니다: 'downgrade_wayback_date'. 파일을 확인하세요.")
+    assert "ERROR" not in capsys.readouterr().out
+
+
+def test_undetected_steam_path_is_logged_as_warning(sink):
+    config = Config(probe({"username": "user", "downgrade_wayback_date": "20230508"}, registry_steam_path=None))
+    log_pipeline.get_pipeline().flush()
+
+    assert config.steam_path == "C:/Steam"
+    assert [record.type for record in sink.records] == ["WARNING", "WARNING"]
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+
+import pytest
+
+from src.net.connectivity import (STATE_ISOLATED, STATE_ONLINE, STATE_UNKNOWN, ConnectivityMonitor,
+                                  ConnectivityProbe, InterfaceProbe, TcpProbe, parse_probe)
+
+
+class FakeProbe(ConnectivityProbe):
+    """online 값을 그대로 돌려주는 프로브. delay만큼 늦게 답하거나 예외를 낼 수 있습니다."""
+
+    def __init__(self, online: bool = True, delay: float = 0.0, error: Exception = None, timeout: float = 0.2):
+        self.online = online
+        self.delay = delay
+        self.error = error
+        self.timeout = timeout
+        self.calls = 0
+
+    def check(self) -> bool:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.online
+
+
+def test_state_changes_after_confirmations():
+    probe = FakeProbe(online=True)
+    changes = []
+    monitor = ConnectivityMonitor([probe], confirmations=2, on_change=changes.append)
+    try:
+        assert monitor.state == STATE_UNKNOWN
+        monitor._update(monitor.check_once())
+        assert monitor.state == STATE_ONLINE and monitor.seen_online
+
+        probe.online = False
+        monitor._update(monitor.check_once())
+        # 한 번 실패로는 차단으로 보지 않습니다.
+        assert monitor.state == STATE_ONLINE
+        monitor._update(monitor.check_once())
+        assert monitor.state == STATE_ISOLATED
+
+        probe.online = True
+        monitor._update(monitor.check_once())
+        assert monitor.state == STATE_ONLINE
+        assert changes == [STATE_ONLINE, STATE_ISOLATED, STATE_ONLINE]
+        assert monitor.checks == 4
+    finally:
+        monitor.stop()
+
+
+def test_any_probe_online_is_enough():
+    monitor = ConnectivityMonitor([FakeProbe(online=False), FakeProbe(error=OSError("down")), FakeProbe(online=True)])
+    try:
+        assert monitor.check_once()
+    finally:
+        monitor.stop()
+
+
+def test_slow_and_failing_probes_count_as_offline():
+    slow = FakeProbe(online=True, delay=2.0, timeout=0.1)
+    monitor = ConnectivityMonitor([slow, FakeProbe(error=RuntimeError("boom"))])
+    try:
+        started = time.monotonic()
+        assert not monitor.check_once()
+        assert time.monotonic() - started < 1.5
+    finally:
+        monitor.stop()
+
+
+def test_wait_for_isolation_wakes_on_change():
+    probe = FakeProbe(online=True)
+    with ConnectivityMonitor([probe], interval=0.02, confirmations=2) as monitor:
+        assert monitor.wait_for_state(STATE_ONLINE, timeout=5)
+        threading.Timer(0.1, setattr, args=(probe, "online", False)).start()
+        assert monitor.wait_for_isolation(timeout=5)
+        assert monitor.state == STATE_ISOLATED
+
+
+def test_wait_returns_false_on_timeout_and_stop():
+    monitor = ConnectivityMonitor([FakeProbe(online=True)], interval=0.02)
+    with monitor:
+        assert not monitor.wait_for_isolation(timeout=0.1)
+    assert not monitor.wait_for_isolation(timeout=1)
+
+
+def test_requires_probes():
+    with pytest.raises(ValueError):
+        ConnectivityMonitor([])
+
+
+def test_parse_probe():
+    probe = parse_probe("steamcommunity.com:443")
+    assert isinstance(probe, TcpProbe) and (probe.host, probe.port) == ("steamcommunity.com", 443)
+    probe = parse_probe("http://example.com/path")
+    assert (probe.host, probe.port) == ("example.com", 80)
+    assert parse_probe("[::1]:8080").host == "::1"
+    for spec in ("example.com", "example.com:http", "https:///nohost"):
+        with pytest.raises(ValueError):
+            parse_probe(spec)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows는 wininet으로 확인합니다.")
+def test_interface_probe_reads_operstate(tmp_path):
+    for name, state in (("lo", "unknown"), ("eth0", "down"), ("wlan0", "up")):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "operstate").write_text(state + "\n")
+    assert InterfaceProbe(sys_net_root=str(tmp_path)).check()
+    assert not InterfaceProbe("eth0", sys_net_root=str(tmp_path)).check()
@@ -0,0 +1,70 @@
+"""
+main.py 시작 시간 예산.
+
+`python -X importtime main.py --help`를 여러 번 실행해, 인터프리터 시작(-c pass)에서 이미 불러오는 모듈을 뺀
+최상위 import 누적 시간의 가장 빠른 값을 예산과 비교합니다. 하위 명령을 실행할 때까지 미뤄야 하는 모듈(pyuac, yaml,
+colorama, winreg, 다운그레이드 단계, http 등)을 시작 시점에 불러오면 실패합니다.
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUDGET_MS = 60.0
+REPEAT = 5
+# main.py를 시작할 때 함께 불러오면 안 되는 모듈 (하위 명령을 실행할 때 불러옵니다)
+DEFERRED_MODULES = (
+    "pyuac",
+    "yaml",
+    "colorama",
+    "winreg",
+    "logging",
+    "http.client",
+    "http.server",
+    "urllib.request",
+    "sqlite3",
+    "ssfn",
+    "src.helper.config",
+    "src.util.logger",
+    "src.util.steam_downgrader",
+)
+
+
+def import_times(*args) -> dict:
+    """{모듈 이름: (누적 시간 us, 최상위 import 여부)} - 이미 불러온 모듈은 나오지 않습니다."""
+    env = dict(os.environ)
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT, env=env, capture_output=True,
+                            text=True)
+    assert result.returncode == 0, result.stderr[-2000:]
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # 하위 import는 이름 앞에 단계마다 공백 두 칸이 더 붙습니다.
+        modules[name.strip()] = (int(cumulative), not name[1:].startswith(" "))
+    return modules
+
+
+def startup_ms(modules: dict, baseline: set) -> float:
+    return sum(cumulative for name, (cumulative, top) in modules.items() if top and name not in baseline) / 1000
+
+
+def test_main_help_import_time_within_budget():
+    baseline = set(import_times("-c", "pass"))
+    runs = [import_times("main.py", "--help") for _ in range(REPEAT)]
+    best = min(runs, key=lambda modules: startup_ms(modules, baseline))
+    elapsed_ms = startup_ms(best, baseline)
+    slowest = sorted(((cumulative, name) for name, (cumulative, top) in best.items() if top and name not in baseline),
+                     reverse=True)[:10]
+    assert elapsed_ms <= BUDGET_MS, (
+        f"main.py --help import {elapsed_ms:.1f}ms > 예산 {BUDGET_MS:.1f}ms: "
+        + ", ".join(f"{name} {cumulative / 1000:.1f}ms" for cumulative, name in slowest)
+    )
+
+
+def test_main_help_defers_heavy_imports():
+    modules = import_times("main.py", "--help")
+    assert [name for name in DEFERRED_MODULES if name in modules] == []
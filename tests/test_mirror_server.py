@@ -0,0 +1,126 @@
+import errno
+import os
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.net import mirror_server
+from src.net.mirror_server import CLIENT_PREFIX, PackageMirror
+from src.net.package_cache import PackageCache
+
+PACKAGE = bytes(range(256)) * 40
+
+
+class _OriginHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        body = self.server.files.get(self.path.rsplit("/", 1)[-1])
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def origin():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OriginHandler)
+    server.files = {"bins_win32.zip": PACKAGE}
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def mirror(tmp_path, origin):
+    base = f"http://127.0.0.1:{origin.server_address[1]}/client"
+    with PackageMirror(PackageCache(str(tmp_path), 1 << 20), base) as mirror:
+        yield mirror
+
+
+def get(mirror, name: str, range_header: str = None, method: str = "GET"):
+    request = urllib.request.Request(f"{mirror.base_url}/{name}", method=method)
+    if range_header:
+        request.add_header("Range", range_header)
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        with e:
+            return e.code, dict(e.headers), e.read()
+
+
+def test_full_download_is_cached(mirror, origin):
+    assert get(mirror, "bins_win32.zip")[::2] == (200, PACKAGE)
+    assert get(mirror, "bins_win32.zip")[::2] == (200, PACKAGE)
+    assert len(origin.requests) == 1
+    assert mirror.bytes_from_origin == len(PACKAGE)
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=100-199", 100, 199),
+    ("bytes=10000-", 10000, len(PACKAGE) - 1),
+    ("bytes=-50", len(PACKAGE) - 50, len(PACKAGE) - 1),
+    ("bytes=9000-999999", 9000, len(PACKAGE) - 1),
+])
+def test_range_request(mirror, header, start, end):
+    status, headers, body = get(mirror, "bins_win32.zip", header)
+    assert status == 206
+    assert body == PACKAGE[start:end + 1]
+    assert headers["Content-Range"] == f"bytes {start}-{end}/{len(PACKAGE)}"
+    assert headers["Content-Length"] == str(end - start + 1)
+
+
+def test_unsatisfiable_range(mirror):
+    status, headers, body = get(mirror, "bins_win32.zip", f"bytes={len(PACKAGE)}-")
+    assert status == 416
+    assert headers["Content-Range"] == f"bytes */{len(PACKAGE)}"
+    assert body == b""
+
+
+def test_head_sends_headers_only(mirror):
+    status, headers, body = get(mirror, "bins_win32.zip", method="HEAD")
+    assert (status, body) == (200, b"")
+    assert headers["Content-Length"] == str(len(PACKAGE))
+
+
+def test_origin_errors_and_bad_paths(mirror):
+    assert get(mirror, "missing.zip")[0] == 404
+    assert get(mirror, "..")[0] == 404
+    request = urllib.request.Request(f"http://127.0.0.1:{mirror.port}/other{CLIENT_PREFIX}/bins_win32.zip")
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request, timeout=10)
+    assert error.value.code == 404
+    error.value.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "sendfile"), reason="os.sendfile 없음")
+@pytest.mark.parametrize("header, start", [(None, 0), ("bytes=1000-", 1000)])
+def test_sendfile_failure_midway_continues_without_resending(mirror, monkeypatch, header, start):
+    calls = []
+    real_sendfile = os.sendfile
+
+    def flaky_sendfile(out_fd, in_fd, offset, count):
+        calls.append(offset)
+        if len(calls) > 1:
+            raise OSError(errno.EINVAL, "sendfile 실패")
+        return real_sendfile(out_fd, in_fd, offset, min(count, 777))
+
+    assert get(mirror, "bins_win32.zip")[0] == 200
+    monkeypatch.setattr(mirror_server.os, "sendfile", flaky_sendfile)
+
+    status, _, body = get(mirror, "bins_win32.zip", header)
+
+    assert (status, body) == (206 if header else 200, PACKAGE[start:])
+    assert calls == [start, start + 777]
@@ -0,0 +1,66 @@
+import os
+
+from src.net.package_cache import PackageCache
+
+
+def test_store_and_lookup_by_digest(tmp_path):
+    cache = PackageCache(str(tmp_path), 1 << 20)
+    digest = cache.store_bytes("a", b"payload")
+
+    assert cache.lookup("a") == cache.blob_path(digest)
+    assert cache.lookup("missing") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.contains_digest(digest)
+    # 같은 내용은 한 번만 저장합니다.
+    assert cache.store_bytes("b", b"payload") == digest
+    assert cache.total_bytes == len(b"payload")
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = PackageCache(str(tmp_path), 250)
+    cache.store_bytes("old", b"o" * 100)
+    cache.store_bytes("used", b"u" * 100)
+    # "old"보다 "used"를 나중에 썼으므로 새 항목이 들어오면 "old"가 먼저 빠집니다.
+    cache.entries["old"]["last_used"] -= 10
+    cache.store_bytes("new", b"n" * 100)
+
+    assert cache.lookup("old", record=False) is None
+    assert cache.lookup("used", record=False) is not None
+    assert cache.lookup("new", record=False) is not None
+    assert cache.total_bytes <= 250
+
+
+def test_keeps_blob_shared_by_another_key(tmp_path):
+    cache = PackageCache(str(tmp_path), 250)
+    digest = cache.store_bytes("first", b"s" * 100)
+    cache.store_bytes("other", b"x" * 100)
+    cache.link_key("alias", digest)
+    cache.entries["first"]["last_used"] -= 20
+    cache.entries["other"]["last_used"] -= 10
+    cache.store_bytes("new", b"n" * 100)
+
+    # "first"를 빼도 같은 내용을 가리키는 "alias"가 남아 크기가 줄지 않으므로 다음으로 오래된 "other"까지 뺍니다.
+    assert "first" not in cache.entries and "other" not in cache.entries
+    assert cache.lookup("alias", record=False) == cache.blob_path(digest)
+    assert os.path.isfile(cache.blob_path(digest))
+
+
+def test_keeps_just_stored_blob_larger_than_limit(tmp_path):
+    cache = PackageCache(str(tmp_path), 50)
+    cache.store_bytes("small", b"s" * 10)
+    digest = cache.store_bytes("huge", b"h" * 100)
+
+    assert cache.lookup("huge", record=False) == cache.blob_path(digest)
+    assert cache.lookup("small", record=False) is None
+
+
+def test_index_survives_reopen_and_drops_missing_blobs(tmp_path):
+    cache = PackageCache(str(tmp_path), 1 << 20)
+    kept = cache.store_bytes("kept", b"k" * 10)
+    lost = cache.store_bytes("lost", b"l" * 10)
+    os.remove(cache.blob_path(lost))
+
+    reopened = PackageCache(str(tmp_path), 1 << 20)
+
+    assert reopened.lookup("kept") == reopened.blob_path(kept)
+    assert "lost" not in reopened.entries
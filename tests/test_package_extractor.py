@@ -0,0 +1,74 @@
+import hashlib
+import io
+import os
+import zipfile
+
+from src.steam.client_manifest import ClientManifest
+from src.steam.package_extractor import PackageExtractor
+
+CONTENT = b"new steamui " * 1000
+
+
+def package_bytes(files: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def install_package(root, data: bytes) -> ClientManifest:
+    name = f"bins_win32.zip.{hashlib.sha1(data).hexdigest()}"
+    package_dir = root / "package"
+    package_dir.mkdir(exist_ok=True)
+    (package_dir / name).write_bytes(data)
+    return ClientManifest.parse(
+        f'"win32"\n{{\n\t"version"\t\t"1683580360"\n\t"bins_win32"\n\t{{\n\t\t"file"\t\t"{name}"\n'
+        f'\t\t"size"\t\t"{len(data)}"\n\t\t"sha2"\t\t"{hashlib.sha256(data).hexdigest()}"\n\t}}\n}}\n')
+
+
+def test_extracts_and_skips_temporary_files(tmp_path):
+    manifest = install_package(tmp_path, package_bytes({"bin/steamui.dll": CONTENT, "bin/steamui.dll.tmp": b"x"}))
+
+    report = PackageExtractor(str(tmp_path)).extract(manifest)
+
+    assert report.ok, report.failed
+    assert (tmp_path / "bin" / "steamui.dll").read_bytes() == CONTENT
+    assert not (tmp_path / "bin" / "steamui.dll.tmp").exists()
+    assert report.results[0].skipped == 1
+    assert os.listdir(tmp_path / "bin") == ["steamui.dll"]
+
+
+def test_corrupt_member_leaves_installed_file_untouched(tmp_path):
+    data = bytearray(package_bytes({"bin/steamui.dll": CONTENT}))
+    # 저장(STORED)된 항목 내용을 한 바이트 바꿔 CRC가 맞지 않게 만듭니다.
+    index = bytes(data).index(CONTENT) + len(CONTENT) // 2
+    data[index] ^= 0xFF
+    manifest = install_package(tmp_path, bytes(data))
+    installed = tmp_path / "bin" / "steamui.dll"
+    installed.parent.mkdir()
+    installed.write_bytes(b"old steamui")
+
+    report = PackageExtractor(str(tmp_path)).extract(manifest)
+
+    assert not report.ok
+    assert installed.read_bytes() == b"old steamui"
+    assert os.listdir(installed.parent) == ["steamui.dll"]
+
+
+def test_place_package_files_does_not_share_cache_inode(tmp_path):
+    from src.net.package_cache import PackageCache
+
+    data = package_bytes({"bin/steamui.dll": CONTENT})
+    manifest = ClientManifest.parse(
+        f'"win32"\n{{\n\t"version"\t\t"1"\n\t"bins_win32"\n\t{{\n\t\t"file"\t\t"bins_win32.zip.1"\n'
+        f'\t\t"size"\t\t"{len(data)}"\n\t\t"sha2"\t\t"{hashlib.sha256(data).hexdigest()}"\n\t}}\n}}\n')
+    cache = PackageCache(str(tmp_path / "cache"), 1 << 30)
+    digest = cache.store_bytes("bins_win32.zip.1", data)
+    root = tmp_path / "steam"
+
+    assert PackageExtractor(str(root), cache=cache).place_package_files(manifest) == []
+
+    placed = root / "package" / "bins_win32.zip.1"
+    assert placed.read_bytes() == data
+    assert not os.path.samefile(placed, cache.blob_path(digest))
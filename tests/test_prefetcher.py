@@ -0,0 +1,115 @@
+import hashlib
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.net.package_cache import PackageCache
+from src.net.prefetcher import PackagePrefetcher, is_safe_name
+
+PACKAGE = os.urandom(64 * 1024)
+SHA256 = hashlib.sha256(PACKAGE).hexdigest()
+
+
+class _OriginHandler(BaseHTTPRequestHandler):
+    """Range를 지원하는 원본. server.cut_after바이트만 보내고 연결을 끊도록 할 수 있습니다."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        range_header = self.headers.get("Range")
+        self.server.requests.append(range_header)
+        start = int(re.match(r"bytes=(\d+)-$", range_header).group(1)) if range_header else 0
+        body = self.server.body
+        if start >= len(body):
+            self.send_response(416)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(206 if start else 200)
+        self.send_header("Content-Length", str(len(body) - start))
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        self.end_headers()
+        cut_after = self.server.cut_after
+        if cut_after is not None:
+            self.server.cut_after = None
+            self.wfile.write(body[start:start + cut_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body[start:])
+
+
+@pytest.fixture
+def origin():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OriginHandler)
+    server.body = PACKAGE
+    server.cut_after = None
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def prefetcher(tmp_path, origin):
+    cache = PackageCache(str(tmp_path), 1 << 30)
+    prefetcher = PackagePrefetcher(cache, f"http://127.0.0.1:{origin.server_address[1]}/client", retries=2,
+                                   backoff=0, timeout=10)
+    yield prefetcher
+    prefetcher.close()
+
+
+def test_resumes_broken_transfer_with_range(prefetcher, origin):
+    origin.cut_after = 10000
+
+    result = prefetcher.fetch("bins_win32.zip", len(PACKAGE), SHA256)
+
+    assert result.ok, result.error
+    assert result.attempts == 2
+    assert result.resumed_from == 10000
+    assert origin.requests == [None, "bytes=10000-"]
+    with open(prefetcher.cache.lookup(prefetcher.cache_key("bins_win32.zip")), "rb") as f:
+        assert f.read() == PACKAGE
+    assert not os.listdir(prefetcher.partial_dir)
+
+
+def test_second_fetch_is_served_from_cache(prefetcher, origin):
+    assert prefetcher.fetch("bins_win32.zip", len(PACKAGE), SHA256).ok
+    result = prefetcher.fetch("bins_win32.zip", len(PACKAGE), SHA256)
+    assert result.ok and result.from_cache
+    assert len(origin.requests) == 1
+
+
+def test_digest_mismatch_is_not_cached(prefetcher, origin):
+    result = prefetcher.fetch("bins_win32.zip", len(PACKAGE), "0" * 64)
+
+    assert not result.ok
+    assert "해시 불일치" in result.error
+    # 매번 손상된 파일을 지우고 처음부터 다시 받습니다.
+    assert origin.requests == [None] * 3
+    assert prefetcher.cache.lookup(prefetcher.cache_key("bins_win32.zip")) is None
+    assert not os.listdir(prefetcher.partial_dir)
+
+
+@pytest.mark.parametrize("name", ["", ".", "..", "../escape", "sub/file", "..\\escape", "c:evil", "nul\0byte"])
+def test_rejects_unsafe_names(prefetcher, origin, name):
+    assert not is_safe_name(name)
+    result = prefetcher.fetch(name)
+    assert not result.ok
+    assert "잘못된 파일 이름" in result.error
+    assert origin.requests == []
+    assert result.attempts == 0
+
+
+def test_accepts_package_names():
+    assert is_safe_name("bins_win32.zip.0123abcd")
+    assert is_safe_name("steam_client_win32")
@@ -0,0 +1,121 @@
+from src.util.process_supervisor import STEAM_PROCESS_NAMES, FakeProcessBackend
+from src.util.process_table import KillResult, ProcessTable
+
+
+def steam_tree(backend: FakeProcessBackend) -> dict:
+    """steam.exe -> steamwebhelper.exe -> steamwebhelper.exe (렌더러), steam.exe -> steamservice.exe"""
+    pids = {"steam": backend.add("steam.exe", ppid=1)}
+    pids["helper"] = backend.add("steamwebhelper.exe", ppid=pids["steam"])
+    pids["renderer"] = backend.add("steamwebhelper.exe", ppid=pids["helper"])
+    pids["service"] = backend.add("steamservice.exe", ppid=pids["steam"])
+    return pids
+
+
+def test_kill_tree_terminates_descendants_before_parents():
+    backend = FakeProcessBackend()
+    pids = steam_tree(backend)
+    other = backend.add("explorer.exe", ppid=1)
+
+    result = ProcessTable(backend).kill_tree(["steam.exe"])
+
+    order = backend.terminated
+    assert set(order) == set(pids.values())
+    assert order.index(pids["renderer"]) < order.index(pids["helper"]) < order.index(pids["steam"])
+    assert order.index(pids["service"]) < order.index(pids["steam"])
+    assert backend.find(["explorer.exe"]) == [other]
+    assert not backend.find(STEAM_PROCESS_NAMES)
+
+
+def test_kill_tree_skips_child_started_before_parent():
+    backend = FakeProcessBackend()
+    steam = backend.add("steam.exe", ppid=1, started=100)
+    helper = backend.add("steamwebhelper.exe", ppid=steam, started=101)
+    # Windows가 pid를 재사용해 steam.exe의 pid를 부모로 가리키지만, steam.exe보다 먼저 생성된 관계없는 프로세스
+    unrelated = backend.add("unrelated.exe", ppid=steam, started=50)
+
+    matched = ProcessTable(backend).match(["steam.exe"])
+
+    assert [process.pid for process in matched] == [helper, steam]
+    ProcessTable(backend).kill_tree(["steam.exe"])
+    assert unrelated not in backend.terminated
+    assert backend.find(["unrelated.exe"]) == [unrelated]
+
+
+def test_kill_tree_ignores_process_that_already_exited():
+    class StaleSnapshotBackend(FakeProcessBackend):
+        """조회한 뒤 종료 전에 끝난 프로세스를 흉내 냅니다. (스냅샷에는 남아 있음)"""
+
+        def __init__(self):
+            super().__init__()
+            self.stale = []
+
+        def snapshot(self):
+            return super().snapshot() + [(pid, ppid, name) for pid, ppid, name, _ in self.stale]
+
+        def start_time(self, pid: int):
+            started = {pid: started for pid, _, _, started in self.stale}
+            return started.get(pid, super().start_time(pid))
+
+    backend = StaleSnapshotBackend()
+    pids = steam_tree(backend)
+    backend.stale.append((4242, pids["steam"], "steamwebhelper.exe", 1000))
+
+    result = ProcessTable(backend).kill_tree(["steam.exe"])
+
+    assert 4242 in [process.pid for process in result.matched]
+    assert result.ok
+    assert 4242 in result.terminated
+    assert not backend.find(STEAM_PROCESS_NAMES)
+
+
+def test_kill_tree_result_reports_matches_and_failures():
+    backend = FakeProcessBackend()
+    pids = steam_tree(backend)
+    backend.protected.add(pids["service"])
+
+    result = ProcessTable(backend).kill_tree(["steam.exe"])
+
+    assert isinstance(result, KillResult)
+    assert result.was_running
+    assert not result.ok
+    assert list(result.failed) == [pids["service"]]
+    assert isinstance(result.failed[pids["service"]], PermissionError)
+    assert sorted(result.terminated) == sorted(pid for name, pid in pids.items() if name != "service")
+    assert {process.pid: process.ppid for process in result.matched}[pids["renderer"]] == pids["helper"]
+    assert result.elapsed >= 0
+
+
+def test_kill_tree_without_matches():
+    backend = FakeProcessBackend()
+    backend.add("explorer.exe", ppid=1)
+
+    result = ProcessTable(backend).kill_tree(STEAM_PROCESS_NAMES)
+
+    assert not result.was_running
+    assert result.ok
+    assert result.matched == [] and result.terminated == [] and backend.terminated == []
+
+
+def write_proc_entry(proc_root, pid: int, ppid: int, comm: str, argv: list, state: str = "S"):
+    entry = proc_root / str(pid)
+    entry.mkdir()
+    # starttime(22번째 필드)까지 채웁니다.
+    (entry / "stat").write_text(f"{pid} ({comm}) {state} {ppid} " + " ".join(["0"] * 16) + f" {pid * 10} 0\n")
+    (entry / "cmdline").write_bytes(b"\0".join(arg.encode() for arg in argv) + b"\0")
+
+
+def test_procfs_backend_matches_names_truncated_in_comm(tmp_path):
+    from src.util.process_supervisor import ProcfsProcessBackend
+
+    write_proc_entry(tmp_path, 10, 1, "steam.exe", ["C:\\Program Files (x86)\\Steam\\steam.exe"])
+    write_proc_entry(tmp_path, 11, 10, "steamwebhelper.", ["C:\\Program Files (x86)\\Steam\\bin\\cef\\steamwebhelper.exe",
+                                                           "--type=renderer"])
+    write_proc_entry(tmp_path, 12, 10, "steamservice.ex", ["/opt/steam/steamservice.exe"])
+    # argv를 바꾼 프로세스는 comm을 그대로 씁니다.
+    write_proc_entry(tmp_path, 13, 1, "steamwebhelper.", ["renamed"])
+    write_proc_entry(tmp_path, 14, 10, "steamwebhelper.", ["steamwebhelper.exe"], state="Z")
+    backend = ProcfsProcessBackend(str(tmp_path))
+
+    assert sorted(backend.find(STEAM_PROCESS_NAMES)) == [10, 11, 12]
+    assert (13, 1, "steamwebhelper.") in backend.snapshot()
+    assert [process.pid for process in ProcessTable(backend).match(["steam.exe"])] == [11, 12, 10]
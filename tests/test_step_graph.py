@@ -0,0 +1,110 @@
+import os
+import signal
+import sys
+import threading
+import time
+
+import pytest
+
+from src.util.process_supervisor import FakeProcessBackend, ProcessSupervisor
+from src.util.step_graph import (STATUS_FAILED, STATUS_OK, STATUS_SKIPPED, STATUS_TIMEOUT, StepGraph, StepScheduler,
+                                 current_cancel_event)
+
+
+def test_runs_dependencies_in_order_and_passes_values():
+    graph = StepGraph()
+    graph.add("a", lambda values: 1)
+    graph.add("b", lambda values: values["a"] + 1, deps=["a"])
+    graph.add("c", lambda values: values["a"] + values["b"], deps=["a", "b"])
+
+    report = StepScheduler(graph).run()
+
+    assert report.ok
+    assert [report.results[name].value for name in "abc"] == [1, 2, 3]
+    assert [result.name for result in report.critical_path(graph)] == ["a", "b", "c"]
+
+
+def test_required_failure_skips_dependents_but_optional_does_not():
+    graph = StepGraph()
+    graph.add("optional", lambda values: 1 / 0, optional=True)
+    graph.add("after_optional", lambda values: values["optional"], deps=["optional"])
+    graph.add("required", lambda values: 1 / 0)
+    graph.add("after_required", lambda values: "never", deps=["required"])
+
+    report = StepScheduler(graph).run()
+
+    statuses = {name: result.status for name, result in report.results.items()}
+    assert statuses == {"optional": STATUS_FAILED, "after_optional": STATUS_OK, "required": STATUS_FAILED,
+                        "after_required": STATUS_SKIPPED}
+    assert report.results["after_optional"].value is None
+
+
+def test_timeout_sets_cancel_event_and_step_stops():
+    stopped = threading.Event()
+
+    def slow(values):
+        cancel = current_cancel_event()
+        assert cancel is not None
+        # 제한 시간보다 훨씬 오래 걸리는 작업. 취소 이벤트를 지키면 곧 끝납니다.
+        if cancel.wait(30):
+            stopped.set()
+        return "done"
+
+    graph = StepGraph()
+    graph.add("slow", slow, timeout=0.1)
+    graph.add("after", lambda values: "never", deps=["slow"])
+
+    started = time.monotonic()
+    report = StepScheduler(graph).run()
+
+    assert report.results["slow"].status == STATUS_TIMEOUT
+    assert report.results["after"].status == STATUS_SKIPPED
+    assert isinstance(report.results["slow"].error, TimeoutError)
+    assert stopped.wait(5)
+    assert time.monotonic() - started < 5
+
+
+def test_cancel_event_is_only_set_inside_steps():
+    seen = []
+    graph = StepGraph()
+    graph.add("a", lambda values: seen.append(current_cancel_event()))
+    StepScheduler(graph).run()
+
+    assert current_cancel_event() is None
+    assert len(seen) == 1 and isinstance(seen[0], threading.Event) and not seen[0].is_set()
+
+
+def test_supervised_run_honours_step_cancel():
+    def download(values):
+        result = ProcessSupervisor(FakeProcessBackend()).run(
+            [sys.executable, "-c", "import time; time.sleep(30)"], timeout=60,
+            cancel=(threading.Event(), current_cancel_event()))
+        # 취소되면 프로세스 정리는 호출한 쪽이 합니다.
+        for pid in result.pids:
+            os.kill(pid, signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+        return result
+
+    graph = StepGraph()
+    graph.add("download", download, timeout=0.2)
+
+    started = time.monotonic()
+    report = StepScheduler(graph).run()
+    assert report.results["download"].status == STATUS_TIMEOUT
+    # 작업 스레드가 풀려야 인터프리터가 끝날 수 있습니다.
+    for thread in threading.enumerate():
+        if thread.name.startswith("step"):
+            thread.join(5)
+            assert not thread.is_alive()
+    assert time.monotonic() - started < 10
+
+
+def test_validate_rejects_cycles_and_unknown_deps():
+    graph = StepGraph()
+    graph.add("a", lambda values: None, deps=["b"])
+    graph.add("b", lambda values: None, deps=["a"])
+    with pytest.raises(ValueError):
+        graph.validate()
+    graph = StepGraph()
+    graph.add("a", lambda values: None, deps=["missing"])
+    with pytest.raises(ValueError):
+        graph.validate()
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from src.steam import vdf
+
+LOGINUSERS = (
+    '"users"\n{\n'
+    '\t"76561197960265729"\n\t{\n\t\t"AccountName"\t\t"alice"\n\t\t"RememberPassword"\t\t"0"\n'
+    '\t\t"WantsOfflineMode"\t\t"1"\n\t}\n'
+    '\t"76561197960265730"\n\t{\n\t\t"AccountName" "bob"\n\t\t"rememberpassword" 0\n\t\t"AllowAutoLogin" "1"\n\t}\n'
+    '\t"76561197960265731" { "AccountName" "carol" }\n'
+    '}\n'
+)
+
+CASES = {
+    "lf": LOGINUSERS,
+    "crlf": LOGINUSERS.replace("\n", "\r\n"),
+    "bare": "users\n{\n\t76561197960265729\n\t{\n\t\tRememberPassword 0\n\t}\n}\n",
+    "empty user": '"users"\n{\n\t"76561197960265729"\n\t{\n\t}\n}',
+    "no users": '"users"\n{\n}\n',
+    "already set": '"users"\n{\n\t"1"\n\t{\n' + "".join(f'\t\t"{key}"\t\t"1"\n' for key in vdf.OFFLINE_LOGIN_FLAGS) + "\t}\n}\n",
+    # 아래는 메모리 편집 대상이 아니어서 스트리밍 편집기가 처리합니다.
+    "nested": '"users"\n{\n\t"1"\n\t{\n\t\t"sub"\n\t\t{\n\t\t\t"RememberPassword"\t"0"\n\t\t}\n\t}\n}\n',
+    "comment": '// loginusers\n"users"\n{\n\t"1"\n\t{\n\t\t"RememberPassword"\t"0"\n\t}\n}\n',
+    "escape": '"users"\n{\n\t"1"\n\t{\n\t\t"PersonaName"\t"a\\"b"\n\t}\n}\n',
+    "other root": '"config"\n{\n\t"1"\n\t{\n\t\t"RememberPassword"\t"0"\n\t}\n}\n',
+}
+
+
+def write(tmp_path, name: str, text: str) -> str:
+    path = tmp_path / name
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_in_memory_and_streaming_paths_agree(tmp_path, name):
+    memory = write(tmp_path, "memory.vdf", CASES[name])
+    stream = write(tmp_path, "stream.vdf", CASES[name])
+
+    memory_stats = vdf.rewrite_user_flags(memory, vdf.OFFLINE_LOGIN_FLAGS)
+    stream_stats = vdf.rewrite_user_flags(stream, vdf.OFFLINE_LOGIN_FLAGS, chunk_size=7, in_memory_limit=-1)
+
+    assert memory_stats == stream_stats
+    with open(memory, "rb") as a, open(stream, "rb") as b:
+        assert a.read() == b.read()
+    assert sorted(os.listdir(tmp_path)) == ["memory.vdf", "stream.vdf"]
+
+
+def test_rewrite_sets_and_inserts_flags(tmp_path):
+    path = write(tmp_path, "loginusers.vdf", LOGINUSERS)
+
+    stats = vdf.rewrite_user_flags(path, vdf.OFFLINE_LOGIN_FLAGS)
+
+    assert stats == {"users": 3, "updated": 2, "inserted": 8, "changed": True}
+    document = vdf.load_file(path)
+    for _, user in document.get("users").children():
+        for key, value in vdf.OFFLINE_LOGIN_FLAGS.items():
+            assert user.get(key) == value
+
+
+def test_unchanged_file_is_not_rewritten(tmp_path):
+    path = write(tmp_path, "loginusers.vdf", CASES["already set"])
+    before = os.stat(path)
+
+    stats = vdf.rewrite_user_flags(path, vdf.OFFLINE_LOGIN_FLAGS)
+
+    assert stats == {"users": 1, "updated": 0, "inserted": 0, "changed": False}
+    after = os.stat(path)
+    assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+
+@pytest.mark.parametrize("text", ['"users"\n{\n\t"1"\n\t{\n\t\t"RememberPassword"\n\t}\n}\n', '"users"\n{\n\t"1"\n\t{\n}\n'])
+def test_syntax_error_in_small_file(tmp_path, text):
+    path = write(tmp_path, "loginusers.vdf", text)
+
+    with pytest.raises(vdf.VdfSyntaxError):
+        vdf.rewrite_user_flags(path, vdf.OFFLINE_LOGIN_FLAGS)
+    assert os.listdir(tmp_path) == ["loginusers.vdf"]